@@ -20,6 +20,7 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
 
 // Platform specific includes
 
@@ -106,6 +107,39 @@ namespace FIFE {
 		m_callback = cb;
 	}
 
+	void SoundEmitter::addListener(SoundEmitterListener* listener) {
+		m_listeners.push_back(listener);
+	}
+
+	void SoundEmitter::removeListener(SoundEmitterListener* listener) {
+		std::vector<SoundEmitterListener*>::iterator i = m_listeners.begin();
+		while (i != m_listeners.end()) {
+			if ((*i) == listener) {
+				*i = NULL;
+				return;
+			}
+			++i;
+		}
+		FL_WARN(_log, "Cannot remove unknown listener");
+	}
+
+	void SoundEmitter::callOnFinished() {
+		if (m_callback) {
+			m_callback();
+		}
+
+		std::vector<SoundEmitterListener*>::iterator i = m_listeners.begin();
+		while (i != m_listeners.end()) {
+			if (*i) {
+				(*i)->onSoundFinished(m_emitterid, m_soundclipid);
+			}
+			++i;
+		}
+		m_listeners.erase(
+			std::remove(m_listeners.begin(), m_listeners.end(), (SoundEmitterListener*)NULL),
+			m_listeners.end());
+	}
+
 	void SoundEmitter::attachSoundClip() {
 		if (!m_soundclip->isStream()) {
 			// non-streaming
@@ -126,6 +160,22 @@ namespace FIFE {
 	}
 
 	void SoundEmitter::updateEvent(uint32_t time) {
+		if (!m_soundclip->isStream()) {
+			// the source plays on its own, only the end of the clip is checked
+			ALint state = 0;
+			alGetSourcei(m_source, AL_SOURCE_STATE, &state);
+			if (m_loop || state == AL_STOPPED || state == AL_INITIAL) {
+				setPeriod(-1);
+				if (!m_loop && state == AL_STOPPED) {
+					callOnFinished();
+				}
+			} else {
+				// not over yet, check again in the next frame
+				setPeriod(0);
+			}
+			return;
+		}
+
 		ALint procs;
 		ALint bufs;
 		ALuint buffer;
@@ -148,9 +198,9 @@ namespace FIFE {
 					if (bufs == 0) {
 						setPeriod(-1);
 						alSourceStop(m_source);
-						if(m_callback) {
-							m_callback();
-						}
+						// the listeners may reuse the emitter for another clip
+						callOnFinished();
+						return;
 					}
 					continue;
 				}
@@ -165,6 +215,13 @@ namespace FIFE {
 		if (m_soundclip) {
 			if (!m_soundclip->isStream()) {
 				alSourcei(m_source, AL_LOOPING, loop ? AL_TRUE : AL_FALSE);
+				ALint state = 0;
+				alGetSourcei(m_source, AL_SOURCE_STATE, &state);
+				if (!loop && m_loop && state == AL_PLAYING) {
+					// a playing clip runs to its end now
+					setLastUpdateTime(TimeManager::instance()->getTime());
+					setPeriod(0);
+				}
 			} else {
 				alSourcei(m_source, AL_LOOPING, AL_FALSE);
 			}
@@ -177,6 +234,12 @@ namespace FIFE {
 			alSourcePlay(m_source);
 			if (m_soundclip->isStream()) {
 				setPeriod(5000);
+			} else if (!m_loop) {
+				// check for the end of the clip when it should be over
+				int32_t remaining = static_cast<int32_t>(getDuration()) -
+					static_cast<int32_t>(getCursor(SD_TIME_POS) * 1000.0f);
+				setLastUpdateTime(TimeManager::instance()->getTime());
+				setPeriod(std::max(remaining, 0));
 			}
 		}
 	}
@@ -184,9 +247,9 @@ namespace FIFE {
 	void SoundEmitter::stop() {
 		if (m_soundclip) {
 			alSourceStop(m_source);
+			setPeriod(-1);
 
 			if (m_soundclip->isStream()) {
-				setPeriod(-1);
 				setCursor(SD_BYTE_POS, 0);
 			} else {
 				alSourceRewind(m_source);
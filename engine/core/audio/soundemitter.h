@@ -23,6 +23,7 @@
 #define FIFE_SOUNDEMITTER_H_
 
 // Standard C++ library includes
+#include <vector>
 
 // Platform specific includes
 
@@ -41,6 +42,21 @@ namespace FIFE {
 
 	class SoundManager;
 
+	/** Listener interface for the end of a sound clip.
+	 */
+	class SoundEmitterListener {
+	public:
+		virtual ~SoundEmitterListener() {};
+
+		/** Called when a clip that doesn't loop has finished playing.
+		 *  It is not called when the emitter is stopped.
+		 *
+		 * @param emitterId The id of the emitter.
+		 * @param soundClipId The handle of the sound clip that was played.
+		 */
+		virtual void onSoundFinished(uint32_t emitterId, uint32_t soundClipId) = 0;
+	};
+
 	/** The class for playing audio files
 	 */
 	class SoundEmitter : private TimeEvent {
@@ -84,13 +100,20 @@ namespace FIFE {
 		 */
 		SoundClipPtr getSoundClip() { return m_soundclip; };
 
-		/** Sets the callback to use when the STREAM has finished being played.
-		 *  NOTE: This only works with streaming audio.
+		/** Sets the callback to use when the clip has finished being played.
 		 *
 		 * @param cb function callback
 		 */
 		void setCallback(const type_callback& cb);
 
+		/** Adds a listener that is told when the clip has finished being played.
+		 */
+		void addListener(SoundEmitterListener* listener);
+
+		/** Removes a listener.
+		 */
+		void removeListener(SoundEmitterListener* listener);
+
 		/** Reset the emitter, free all internal buffers
 		 *
 		 * @param defaultall If set to true, emitter position, velocity, gain and type will be set to the default values
@@ -102,6 +125,7 @@ namespace FIFE {
 		void release();
 
 		/** Sets the playing mode
+		 *  Looping clips never finish, the listeners are not called for them.
 		 */
 		void setLooping(bool loop);
 
@@ -114,10 +138,12 @@ namespace FIFE {
 		void stop();
 
 		/** Pauses playing the audio file
+		 * The end of the clip is not checked while paused, play() schedules the check again.
 		 */
 		void pause() {
 			if (m_soundclip) {
 				alSourcePause(m_source);
+				setPeriod(-1);
 			}
 		}
 
@@ -222,6 +248,10 @@ namespace FIFE {
 		 */
 		void attachSoundClip();
 
+		/** Calls the callback and the listeners at the end of the clip
+		 */
+		void callOnFinished();
+
 		SoundManager*	m_manager;
 		ALuint			m_source;			// The openAL-source
 		SoundClipPtr	m_soundclip;	// the attached soundclip
@@ -230,6 +260,7 @@ namespace FIFE {
 		uint32_t	m_emitterid;	// the emitter-id
 		bool			m_loop;				// loop?
 		type_callback 	m_callback;
+		std::vector<SoundEmitterListener*> m_listeners;
 	};
 }
 
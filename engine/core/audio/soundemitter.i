@@ -35,6 +35,13 @@ namespace FIFE {
 	class SoundDecoder;
 	class SoundManager;
 
+	%feature("director") SoundEmitterListener;
+	class SoundEmitterListener {
+	public:
+		virtual ~SoundEmitterListener() {};
+		virtual void onSoundFinished(uint32_t emitterId, uint32_t soundClipId) = 0;
+	};
+
 	class SoundEmitter {
 	public:
 		SoundEmitter(SoundManager* manager, uint32_t uid);
@@ -47,6 +54,9 @@ namespace FIFE {
 		void reset(bool defaultall = false);
 		void release();
 
+		void addListener(SoundEmitterListener* listener);
+		void removeListener(SoundEmitterListener* listener);
+
 		void play();
 		void pause();
 		void stop();
@@ -32,7 +32,9 @@
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
 #include "util/base/exception.h"
+#include "util/base/workerpool.h"
 #include "util/log/logger.h"
+#include "util/time/profiler.h"
 #include "util/time/timemanager.h"
 #include "audio/soundmanager.h"
 #include "gui/guimanager.h"
@@ -54,6 +56,7 @@
 #include "video/opengl/renderbackendopengl.h"
 #endif
 #include "video/sdl/renderbackendsdl.h"
+#include "video/null/renderbackendnull.h"
 #include "loaders/native/video/imageloader.h"
 #include "loaders/native/audio/ogg_loader.h"
 #include "model/model.h"
@@ -96,6 +99,8 @@ namespace FIFE {
 		m_eventmanager(0),
 		m_soundmanager(0),
 		m_timemanager(0),
+		m_profiler(0),
+		m_workerpool(0),
 		m_imagemanager(0),
 		m_animationmanager(0),
 		m_soundclipmanager(0),
@@ -164,6 +169,10 @@ namespace FIFE {
 		FL_LOG(_log, "================== Engine initialize start =================");
 		m_timemanager = new TimeManager();
 		FL_LOG(_log, "Time manager created");
+		m_profiler = new Profiler();
+		FL_LOG(_log, "Profiler created");
+		m_workerpool = new WorkerPool();
+		FL_LOG(_log, "Worker pool created");
 
 		FL_LOG(_log, "Creating VFS");
 		m_vfs = new VFS();
@@ -202,6 +211,9 @@ namespace FIFE {
 		if (rbackend == "SDL") {
 			m_renderbackend = new RenderBackendSDL(m_settings.getColorKey());
 			FL_LOG(_log, "SDL Render backend created");
+		} else if (rbackend == "Null") {
+			m_renderbackend = new RenderBackendNull(m_settings.getColorKey());
+			FL_LOG(_log, "Null Render backend created");
 		} else {
 #ifdef HAVE_OPENGL
 			m_renderbackend = new RenderBackendOpenGL(m_settings.getColorKey());
@@ -254,19 +266,29 @@ namespace FIFE {
 			m_devcaps.setRenderDriverName(driver);
 		}
 
-		FL_LOG(_log, "Querying device capabilities");
-		m_devcaps.fillDeviceCaps();
-
 		uint16_t bpp = m_settings.getBitsPerPixel();
 
-		m_screenMode = m_devcaps.getNearestScreenMode(
-			m_settings.getScreenWidth(),
-			m_settings.getScreenHeight(),
-			bpp,
-			rbackend,
-			m_settings.isFullScreen(),
-			m_settings.getRefreshRate(),
-			m_settings.getDisplay());
+		if (rbackend == "Null") {
+			// there is no display to query, so the settings are used as they are
+			m_screenMode = ScreenMode(
+				m_settings.getScreenWidth(),
+				m_settings.getScreenHeight(),
+				bpp,
+				m_settings.getRefreshRate(),
+				0);
+		} else {
+			FL_LOG(_log, "Querying device capabilities");
+			m_devcaps.fillDeviceCaps();
+
+			m_screenMode = m_devcaps.getNearestScreenMode(
+				m_settings.getScreenWidth(),
+				m_settings.getScreenHeight(),
+				bpp,
+				rbackend,
+				m_settings.isFullScreen(),
+				m_settings.getRefreshRate(),
+				m_settings.getDisplay());
+		}
 
 		FL_LOG(_log, "Creating main screen");
 		m_renderbackend->createMainScreen(
@@ -343,6 +365,8 @@ namespace FIFE {
 		delete m_renderbackend;
 		delete m_vfs;
 		delete m_timemanager;
+		delete m_profiler;
+		delete m_workerpool;
 
 		TTF_Quit();
 		SDL_Quit();
@@ -360,24 +384,54 @@ namespace FIFE {
 	}
 
 	void Engine::pump() {
+		m_profiler->beginFrame();
 		m_renderbackend->startFrame();
-		m_eventmanager->processEvents();
-		m_timemanager->update();
+		{
+			ScopedProfile zone("EventManager::processEvents");
+			m_eventmanager->processEvents();
+		}
+		{
+			ScopedProfile zone("TimeManager::update");
+			m_timemanager->update();
+		}
+		{
+			ScopedProfile zone("VFS::processAsyncReads");
+			m_vfs->processAsyncReads();
+		}
+		{
+			ScopedProfile zone("ImageManager::processAsyncLoads");
+			m_imagemanager->processAsyncLoads();
+		}
 
         m_renderbackend->clearBackBuffer();
-		m_targetrenderer->render();
+		{
+			ScopedProfile zone("TargetRenderer::render");
+			m_targetrenderer->render();
+		}
 		if (m_model->getActiveCameraCount() == 0) {
+			ScopedProfile zone("OffRenderer::render");
 			m_offrenderer->render();
 		} else {
+			ScopedProfile zone("Model::update");
 			m_model->update();
 		}
 
 		if (m_guimanager) {
+			ScopedProfile zone("GUIManager::turn");
 			m_guimanager->turn();
 		}
 
 		m_cursor->draw();
-		m_renderbackend->endFrame();
+		{
+			ScopedProfile zone("RenderBackend::endFrame");
+			m_renderbackend->endFrame();
+		}
+		{
+			ScopedProfile zone("ResourceManagers::enforceMemoryBudget");
+			m_animationmanager->enforceMemoryBudget();
+			m_imagemanager->enforceMemoryBudget();
+		}
+		m_profiler->endFrame();
 	}
 
 	void Engine::finalizePumping() {
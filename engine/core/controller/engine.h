@@ -51,6 +51,8 @@ namespace FIFE {
 	class VFSSourceFactory;
 	class EventManager;
 	class TimeManager;
+	class Profiler;
+	class WorkerPool;
 	class Model;
 	class LogManager;
 	class Cursor;
@@ -139,6 +141,10 @@ namespace FIFE {
 		 */
 		TimeManager* getTimeManager() const { return m_timemanager; }
 
+		/** Provides access point to the Profiler
+		 */
+		Profiler* getProfiler() const { return m_profiler; }
+
 
 		/** Sets the GUI Manager to use.  Engine takes
 		 * ownership of the manager so DONT DELETE IT!
@@ -205,6 +211,8 @@ namespace FIFE {
 		EventManager* m_eventmanager;
 		SoundManager* m_soundmanager;
 		TimeManager* m_timemanager;
+		Profiler* m_profiler;
+		WorkerPool* m_workerpool;
 		ImageManager* m_imagemanager;
 		AnimationManager* m_animationmanager;
 		SoundClipManager* m_soundclipmanager;
@@ -29,6 +29,7 @@ namespace FIFE {
 	class SoundManager;
 	class EventManager;
 	class TimeManager;
+	class Profiler;
 	class IGUIManager;
 	class GUIChanManager;
 	class RenderBackend;
@@ -148,6 +149,7 @@ namespace FIFE {
 		SoundManager* getSoundManager();
 		EventManager* getEventManager();
 		TimeManager* getTimeManager();
+		Profiler* getProfiler();
 		void setGuiManager(IGUIManager* guimanager);
 		IGUIManager* getGuiManager();
 		ImageManager* getImageManager();
@@ -211,9 +211,9 @@ namespace FIFE {
 			m_gui_graphics = new OpenGLGuiGraphics();
 		}
 #endif
-        else {
-			//should never get here
-			assert(0);
+		else {
+			// the Null backend has no gui graphics
+			throw NotSupported("The fifechan gui does not support the " + backend + " render backend");
 		}
 
 		m_fcn_gui->setGraphics(m_gui_graphics);
@@ -92,6 +92,7 @@ namespace FIFE {
 			 * @param backend The GUI backend object to use
 			 * @param screenWidth width for the gui top container
 			 * @param screenHeight height for the gui top container
+			 * @throws NotSupported if the render backend has no gui graphics, e.g. Null
 			 */
 			void init(const std::string& backend, int32_t screenWidth, int32_t screenHeight);
 
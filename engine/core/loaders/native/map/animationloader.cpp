@@ -264,6 +264,9 @@ namespace FIFE {
 				ImagePtr imagePtr;
 				if (!m_imageManager->exists(framePath.string())) {
 					imagePtr = m_imageManager->create(framePath.string());
+					if (m_imageManager->isAutoAtlasingEnabled()) {
+						m_imageManager->packIntoAtlas(imagePtr);
+					}
 				} else {
 					imagePtr = m_imageManager->getPtr(framePath.string());
 				}
@@ -404,6 +404,9 @@ namespace FIFE {
 							ImagePtr imagePtr;
 							if(!m_imageManager->exists(imagePath.string())) {
 								imagePtr = m_imageManager->create(imagePath.string());
+								if (m_imageManager->isAutoAtlasingEnabled()) {
+									m_imageManager->packIntoAtlas(imagePtr);
+								}
 							}
 							else {
 								imagePtr = m_imageManager->getPtr(imagePath.string());
@@ -58,46 +58,43 @@ namespace FIFE {
 			size_t datalen = data->getDataLength();
 			boost::scoped_array<uint8_t> darray(new uint8_t[datalen]);
 			data->readInto(darray.get(), datalen);
-			SDL_RWops* rwops = SDL_RWFromConstMem(darray.get(), static_cast<int>(datalen));
-
-			SDL_Surface* surface = IMG_Load_RW(rwops, false);
-
-			if (!surface) {
-				throw SDLException(std::string("Fatal Error when loading image into a SDL_Surface: ") + SDL_GetError());
-			}
 
 			RenderBackend* rb = RenderBackend::instance();
 			// in case of SDL we don't need to convert the surface
-			if (rb->getName() == "SDL") {
-				img->setSurface(surface);
 			// in case of OpenGL we need a 32bit surface
-			} else {
-				SDL_PixelFormat dst_format = rb->getPixelFormat();
-				SDL_PixelFormat src_format = *surface->format;
-				uint8_t dstbits = dst_format.BitsPerPixel;
-				uint8_t srcbits = src_format.BitsPerPixel;
+			const SDL_PixelFormat* format = rb->getName() == "SDL" ? 0 : &rb->getPixelFormat();
+			img->setSurface(decode(darray.get(), datalen, format));
+		}
+		//restore saved x and y shifts
+		img->setXShift(xShiftSave);
+		img->setYShift(yShiftSave);
+	}
 
-				if (srcbits != 32 || dst_format.Rmask != src_format.Rmask || dst_format.Gmask != src_format.Gmask ||
-					dst_format.Bmask != src_format.Bmask || dst_format.Amask != src_format.Amask) {
-					dst_format.BitsPerPixel = 32;
-					SDL_Surface* conv = SDL_ConvertSurface(surface, &dst_format, 0);
-					dst_format.BitsPerPixel = dstbits;
+	SDL_Surface* ImageLoader::decode(const uint8_t* data, size_t length, const SDL_PixelFormat* format) {
+		SDL_RWops* rwops = SDL_RWFromConstMem(data, static_cast<int>(length));
+		SDL_Surface* surface = IMG_Load_RW(rwops, false);
+		SDL_FreeRW(rwops);
 
-					if (!conv) {
-						throw SDLException(std::string("Fatal Error when converting surface to the screen format: ") + SDL_GetError());
-					}
+		if (!surface) {
+			throw SDLException(std::string("Fatal Error when loading image into a SDL_Surface: ") + SDL_GetError());
+		}
+		if (!format) {
+			return surface;
+		}
 
-					img->setSurface(conv);
-					SDL_FreeSurface(surface);
-				} else {
-					img->setSurface(surface);
-				}
-			}
+		SDL_PixelFormat dst_format = *format;
+		SDL_PixelFormat src_format = *surface->format;
+		if (src_format.BitsPerPixel != 32 || dst_format.Rmask != src_format.Rmask || dst_format.Gmask != src_format.Gmask ||
+			dst_format.Bmask != src_format.Bmask || dst_format.Amask != src_format.Amask) {
+			dst_format.BitsPerPixel = 32;
+			SDL_Surface* conv = SDL_ConvertSurface(surface, &dst_format, 0);
+			SDL_FreeSurface(surface);
 
-			SDL_FreeRW(rwops);
+			if (!conv) {
+				throw SDLException(std::string("Fatal Error when converting surface to the screen format: ") + SDL_GetError());
+			}
+			return conv;
 		}
-		//restore saved x and y shifts
-		img->setXShift(xShiftSave);
-		img->setYShift(yShiftSave);
+		return surface;
 	}
 }  //FIFE
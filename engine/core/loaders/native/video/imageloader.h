@@ -30,8 +30,12 @@
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
+#include "util/base/fife_stdint.h"
 #include "util/resource/resource.h"
 
+struct SDL_Surface;
+struct SDL_PixelFormat;
+
 namespace FIFE {
 	/** ImageLoader for some basic formats like jpeg, png etc.
 	 */
@@ -39,6 +43,18 @@ namespace FIFE {
 	public:
 		ImageLoader() {}
 		virtual void load(IResource* res);
+
+		/** Decodes an image file that is already read into memory.
+		 *
+		 * Does not touch the render backend or the vfs, so it can be called
+		 * from worker threads. Throws a SDLException if the data can not be decoded.
+		 *
+		 * @param data The content of the image file.
+		 * @param length The length of the data in bytes.
+		 * @param format The 32 bit format the surface is converted to, 0 keeps the format of the file.
+		 * @return The new surface, the caller owns it.
+		 */
+		static SDL_Surface* decode(const uint8_t* data, size_t length, const SDL_PixelFormat* format);
 	};
 }
 #endif
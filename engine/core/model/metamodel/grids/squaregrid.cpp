@@ -20,6 +20,7 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
 #include <cassert>
 #include <iostream>
 
@@ -81,7 +82,15 @@ namespace FIFE {
 	}
 	
 	double SquareGrid::getHeuristicCost(const ModelCoordinate& curpos, const ModelCoordinate& target) {
-		return static_cast<double>(ABS(target.x - curpos.x) + ABS(target.y - curpos.y));
+		int32_t dx = ABS(target.x - curpos.x);
+		int32_t dy = ABS(target.y - curpos.y);
+		if (m_allow_diagonals) {
+			// a diagonal step costs 1.4 and covers one cell in both directions,
+			// so the manhattan distance would overestimate the remaining cost
+			int32_t diagonal = std::min(dx, dy);
+			return static_cast<double>(std::max(dx, dy) - diagonal) + 1.4 * static_cast<double>(diagonal);
+		}
+		return static_cast<double>(dx + dy);
 	}
 
 	const std::string& SquareGrid::getType() const {
@@ -31,6 +31,7 @@
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
+#include "pathfinder/route.h"
 
 namespace FIFE {
 	class Location;
@@ -108,6 +109,17 @@ namespace FIFE {
 		 */
 		virtual int32_t getMaxTicks() = 0;
 
+		/** Sets the search mode that is used for routes which do not define their own.
+		 * Pathers which only know one search mode can ignore it, the default does nothing.
+		 * @param mode A SearchModeInfo which holds the mode.
+		 */
+		virtual void setSearchMode(SearchModeInfo mode) {}
+
+		/** Returns the search mode that is used for routes which do not define their own.
+		 * @return A SearchModeInfo which holds the mode, SEARCH_MODE_ASTAR by default.
+		 */
+		virtual SearchModeInfo getSearchMode() { return SEARCH_MODE_ASTAR; }
+
 		/** Gets the name of this pather
 		 */
 		virtual std::string getName() const = 0;
@@ -45,6 +45,8 @@ namespace FIFE {
 		virtual bool cancelSession(const int32_t sessionId) = 0;
 		virtual void setMaxTicks(int32_t ticks) = 0;
 		virtual int32_t getMaxTicks() = 0;
+		virtual void setSearchMode(SearchModeInfo mode);
+		virtual SearchModeInfo getSearchMode();
 		virtual std::string getName() const = 0;
 	};
 }
@@ -29,6 +29,7 @@
 // Second block: files included from the same folder
 #include "util/structures/purge.h"
 #include "util/log/logger.h"
+#include "util/time/profiler.h"
 #include "model/metamodel/ipather.h"
 #include "model/metamodel/object.h"
 #include "model/metamodel/grids/cellgrid.h"
@@ -280,10 +281,12 @@ namespace FIFE {
 	void Model::update() {
 		std::list<Map*>::iterator it = m_maps.begin();
 		for(; it != m_maps.end(); ++it) {
+			ScopedProfile zone("Map::update");
 			(*it)->update();
 		}
 		std::vector<IPather*>::iterator jt = m_pathers.begin();
 		for(; jt != m_pathers.end(); ++jt) {
+			ScopedProfile zone(Profiler::getActive() ? (*jt)->getName() : std::string());
 			(*jt)->update();
 		}
 	}
@@ -319,8 +319,10 @@ namespace FIFE {
 		if (old_type != m_type) {
 			bool block = (m_type == CTYPE_STATIC_BLOCKER ||
 				m_type == CTYPE_DYNAMIC_BLOCKER || m_type == CTYPE_CELL_BLOCKER);
-			m_layer->getCellCache()->setBlockingUpdate(true);
+			CellCache* cache = m_layer->getCellCache();
+			cache->setBlockingUpdate(true);
 			callOnBlockingChanged(block);
+			cache->callOnBlockingChanged(this, block);
 		}
 	}
 
@@ -497,7 +499,13 @@ namespace FIFE {
 	}
 
 	void Cell::setCellType(CellTypeInfo type) {
+		if (m_type == type) {
+			return;
+		}
 		m_type = type;
+		bool block = (m_type == CTYPE_STATIC_BLOCKER ||
+			m_type == CTYPE_DYNAMIC_BLOCKER || m_type == CTYPE_CELL_BLOCKER);
+		m_layer->getCellCache()->callOnBlockingChanged(this, block);
 	}
 
 	const std::set<Instance*>& Cell::getInstances() {
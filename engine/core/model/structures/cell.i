@@ -29,6 +29,7 @@ namespace FIFE {
 	class Instance;
 	class Layer;
 	class Cell;
+	class Zone;
 	
 	enum CellType {
 		CTYPE_NO_BLOCKER = 0,
@@ -77,6 +78,8 @@ namespace FIFE {
 			void updateCellInfo();
 			int32_t getCellId();
 			const ModelCoordinate getLayerCoordinates() const;
+			Zone* getZone();
+			bool isZoneProtected();
 			bool defaultCost();
 			void setCostMultiplier(double multi);
 			double getCostMultiplier();
@@ -20,6 +20,10 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
+#include <cstring>
+#include <deque>
+#include <map>
 
 // 3rd party library includes
 
@@ -28,11 +32,14 @@
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
 #include "model/metamodel/grids/cellgrid.h"
+#include "util/base/exception.h"
 #include "util/log/logger.h"
 #include "util/structures/purge.h"
 
 #include "cellcache.h"
 #include "cell.h"
+#include "clustergraph.h"
+#include "flowfield.h"
 #include "layer.h"
 #include "instance.h"
 #include "map.h"
@@ -347,20 +354,36 @@ namespace FIFE {
 				cell->setZoneProtected(true);
 				m_cache->splitZone(cell);
 			} else {
-				Zone* z1 = cell->getZone();
-				Zone* z2 = NULL;
+				// merge the zones of the open neighbors, closed narrow cells, e.g. other doors, do not connect them
+				Zone* z1 = NULL;
 				const std::vector<Cell*>& neighbors = cell->getNeighbors();
 				std::vector<Cell*>::const_iterator it = neighbors.begin();
 				for (; it != neighbors.end(); ++it) {
 					Zone* z = (*it)->getZone();
-					if (z && z != z1) {
-						z2 = z;
+					if (!z || z == z1 || (*it)->isZoneProtected() || (*it)->getCellType() == CTYPE_STATIC_BLOCKER ||
+						(*it)->getCellType() == CTYPE_CELL_BLOCKER) {
+						continue;
+					}
+					if (!z1) {
+						z1 = z;
+					} else {
+						m_cache->mergeZones(z1, z);
+						z1 = (*it)->getZone();
 					}
 				}
-				if (z1 && z2) {
-					cell->setZoneProtected(false);
-					m_cache->mergeZones(z1, z2);
+				// the cell kept the zone of one side while it was closed, it joins the zone of its open neighbors
+				Zone* oldZone = cell->getZone();
+				if (z1 && oldZone != z1) {
+					if (oldZone) {
+						oldZone->removeCell(cell);
+						if (oldZone->getCellCount() == 0) {
+							m_cache->removeZone(oldZone);
+						}
+					}
+					z1->addCell(cell);
+					cell->setInserted(true);
 				}
+				cell->setZoneProtected(false);
 			}
 		}
 
@@ -377,8 +400,20 @@ namespace FIFE {
 		m_fowUpdate(false),
 		m_sizeUpdate(false),
 		m_updated(false),
+		m_zoneUpdateCells(0),
+		m_zoneUpdates(0),
+		m_lastZoneUpdateCells(0),
+		m_lastZoneUpdates(0),
+		m_maxZoneUpdateCells(0),
 		m_searchNarrow(true),
-		m_staticSize(false) {
+		m_staticSize(false),
+		m_costMultiplierCount(0),
+		m_speedMultiplierCount(0),
+		m_clusterGraph(NULL),
+		m_clusterSize(16),
+		m_maxFlowFields(16),
+		m_flowFieldUses(0),
+		m_searchMode(SEARCH_MODE_DEFAULT) {
 		// create cell change listener
 		m_cellZoneListener = new ZoneCellChangeListener(this);
 		// set base size
@@ -434,6 +469,10 @@ namespace FIFE {
 	}
 
 	void CellCache::reset() {
+		// delete cluster graph and flow fields
+		delete m_clusterGraph;
+		m_clusterGraph = NULL;
+		removeFlowFields();
 		// delete zones
 		if (!m_zones.empty()) {
 			std::vector<Zone*>::iterator it = m_zones.begin();
@@ -446,7 +485,9 @@ namespace FIFE {
 		m_costsToCells.clear();
 		m_costsTable.clear();
 		m_costMultipliers.clear();
+		m_costMultiplierCount = 0;
 		m_speedMultipliers.clear();
+		m_speedMultiplierCount = 0;
 		m_narrowCells.clear();
 		m_cellAreas.clear();
 		// delete cells
@@ -485,6 +526,11 @@ namespace FIFE {
 		// check if size has changed
 		Rect newsize = rec;
 		if (newsize.x != m_size.x || newsize.y != m_size.y || newsize.w != m_size.w || newsize.h != m_size.h) {
+			// cell ids are changed, so the cluster graph and the flow fields are invalid
+			delete m_clusterGraph;
+			m_clusterGraph = NULL;
+			removeFlowFields();
+
 			uint32_t w = ABS(newsize.w - newsize.x) + 1;
 			uint32_t h = ABS(newsize.h - newsize.y) + 1;
 
@@ -493,7 +539,18 @@ namespace FIFE {
 			for (uint32_t i = 0; i < w; ++i) {
 				cells[i].resize(h, NULL);
 			}
-			const std::vector<Layer*>& interacts = m_layer->getInteractLayers();
+			// the multipliers are moved to the new cell ids
+			std::vector<double> costMultipliers;
+			std::vector<double> speedMultipliers;
+			uint32_t costMultiplierCount = 0;
+			uint32_t speedMultiplierCount = 0;
+			if (m_costMultiplierCount > 0) {
+				costMultipliers.resize(w * h, -1.0);
+			}
+			if (m_speedMultiplierCount > 0) {
+				speedMultipliers.resize(w * h, -1.0);
+			}
+			std::vector<Cell*> newCells;
 			for(uint32_t y = 0; y < h; ++y) {
 				for(uint32_t x = 0; x < w; ++x) {
 					// transfer cells
@@ -506,35 +563,21 @@ namespace FIFE {
 						int32_t coordId = x + y * w;
 						cell = new Cell(coordId, mc, m_layer);
 						cells[x][y] = cell;
-
-						std::list<Instance*> cell_instances;
-						m_layer->getInstanceTree()->findInstances(mc, 0, 0, cell_instances);
-						if (!interacts.empty()) {
-							// fill interact Instances into Cell
-							std::vector<Layer*>::const_iterator it = interacts.begin();
-							std::list<Instance*> interact_instances;
-							for(; it != interacts.end(); ++it) {
-								// convert coordinates
-								ExactModelCoordinate emc(FIFE::intPt2doublePt(mc));
-								ModelCoordinate inter_mc = (*it)->getCellGrid()->toLayerCoordinates(m_layer->getCellGrid()->toMapCoordinates(emc));
-								// check interact layer for instances
-								(*it)->getInstanceTree()->findInstances(inter_mc, 0, 0, interact_instances);
-								if (!interact_instances.empty()) {
-									cell_instances.insert(cell_instances.end(), interact_instances.begin(), interact_instances.end());
-									interact_instances.clear();
-								}
-							}
-						}
-						if (!cell_instances.empty()) {
-							// add instances to cell
-							cell->addInstances(cell_instances);
-						}
+						newCells.push_back(cell);
 					// transfer ownership
 					} else {
 						cell = m_cells[static_cast<uint32_t>(old_x)][static_cast<uint32_t>(old_y)];
 						m_cells[static_cast<uint32_t>(old_x)][static_cast<uint32_t>(old_y)] = NULL;
 						cells[x][y] = cell;
 						int32_t coordId = x + y * w;
+						if (!costMultipliers.empty() && m_costMultipliers[cell->getCellId()] >= 0.0) {
+							costMultipliers[coordId] = m_costMultipliers[cell->getCellId()];
+							++costMultiplierCount;
+						}
+						if (!speedMultipliers.empty() && m_speedMultipliers[cell->getCellId()] >= 0.0) {
+							speedMultipliers[coordId] = m_speedMultipliers[cell->getCellId()];
+							++speedMultiplierCount;
+						}
 						cell->setCellId(coordId);
 						cell->resetNeighbors();
 					}
@@ -553,10 +596,43 @@ namespace FIFE {
 			}
 			// use new values
 			m_cells = cells;
+			m_costMultipliers.swap(costMultipliers);
+			m_costMultiplierCount = costMultiplierCount;
+			m_speedMultipliers.swap(speedMultipliers);
+			m_speedMultiplierCount = speedMultiplierCount;
 			m_size = newsize;
 			m_width = w;
 			m_height = h;
 
+			// the instances can set multipliers, so they are added to the new cells after the size is updated
+			const std::vector<Layer*>& interacts = m_layer->getInteractLayers();
+			std::vector<Cell*>::iterator nit = newCells.begin();
+			for (; nit != newCells.end(); ++nit) {
+				ModelCoordinate mc = (*nit)->getLayerCoordinates();
+				std::list<Instance*> cell_instances;
+				m_layer->getInstanceTree()->findInstances(mc, 0, 0, cell_instances);
+				if (!interacts.empty()) {
+					// fill interact Instances into Cell
+					std::vector<Layer*>::const_iterator it = interacts.begin();
+					std::list<Instance*> interact_instances;
+					for(; it != interacts.end(); ++it) {
+						// convert coordinates
+						ExactModelCoordinate emc(FIFE::intPt2doublePt(mc));
+						ModelCoordinate inter_mc = (*it)->getCellGrid()->toLayerCoordinates(m_layer->getCellGrid()->toMapCoordinates(emc));
+						// check interact layer for instances
+						(*it)->getInstanceTree()->findInstances(inter_mc, 0, 0, interact_instances);
+						if (!interact_instances.empty()) {
+							cell_instances.insert(cell_instances.end(), interact_instances.begin(), interact_instances.end());
+							interact_instances.clear();
+						}
+					}
+				}
+				if (!cell_instances.empty()) {
+					// add instances to cell
+					(*nit)->addInstances(cell_instances);
+				}
+			}
+
 			bool zCheck = m_neighborZ != -1;
 			// fill neighbors into cells
 			it = m_cells.begin();
@@ -722,10 +798,10 @@ namespace FIFE {
 		if (!m_costsToCells.empty()) {
 			removeCellFromCost(cell);
 		}
-		if (!m_costMultipliers.empty()) {
+		if (m_costMultiplierCount > 0) {
 			resetCostMultiplier(cell);
 		}
-		if (!m_speedMultipliers.empty()) {
+		if (m_speedMultiplierCount > 0) {
 			resetSpeedMultiplier(cell);
 		}
 		if (!m_narrowCells.empty()) {
@@ -1158,63 +1234,75 @@ namespace FIFE {
 	}
 
 	bool CellCache::isDefaultCost(Cell* cell) {
-		std::map<Cell*, double>::iterator it = m_costMultipliers.find(cell);
-		if (it != m_costMultipliers.end()) {
-			return false;
+		if (m_costMultiplierCount == 0) {
+			return true;
 		}
-		return true;
+		return m_costMultipliers[cell->getCellId()] < 0.0;
+	}
+
+	bool CellCache::isDefaultCost() {
+		return m_costMultiplierCount == 0;
 	}
 
 	void CellCache::setCostMultiplier(Cell* cell, double multi) {
-		std::pair<std::map<Cell*, double>::iterator, bool> insertiter =
-			m_costMultipliers.insert(std::pair<Cell*, double>(cell, multi));
-		if (insertiter.second == false) {
-			double& old = insertiter.first->second;
-			old = multi;
+		// the array is created with the first multiplier
+		if (m_costMultipliers.empty()) {
+			m_costMultipliers.resize(m_width * m_height, -1.0);
 		}
+		double& old = m_costMultipliers[cell->getCellId()];
+		if (old < 0.0) {
+			++m_costMultiplierCount;
+		}
+		old = multi;
 	}
 
 	double CellCache::getCostMultiplier(Cell* cell) {
 		double cost = 1.0;
-		std::map<Cell*, double>::iterator it = m_costMultipliers.find(cell);
-		if (it != m_costMultipliers.end()) {
-			cost = it->second;
+		if (m_costMultiplierCount > 0 && m_costMultipliers[cell->getCellId()] >= 0.0) {
+			cost = m_costMultipliers[cell->getCellId()];
 		}
 		return cost;
 	}
 
 	void CellCache::resetCostMultiplier(Cell* cell) {
-		m_costMultipliers.erase(cell);
+		if (m_costMultiplierCount > 0 && m_costMultipliers[cell->getCellId()] >= 0.0) {
+			m_costMultipliers[cell->getCellId()] = -1.0;
+			--m_costMultiplierCount;
+		}
 	}
 
 	bool CellCache::isDefaultSpeed(Cell* cell) {
-		std::map<Cell*, double>::iterator it = m_speedMultipliers.find(cell);
-		if (it != m_speedMultipliers.end()) {
-			return false;
+		if (m_speedMultiplierCount == 0) {
+			return true;
 		}
-		return true;
+		return m_speedMultipliers[cell->getCellId()] < 0.0;
 	}
 
 	void CellCache::setSpeedMultiplier(Cell* cell, double multi) {
-		std::pair<std::map<Cell*, double>::iterator, bool> insertiter =
-			m_speedMultipliers.insert(std::pair<Cell*, double>(cell, multi));
-		if (insertiter.second == false) {
-			double& old = insertiter.first->second;
-			old = multi;
+		// the array is created with the first multiplier
+		if (m_speedMultipliers.empty()) {
+			m_speedMultipliers.resize(m_width * m_height, -1.0);
 		}
+		double& old = m_speedMultipliers[cell->getCellId()];
+		if (old < 0.0) {
+			++m_speedMultiplierCount;
+		}
+		old = multi;
 	}
 
 	double CellCache::getSpeedMultiplier(Cell* cell) {
 		double speed = 1.0;
-		std::map<Cell*, double>::iterator it = m_speedMultipliers.find(cell);
-		if (it != m_speedMultipliers.end()) {
-			speed = it->second;
+		if (m_speedMultiplierCount > 0 && m_speedMultipliers[cell->getCellId()] >= 0.0) {
+			speed = m_speedMultipliers[cell->getCellId()];
 		}
 		return speed;
 	}
 
 	void CellCache::resetSpeedMultiplier(Cell* cell) {
-		m_speedMultipliers.erase(cell);
+		if (m_speedMultiplierCount > 0 && m_speedMultipliers[cell->getCellId()] >= 0.0) {
+			m_speedMultipliers[cell->getCellId()] = -1.0;
+			--m_speedMultiplierCount;
+		}
 	}
 
 	void CellCache::addTransition(Cell* cell) {
@@ -1307,38 +1395,92 @@ namespace FIFE {
 			return;
 		}
 
-		Zone* newZone = createZone();
-		std::stack<Cell*> cellstack;
+		// each walkable neighbor starts a search, searches that meet are united.
+		// protected narrow cells, e.g. closed doors, are added to a component but the search stops there
+		std::map<Cell*, uint32_t> labels;
+		std::vector<uint32_t> parents;
+		std::vector<bool> finished;
+		std::vector<std::deque<Cell*> > queues;
+		std::vector<std::vector<Cell*> > visited;
 		const std::vector<Cell*>& neighbors = cell->getNeighbors();
 		for (std::vector<Cell*>::const_iterator nit = neighbors.begin(); nit != neighbors.end(); ++nit) {
 			Cell* nc = *nit;
-			if (nc->isInserted() && !nc->isZoneProtected() &&
-				nc->getCellType() != CTYPE_STATIC_BLOCKER && nc->getCellType() != CTYPE_CELL_BLOCKER) {
-					cellstack.push(nc);
-					break;
-			}
-		}
-
-		while(!cellstack.empty()) {
-			Cell* c = cellstack.top();
-			cellstack.pop();
-
-			currentZone->removeCell(c);
-			newZone->addCell(c);
-			c->setInserted(true);
-			if (c->isZoneProtected()) {
+			if (nc->getZone() != currentZone || labels.find(nc) != labels.end() || nc->isZoneProtected() ||
+				nc->getCellType() == CTYPE_STATIC_BLOCKER || nc->getCellType() == CTYPE_CELL_BLOCKER) {
 				continue;
 			}
-			const std::vector<Cell*>& neigh = c->getNeighbors();
-			for (std::vector<Cell*>::const_iterator nit = neigh.begin(); nit != neigh.end(); ++nit) {
-				Cell* nc = *nit;
-				if (nc->getZone() == currentZone && nc->isInserted() &&
-					nc->getCellType() != CTYPE_STATIC_BLOCKER && nc->getCellType() != CTYPE_CELL_BLOCKER) {
-					cellstack.push(nc);
-					nc->setInserted(false);
+			uint32_t label = parents.size();
+			labels.insert(std::pair<Cell*, uint32_t>(nc, label));
+			parents.push_back(label);
+			finished.push_back(false);
+			queues.push_back(std::deque<Cell*>(1, nc));
+			visited.push_back(std::vector<Cell*>(1, nc));
+		}
+
+		uint32_t active = parents.size();
+		uint32_t visitedCells = 0;
+		while (active > 1) {
+			// the searches are advanced in turns, so the work is bounded by the smaller components
+			for (uint32_t i = 0; i < parents.size() && active > 1; ++i) {
+				if (parents[i] != i || finished[i]) {
+					continue;
+				}
+				if (queues[i].empty()) {
+					// the search found no other search, so this component is cut off
+					Zone* newZone = createZone();
+					std::vector<Cell*>::iterator cit = visited[i].begin();
+					for (; cit != visited[i].end(); ++cit) {
+						currentZone->removeCell(*cit);
+						newZone->addCell(*cit);
+						(*cit)->setInserted(true);
+					}
+					visitedCells += visited[i].size();
+					finished[i] = true;
+					--active;
+					continue;
+				}
+				Cell* c = queues[i].front();
+				queues[i].pop_front();
+				++visitedCells;
+				const std::vector<Cell*>& neigh = c->getNeighbors();
+				for (std::vector<Cell*>::const_iterator nit = neigh.begin(); nit != neigh.end(); ++nit) {
+					Cell* nc = *nit;
+					if (nc == cell || nc->getZone() != currentZone ||
+						nc->getCellType() == CTYPE_STATIC_BLOCKER || nc->getCellType() == CTYPE_CELL_BLOCKER) {
+						continue;
+					}
+					std::map<Cell*, uint32_t>::iterator lit = labels.find(nc);
+					if (lit == labels.end()) {
+						labels.insert(std::pair<Cell*, uint32_t>(nc, i));
+						if (!nc->isZoneProtected()) {
+							queues[i].push_back(nc);
+						}
+						visited[i].push_back(nc);
+						continue;
+					}
+					if (nc->isZoneProtected()) {
+						// a closed door does not connect the searches on both sides
+						continue;
+					}
+					uint32_t other = lit->second;
+					while (parents[other] != other) {
+						other = parents[other];
+					}
+					lit->second = other;
+					if (other != i && !finished[other]) {
+						parents[other] = i;
+						queues[i].insert(queues[i].end(), queues[other].begin(), queues[other].end());
+						queues[other].clear();
+						visited[i].insert(visited[i].end(), visited[other].begin(), visited[other].end());
+						visited[other].clear();
+						--active;
+					}
 				}
 			}
 		}
+		m_zoneUpdateCells += visitedCells;
+		++m_zoneUpdates;
+
 		if (currentZone->getCellCount() == 0) {
 			removeZone(currentZone);
 		}
@@ -1354,10 +1496,32 @@ namespace FIFE {
 			addZone = zone1;
 			oldZone = zone2;
 		}
+		m_zoneUpdateCells += oldZone->getCellCount();
+		++m_zoneUpdates;
 		addZone->mergeZone(oldZone);
 		removeZone(oldZone);
 	}
 
+	uint32_t CellCache::getZoneUpdateCells() {
+		return m_lastZoneUpdateCells;
+	}
+
+	uint32_t CellCache::getZoneUpdates() {
+		return m_lastZoneUpdates;
+	}
+
+	uint32_t CellCache::getMaxZoneUpdateCells() {
+		return m_maxZoneUpdateCells;
+	}
+
+	void CellCache::resetZoneUpdateStats() {
+		m_zoneUpdateCells = 0;
+		m_zoneUpdates = 0;
+		m_lastZoneUpdateCells = 0;
+		m_lastZoneUpdates = 0;
+		m_maxZoneUpdateCells = 0;
+	}
+
 	void CellCache::addNarrowCell(Cell* cell) {
 		std::pair<std::set<Cell*>::iterator, bool> insertiter = m_narrowCells.insert(cell);
 		if (insertiter.second) {
@@ -1519,6 +1683,214 @@ namespace FIFE {
 		return m_staticSize;
 	}
 
+	void CellCache::addCellChangeListener(CellChangeListener* listener) {
+		m_cellChangeListeners.push_back(listener);
+	}
+
+	void CellCache::removeCellChangeListener(CellChangeListener* listener) {
+		std::vector<CellChangeListener*>::iterator it = std::find(m_cellChangeListeners.begin(),
+			m_cellChangeListeners.end(), listener);
+		if (it != m_cellChangeListeners.end()) {
+			m_cellChangeListeners.erase(it);
+		}
+	}
+
+	void CellCache::callOnBlockingChanged(Cell* cell, bool blocks) {
+		if (m_cellChangeListeners.empty()) {
+			return;
+		}
+		CellTypeInfo type = cell->getCellType();
+		std::vector<CellChangeListener*>::iterator it = m_cellChangeListeners.begin();
+		for (; it != m_cellChangeListeners.end(); ++it) {
+			(*it)->onBlockingChangedCell(cell, type, blocks);
+		}
+	}
+
+	ClusterGraph* CellCache::getClusterGraph() {
+		if (!m_clusterGraph) {
+			m_clusterGraph = new ClusterGraph(this, m_clusterSize);
+		}
+		return m_clusterGraph;
+	}
+
+	void CellCache::setClusterSize(uint32_t size) {
+		size = std::max(size, static_cast<uint32_t>(2));
+		if (size == m_clusterSize) {
+			return;
+		}
+		m_clusterSize = size;
+		delete m_clusterGraph;
+		m_clusterGraph = NULL;
+	}
+
+	uint32_t CellCache::getClusterSize() {
+		return m_clusterSize;
+	}
+
+	FlowField* CellCache::getFlowField(const ModelCoordinate& goal, const std::string& costId) {
+		std::pair<int32_t, std::string> key(convertCoordToInt(goal), costId);
+		std::map<std::pair<int32_t, std::string>, FlowField*>::iterator it = m_flowFields.find(key);
+		if (it == m_flowFields.end()) {
+			if (m_flowFields.size() >= m_maxFlowFields) {
+				removeOldestFlowField();
+			}
+			it = m_flowFields.insert(std::make_pair(key, new FlowField(this, goal, costId))).first;
+		}
+		it->second->setLastUse(++m_flowFieldUses);
+		return it->second;
+	}
+
+	void CellCache::removeFlowFields() {
+		std::map<std::pair<int32_t, std::string>, FlowField*>::iterator it = m_flowFields.begin();
+		for (; it != m_flowFields.end(); ++it) {
+			delete it->second;
+		}
+		m_flowFields.clear();
+	}
+
+	void CellCache::setMaxFlowFields(uint32_t max) {
+		m_maxFlowFields = std::max(max, static_cast<uint32_t>(1));
+		while (m_flowFields.size() > m_maxFlowFields) {
+			removeOldestFlowField();
+		}
+	}
+
+	uint32_t CellCache::getMaxFlowFields() {
+		return m_maxFlowFields;
+	}
+
+	void CellCache::setSearchMode(SearchModeInfo mode) {
+		m_searchMode = mode;
+	}
+
+	SearchModeInfo CellCache::getSearchMode() {
+		return m_searchMode;
+	}
+
+	static std::string multiplierGrid(const std::vector<double>& data) {
+		if (data.empty()) {
+			return std::string();
+		}
+		return std::string(reinterpret_cast<const char*>(&data[0]), data.size() * sizeof(double));
+	}
+
+	std::string CellCache::getCellTypeGrid() {
+		std::string grid(m_width * m_height, '\0');
+		for (uint32_t y = 0; y < m_height; ++y) {
+			for (uint32_t x = 0; x < m_width; ++x) {
+				Cell* cell = m_cells[x][y];
+				if (cell) {
+					grid[x + y * m_width] = static_cast<char>(cell->getCellType());
+				}
+			}
+		}
+		return grid;
+	}
+
+	std::string CellCache::getCostMultiplierGrid() {
+		if (m_costMultipliers.empty()) {
+			return multiplierGrid(std::vector<double>(m_width * m_height, -1.0));
+		}
+		return multiplierGrid(m_costMultipliers);
+	}
+
+	std::string CellCache::getSpeedMultiplierGrid() {
+		if (m_speedMultipliers.empty()) {
+			return multiplierGrid(std::vector<double>(m_width * m_height, -1.0));
+		}
+		return multiplierGrid(m_speedMultipliers);
+	}
+
+	void CellCache::setCostMultiplierGrid(const std::string& grid) {
+		if (grid.size() != m_width * m_height * sizeof(double)) {
+			throw InvalidFormat("Cost multiplier grid does not match the size of the CellCache");
+		}
+		const char* data = grid.data();
+		for (uint32_t y = 0; y < m_height; ++y) {
+			for (uint32_t x = 0; x < m_width; ++x) {
+				double multi;
+				std::memcpy(&multi, data + (x + y * m_width) * sizeof(double), sizeof(double));
+				Cell* cell = m_cells[x][y];
+				if (multi < 0.0) {
+					resetCostMultiplier(cell);
+				} else {
+					setCostMultiplier(cell, multi);
+				}
+			}
+		}
+	}
+
+	void CellCache::setSpeedMultiplierGrid(const std::string& grid) {
+		if (grid.size() != m_width * m_height * sizeof(double)) {
+			throw InvalidFormat("Speed multiplier grid does not match the size of the CellCache");
+		}
+		const char* data = grid.data();
+		for (uint32_t y = 0; y < m_height; ++y) {
+			for (uint32_t x = 0; x < m_width; ++x) {
+				double multi;
+				std::memcpy(&multi, data + (x + y * m_width) * sizeof(double), sizeof(double));
+				Cell* cell = m_cells[x][y];
+				if (multi < 0.0) {
+					resetSpeedMultiplier(cell);
+				} else {
+					setSpeedMultiplier(cell, multi);
+				}
+			}
+		}
+	}
+
+	void CellCache::setCostMultiplierMask(const std::string& mask, double multi) {
+		if (mask.size() != m_width * m_height) {
+			throw InvalidFormat("Cost multiplier mask does not match the size of the CellCache");
+		}
+		for (uint32_t y = 0; y < m_height; ++y) {
+			for (uint32_t x = 0; x < m_width; ++x) {
+				if (mask[x + y * m_width] == 0) {
+					continue;
+				}
+				Cell* cell = m_cells[x][y];
+				if (multi < 0.0) {
+					resetCostMultiplier(cell);
+				} else {
+					setCostMultiplier(cell, multi);
+				}
+			}
+		}
+	}
+
+	void CellCache::setSpeedMultiplierMask(const std::string& mask, double multi) {
+		if (mask.size() != m_width * m_height) {
+			throw InvalidFormat("Speed multiplier mask does not match the size of the CellCache");
+		}
+		for (uint32_t y = 0; y < m_height; ++y) {
+			for (uint32_t x = 0; x < m_width; ++x) {
+				if (mask[x + y * m_width] == 0) {
+					continue;
+				}
+				Cell* cell = m_cells[x][y];
+				if (multi < 0.0) {
+					resetSpeedMultiplier(cell);
+				} else {
+					setSpeedMultiplier(cell, multi);
+				}
+			}
+		}
+	}
+
+	void CellCache::removeOldestFlowField() {
+		std::map<std::pair<int32_t, std::string>, FlowField*>::iterator oldest = m_flowFields.begin();
+		std::map<std::pair<int32_t, std::string>, FlowField*>::iterator it = m_flowFields.begin();
+		for (; it != m_flowFields.end(); ++it) {
+			if (it->second->getLastUse() < oldest->second->getLastUse()) {
+				oldest = it;
+			}
+		}
+		if (oldest != m_flowFields.end()) {
+			delete oldest->second;
+			m_flowFields.erase(oldest);
+		}
+	}
+
 	void CellCache::setBlockingUpdate(bool update) {
 		m_blockingUpdate = update;
 	}
@@ -1532,6 +1904,17 @@ namespace FIFE {
 	}
 
 	void CellCache::update() {
+		// zone updates happened during the layer update of this frame
+		m_lastZoneUpdateCells = m_zoneUpdateCells;
+		m_lastZoneUpdates = m_zoneUpdates;
+		if (m_zoneUpdateCells > m_maxZoneUpdateCells) {
+			m_maxZoneUpdateCells = m_zoneUpdateCells;
+		}
+		if (m_zoneUpdates > 0) {
+			FL_DBG(_log, LMsg("CellCache::update() - ") << m_zoneUpdates << " zone updates visited " << m_zoneUpdateCells << " cells");
+		}
+		m_zoneUpdateCells = 0;
+		m_zoneUpdates = 0;
 		m_updated = m_fowUpdate;
 		m_fowUpdate = false;
 		if (m_sizeUpdate) {
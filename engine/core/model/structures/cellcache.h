@@ -39,12 +39,16 @@
 #include "util/structures/rect.h"
 #include "model/metamodel/modelcoords.h"
 #include "model/metamodel/object.h"
+#include "pathfinder/route.h"
 
 #include "layer.h"
 #include "cell.h"
 
 namespace FIFE {
 
+	class ClusterGraph;
+	class FlowField;
+
 	/** A Zone is an abstract depiction of a CellCache or of a part of it.
 	 */
 	class Zone {
@@ -412,6 +416,11 @@ namespace FIFE {
 			 */
 			bool isDefaultCost(Cell* cell);
 
+			/** Gets if all cells use the default cost multiplier.
+			 * @return A boolean, true if no cell has a own cost multiplier, otherwise false.
+			 */
+			bool isDefaultCost();
+
 			/** Sets cost multiplier for the cell.
 			 * @param cell A pointer to the cell.
 			 * @param multi A double, the cost multiplier.
@@ -490,16 +499,40 @@ namespace FIFE {
 			void removeZone(Zone* zone);
 
 			/** Splits zone on the cell.
+			 * The walkable neighbors of the cell are flood filled at the same time and searches that meet are united.
+			 * Only the components that were cut off are moved to new zones, so the cost depends on their size.
+			 * Protected narrow cells, e.g. closed doors, are added to a component but do not connect it to others.
 			 * @param cell A pointer to the cell where the zone should be splited.
 			 */
 			void splitZone(Cell* cell);
 
 			/** Merges two zones to one.
+			 * The cells of the smaller zone are moved to the larger one.
 			 * @param zone1 A pointer to the first zone.
 			 * @param zone2 A pointer to the second zone.
 			 */
 			void mergeZones(Zone* zone1, Zone* zone2);
 
+			/** Returns the number of cells that were visited by zone updates in the last frame.
+			 * Zone updates happen if narrow cells change their blocking, e.g. a door is opened or closed.
+			 * @return A unsigned integer, the number of visited cells.
+			 */
+			uint32_t getZoneUpdateCells();
+
+			/** Returns the number of zone splits and merges in the last frame.
+			 * @return A unsigned integer, the number of zone updates.
+			 */
+			uint32_t getZoneUpdates();
+
+			/** Returns the highest number of cells that were visited by zone updates in one frame.
+			 * @return A unsigned integer, the number of visited cells.
+			 */
+			uint32_t getMaxZoneUpdateCells();
+
+			/** Resets the zone update statistics.
+			 */
+			void resetZoneUpdateStats();
+
 			/** Adds cell to narrow cells.
 			 * Narrow cells are observed. On blocking change, the underlying zones are merged or splitted.
 			 * @param cell A pointer to the cell.
@@ -607,6 +640,119 @@ namespace FIFE {
 			 */
 			bool isStaticSize();
 
+			/** Adds a cache wide listener. It is informed about blocking changes of all cells.
+			 * @param listener A pointer to the listener.
+			 */
+			void addCellChangeListener(CellChangeListener* listener);
+
+			/** Removes a cache wide listener.
+			 * @param listener A pointer to the listener.
+			 */
+			void removeCellChangeListener(CellChangeListener* listener);
+
+			/** Called by cells if their blocking was changed. Informs the cache wide listeners.
+			 * @param cell A pointer to the cell.
+			 * @param blocks A boolean, true if the cell blocks, otherwise false.
+			 */
+			void callOnBlockingChanged(Cell* cell, bool blocks);
+
+			/** Returns the cluster graph which is used for hierarchical pathfinding.
+			 * The graph is created on first use.
+			 * @return A pointer to the cluster graph.
+			 */
+			ClusterGraph* getClusterGraph();
+
+			/** Sets the width and height of the clusters that are used for hierarchical pathfinding.
+			 * An existing cluster graph is removed.
+			 * @param size A unsigned integer with the cluster size in cells, minimum is 2.
+			 */
+			void setClusterSize(uint32_t size);
+
+			/** Returns the width and height of the clusters that are used for hierarchical pathfinding.
+			 * @return A unsigned integer with the cluster size in cells.
+			 */
+			uint32_t getClusterSize();
+
+			/** Returns the flow field for the goal and cost identifier.
+			 * The field is created on first use and shared by all routes with the same goal.
+			 * If the maximal number of fields is reached, the longest unused field is removed.
+			 * @param goal A const reference to the layer coordinate of the goal.
+			 * @param costId A const reference to a string that contains the cost identifier, can be empty.
+			 * @return A pointer to the flow field.
+			 */
+			FlowField* getFlowField(const ModelCoordinate& goal, const std::string& costId = "");
+
+			/** Removes all flow fields.
+			 */
+			void removeFlowFields();
+
+			/** Sets the maximal number of flow fields.
+			 * @param max A unsigned integer with the maximal number of fields, minimum is 1.
+			 */
+			void setMaxFlowFields(uint32_t max);
+
+			/** Returns the maximal number of flow fields.
+			 * @return A unsigned integer with the maximal number of fields, default is 16.
+			 */
+			uint32_t getMaxFlowFields();
+
+			/** Sets the search mode that is used for routes on this CellCache.
+			 * The mode of the route has priority, SEARCH_MODE_DEFAULT uses the mode of the pather.
+			 * @param mode A SearchModeInfo which holds the mode.
+			 */
+			void setSearchMode(SearchModeInfo mode);
+
+			/** Returns the search mode that is used for routes on this CellCache.
+			 * @return A SearchModeInfo which holds the mode, default is SEARCH_MODE_DEFAULT.
+			 */
+			SearchModeInfo getSearchMode();
+
+			/** Returns the types of all cells as a byte string, one byte per cell.
+			 * The cells are stored row by row, index is x + y * width. Can be used with numpy.frombuffer.
+			 * @return A string that contains the CellTypeInfo of each cell.
+			 */
+			std::string getCellTypeGrid();
+
+			/** Returns the cost multipliers of all cells as a byte string of native doubles.
+			 * The cells are stored row by row, negative values mark cells that use the default multiplier.
+			 * @return A string that contains the cost multiplier of each cell.
+			 */
+			std::string getCostMultiplierGrid();
+
+			/** Returns the speed multipliers of all cells as a byte string of native doubles.
+			 * The cells are stored row by row, negative values mark cells that use the default multiplier.
+			 * @return A string that contains the speed multiplier of each cell.
+			 */
+			std::string getSpeedMultiplierGrid();
+
+			/** Sets the cost multipliers of all cells from a byte string of native doubles.
+			 * Negative values reset the cell to the default multiplier.
+			 * @param grid A string that contains one double per cell, in the layout of getCostMultiplierGrid.
+			 * @throws InvalidFormat if the size of the grid does not match the cache.
+			 */
+			void setCostMultiplierGrid(const std::string& grid);
+
+			/** Sets the speed multipliers of all cells from a byte string of native doubles.
+			 * Negative values reset the cell to the default multiplier.
+			 * @param grid A string that contains one double per cell, in the layout of getSpeedMultiplierGrid.
+			 * @throws InvalidFormat if the size of the grid does not match the cache.
+			 */
+			void setSpeedMultiplierGrid(const std::string& grid);
+
+			/** Sets the cost multiplier of all cells that are marked in the mask.
+			 * @param mask A string that contains one byte per cell, cells with a non-zero byte are changed.
+			 * @param multi The cost multiplier, a negative value resets the cells to the default multiplier.
+			 * @throws InvalidFormat if the size of the mask does not match the cache.
+			 */
+			void setCostMultiplierMask(const std::string& mask, double multi);
+
+			/** Sets the speed multiplier of all cells that are marked in the mask.
+			 * @param mask A string that contains one byte per cell, cells with a non-zero byte are changed.
+			 * @param multi The speed multiplier, a negative value resets the cells to the default multiplier.
+			 * @throws InvalidFormat if the size of the mask does not match the cache.
+			 */
+			void setSpeedMultiplierMask(const std::string& mask, double multi);
+
 			void setBlockingUpdate(bool update);
 			void setFowUpdate(bool update);
 			void setSizeUpdate(bool update);
@@ -620,6 +766,10 @@ namespace FIFE {
 			 * @return A rect that contains the min, max coordinates.
 			 */
 			Rect calculateCurrentSize();
+
+			/** Removes the longest unused flow field.
+			 */
+			void removeOldestFlowField();
 			
 			//! walkable layer
 			Layer* m_layer;
@@ -661,6 +811,21 @@ namespace FIFE {
 			//! need update
 			bool m_updated;
 
+			//! cells visited by zone updates in the current frame
+			uint32_t m_zoneUpdateCells;
+
+			//! zone splits and merges in the current frame
+			uint32_t m_zoneUpdates;
+
+			//! cells visited by zone updates in the last frame
+			uint32_t m_lastZoneUpdateCells;
+
+			//! zone splits and merges in the last frame
+			uint32_t m_lastZoneUpdates;
+
+			//! highest number of cells visited by zone updates in one frame
+			uint32_t m_maxZoneUpdateCells;
+
 			//! is automatic seach enabled
 			bool m_searchNarrow;
 
@@ -688,11 +853,38 @@ namespace FIFE {
 			//! holds cells for each cost
 			StringCellMultimap m_costsToCells;
 
-			//! holds default cost multiplier, only if it is not default(1.0)
-			std::map<Cell*, double> m_costMultipliers;
+			//! cost multipliers indexed by cell identifier, negative for default, empty until one is set
+			std::vector<double> m_costMultipliers;
+
+			//! number of cells with a cost multiplier
+			uint32_t m_costMultiplierCount;
+
+			//! speed multipliers indexed by cell identifier, negative for default, empty until one is set
+			std::vector<double> m_speedMultipliers;
+
+			//! number of cells with a speed multiplier
+			uint32_t m_speedMultiplierCount;
+
+			//! cache wide listeners
+			std::vector<CellChangeListener*> m_cellChangeListeners;
+
+			//! cluster graph for hierarchical pathfinding, created on demand
+			ClusterGraph* m_clusterGraph;
+
+			//! width and height of a cluster
+			uint32_t m_clusterSize;
+
+			//! flow fields, indexed by goal cell identifier and cost identifier
+			std::map<std::pair<int32_t, std::string>, FlowField*> m_flowFields;
+
+			//! maximal number of flow fields
+			uint32_t m_maxFlowFields;
+
+			//! counter for the flow field usage
+			uint32_t m_flowFieldUses;
 
-			//! holds default speed multiplier, only if it is not default(1.0)
-			std::map<Cell*, double> m_speedMultipliers;
+			//! search mode for routes on this cache
+			SearchModeInfo m_searchMode;
 	};
 
 } // FIFE
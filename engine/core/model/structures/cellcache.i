@@ -29,6 +29,15 @@ namespace FIFE {
 	class Cell;
 	class Layer;
 
+	class Zone {
+		public:
+			Zone(uint32_t id);
+			~Zone();
+
+			uint32_t getId() const;
+			uint32_t getCellCount() const;
+	};
+
 	class CellCache : public FifeClass {
 		public:
 			CellCache(Layer* layer);
@@ -88,5 +97,23 @@ namespace FIFE {
 			bool isCellInArea(const std::string& id, Cell* cell);
 			void setStaticSize(bool staticSize);
 			bool isStaticSize();
+			void setClusterSize(uint32_t size);
+			uint32_t getClusterSize();
+			void removeFlowFields();
+			void setMaxFlowFields(uint32_t max);
+			uint32_t getMaxFlowFields();
+			void setSearchMode(SearchModeInfo mode);
+			SearchModeInfo getSearchMode();
+			std::string getCellTypeGrid();
+			std::string getCostMultiplierGrid();
+			std::string getSpeedMultiplierGrid();
+			void setCostMultiplierGrid(const std::string& grid);
+			void setSpeedMultiplierGrid(const std::string& grid);
+			void setCostMultiplierMask(const std::string& mask, double multi);
+			void setSpeedMultiplierMask(const std::string& mask, double multi);
+			uint32_t getZoneUpdateCells();
+			uint32_t getZoneUpdates();
+			uint32_t getMaxZoneUpdateCells();
+			void resetZoneUpdateStats();
 	};
 }
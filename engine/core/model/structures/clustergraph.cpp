@@ -0,0 +1,459 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <algorithm>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/metamodel/grids/cellgrid.h"
+#include "util/log/logger.h"
+#include "util/math/fife_math.h"
+#include "util/structures/priorityqueue.h"
+
+#include "clustergraph.h"
+#include "cellcache.h"
+#include "cell.h"
+#include "layer.h"
+
+namespace FIFE {
+
+	static Logger _log(LM_STRUCTURES);
+
+	ClusterGraph::ClusterGraph(CellCache* cache, uint32_t clusterSize):
+		m_cache(cache),
+		m_clusterSize(std::max(clusterSize, static_cast<uint32_t>(2))),
+		m_width(0),
+		m_height(0),
+		m_clustersX(0),
+		m_clustersY(0) {
+		m_cache->addCellChangeListener(this);
+	}
+
+	ClusterGraph::~ClusterGraph() {
+		m_cache->removeCellChangeListener(this);
+	}
+
+	void ClusterGraph::update() {
+		if (m_width != m_cache->getWidth() || m_height != m_cache->getHeight() || m_clusters.empty()) {
+			createClusters();
+		}
+		if (m_dirtyClusters.empty()) {
+			return;
+		}
+
+		// collect borders and clusters which are affected by the dirty clusters
+		std::set<std::pair<uint32_t, uint32_t> > borders;
+		std::set<uint32_t> clusters;
+		std::vector<uint32_t> neighbors;
+		std::set<uint32_t>::iterator it = m_dirtyClusters.begin();
+		for (; it != m_dirtyClusters.end(); ++it) {
+			clusters.insert(*it);
+			neighbors.clear();
+			getNeighborClusters(*it, neighbors);
+			std::vector<uint32_t>::iterator nit = neighbors.begin();
+			for (; nit != neighbors.end(); ++nit) {
+				borders.insert(std::make_pair(std::min(*it, *nit), std::max(*it, *nit)));
+				clusters.insert(*nit);
+			}
+		}
+		m_dirtyClusters.clear();
+
+		std::set<std::pair<uint32_t, uint32_t> >::iterator bit = borders.begin();
+		for (; bit != borders.end(); ++bit) {
+			calculateBorder(bit->first, bit->second);
+		}
+		for (it = clusters.begin(); it != clusters.end(); ++it) {
+			calculateCluster(*it);
+		}
+		FL_DBG(_log, LMsg("ClusterGraph updated ") << clusters.size() << " clusters and " << borders.size() << " borders");
+	}
+
+	uint32_t ClusterGraph::getClusterSize() const {
+		return m_clusterSize;
+	}
+
+	uint32_t ClusterGraph::getClusterCount() const {
+		return static_cast<uint32_t>(m_clusters.size());
+	}
+
+	uint32_t ClusterGraph::getClusterId(int32_t cellId) const {
+		uint32_t x = static_cast<uint32_t>(cellId) % m_width;
+		uint32_t y = static_cast<uint32_t>(cellId) / m_width;
+		return (x / m_clusterSize) + (y / m_clusterSize) * m_clustersX;
+	}
+
+	uint32_t ClusterGraph::getClusterDistance(uint32_t cluster1, uint32_t cluster2) const {
+		int32_t dx = static_cast<int32_t>(cluster1 % m_clustersX) - static_cast<int32_t>(cluster2 % m_clustersX);
+		int32_t dy = static_cast<int32_t>(cluster1 / m_clustersX) - static_cast<int32_t>(cluster2 / m_clustersX);
+		return static_cast<uint32_t>(std::max(ABS(dx), ABS(dy)));
+	}
+
+	const std::vector<int32_t>& ClusterGraph::getEntrances(uint32_t cluster) const {
+		return m_clusters[cluster].entrances;
+	}
+
+	int32_t ClusterGraph::getEntranceIndex(int32_t cellId) const {
+		if (cellId < 0 || cellId >= static_cast<int32_t>(m_entranceIndex.size())) {
+			return -1;
+		}
+		return m_entranceIndex[cellId];
+	}
+
+	double ClusterGraph::getEntranceCost(uint32_t cluster, uint32_t from, uint32_t to) const {
+		const Cluster& c = m_clusters[cluster];
+		return c.costs[from * c.entrances.size() + to];
+	}
+
+	const std::vector<int32_t>& ClusterGraph::getEntrancePartners(uint32_t cluster, uint32_t index) const {
+		return m_clusters[cluster].partners[index];
+	}
+
+	bool ClusterGraph::isBlocked(int32_t cellId) const {
+		return m_blocked[cellId];
+	}
+
+	void ClusterGraph::getClusterCosts(int32_t cellId, uint32_t cluster, std::map<int32_t, double>& costs, bool reverse) {
+		costs.clear();
+		std::set<int32_t> closed;
+		PriorityQueue<int32_t, double> frontier;
+		frontier.pushElement(PriorityQueue<int32_t, double>::value_type(cellId, 0.0));
+		costs[cellId] = 0.0;
+		while (!frontier.empty()) {
+			PriorityQueue<int32_t, double>::value_type top = frontier.getPriorityElement();
+			frontier.popElement();
+			closed.insert(top.first);
+
+			Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(top.first));
+			if (!cell) {
+				continue;
+			}
+			ModelCoordinate currentCoord = cell->getLayerCoordinates();
+			const std::vector<Cell*>& neighbors = cell->getNeighbors();
+			for (std::vector<Cell*>::const_iterator it = neighbors.begin(); it != neighbors.end(); ++it) {
+				if ((*it)->getLayer()->getCellCache() != m_cache) {
+					continue;
+				}
+				int32_t neighborId = (*it)->getCellId();
+				if (m_blocked[neighborId] || getClusterId(neighborId) != cluster ||
+					closed.find(neighborId) != closed.end()) {
+					continue;
+				}
+				ModelCoordinate neighborCoord = (*it)->getLayerCoordinates();
+				double cost = top.second;
+				if (reverse) {
+					cost += m_cache->getAdjacentCost(neighborCoord, currentCoord);
+				} else {
+					cost += m_cache->getAdjacentCost(currentCoord, neighborCoord);
+				}
+				std::map<int32_t, double>::iterator cit = costs.find(neighborId);
+				if (cit == costs.end()) {
+					costs.insert(std::make_pair(neighborId, cost));
+					frontier.pushElement(PriorityQueue<int32_t, double>::value_type(neighborId, cost));
+				} else if (cost < cit->second) {
+					cit->second = cost;
+					frontier.changeElementPriority(neighborId, cost);
+				}
+			}
+		}
+	}
+
+	bool ClusterGraph::findClusterPath(int32_t from, int32_t to, uint32_t cluster, uint8_t blockerThreshold, std::vector<int32_t>& path) {
+		path.clear();
+		if (from == to) {
+			return true;
+		}
+		Cell* target = m_cache->getCell(m_cache->convertIntToCoord(to));
+		if (!target) {
+			return false;
+		}
+		CellGrid* grid = m_cache->getLayer()->getCellGrid();
+		ModelCoordinate targetCoord = target->getLayerCoordinates();
+
+		std::map<int32_t, int32_t> parents;
+		std::map<int32_t, double> gCosts;
+		std::set<int32_t> closed;
+		PriorityQueue<int32_t, double> frontier;
+		frontier.pushElement(PriorityQueue<int32_t, double>::value_type(from, 0.0));
+		gCosts[from] = 0.0;
+		parents[from] = -1;
+		bool found = false;
+		while (!frontier.empty()) {
+			int32_t current = frontier.getPriorityElement().first;
+			frontier.popElement();
+			if (current == to) {
+				found = true;
+				break;
+			}
+			closed.insert(current);
+
+			Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(current));
+			if (!cell) {
+				continue;
+			}
+			ModelCoordinate currentCoord = cell->getLayerCoordinates();
+			const std::vector<Cell*>& neighbors = cell->getNeighbors();
+			for (std::vector<Cell*>::const_iterator it = neighbors.begin(); it != neighbors.end(); ++it) {
+				if ((*it)->getLayer()->getCellCache() != m_cache) {
+					continue;
+				}
+				int32_t neighborId = (*it)->getCellId();
+				if (closed.find(neighborId) != closed.end()) {
+					continue;
+				}
+				if (neighborId != to && (getClusterId(neighborId) != cluster ||
+					(*it)->getCellType() > blockerThreshold)) {
+					continue;
+				}
+				ModelCoordinate neighborCoord = (*it)->getLayerCoordinates();
+				double gCost = gCosts[current] + m_cache->getAdjacentCost(currentCoord, neighborCoord);
+				double fCost = gCost + grid->getHeuristicCost(neighborCoord, targetCoord);
+				std::map<int32_t, double>::iterator cit = gCosts.find(neighborId);
+				if (cit == gCosts.end()) {
+					gCosts.insert(std::make_pair(neighborId, gCost));
+					parents[neighborId] = current;
+					frontier.pushElement(PriorityQueue<int32_t, double>::value_type(neighborId, fCost));
+				} else if (gCost < cit->second) {
+					cit->second = gCost;
+					parents[neighborId] = current;
+					frontier.changeElementPriority(neighborId, fCost);
+				}
+			}
+		}
+		if (!found) {
+			return false;
+		}
+		int32_t current = to;
+		while (current != from) {
+			path.push_back(current);
+			current = parents[current];
+		}
+		std::reverse(path.begin(), path.end());
+		return true;
+	}
+
+	void ClusterGraph::setClusterDirty(uint32_t cluster) {
+		m_dirtyClusters.insert(cluster);
+	}
+
+	void ClusterGraph::onInstanceEnteredCell(Cell* cell, Instance* instance) {
+	}
+
+	void ClusterGraph::onInstanceExitedCell(Cell* cell, Instance* instance) {
+	}
+
+	void ClusterGraph::onBlockingChangedCell(Cell* cell, CellTypeInfo type, bool blocks) {
+		// the graph is created lazy, so there is nothing to invalidate
+		if (m_clusters.empty()) {
+			return;
+		}
+		int32_t cellId = cell->getCellId();
+		if (cellId < 0 || cellId >= static_cast<int32_t>(m_blocked.size())) {
+			return;
+		}
+		// dynamic blockers are not part of the graph
+		bool blocked = !isWalkable(cell);
+		if (m_blocked[cellId] != blocked) {
+			m_blocked[cellId] = blocked;
+			setClusterDirty(getClusterId(cellId));
+		}
+	}
+
+	void ClusterGraph::createClusters() {
+		m_width = m_cache->getWidth();
+		m_height = m_cache->getHeight();
+		m_clustersX = (m_width + m_clusterSize - 1) / m_clusterSize;
+		m_clustersY = (m_height + m_clusterSize - 1) / m_clusterSize;
+		m_clusters.clear();
+		m_clusters.resize(m_clustersX * m_clustersY);
+		m_borders.clear();
+		m_dirtyClusters.clear();
+		m_entranceIndex.assign(m_width * m_height, -1);
+		m_blocked.assign(m_width * m_height, false);
+
+		const std::vector<std::vector<Cell*> >& cells = m_cache->getCells();
+		std::vector<std::vector<Cell*> >::const_iterator it = cells.begin();
+		for (; it != cells.end(); ++it) {
+			std::vector<Cell*>::const_iterator cit = (*it).begin();
+			for (; cit != (*it).end(); ++cit) {
+				if (*cit) {
+					m_blocked[(*cit)->getCellId()] = !isWalkable(*cit);
+				}
+			}
+		}
+		for (uint32_t i = 0; i < m_clusters.size(); ++i) {
+			m_dirtyClusters.insert(i);
+		}
+	}
+
+	void ClusterGraph::getNeighborClusters(uint32_t cluster, std::vector<uint32_t>& neighbors) const {
+		int32_t cx = static_cast<int32_t>(cluster % m_clustersX);
+		int32_t cy = static_cast<int32_t>(cluster / m_clustersX);
+		for (int32_t y = cy - 1; y <= cy + 1; ++y) {
+			for (int32_t x = cx - 1; x <= cx + 1; ++x) {
+				if (x < 0 || y < 0 || x >= static_cast<int32_t>(m_clustersX) ||
+					y >= static_cast<int32_t>(m_clustersY) || (x == cx && y == cy)) {
+					continue;
+				}
+				neighbors.push_back(static_cast<uint32_t>(x + y * m_clustersX));
+			}
+		}
+	}
+
+	void ClusterGraph::calculateBorder(uint32_t cluster1, uint32_t cluster2) {
+		// collect all walkable cells of cluster1 which have a walkable neighbor in cluster2
+		std::map<int32_t, int32_t> crossings;
+		uint32_t x0 = (cluster1 % m_clustersX) * m_clusterSize;
+		uint32_t y0 = (cluster1 / m_clustersX) * m_clusterSize;
+		uint32_t x1 = std::min(x0 + m_clusterSize, m_width);
+		uint32_t y1 = std::min(y0 + m_clusterSize, m_height);
+		for (uint32_t y = y0; y < y1; ++y) {
+			for (uint32_t x = x0; x < x1; ++x) {
+				// only the outer ring of the cluster can have neighbors in other clusters
+				if (x != x0 && y != y0 && x != x1 - 1 && y != y1 - 1) {
+					continue;
+				}
+				int32_t cellId = static_cast<int32_t>(x + y * m_width);
+				if (m_blocked[cellId]) {
+					continue;
+				}
+				Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(cellId));
+				if (!cell) {
+					continue;
+				}
+				TransitionInfo* trans = cell->getTransition();
+				const std::vector<Cell*>& neighbors = cell->getNeighbors();
+				for (std::vector<Cell*>::const_iterator it = neighbors.begin(); it != neighbors.end(); ++it) {
+					if ((*it)->getLayer()->getCellCache() != m_cache) {
+						continue;
+					}
+					// portals are not part of the graph
+					if (trans && trans->m_mc == (*it)->getLayerCoordinates()) {
+						continue;
+					}
+					int32_t neighborId = (*it)->getCellId();
+					if (m_blocked[neighborId] || getClusterId(neighborId) != cluster2) {
+						continue;
+					}
+					crossings.insert(std::make_pair(cellId, neighborId));
+					break;
+				}
+			}
+		}
+
+		std::pair<uint32_t, uint32_t> key(cluster1, cluster2);
+		if (crossings.empty()) {
+			m_borders.erase(key);
+			return;
+		}
+
+		// group adjacent crossings to entrances, short entrances get one transition in the middle,
+		// long entrances get one on each end
+		std::vector<CellPair>& transitions = m_borders[key];
+		transitions.clear();
+		std::vector<CellPair> run;
+		Cell* previous = NULL;
+		std::map<int32_t, int32_t>::iterator it = crossings.begin();
+		while (true) {
+			Cell* current = NULL;
+			if (it != crossings.end()) {
+				current = m_cache->getCell(m_cache->convertIntToCoord(it->first));
+			}
+			if (!run.empty() && (!current || !previous->isNeighbor(current))) {
+				if (run.size() < 6) {
+					transitions.push_back(run[run.size() / 2]);
+				} else {
+					transitions.push_back(run.front());
+					transitions.push_back(run.back());
+				}
+				run.clear();
+			}
+			if (!current) {
+				break;
+			}
+			run.push_back(*it);
+			previous = current;
+			++it;
+		}
+	}
+
+	void ClusterGraph::calculateCluster(uint32_t cluster) {
+		Cluster& c = m_clusters[cluster];
+		std::vector<int32_t>::iterator eit = c.entrances.begin();
+		for (; eit != c.entrances.end(); ++eit) {
+			m_entranceIndex[*eit] = -1;
+		}
+
+		// collect entrances and their partners from all borders
+		std::map<int32_t, std::vector<int32_t> > entrances;
+		std::vector<uint32_t> neighbors;
+		getNeighborClusters(cluster, neighbors);
+		std::vector<uint32_t>::iterator nit = neighbors.begin();
+		for (; nit != neighbors.end(); ++nit) {
+			bool lower = cluster < *nit;
+			BorderMap::iterator bit = m_borders.find(std::make_pair(std::min(cluster, *nit), std::max(cluster, *nit)));
+			if (bit == m_borders.end()) {
+				continue;
+			}
+			std::vector<CellPair>::iterator pit = bit->second.begin();
+			for (; pit != bit->second.end(); ++pit) {
+				if (lower) {
+					entrances[pit->first].push_back(pit->second);
+				} else {
+					entrances[pit->second].push_back(pit->first);
+				}
+			}
+		}
+
+		c.entrances.clear();
+		c.partners.clear();
+		std::map<int32_t, std::vector<int32_t> >::iterator it = entrances.begin();
+		for (; it != entrances.end(); ++it) {
+			m_entranceIndex[it->first] = static_cast<int32_t>(c.entrances.size());
+			c.entrances.push_back(it->first);
+			c.partners.push_back(it->second);
+		}
+
+		// precalculate costs between the entrances
+		uint32_t count = static_cast<uint32_t>(c.entrances.size());
+		c.costs.assign(count * count, -1.0);
+		std::map<int32_t, double> costs;
+		for (uint32_t i = 0; i < count; ++i) {
+			getClusterCosts(c.entrances[i], cluster, costs);
+			for (uint32_t j = 0; j < count; ++j) {
+				std::map<int32_t, double>::iterator cit = costs.find(c.entrances[j]);
+				if (cit != costs.end()) {
+					c.costs[i * count + j] = cit->second;
+				}
+			}
+		}
+	}
+
+	bool ClusterGraph::isWalkable(Cell* cell) const {
+		CellTypeInfo type = cell->getCellType();
+		return type != CTYPE_STATIC_BLOCKER && type != CTYPE_CELL_BLOCKER;
+	}
+
+} // FIFE
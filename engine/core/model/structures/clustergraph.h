@@ -0,0 +1,220 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_CLUSTERGRAPH_H
+#define FIFE_CLUSTERGRAPH_H
+
+// Standard C++ library includes
+#include <map>
+#include <set>
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "cell.h"
+
+namespace FIFE {
+
+	class CellCache;
+
+	/** A ClusterGraph is an abstract depiction of a CellCache, used for hierarchical pathfinding.
+	 *
+	 * The CellCache is divided into quadratic clusters. On the borders between two clusters
+	 * entrances are placed and the cost to walk from one entrance to every other entrance of the
+	 * same cluster is precalculated. Only static blockers are taken into account, so the graph
+	 * only needs to be rebuild if static blockers change. In that case only the affected cluster
+	 * and its neighbors are recalculated on the next update.
+	 */
+	class ClusterGraph : public CellChangeListener {
+	public:
+		/** Constructor
+		 * @param cache A pointer to the CellCache which should be abstracted.
+		 * @param clusterSize The width and height of a cluster in cells.
+		 */
+		ClusterGraph(CellCache* cache, uint32_t clusterSize);
+
+		/** Destructor
+		 */
+		virtual ~ClusterGraph();
+
+		/** Recalculates all clusters that were marked as dirty.
+		 */
+		void update();
+
+		/** Returns the width and height of a cluster in cells.
+		 * @return A unsigned integer with the cluster size.
+		 */
+		uint32_t getClusterSize() const;
+
+		/** Returns the number of clusters.
+		 * @return A unsigned integer with the number of clusters.
+		 */
+		uint32_t getClusterCount() const;
+
+		/** Returns the cluster that contains the cell.
+		 * @param cellId The cell identifier.
+		 * @return A unsigned integer with the cluster identifier.
+		 */
+		uint32_t getClusterId(int32_t cellId) const;
+
+		/** Returns the distance between two clusters, measured in clusters.
+		 * @param cluster1 The first cluster identifier.
+		 * @param cluster2 The second cluster identifier.
+		 * @return A unsigned integer with the distance, 0 means the clusters are identical.
+		 */
+		uint32_t getClusterDistance(uint32_t cluster1, uint32_t cluster2) const;
+
+		/** Returns the entrance cells of a cluster.
+		 * @param cluster The cluster identifier.
+		 * @return A const reference to a vector that contains the cell identifiers.
+		 */
+		const std::vector<int32_t>& getEntrances(uint32_t cluster) const;
+
+		/** Returns the index of the entrance inside of its cluster.
+		 * @param cellId The cell identifier.
+		 * @return A integer, -1 if the cell is not an entrance.
+		 */
+		int32_t getEntranceIndex(int32_t cellId) const;
+
+		/** Returns the precalculated cost between two entrances of the same cluster.
+		 * @param cluster The cluster identifier.
+		 * @param from The index of the start entrance.
+		 * @param to The index of the target entrance.
+		 * @return A double, negative if the entrances are not connected.
+		 */
+		double getEntranceCost(uint32_t cluster, uint32_t from, uint32_t to) const;
+
+		/** Returns the entrances of neighbor clusters which can be reached in one step.
+		 * @param cluster The cluster identifier.
+		 * @param index The index of the entrance.
+		 * @return A const reference to a vector that contains the cell identifiers.
+		 */
+		const std::vector<int32_t>& getEntrancePartners(uint32_t cluster, uint32_t index) const;
+
+		/** Gets if the cell is blocked by a static blocker.
+		 * @param cellId The cell identifier.
+		 * @return A boolean, true if the cell is blocked, otherwise false.
+		 */
+		bool isBlocked(int32_t cellId) const;
+
+		/** Calculates the costs from a cell to all cells of the cluster.
+		 * @param cellId The identifier of the start cell, it has to be part of the cluster.
+		 * @param cluster The cluster identifier.
+		 * @param costs Receives the costs indexed by cell identifier, cells that are not reachable are missing.
+		 * @param reverse A boolean, if true the costs are calculated from all cells to the start cell.
+		 */
+		void getClusterCosts(int32_t cellId, uint32_t cluster, std::map<int32_t, double>& costs, bool reverse = false);
+
+		/** Searches a path between two cells inside of a cluster.
+		 * @param from The identifier of the start cell.
+		 * @param to The identifier of the target cell.
+		 * @param cluster The cluster identifier, both cells have to be part of it.
+		 * @param blockerThreshold Cell types above this value are handled as blocker.
+		 * @param path Receives the cell identifiers, without the start cell.
+		 * @return A boolean, true if a path could be found, otherwise false.
+		 */
+		bool findClusterPath(int32_t from, int32_t to, uint32_t cluster, uint8_t blockerThreshold, std::vector<int32_t>& path);
+
+		/** Marks a cluster as dirty, so that it's recalculated on the next update.
+		 * @param cluster The cluster identifier.
+		 */
+		void setClusterDirty(uint32_t cluster);
+
+		// CellChangeListener
+		void onInstanceEnteredCell(Cell* cell, Instance* instance);
+		void onInstanceExitedCell(Cell* cell, Instance* instance);
+		void onBlockingChangedCell(Cell* cell, CellTypeInfo type, bool blocks);
+
+	private:
+		//! Holds the precalculated values of a cluster
+		struct Cluster {
+			//! cell identifiers of the entrances
+			std::vector<int32_t> entrances;
+			//! costs between the entrances, entrances x entrances
+			std::vector<double> costs;
+			//! entrances of other clusters that are reachable in one step, one vector per entrance
+			std::vector<std::vector<int32_t> > partners;
+		};
+
+		//! A pair of cells, first is part of the lower and second part of the higher cluster.
+		typedef std::pair<int32_t, int32_t> CellPair;
+
+		//! Holds the chosen transitions between two clusters, the key is (lower cluster, higher cluster).
+		typedef std::map<std::pair<uint32_t, uint32_t>, std::vector<CellPair> > BorderMap;
+
+		/** Creates clusters and marks all as dirty.
+		 */
+		void createClusters();
+
+		/** Returns the neighbor clusters, incl. diagonal neighbors.
+		 * @param cluster The cluster identifier.
+		 * @param neighbors Receives the neighbor cluster identifiers.
+		 */
+		void getNeighborClusters(uint32_t cluster, std::vector<uint32_t>& neighbors) const;
+
+		/** Recalculates the transitions between two clusters.
+		 * @param cluster1 The lower cluster identifier.
+		 * @param cluster2 The higher cluster identifier.
+		 */
+		void calculateBorder(uint32_t cluster1, uint32_t cluster2);
+
+		/** Recalculates the entrances, partners and costs of a cluster, based on the borders.
+		 * @param cluster The cluster identifier.
+		 */
+		void calculateCluster(uint32_t cluster);
+
+		/** Gets if the cell can be used by the graph and blocks not.
+		 * @param cell A pointer to the cell.
+		 * @return A boolean, true if the cell is walkable, otherwise false.
+		 */
+		bool isWalkable(Cell* cell) const;
+
+		//! the abstracted CellCache
+		CellCache* m_cache;
+		//! width and height of a cluster
+		uint32_t m_clusterSize;
+		//! cache width in cells
+		uint32_t m_width;
+		//! cache height in cells
+		uint32_t m_height;
+		//! number of clusters in x direction
+		uint32_t m_clustersX;
+		//! number of clusters in y direction
+		uint32_t m_clustersY;
+		//! clusters
+		std::vector<Cluster> m_clusters;
+		//! transitions between clusters
+		BorderMap m_borders;
+		//! entrance index per cell, -1 if the cell is no entrance
+		std::vector<int32_t> m_entranceIndex;
+		//! static blocking state per cell, as known by the graph
+		std::vector<bool> m_blocked;
+		//! clusters that need a recalculation
+		std::set<uint32_t> m_dirtyClusters;
+	};
+
+} // FIFE
+
+#endif
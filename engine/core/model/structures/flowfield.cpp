@@ -0,0 +1,302 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <algorithm>
+#include <functional>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/log/logger.h"
+
+#include "flowfield.h"
+#include "cellcache.h"
+#include "cell.h"
+#include "layer.h"
+
+namespace FIFE {
+
+	static Logger _log(LM_STRUCTURES);
+
+	FlowField::FlowField(CellCache* cache, const ModelCoordinate& goal, const std::string& costId):
+		m_cache(cache),
+		m_goal(goal),
+		m_goalId(cache->convertCoordToInt(goal)),
+		m_costId(costId),
+		m_calculated(false),
+		m_lastUse(0) {
+		m_cache->addCellChangeListener(this);
+	}
+
+	FlowField::~FlowField() {
+		m_cache->removeCellChangeListener(this);
+	}
+
+	void FlowField::update() {
+		if (!m_calculated || static_cast<int32_t>(m_costs.size()) != m_cache->getMaxIndex()) {
+			calculate();
+		} else if (!m_changed.empty()) {
+			repair();
+		}
+	}
+
+	const ModelCoordinate& FlowField::getGoal() const {
+		return m_goal;
+	}
+
+	const std::string& FlowField::getCostId() const {
+		return m_costId;
+	}
+
+	double FlowField::getCost(int32_t cellId) const {
+		if (cellId < 0 || cellId >= static_cast<int32_t>(m_costs.size())) {
+			return -1.0;
+		}
+		return m_costs[cellId];
+	}
+
+	int32_t FlowField::getNext(int32_t cellId) const {
+		if (cellId < 0 || cellId >= static_cast<int32_t>(m_next.size())) {
+			return -1;
+		}
+		return m_next[cellId];
+	}
+
+	bool FlowField::getPath(int32_t cellId, uint8_t blockerThreshold, std::vector<int32_t>& path) {
+		path.clear();
+		if (getCost(cellId) < 0.0) {
+			return false;
+		}
+		std::set<int32_t> visited;
+		int32_t current = cellId;
+		path.push_back(current);
+		visited.insert(current);
+		while (current != m_goalId) {
+			int32_t next = m_next[current];
+			if (next == -1) {
+				return false;
+			}
+			Cell* nextCell = m_cache->getCell(m_cache->convertIntToCoord(next));
+			if (visited.find(next) != visited.end() ||
+				(next != m_goalId && nextCell->getCellType() > blockerThreshold)) {
+				// the field is blocked, so we look for the best free neighbor
+				next = -1;
+				double bestCost = 0.0;
+				Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(current));
+				const std::vector<Cell*>& neighbors = cell->getNeighbors();
+				for (std::vector<Cell*>::const_iterator it = neighbors.begin(); it != neighbors.end(); ++it) {
+					if ((*it)->getLayer()->getCellCache() != m_cache) {
+						continue;
+					}
+					int32_t neighborId = (*it)->getCellId();
+					if (m_costs[neighborId] < 0.0 || visited.find(neighborId) != visited.end() ||
+						(neighborId != m_goalId && (*it)->getCellType() > blockerThreshold)) {
+						continue;
+					}
+					double cost = m_costs[neighborId] + getStepCost(cell, *it);
+					if (next == -1 || cost < bestCost) {
+						next = neighborId;
+						bestCost = cost;
+					}
+				}
+				if (next == -1) {
+					return false;
+				}
+			}
+			current = next;
+			path.push_back(current);
+			visited.insert(current);
+		}
+		return true;
+	}
+
+	void FlowField::setLastUse(uint32_t time) {
+		m_lastUse = time;
+	}
+
+	uint32_t FlowField::getLastUse() const {
+		return m_lastUse;
+	}
+
+	void FlowField::onInstanceEnteredCell(Cell* cell, Instance* instance) {
+	}
+
+	void FlowField::onInstanceExitedCell(Cell* cell, Instance* instance) {
+	}
+
+	void FlowField::onBlockingChangedCell(Cell* cell, CellTypeInfo type, bool blocks) {
+		if (!m_calculated) {
+			return;
+		}
+		int32_t cellId = cell->getCellId();
+		if (cellId < 0 || cellId >= static_cast<int32_t>(m_blocked.size()) || cellId == m_goalId) {
+			return;
+		}
+		// dynamic blockers are not part of the field
+		bool blocked = type == CTYPE_STATIC_BLOCKER || type == CTYPE_CELL_BLOCKER;
+		if (m_blocked[cellId] != blocked) {
+			m_blocked[cellId] = blocked;
+			m_changed.insert(cellId);
+		}
+	}
+
+	void FlowField::calculate() {
+		int32_t size = m_cache->getMaxIndex();
+		m_costs.assign(size, -1.0);
+		m_next.assign(size, -1);
+		m_blocked.assign(size, false);
+		m_changed.clear();
+		m_queue.clear();
+
+		const std::vector<std::vector<Cell*> >& cells = m_cache->getCells();
+		std::vector<std::vector<Cell*> >::const_iterator it = cells.begin();
+		for (; it != cells.end(); ++it) {
+			std::vector<Cell*>::const_iterator cit = (*it).begin();
+			for (; cit != (*it).end(); ++cit) {
+				if (*cit) {
+					CellTypeInfo type = (*cit)->getCellType();
+					m_blocked[(*cit)->getCellId()] = type == CTYPE_STATIC_BLOCKER || type == CTYPE_CELL_BLOCKER;
+				}
+			}
+		}
+		m_calculated = true;
+		if (m_goalId < 0 || m_goalId >= size) {
+			return;
+		}
+		m_costs[m_goalId] = 0.0;
+		m_queue.push_back(QueueEntry(0.0, m_goalId));
+		propagate();
+		FL_DBG(_log, LMsg("FlowField calculated for goal ") << m_goal);
+	}
+
+	void FlowField::repair() {
+		std::vector<int32_t> seeds;
+		std::vector<int32_t> stack;
+		std::set<int32_t>::iterator it = m_changed.begin();
+		for (; it != m_changed.end(); ++it) {
+			if (!m_blocked[*it]) {
+				seeds.push_back(*it);
+				continue;
+			}
+			// the new blocker invalidates all cells that lead through it
+			stack.push_back(*it);
+			while (!stack.empty()) {
+				int32_t current = stack.back();
+				stack.pop_back();
+				if (m_costs[current] < 0.0) {
+					continue;
+				}
+				m_costs[current] = -1.0;
+				m_next[current] = -1;
+				seeds.push_back(current);
+				Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(current));
+				const std::vector<Cell*>& neighbors = cell->getNeighbors();
+				for (std::vector<Cell*>::const_iterator nit = neighbors.begin(); nit != neighbors.end(); ++nit) {
+					if ((*nit)->getLayer()->getCellCache() != m_cache) {
+						continue;
+					}
+					int32_t neighborId = (*nit)->getCellId();
+					if (m_next[neighborId] == current) {
+						stack.push_back(neighborId);
+					}
+				}
+			}
+		}
+		m_changed.clear();
+
+		// connect the invalidated and the freed cells with the valid part of the field
+		std::vector<int32_t>::iterator sit = seeds.begin();
+		for (; sit != seeds.end(); ++sit) {
+			if (m_blocked[*sit]) {
+				continue;
+			}
+			Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(*sit));
+			const std::vector<Cell*>& neighbors = cell->getNeighbors();
+			for (std::vector<Cell*>::const_iterator nit = neighbors.begin(); nit != neighbors.end(); ++nit) {
+				if ((*nit)->getLayer()->getCellCache() != m_cache) {
+					continue;
+				}
+				int32_t neighborId = (*nit)->getCellId();
+				if (m_costs[neighborId] < 0.0 || m_blocked[neighborId]) {
+					continue;
+				}
+				double cost = m_costs[neighborId] + getStepCost(cell, *nit);
+				if (m_costs[*sit] < 0.0 || cost < m_costs[*sit]) {
+					m_costs[*sit] = cost;
+					m_next[*sit] = neighborId;
+				}
+			}
+			if (m_costs[*sit] >= 0.0) {
+				m_queue.push_back(QueueEntry(m_costs[*sit], *sit));
+				std::push_heap(m_queue.begin(), m_queue.end(), std::greater<QueueEntry>());
+			}
+		}
+		propagate();
+		FL_DBG(_log, LMsg("FlowField repaired ") << seeds.size() << " cells for goal " << m_goal);
+	}
+
+	void FlowField::propagate() {
+		std::make_heap(m_queue.begin(), m_queue.end(), std::greater<QueueEntry>());
+		while (!m_queue.empty()) {
+			std::pop_heap(m_queue.begin(), m_queue.end(), std::greater<QueueEntry>());
+			QueueEntry entry = m_queue.back();
+			m_queue.pop_back();
+			// outdated entry
+			if (entry.first > m_costs[entry.second]) {
+				continue;
+			}
+			Cell* cell = m_cache->getCell(m_cache->convertIntToCoord(entry.second));
+			if (!cell) {
+				continue;
+			}
+			const std::vector<Cell*>& neighbors = cell->getNeighbors();
+			for (std::vector<Cell*>::const_iterator it = neighbors.begin(); it != neighbors.end(); ++it) {
+				if ((*it)->getLayer()->getCellCache() != m_cache) {
+					continue;
+				}
+				int32_t neighborId = (*it)->getCellId();
+				if (neighborId == m_goalId || m_blocked[neighborId]) {
+					continue;
+				}
+				// the costs are calculated in walking direction, from the neighbor to the cell
+				double cost = entry.first + getStepCost(*it, cell);
+				if (m_costs[neighborId] < 0.0 || cost < m_costs[neighborId]) {
+					m_costs[neighborId] = cost;
+					m_next[neighborId] = entry.second;
+					m_queue.push_back(QueueEntry(cost, neighborId));
+					std::push_heap(m_queue.begin(), m_queue.end(), std::greater<QueueEntry>());
+				}
+			}
+		}
+	}
+
+	double FlowField::getStepCost(Cell* from, Cell* to) {
+		if (m_costId.empty()) {
+			return m_cache->getAdjacentCost(to->getLayerCoordinates(), from->getLayerCoordinates());
+		}
+		return m_cache->getAdjacentCost(to->getLayerCoordinates(), from->getLayerCoordinates(), m_costId);
+	}
+
+} // FIFE
@@ -0,0 +1,172 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_FLOWFIELD_H
+#define FIFE_FLOWFIELD_H
+
+// Standard C++ library includes
+#include <set>
+#include <string>
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/metamodel/modelcoords.h"
+
+#include "cell.h"
+
+namespace FIFE {
+
+	class CellCache;
+
+	/** A FlowField holds the costs from every cell of a CellCache to one goal.
+	 *
+	 * Each cell points to the neighbor that leads to the goal, so any number of agents
+	 * that share the goal can follow the field without an own search. Only static blockers
+	 * are taken into account. If they change, only the affected part of the field is
+	 * recalculated on the next update. Changes of the cost multipliers are not observed.
+	 */
+	class FlowField : public CellChangeListener {
+	public:
+		/** Constructor
+		 * @param cache A pointer to the CellCache.
+		 * @param goal The layer coordinate of the goal.
+		 * @param costId A const reference to a string that contains the cost identifier, can be empty.
+		 */
+		FlowField(CellCache* cache, const ModelCoordinate& goal, const std::string& costId);
+
+		/** Destructor
+		 */
+		virtual ~FlowField();
+
+		/** Calculates the field on first use, afterwards the changed blockers are applied.
+		 */
+		void update();
+
+		/** Returns the layer coordinate of the goal.
+		 * @return A const reference to the goal coordinate.
+		 */
+		const ModelCoordinate& getGoal() const;
+
+		/** Returns the cost identifier.
+		 * @return A const reference to a string that contains the cost identifier.
+		 */
+		const std::string& getCostId() const;
+
+		/** Returns the costs from a cell to the goal.
+		 * @param cellId The cell identifier.
+		 * @return A double, negative if the goal can not be reached.
+		 */
+		double getCost(int32_t cellId) const;
+
+		/** Returns the neighbor that leads to the goal.
+		 * @param cellId The cell identifier.
+		 * @return A integer with the cell identifier, -1 if there is none.
+		 */
+		int32_t getNext(int32_t cellId) const;
+
+		/** Follows the field from a cell to the goal.
+		 * If the next cell is blocked, the best free neighbor is used instead.
+		 * @param cellId The identifier of the start cell.
+		 * @param blockerThreshold Cell types above this value are handled as blocker.
+		 * @param path Receives the cell identifiers, including start and goal.
+		 * @return A boolean, true if the goal could be reached, otherwise false.
+		 */
+		bool getPath(int32_t cellId, uint8_t blockerThreshold, std::vector<int32_t>& path);
+
+		/** Sets the time of the last use, used to remove old fields.
+		 * @param time A unsigned integer that contains the time.
+		 */
+		void setLastUse(uint32_t time);
+
+		/** Returns the time of the last use.
+		 * @return A unsigned integer that contains the time.
+		 */
+		uint32_t getLastUse() const;
+
+		void onInstanceEnteredCell(Cell* cell, Instance* instance);
+		void onInstanceExitedCell(Cell* cell, Instance* instance);
+		void onBlockingChangedCell(Cell* cell, CellTypeInfo type, bool blocks);
+
+	private:
+		/** Calculates the complete field.
+		 */
+		void calculate();
+
+		/** Applies the changed blockers to the field.
+		 */
+		void repair();
+
+		/** Propagates the costs from the queued cells to their neighbors.
+		 */
+		void propagate();
+
+		/** Returns the costs to move from one cell to a neighbor.
+		 * @param from A pointer to the start cell.
+		 * @param to A pointer to the neighbor.
+		 * @return A double with the costs.
+		 */
+		double getStepCost(Cell* from, Cell* to);
+
+		//! pair of cost and cell identifier
+		typedef std::pair<double, int32_t> QueueEntry;
+
+		//! pointer to the CellCache
+		CellCache* m_cache;
+
+		//! goal coordinate
+		ModelCoordinate m_goal;
+
+		//! goal cell identifier
+		int32_t m_goalId;
+
+		//! cost identifier
+		std::string m_costId;
+
+		//! costs to the goal, indexed by cell identifier
+		std::vector<double> m_costs;
+
+		//! neighbor that leads to the goal, indexed by cell identifier
+		std::vector<int32_t> m_next;
+
+		//! static blocker state that was used for the calculation
+		std::vector<bool> m_blocked;
+
+		//! cells which static blocker state was changed since the last update
+		std::set<int32_t> m_changed;
+
+		//! cells which wait for propagation
+		std::vector<QueueEntry> m_queue;
+
+		//! indicates if the field was calculated
+		bool m_calculated;
+
+		//! time of the last use
+		uint32_t m_lastUse;
+	};
+
+} // FIFE
+
+#endif
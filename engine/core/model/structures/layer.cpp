@@ -20,6 +20,7 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
 
 // 3rd party library includes
 
@@ -27,6 +28,7 @@
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
+#include "util/base/exception.h"
 #include "util/log/logger.h"
 #include "util/structures/purge.h"
 #include "model/metamodel/grids/cellgrid.h"
@@ -45,6 +47,20 @@ namespace FIFE {
 	 */
 	static Logger _log(LM_STRUCTURES);
 
+	typedef std::pair<ModelCoordinate, Instance*> CoordinateInstance;
+
+	/** Orders instances by the x coordinate of their cell, used for batch queries.
+	 */
+	class CoordinateInstanceLess {
+	public:
+		bool operator()(const CoordinateInstance& a, const CoordinateInstance& b) const {
+			return a.first.x < b.first.x;
+		}
+		bool operator()(const CoordinateInstance& a, int32_t x) const {
+			return a.first.x < x;
+		}
+	};
+
 	Layer::Layer(const std::string& identifier, Map* map, CellGrid* grid)
 		: m_id(identifier),
 		m_map(map),
@@ -382,6 +398,112 @@ namespace FIFE {
 		return instances;
 	}
 
+	void Layer::getInstancesInRects(const std::vector<Rect>& rects, std::vector<Instance*>& instances, std::vector<int32_t>& offsets) {
+		findInstancesInRects(rects, std::vector<int32_t>(), instances, offsets);
+	}
+
+	void Layer::getInstancesInCircles(const std::vector<ModelCoordinate>& centers, const std::vector<int32_t>& radii,
+		std::vector<Instance*>& instances, std::vector<int32_t>& offsets) {
+		if (radii.size() != centers.size() && radii.size() != 1) {
+			throw InvalidFormat("Number of radii does not match the number of centers");
+		}
+		std::vector<Rect> rects;
+		std::vector<int32_t> rectRadii;
+		rects.reserve(centers.size());
+		rectRadii.reserve(centers.size());
+		for (uint32_t i = 0; i < centers.size(); ++i) {
+			int32_t radius = radii.size() == 1 ? radii.front() : radii[i];
+			rects.push_back(Rect(centers[i].x - radius, centers[i].y - radius, radius * 2, radius * 2));
+			rectRadii.push_back(radius);
+		}
+		findInstancesInRects(rects, rectRadii, instances, offsets);
+	}
+
+	void Layer::findInstancesInRects(const std::vector<Rect>& rects, const std::vector<int32_t>& radii,
+		std::vector<Instance*>& instances, std::vector<int32_t>& offsets) {
+		instances.clear();
+		offsets.clear();
+		offsets.reserve(rects.size() + 1);
+		if (rects.empty()) {
+			offsets.push_back(0);
+			return;
+		}
+
+		// bounding box of the batch
+		int32_t minX = rects.front().x;
+		int32_t minY = rects.front().y;
+		int32_t maxX = rects.front().right();
+		int32_t maxY = rects.front().bottom();
+		double area = 0.0;
+		std::vector<Rect>::const_iterator rit = rects.begin();
+		for (; rit != rects.end(); ++rit) {
+			minX = std::min(minX, rit->x);
+			minY = std::min(minY, rit->y);
+			maxX = std::max(maxX, rit->right());
+			maxY = std::max(maxY, rit->bottom());
+			area += (static_cast<double>(rit->w) + 1.0) * (static_cast<double>(rit->h) + 1.0);
+		}
+		double boundsArea = (static_cast<double>(maxX - minX) + 1.0) * (static_cast<double>(maxY - minY) + 1.0);
+		// if the rects cover most of the bounding box the tree is walked only once
+		bool dense = boundsArea <= area * 4.0;
+
+		std::list<Instance*> found;
+		std::vector<CoordinateInstance> sorted;
+		if (dense) {
+			m_instanceTree->findInstances(ModelCoordinate(minX, minY), maxX - minX, maxY - minY, found);
+			sorted.reserve(found.size());
+			for (std::list<Instance*>::iterator it = found.begin(); it != found.end(); ++it) {
+				sorted.push_back(CoordinateInstance((*it)->getLocationRef().getLayerCoordinates(), *it));
+			}
+			std::sort(sorted.begin(), sorted.end(), CoordinateInstanceLess());
+		}
+
+		for (uint32_t i = 0; i < rects.size(); ++i) {
+			const Rect& rect = rects[i];
+			offsets.push_back(static_cast<int32_t>(instances.size()));
+			int32_t radius = radii.empty() ? -1 : radii[i];
+			int32_t radiusp2 = (radius + 1) * radius;
+			if (dense) {
+				std::vector<CoordinateInstance>::const_iterator it =
+					std::lower_bound(sorted.begin(), sorted.end(), rect.x, CoordinateInstanceLess());
+				for (; it != sorted.end() && it->first.x <= rect.right(); ++it) {
+					const ModelCoordinate& mc = it->first;
+					if (mc.y < rect.y || mc.y > rect.bottom()) {
+						continue;
+					}
+					if (radius >= 0) {
+						int32_t dx = mc.x - rect.x - radius;
+						int32_t dy = mc.y - rect.y - radius;
+						if (dx * dx + dy * dy > radiusp2) {
+							continue;
+						}
+					}
+					instances.push_back(it->second);
+				}
+			} else {
+				m_instanceTree->findInstances(ModelCoordinate(rect.x, rect.y), rect.w, rect.h, found);
+				sorted.clear();
+				for (std::list<Instance*>::iterator it = found.begin(); it != found.end(); ++it) {
+					ModelCoordinate mc = (*it)->getLocationRef().getLayerCoordinates();
+					if (radius >= 0) {
+						int32_t dx = mc.x - rect.x - radius;
+						int32_t dy = mc.y - rect.y - radius;
+						if (dx * dx + dy * dy > radiusp2) {
+							continue;
+						}
+					}
+					sorted.push_back(CoordinateInstance(mc, *it));
+				}
+				// the tree returns the instances in node order, the dense path returns them by x coordinate
+				std::sort(sorted.begin(), sorted.end(), CoordinateInstanceLess());
+				for (std::vector<CoordinateInstance>::const_iterator it = sorted.begin(); it != sorted.end(); ++it) {
+					instances.push_back(it->second);
+				}
+			}
+		}
+		offsets.push_back(static_cast<int32_t>(instances.size()));
+	}
+
 	void Layer::getMinMaxCoordinates(ModelCoordinate& min, ModelCoordinate& max, const Layer* layer) const {
 		if (!layer) {
 			layer = this;
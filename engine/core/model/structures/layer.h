@@ -202,6 +202,28 @@ namespace FIFE {
 			 */
 			std::vector<Instance*> getInstancesInCircleSegment(const ModelCoordinate& center, uint16_t radius, int32_t sangle, int32_t eangle);
 
+			/** Returns the instances in many rects with one call.
+			 * The results of all rects are stored one after another, the vectors are cleared first but keep their capacity,
+			 * so they can be reused between calls. Within a rect the instances are ordered by x coordinate.
+			 * @param rects A const reference to a vector that contains the rects, the borders are included.
+			 * @param instances A reference to a vector that is filled with the instances.
+			 * @param offsets A reference to a vector that is filled with the start index of each rect in instances,
+			 * followed by the total number of instances.
+			 */
+			void getInstancesInRects(const std::vector<Rect>& rects, std::vector<Instance*>& instances, std::vector<int32_t>& offsets);
+
+			/** Returns the instances in many circles with one call.
+			 * A cell belongs to a circle under the same rule as getInstancesInCircle.
+			 * @param centers A const reference to a vector that contains the centers of the circles.
+			 * @param radii A const reference to a vector that contains one radius per center, or one radius for all centers.
+			 * @param instances A reference to a vector that is filled with the instances.
+			 * @param offsets A reference to a vector that is filled with the start index of each circle in instances,
+			 * followed by the total number of instances.
+			 * @throws InvalidFormat if the number of radii does not match.
+			 */
+			void getInstancesInCircles(const std::vector<ModelCoordinate>& centers, const std::vector<int32_t>& radii,
+				std::vector<Instance*>& instances, std::vector<int32_t>& offsets);
+
 			/** Get the first instance on this layer with the given identifier.
 			 */
 			Instance* getInstance(const std::string& identifier);
@@ -378,6 +400,17 @@ namespace FIFE {
 			bool isStatic();
 
 		protected:
+			/** Fills the batch results, used by getInstancesInRects and getInstancesInCircles.
+			 * Dense batches walk the instance tree once and search the sorted result,
+			 * sparse batches walk the tree once per rect.
+			 * @param rects A const reference to a vector that contains the rects.
+			 * @param radii A const reference to a vector that contains the radius for each rect, empty if no circles are used.
+			 * @param instances A reference to a vector that is filled with the instances.
+			 * @param offsets A reference to a vector that is filled with the start indices.
+			 */
+			void findInstancesInRects(const std::vector<Rect>& rects, const std::vector<int32_t>& radii,
+				std::vector<Instance*>& instances, std::vector<int32_t>& offsets);
+
 			//! string identifier
 			std::string m_id;
 			//! pointer to map
@@ -84,6 +84,9 @@ namespace FIFE {
 			std::vector<Instance*> getInstancesInLine(const ModelCoordinate& pt1, const ModelCoordinate& pt2);
 			std::vector<Instance*> getInstancesInCircle(const ModelCoordinate& center, uint16_t radius);
 			std::vector<Instance*> getInstancesInCircleSegment(const ModelCoordinate& center, uint16_t radius, int32_t sangle, int32_t eangle);
+			void getInstancesInRects(const std::vector<Rect>& rects, std::vector<Instance*>& instances, std::vector<int32_t>& offsets);
+			void getInstancesInCircles(const std::vector<ModelCoordinate>& centers, const std::vector<int32_t>& radii,
+				std::vector<Instance*>& instances, std::vector<int32_t>& offsets);
 			Instance* getInstance(const std::string& id);
 
 			void setInstancesVisible(bool vis);
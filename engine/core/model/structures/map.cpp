@@ -32,6 +32,7 @@
 #include "util/base/exception.h"
 #include "util/structures/purge.h"
 #include "util/structures/rect.h"
+#include "util/time/profiler.h"
 #include "view/camera.h"
 #include "view/rendererbase.h"
 #include "video/renderbackend.h"
@@ -192,6 +193,7 @@ namespace FIFE {
 		std::list<Layer*>::iterator it = m_layers.begin();
 		// update Layers
 		for(; it != m_layers.end(); ++it) {
+			ScopedProfile zone("Layer::update");
 			if ((*it)->update()) {
 				m_changedLayers.push_back(*it);
 			}
@@ -203,6 +205,7 @@ namespace FIFE {
 		// loop over Caches and update
 		for (std::vector<CellCache*>::iterator cacheIt = cellCaches.begin();
 			cacheIt != cellCaches.end(); ++cacheIt) {
+			ScopedProfile zone("CellCache::update");
 			(*cacheIt)->update();
 		}
 		if (!m_changedLayers.empty()) {
@@ -217,7 +220,11 @@ namespace FIFE {
 		std::vector<Camera*>::iterator camIter = m_cameras.begin();
 		for ( ; camIter != m_cameras.end(); ++camIter) {
 			if ((*camIter)->isEnabled()) {
-				(*camIter)->update();
+				{
+					ScopedProfile zone("Camera::update");
+					(*camIter)->update();
+				}
+				ScopedProfile zone("Camera::render");
 				(*camIter)->render();
 			}
 		}
@@ -48,7 +48,10 @@ namespace FIFE {
 		m_replanned(false),
 		m_ignoresBlocker(false),
 		m_costId(""),
-		m_object(NULL) {
+		m_object(NULL),
+		m_searchMode(SEARCH_MODE_DEFAULT),
+		m_usedSearchMode(SEARCH_MODE_DEFAULT),
+		m_expandedNodes(0) {
 	}
 
 	Route::~Route() {
@@ -319,4 +322,28 @@ namespace FIFE {
 	Object* Route::getObject() {
 		return m_object;
 	}
+
+	void Route::setSearchMode(SearchModeInfo mode) {
+		m_searchMode = mode;
+	}
+
+	SearchModeInfo Route::getSearchMode() {
+		return m_searchMode;
+	}
+
+	void Route::setUsedSearchMode(SearchModeInfo mode) {
+		m_usedSearchMode = mode;
+	}
+
+	SearchModeInfo Route::getUsedSearchMode() {
+		return m_usedSearchMode;
+	}
+
+	void Route::setExpandedNodes(uint32_t nodes) {
+		m_expandedNodes = nodes;
+	}
+
+	uint32_t Route::getExpandedNodes() {
+		return m_expandedNodes;
+	}
 } // FIFE
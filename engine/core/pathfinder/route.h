@@ -55,6 +55,27 @@ namespace FIFE {
 	};
 	typedef uint8_t RouteStatusInfo;
 
+	/** Defines different search modes that can be used to solve the route.
+	 *
+	 * SEARCH_MODE_DEFAULT means, the mode of the CellCache or, if that is default too, of the pather is used.
+	 * SEARCH_MODE_ASTAR means, a plain A* search on the cells is used.
+	 * SEARCH_MODE_HIERARCHICAL means, a A* search on the cluster graph of the CellCache is used
+	 * and the result is refined afterwards. Falls back to A* for short routes and
+	 * routes which need special treatment (multi cell, cost id, areas or z-step range).
+	 * SEARCH_MODE_FLOW_FIELD means, the route follows a flow field of the CellCache that is shared
+	 * by all routes with the same goal and cost id. Falls back to A* for multi cell, areas or z-step range.
+	 * SEARCH_MODE_JUMP_POINT means, a A* search that skips straight and diagonal lines of cells is used.
+	 * Falls back to A* if the layer is not a square grid with diagonals or the costs are not uniform.
+	 */
+	enum SearchMode {
+		SEARCH_MODE_DEFAULT = 0,
+		SEARCH_MODE_ASTAR,
+		SEARCH_MODE_HIERARCHICAL,
+		SEARCH_MODE_FLOW_FIELD,
+		SEARCH_MODE_JUMP_POINT
+	};
+	typedef uint8_t SearchModeInfo;
+
 	//! A path is a list with locations. Each location holds the coordinate for one cell.
 	typedef std::list<Location> Path;
 
@@ -250,6 +271,36 @@ namespace FIFE {
 		 */
 		Object* getObject();
 
+		/** Sets the search mode that should be used to solve the route.
+		 * @param mode A SearchModeInfo, SEARCH_MODE_DEFAULT uses the mode of the pather.
+		 */
+		void setSearchMode(SearchModeInfo mode);
+
+		/** Returns the search mode that should be used to solve the route.
+		 * @return A SearchModeInfo which holds the mode.
+		 */
+		SearchModeInfo getSearchMode();
+
+		/** Sets the search mode that was used to solve the route. Called by the pather.
+		 * @param mode A SearchModeInfo, SEARCH_MODE_ASTAR if the route fell back to A*.
+		 */
+		void setUsedSearchMode(SearchModeInfo mode);
+
+		/** Returns the search mode that was used to solve the route.
+		 * @return A SearchModeInfo which holds the mode, SEARCH_MODE_DEFAULT if the route was not searched.
+		 */
+		SearchModeInfo getUsedSearchMode();
+
+		/** Sets the number of expanded nodes. Called by the searches.
+		 * @param nodes The number of nodes.
+		 */
+		void setExpandedNodes(uint32_t nodes);
+
+		/** Returns the number of nodes that the A* or jump point search took from the open list.
+		 * @return A unsigned integer, the number of expanded nodes.
+		 */
+		uint32_t getExpandedNodes();
+
 	private:
 		//! path iterator
 		typedef Path::iterator PathIterator;
@@ -292,6 +343,15 @@ namespace FIFE {
 
 		//! pointer to multi object
 		Object* m_object;
+
+		//! used search mode
+		SearchModeInfo m_searchMode;
+
+		//! search mode that solved the route
+		SearchModeInfo m_usedSearchMode;
+
+		//! nodes expanded by the search
+		uint32_t m_expandedNodes;
 	};
 
 } // FIFE
@@ -0,0 +1,89 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/structures/layer.h"
+#include "model/structures/cellcache.h"
+#include "model/structures/flowfield.h"
+#include "pathfinder/route.h"
+#include "util/math/fife_math.h"
+
+#include "flowfieldsearch.h"
+
+namespace FIFE {
+	FlowFieldSearch::FlowFieldSearch(Route* route, const int32_t sessionId):
+		RoutePatherSearch(route, sessionId),
+		m_to(route->getEndNode()),
+		m_from(route->getStartNode()),
+		m_cellCache(m_from.getLayer()->getCellCache()),
+		m_startCoordInt(m_cellCache->convertCoordToInt(m_from.getLayerCoordinates())) {
+	}
+
+	FlowFieldSearch::~FlowFieldSearch() {
+	}
+
+	void FlowFieldSearch::updateSearch() {
+		// the field is owned by the cache and can be removed between two updates
+		FlowField* field = m_cellCache->getFlowField(m_to.getLayerCoordinates(), m_route->getCostId());
+		field->update();
+		if (field->getCost(m_startCoordInt) < 0.0) {
+			setSearchStatus(search_status_failed);
+			m_route->setRouteStatus(ROUTE_FAILED);
+			return;
+		}
+		setSearchStatus(search_status_complete);
+		m_route->setRouteStatus(ROUTE_SEARCHED);
+	}
+
+	void FlowFieldSearch::calcPath() {
+		FlowField* field = m_cellCache->getFlowField(m_to.getLayerCoordinates(), m_route->getCostId());
+		field->update();
+		uint8_t blockerThreshold = m_ignoreDynamicBlockers ? 2 : 1;
+		std::vector<int32_t> cells;
+		// in case dynamic blockers can not be bypassed we walk into them
+		if (!field->getPath(m_startCoordInt, blockerThreshold, cells) &&
+			!field->getPath(m_startCoordInt, 2, cells)) {
+			setSearchStatus(search_status_failed);
+			m_route->setRouteStatus(ROUTE_FAILED);
+			return;
+		}
+
+		Path path;
+		Location newnode(m_cellCache->getLayer());
+		std::vector<int32_t>::iterator it = cells.begin();
+		for (; it != cells.end(); ++it) {
+			newnode.setLayerCoordinates(m_cellCache->convertIntToCoord(*it));
+			path.push_back(newnode);
+		}
+		// This assures that the agent always steps into the center of the cell.
+		path.back().setExactLayerCoordinates(FIFE::intPt2doublePt(m_to.getLayerCoordinates()));
+		path.front().setExactLayerCoordinates(m_from.getExactLayerCoordinatesRef());
+		m_route->setPath(path);
+	}
+}
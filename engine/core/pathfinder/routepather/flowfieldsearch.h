@@ -0,0 +1,85 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_PATHFINDER_FLOWFIELDSEARCH
+#define FIFE_PATHFINDER_FLOWFIELDSEARCH
+
+// Standard C++ library includes
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/structures/location.h"
+
+#include "routepathersearch.h"
+
+namespace FIFE {
+
+	class CellCache;
+	class Route;
+
+	/** FlowFieldSearch using the shared flow field of the CellCache.
+	 *
+	 * The field is calculated once per goal and cost id, each search only follows it.
+	 */
+	class FlowFieldSearch: public RoutePatherSearch {
+	public:
+		/** Constructor
+		 *
+		 * @param route A pointer to the route for which a path should be searched.
+		 * @param sessionId A integer containing the session id for this search.
+		 */
+		FlowFieldSearch(Route* route, const int32_t sessionId);
+
+		/** Destructor
+		 */
+		~FlowFieldSearch();
+
+		/** Updates the search.
+		 *
+		 * Brings the flow field up to date and checks if the goal can be reached.
+		 */
+		void updateSearch();
+
+		/** Calculates final path.
+		 *
+		 * If the search is successful then the path is taken from the flow field.
+		 */
+		void calcPath();
+
+	private:
+		//! A location object representing where the search started.
+		Location m_to;
+
+		//! A location object representing where the search ended.
+		Location m_from;
+
+		//! A pointer to the CellCache.
+		CellCache* m_cellCache;
+
+		//! The start coordinate as an int32_t.
+		int32_t m_startCoordInt;
+	};
+}
+#endif
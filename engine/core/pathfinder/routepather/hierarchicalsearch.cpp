@@ -0,0 +1,196 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/metamodel/grids/cellgrid.h"
+#include "model/structures/layer.h"
+#include "model/structures/cellcache.h"
+#include "model/structures/cell.h"
+#include "model/structures/clustergraph.h"
+#include "pathfinder/route.h"
+#include "util/math/fife_math.h"
+
+#include "hierarchicalsearch.h"
+
+namespace FIFE {
+	HierarchicalSearch::HierarchicalSearch(Route* route, const int32_t sessionId):
+		RoutePatherSearch(route, sessionId),
+		m_to(route->getEndNode()),
+		m_from(route->getStartNode()),
+		m_cellCache(m_from.getLayer()->getCellCache()),
+		m_startCoordInt(m_cellCache->convertCoordToInt(m_from.getLayerCoordinates())),
+		m_destCoordInt(m_cellCache->convertCoordToInt(m_to.getLayerCoordinates())),
+		m_destCluster(0),
+		m_initialized(false) {
+	}
+
+	HierarchicalSearch::~HierarchicalSearch() {
+	}
+
+	void HierarchicalSearch::initSearch() {
+		ClusterGraph* graph = m_cellCache->getClusterGraph();
+		m_destCluster = graph->getClusterId(m_destCoordInt);
+		uint32_t startCluster = graph->getClusterId(m_startCoordInt);
+		graph->getClusterCosts(m_startCoordInt, startCluster, m_startCosts);
+		graph->getClusterCosts(m_destCoordInt, m_destCluster, m_destCosts, true);
+
+		m_sf[m_startCoordInt] = -1;
+		m_gCosts[m_startCoordInt] = 0.0;
+		m_sortedfrontier.pushElement(PriorityQueue<int32_t, double>::value_type(m_startCoordInt, 0.0));
+		m_initialized = true;
+	}
+
+	void HierarchicalSearch::addToFrontier(int32_t node, int32_t parent, double gCost) {
+		if (m_closed.find(node) != m_closed.end()) {
+			return;
+		}
+		ModelCoordinate nodeCoord = m_cellCache->convertIntToCoord(node);
+		double hCost = m_cellCache->getLayer()->getCellGrid()->getHeuristicCost(nodeCoord, m_to.getLayerCoordinates());
+		std::map<int32_t, double>::iterator it = m_gCosts.find(node);
+		if (it == m_gCosts.end()) {
+			m_sortedfrontier.pushElement(PriorityQueue<int32_t, double>::value_type(node, gCost + hCost));
+			m_gCosts.insert(std::make_pair(node, gCost));
+			m_sf[node] = parent;
+		} else if (gCost < it->second) {
+			m_sortedfrontier.changeElementPriority(node, gCost + hCost);
+			it->second = gCost;
+			m_sf[node] = parent;
+		}
+	}
+
+	void HierarchicalSearch::updateSearch() {
+		// the graph is owned by the cache and can be recreated between two updates
+		ClusterGraph* graph = m_cellCache->getClusterGraph();
+		graph->update();
+		if (!m_initialized) {
+			initSearch();
+		}
+		if (m_sortedfrontier.empty()) {
+			setSearchStatus(search_status_failed);
+			m_route->setRouteStatus(ROUTE_FAILED);
+			return;
+		}
+
+		int32_t next = m_sortedfrontier.getPriorityElement().first;
+		m_sortedfrontier.popElement();
+		m_closed.insert(next);
+		// found destination
+		if (next == m_destCoordInt) {
+			setSearchStatus(search_status_complete);
+			m_route->setRouteStatus(ROUTE_SEARCHED);
+			return;
+		}
+
+		double gCost = m_gCosts[next];
+		uint32_t cluster = graph->getClusterId(next);
+		int32_t index = graph->getEntranceIndex(next);
+		const std::vector<int32_t>& entrances = graph->getEntrances(cluster);
+		// connections inside of the cluster
+		if (next == m_startCoordInt) {
+			std::vector<int32_t>::const_iterator it = entrances.begin();
+			for (; it != entrances.end(); ++it) {
+				std::map<int32_t, double>::iterator cit = m_startCosts.find(*it);
+				if (cit != m_startCosts.end() && *it != next) {
+					addToFrontier(*it, next, gCost + cit->second);
+				}
+			}
+		} else if (index != -1) {
+			for (uint32_t i = 0; i < entrances.size(); ++i) {
+				double cost = graph->getEntranceCost(cluster, index, i);
+				if (static_cast<int32_t>(i) != index && cost >= 0.0) {
+					addToFrontier(entrances[i], next, gCost + cost);
+				}
+			}
+		}
+		// connections to the neighboring clusters
+		if (index != -1) {
+			ModelCoordinate nextCoord = m_cellCache->convertIntToCoord(next);
+			const std::vector<int32_t>& partners = graph->getEntrancePartners(cluster, index);
+			std::vector<int32_t>::const_iterator it = partners.begin();
+			for (; it != partners.end(); ++it) {
+				double cost = m_cellCache->getAdjacentCost(nextCoord, m_cellCache->convertIntToCoord(*it));
+				addToFrontier(*it, next, gCost + cost);
+			}
+		}
+		// connection to the destination
+		if (cluster == m_destCluster) {
+			std::map<int32_t, double>::iterator cit = m_destCosts.find(next);
+			if (cit != m_destCosts.end()) {
+				addToFrontier(m_destCoordInt, next, gCost + cit->second);
+			}
+		}
+	}
+
+	void HierarchicalSearch::calcPath() {
+		// abstract path from start to destination
+		std::vector<int32_t> nodes;
+		int32_t current = m_destCoordInt;
+		while (current != -1) {
+			nodes.push_back(current);
+			current = m_sf[current];
+		}
+
+		// refine the abstract path, the nodes are stored in reverse order
+		ClusterGraph* graph = m_cellCache->getClusterGraph();
+		graph->update();
+		uint8_t blockerThreshold = m_ignoreDynamicBlockers ? 2 : 1;
+		std::vector<int32_t> cells;
+		std::vector<int32_t> segment;
+		cells.push_back(m_startCoordInt);
+		for (std::vector<int32_t>::reverse_iterator it = nodes.rbegin(); it + 1 != nodes.rend(); ++it) {
+			int32_t from = *it;
+			int32_t to = *(it + 1);
+			uint32_t cluster = graph->getClusterId(from);
+			if (cluster != graph->getClusterId(to)) {
+				cells.push_back(to);
+				continue;
+			}
+			// dynamic blockers are not part of the graph, so in case they block we walk into them
+			if (!graph->findClusterPath(from, to, cluster, blockerThreshold, segment) &&
+				!graph->findClusterPath(from, to, cluster, 2, segment)) {
+				setSearchStatus(search_status_failed);
+				m_route->setRouteStatus(ROUTE_FAILED);
+				return;
+			}
+			cells.insert(cells.end(), segment.begin(), segment.end());
+		}
+
+		Path path;
+		Location newnode(m_cellCache->getLayer());
+		std::vector<int32_t>::iterator it = cells.begin();
+		for (; it != cells.end(); ++it) {
+			newnode.setLayerCoordinates(m_cellCache->convertIntToCoord(*it));
+			path.push_back(newnode);
+		}
+		// This assures that the agent always steps into the center of the cell.
+		path.back().setExactLayerCoordinates(FIFE::intPt2doublePt(m_to.getLayerCoordinates()));
+		path.front().setExactLayerCoordinates(m_from.getExactLayerCoordinatesRef());
+		m_route->setPath(path);
+	}
+}
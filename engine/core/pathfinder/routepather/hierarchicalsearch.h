@@ -0,0 +1,129 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_PATHFINDER_HIERARCHICALSEARCH
+#define FIFE_PATHFINDER_HIERARCHICALSEARCH
+
+// Standard C++ library includes
+#include <map>
+#include <set>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/structures/location.h"
+#include "util/structures/priorityqueue.h"
+
+#include "routepathersearch.h"
+
+namespace FIFE {
+
+	class CellCache;
+	class Route;
+
+	/** HierarchicalSearch using A* on the ClusterGraph of the CellCache.
+	 *
+	 * The search only expands the entrances between the clusters, so long routes need
+	 * much less steps than the SingleLayerSearch. Afterwards the abstract path is refined
+	 * to a path of neighboring cells.
+	 */
+	class HierarchicalSearch: public RoutePatherSearch {
+	public:
+		/** Constructor
+		 *
+		 * @param route A pointer to the route for which a path should be searched.
+		 * @param sessionId A integer containing the session id for this search.
+		 */
+		HierarchicalSearch(Route* route, const int32_t sessionId);
+
+		/** Destructor
+		 */
+		~HierarchicalSearch();
+
+		/** Updates the search.
+		 *
+		 * Each update checks all connections of the last checked entrance and selects the most favorable.
+		 */
+		void updateSearch();
+
+		/** Calculates final path.
+		 *
+		 * If the search is successful then the abstract path is refined and a path is created.
+		 */
+		void calcPath();
+
+	private:
+		/** Connects start and destination with the entrances of their clusters.
+		 */
+		void initSearch();
+
+		/** Adds the node to the frontier or updates it, in case the new costs are lower.
+		 *
+		 * @param node The cell id of the node.
+		 * @param parent The cell id of the parent node.
+		 * @param gCost The costs from the start to the node.
+		 */
+		void addToFrontier(int32_t node, int32_t parent, double gCost);
+
+		//! A location object representing where the search started.
+		Location m_to;
+
+		//! A location object representing where the search ended.
+		Location m_from;
+
+		//! A pointer to the CellCache.
+		CellCache* m_cellCache;
+
+		//! The start coordinate as an int32_t.
+		int32_t m_startCoordInt;
+
+		//! The destination coordinate as an int32_t.
+		int32_t m_destCoordInt;
+
+		//! The cluster of the destination.
+		uint32_t m_destCluster;
+
+		//! Indicates if start and destination are connected to the graph.
+		bool m_initialized;
+
+		//! Costs from the start to the cells of the start cluster.
+		std::map<int32_t, double> m_startCosts;
+
+		//! Costs from the cells of the destination cluster to the destination.
+		std::map<int32_t, double> m_destCosts;
+
+		//! The search frontier, holds the parent of each node.
+		std::map<int32_t, int32_t> m_sf;
+
+		//! A table to hold the costs.
+		std::map<int32_t, double> m_gCosts;
+
+		//! Already checked nodes.
+		std::set<int32_t> m_closed;
+
+		//! Priority queue to hold nodes on the sf in order.
+		PriorityQueue<int32_t, double> m_sortedfrontier;
+	};
+}
+#endif
@@ -0,0 +1,248 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <algorithm>
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/metamodel/grids/cellgrid.h"
+#include "model/structures/layer.h"
+#include "model/structures/cellcache.h"
+#include "model/structures/cell.h"
+#include "pathfinder/route.h"
+#include "util/math/fife_math.h"
+
+#include "jumppointsearch.h"
+
+namespace FIFE {
+	static int32_t getDirection(int32_t delta) {
+		return (delta > 0) - (delta < 0);
+	}
+
+	JumpPointSearch::JumpPointSearch(Route* route, const int32_t sessionId):
+		RoutePatherSearch(route, sessionId),
+		m_to(route->getEndNode()),
+		m_from(route->getStartNode()),
+		m_cellCache(m_from.getLayer()->getCellCache()),
+		m_destCoord(m_to.getLayerCoordinates()),
+		m_startCoordInt(m_cellCache->convertCoordToInt(m_from.getLayerCoordinates())),
+		m_destCoordInt(m_cellCache->convertCoordToInt(m_to.getLayerCoordinates())),
+		m_blockerThreshold(m_ignoreDynamicBlockers ? 2 : 1) {
+
+		// the costs are uniform, so they are the same for all steps
+		CellGrid* grid = m_cellCache->getLayer()->getCellGrid();
+		double multiplier = m_cellCache->getDefaultCostMultiplier();
+		m_straightCost = grid->getAdjacentCost(ModelCoordinate(0, 0), ModelCoordinate(1, 0)) * multiplier;
+		m_diagonalCost = grid->getAdjacentCost(ModelCoordinate(0, 0), ModelCoordinate(1, 1)) * multiplier;
+
+		m_sf[m_startCoordInt] = -1;
+		m_gCosts[m_startCoordInt] = 0.0;
+		m_sortedfrontier.pushElement(PriorityQueue<int32_t, double>::value_type(m_startCoordInt, 0.0));
+	}
+
+	JumpPointSearch::~JumpPointSearch() {
+	}
+
+	void JumpPointSearch::updateSearch() {
+		if (m_sortedfrontier.empty()) {
+			setSearchStatus(search_status_failed);
+			m_route->setRouteStatus(ROUTE_FAILED);
+			return;
+		}
+
+		int32_t next = m_sortedfrontier.getPriorityElement().first;
+		m_sortedfrontier.popElement();
+		m_route->setExpandedNodes(m_route->getExpandedNodes() + 1);
+		m_closed.insert(next);
+		// found destination
+		if (next == m_destCoordInt) {
+			setSearchStatus(search_status_complete);
+			m_route->setRouteStatus(ROUTE_SEARCHED);
+			return;
+		}
+
+		ModelCoordinate current = m_cellCache->convertIntToCoord(next);
+		int32_t x = current.x;
+		int32_t y = current.y;
+		std::vector<std::pair<int32_t, int32_t> > directions;
+		int32_t parent = m_sf[next];
+		if (parent == -1) {
+			// start node, all directions are checked
+			for (int32_t dy = -1; dy <= 1; ++dy) {
+				for (int32_t dx = -1; dx <= 1; ++dx) {
+					if (dx != 0 || dy != 0) {
+						directions.push_back(std::make_pair(dx, dy));
+					}
+				}
+			}
+		} else {
+			// natural and forced neighbors, relative to the direction we came from
+			ModelCoordinate parentCoord = m_cellCache->convertIntToCoord(parent);
+			int32_t dx = getDirection(x - parentCoord.x);
+			int32_t dy = getDirection(y - parentCoord.y);
+			if (dx != 0 && dy != 0) {
+				directions.push_back(std::make_pair(dx, 0));
+				directions.push_back(std::make_pair(0, dy));
+				directions.push_back(std::make_pair(dx, dy));
+				if (!isWalkable(x - dx, y)) {
+					directions.push_back(std::make_pair(-dx, dy));
+				}
+				if (!isWalkable(x, y - dy)) {
+					directions.push_back(std::make_pair(dx, -dy));
+				}
+			} else if (dx != 0) {
+				directions.push_back(std::make_pair(dx, 0));
+				if (!isWalkable(x, y + 1)) {
+					directions.push_back(std::make_pair(dx, 1));
+				}
+				if (!isWalkable(x, y - 1)) {
+					directions.push_back(std::make_pair(dx, -1));
+				}
+			} else {
+				directions.push_back(std::make_pair(0, dy));
+				if (!isWalkable(x + 1, y)) {
+					directions.push_back(std::make_pair(1, dy));
+				}
+				if (!isWalkable(x - 1, y)) {
+					directions.push_back(std::make_pair(-1, dy));
+				}
+			}
+		}
+
+		ModelCoordinate jumpPoint;
+		std::vector<std::pair<int32_t, int32_t> >::iterator it = directions.begin();
+		for (; it != directions.end(); ++it) {
+			if (jump(current, it->first, it->second, jumpPoint)) {
+				addJumpPoint(current, jumpPoint);
+			}
+		}
+	}
+
+	void JumpPointSearch::calcPath() {
+		// collect the jump points from the destination to the start
+		std::vector<int32_t> jumpPoints;
+		int32_t current = m_destCoordInt;
+		while (current != -1) {
+			jumpPoints.push_back(current);
+			current = m_sf[current];
+		}
+		std::reverse(jumpPoints.begin(), jumpPoints.end());
+
+		Path path;
+		Location newnode(m_cellCache->getLayer());
+		ModelCoordinate coord = m_cellCache->convertIntToCoord(m_startCoordInt);
+		newnode.setLayerCoordinates(coord);
+		path.push_back(newnode);
+		// the jump points are connected by straight or diagonal lines
+		std::vector<int32_t>::iterator it = jumpPoints.begin();
+		for (++it; it != jumpPoints.end(); ++it) {
+			ModelCoordinate target = m_cellCache->convertIntToCoord(*it);
+			int32_t dx = getDirection(target.x - coord.x);
+			int32_t dy = getDirection(target.y - coord.y);
+			while (coord.x != target.x || coord.y != target.y) {
+				if (coord.x != target.x) {
+					coord.x += dx;
+				}
+				if (coord.y != target.y) {
+					coord.y += dy;
+				}
+				newnode.setLayerCoordinates(coord);
+				path.push_back(newnode);
+			}
+		}
+		// This assures that the agent always steps into the center of the cell.
+		path.back().setExactLayerCoordinates(FIFE::intPt2doublePt(m_to.getLayerCoordinates()));
+		path.front().setExactLayerCoordinates(m_from.getExactLayerCoordinatesRef());
+		m_route->setPath(path);
+	}
+
+	bool JumpPointSearch::isWalkable(int32_t x, int32_t y) {
+		if (x == m_destCoord.x && y == m_destCoord.y) {
+			return true;
+		}
+		Cell* cell = m_cellCache->getCell(ModelCoordinate(x, y));
+		return cell && cell->getCellType() <= m_blockerThreshold;
+	}
+
+	bool JumpPointSearch::jump(const ModelCoordinate& coord, int32_t dx, int32_t dy, ModelCoordinate& jumpPoint) {
+		int32_t x = coord.x;
+		int32_t y = coord.y;
+		while (true) {
+			x += dx;
+			y += dy;
+			if (!isWalkable(x, y)) {
+				return false;
+			}
+			bool found = x == m_destCoord.x && y == m_destCoord.y;
+			if (!found) {
+				if (dx != 0 && dy != 0) {
+					found = (!isWalkable(x - dx, y) && isWalkable(x - dx, y + dy)) ||
+						(!isWalkable(x, y - dy) && isWalkable(x + dx, y - dy));
+					// a jump point on the straight lines makes this cell a jump point
+					ModelCoordinate tmp;
+					found = found || jump(ModelCoordinate(x, y), dx, 0, tmp) || jump(ModelCoordinate(x, y), 0, dy, tmp);
+				} else if (dx != 0) {
+					found = (!isWalkable(x, y + 1) && isWalkable(x + dx, y + 1)) ||
+						(!isWalkable(x, y - 1) && isWalkable(x + dx, y - 1));
+				} else {
+					found = (!isWalkable(x + 1, y) && isWalkable(x + 1, y + dy)) ||
+						(!isWalkable(x - 1, y) && isWalkable(x - 1, y + dy));
+				}
+			}
+			if (found) {
+				jumpPoint.x = x;
+				jumpPoint.y = y;
+				return true;
+			}
+		}
+	}
+
+	void JumpPointSearch::addJumpPoint(const ModelCoordinate& current, const ModelCoordinate& jumpPoint) {
+		int32_t jumpInt = m_cellCache->convertCoordToInt(jumpPoint);
+		if (m_closed.find(jumpInt) != m_closed.end()) {
+			return;
+		}
+		int32_t currentInt = m_cellCache->convertCoordToInt(current);
+		int32_t distX = ABS(jumpPoint.x - current.x);
+		int32_t distY = ABS(jumpPoint.y - current.y);
+		int32_t diagonal = std::min(distX, distY);
+		int32_t straight = std::max(distX, distY) - diagonal;
+		double gCost = m_gCosts[currentInt] + straight * m_straightCost + diagonal * m_diagonalCost;
+		double hCost = m_cellCache->getLayer()->getCellGrid()->getHeuristicCost(jumpPoint, m_destCoord);
+
+		std::map<int32_t, double>::iterator it = m_gCosts.find(jumpInt);
+		if (it == m_gCosts.end()) {
+			m_sortedfrontier.pushElement(PriorityQueue<int32_t, double>::value_type(jumpInt, gCost + hCost));
+			m_gCosts.insert(std::make_pair(jumpInt, gCost));
+			m_sf[jumpInt] = currentInt;
+		} else if (gCost < it->second) {
+			m_sortedfrontier.changeElementPriority(jumpInt, gCost + hCost);
+			it->second = gCost;
+			m_sf[jumpInt] = currentInt;
+		}
+	}
+}
@@ -0,0 +1,142 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_PATHFINDER_JUMPPOINTSEARCH
+#define FIFE_PATHFINDER_JUMPPOINTSEARCH
+
+// Standard C++ library includes
+#include <map>
+#include <set>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "model/structures/location.h"
+#include "util/structures/priorityqueue.h"
+
+#include "routepathersearch.h"
+
+namespace FIFE {
+
+	class CellCache;
+	class Route;
+
+	/** JumpPointSearch using A* with jump points.
+	 *
+	 * Straight and diagonal lines of cells are skipped until a cell with a forced neighbor
+	 * is reached, so only a small part of the cells is expanded. Requires a square grid with
+	 * diagonals and uniform costs.
+	 */
+	class JumpPointSearch: public RoutePatherSearch {
+	public:
+		/** Constructor
+		 *
+		 * @param route A pointer to the route for which a path should be searched.
+		 * @param sessionId A integer containing the session id for this search.
+		 */
+		JumpPointSearch(Route* route, const int32_t sessionId);
+
+		/** Destructor
+		 */
+		~JumpPointSearch();
+
+		/** Updates the search.
+		 *
+		 * Each update checks all jump points of the last checked coordinate and selects the most favorable.
+		 */
+		void updateSearch();
+
+		/** Calculates final path.
+		 *
+		 * If the search is successful then the jump points are connected to a path.
+		 */
+		void calcPath();
+
+	private:
+		/** Checks if the coordinate can be walked on.
+		 *
+		 * @param x The x coordinate.
+		 * @param y The y coordinate.
+		 * @return True if the cell exists and is not blocked or is the destination, otherwise false.
+		 */
+		bool isWalkable(int32_t x, int32_t y);
+
+		/** Searches the next jump point in one direction.
+		 *
+		 * @param coord The coordinate to start from.
+		 * @param dx The x direction, -1, 0 or 1.
+		 * @param dy The y direction, -1, 0 or 1.
+		 * @param jumpPoint Receives the coordinate of the jump point.
+		 * @return True if a jump point was found, otherwise false.
+		 */
+		bool jump(const ModelCoordinate& coord, int32_t dx, int32_t dy, ModelCoordinate& jumpPoint);
+
+		/** Adds the jump point to the frontier or updates it, in case the new costs are lower.
+		 *
+		 * @param current The coordinate of the current node.
+		 * @param jumpPoint The coordinate of the jump point.
+		 */
+		void addJumpPoint(const ModelCoordinate& current, const ModelCoordinate& jumpPoint);
+
+		//! A location object representing where the search started.
+		Location m_to;
+
+		//! A location object representing where the search ended.
+		Location m_from;
+
+		//! A pointer to the CellCache.
+		CellCache* m_cellCache;
+
+		//! The destination coordinate.
+		ModelCoordinate m_destCoord;
+
+		//! The start coordinate as an int32_t.
+		int32_t m_startCoordInt;
+
+		//! The destination coordinate as an int32_t.
+		int32_t m_destCoordInt;
+
+		//! Cell types above this value are handled as blocker.
+		uint8_t m_blockerThreshold;
+
+		//! Costs for a straight step.
+		double m_straightCost;
+
+		//! Costs for a diagonal step.
+		double m_diagonalCost;
+
+		//! The search frontier, holds the parent of each jump point.
+		std::map<int32_t, int32_t> m_sf;
+
+		//! A table to hold the costs.
+		std::map<int32_t, double> m_gCosts;
+
+		//! Already checked jump points.
+		std::set<int32_t> m_closed;
+
+		//! Priority queue to hold nodes on the sf in order.
+		PriorityQueue<int32_t, double> m_sortedfrontier;
+	};
+}
+#endif
@@ -32,6 +32,7 @@
 #include "model/structures/instance.h"
 #include "model/structures/layer.h"
 #include "model/structures/cellcache.h"
+#include "model/structures/clustergraph.h"
 #include "util/math/angles.h"
 #include "pathfinder/route.h"
 
@@ -39,6 +40,9 @@
 #include "routepathersearch.h"
 #include "singlelayersearch.h"
 #include "multilayersearch.h"
+#include "hierarchicalsearch.h"
+#include "flowfieldsearch.h"
+#include "jumppointsearch.h"
 
 namespace FIFE {
 
@@ -242,11 +246,26 @@ namespace FIFE {
 		}
 
 		RoutePatherSearch* newSearch;
+		SearchModeInfo usedMode = SEARCH_MODE_ASTAR;
 		if (multilayer) {
 			newSearch = new MultiLayerSearch(route, sessionId);
 		} else {
-			newSearch = new SingleLayerSearch(route, sessionId);
+			SearchModeInfo mode = getSearchMode(route);
+			if (mode == SEARCH_MODE_HIERARCHICAL && useHierarchicalSearch(route)) {
+				newSearch = new HierarchicalSearch(route, sessionId);
+				usedMode = SEARCH_MODE_HIERARCHICAL;
+			} else if (mode == SEARCH_MODE_FLOW_FIELD) {
+				newSearch = new FlowFieldSearch(route, sessionId);
+				usedMode = SEARCH_MODE_FLOW_FIELD;
+			} else if (mode == SEARCH_MODE_JUMP_POINT && useJumpPointSearch(route)) {
+				newSearch = new JumpPointSearch(route, sessionId);
+				usedMode = SEARCH_MODE_JUMP_POINT;
+			} else {
+				newSearch = new SingleLayerSearch(route, sessionId);
+			}
 		}
+		route->setUsedSearchMode(usedMode);
+		route->setExpandedNodes(0);
 		if (immediate) {
 			while (newSearch->getSearchStatus() != RoutePatherSearch::search_status_complete) {
 				newSearch->updateSearch();
@@ -438,6 +457,62 @@ namespace FIFE {
 		return m_maxTicks;
 	}
 
+	void RoutePather::setSearchMode(SearchModeInfo mode) {
+		if (mode == SEARCH_MODE_DEFAULT) {
+			mode = SEARCH_MODE_ASTAR;
+		}
+		m_searchMode = mode;
+	}
+
+	SearchModeInfo RoutePather::getSearchMode() {
+		return m_searchMode;
+	}
+
+	SearchModeInfo RoutePather::getSearchMode(Route* route) {
+		SearchModeInfo mode = route->getSearchMode();
+		if (mode == SEARCH_MODE_DEFAULT) {
+			mode = route->getStartNode().getLayer()->getCellCache()->getSearchMode();
+		}
+		if (mode == SEARCH_MODE_DEFAULT) {
+			mode = m_searchMode;
+		}
+		// only A* knows about areas, z-steps and multi cell objects
+		if (route->isMultiCell() || route->isAreaLimited() || route->getZStepRange() != -1) {
+			return SEARCH_MODE_ASTAR;
+		}
+		return mode;
+	}
+
+	bool RoutePather::useJumpPointSearch(Route* route) {
+		// jump points require a square grid with diagonals and uniform costs
+		Layer* layer = route->getStartNode().getLayer();
+		CellCache* cache = layer->getCellCache();
+		if (layer->getPathingStrategy() != CELL_EDGES_AND_DIAGONALS ||
+			layer->getCellGrid()->getType() != "square" || cache->getMaxNeighborZ() != -1) {
+			return false;
+		}
+		if (!cache->isDefaultCost()) {
+			return false;
+		}
+		return route->getCostId() == "" || cache->getCostCells(route->getCostId()).empty();
+	}
+
+	bool RoutePather::useHierarchicalSearch(Route* route) {
+		// the cluster graph knows nothing about special costs
+		if (route->getCostId() != "") {
+			return false;
+		}
+		// for short routes the plain search is faster
+		const Location& start = route->getStartNode();
+		const Location& end = route->getEndNode();
+		CellCache* cache = start.getLayer()->getCellCache();
+		ClusterGraph* graph = cache->getClusterGraph();
+		graph->update();
+		uint32_t startCluster = graph->getClusterId(cache->convertCoordToInt(start.getLayerCoordinates()));
+		uint32_t endCluster = graph->getClusterId(cache->convertCoordToInt(end.getLayerCoordinates()));
+		return graph->getClusterDistance(startCluster, endCluster) > 1;
+	}
+
 	std::string RoutePather::getName() const {
 		return "RoutePather";
 	}
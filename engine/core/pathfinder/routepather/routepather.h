@@ -47,7 +47,7 @@ namespace FIFE {
 		/** Constructor.
 		 *
 		 */
-		RoutePather() : m_nextFreeSessionId(0), m_maxTicks(1000) {
+		RoutePather() : m_nextFreeSessionId(0), m_maxTicks(1000), m_searchMode(SEARCH_MODE_ASTAR) {
 		}
 
 		/** Creates a route between the start and end location that needs be solved.
@@ -107,6 +107,16 @@ namespace FIFE {
 		 */
 		int32_t getMaxTicks();
 
+		/** Sets the search mode that is used for routes which do not define their own.
+		 * @param mode A SearchModeInfo which holds the mode. default is SEARCH_MODE_ASTAR
+		 */
+		void setSearchMode(SearchModeInfo mode);
+
+		/** Returns the search mode that is used for routes which do not define their own.
+		 * @return A SearchModeInfo which holds the mode. default is SEARCH_MODE_ASTAR
+		 */
+		SearchModeInfo getSearchMode();
+
 		/** Returns name of the pathfinder.
 		 * @return A string that contains the name of the pathfinder.
 		 */
@@ -160,6 +170,24 @@ namespace FIFE {
 		 */
 		bool invalidateSessionId(const int32_t sessionId);
 
+		/** Returns the search mode that can be used for the route.
+		 * @param route A pointer to the route.
+		 * @return A SearchModeInfo which holds the mode, never SEARCH_MODE_DEFAULT.
+		 */
+		SearchModeInfo getSearchMode(Route* route);
+
+		/** Checks if the route can be solved with a jump point search.
+		 * @param route A pointer to the route.
+		 * @return True if the jump point search can be used, otherwise false.
+		 */
+		bool useJumpPointSearch(Route* route);
+
+		/** Checks if the route should be solved with a hierarchical search.
+		 * @param route A pointer to the route.
+		 * @return True if the hierarchical search should be used, otherwise false.
+		 */
+		bool useHierarchicalSearch(Route* route);
+
 		//! A map of currently running sessions (searches).
 		SessionQueue m_sessions;
 
@@ -171,6 +199,9 @@ namespace FIFE {
 
 		//! The maximum number of ticks allowed.
 		int32_t m_maxTicks;
+
+		//! The default search mode.
+		SearchModeInfo m_searchMode;
 	};
 }
 #endif
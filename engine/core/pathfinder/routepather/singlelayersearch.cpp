@@ -66,6 +66,7 @@ namespace FIFE {
 
 		PriorityQueue<int32_t, double>::value_type topvalue = m_sortedfrontier.getPriorityElement();
 		m_sortedfrontier.popElement();
+		m_route->setExpandedNodes(m_route->getExpandedNodes() + 1);
 		m_next = topvalue.first;
 		m_spt[m_next] = m_sf[m_next];
 		// found destination
@@ -0,0 +1,161 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <exception>
+
+// 3rd party library includes
+#include <SDL.h>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/log/logger.h"
+
+#include "workerpool.h"
+
+namespace FIFE {
+	static Logger _log(LM_UTIL);
+
+	WorkerPool::WorkerPool(uint32_t threads):
+		m_mutex(SDL_CreateMutex()),
+		m_wakeup(SDL_CreateCond()),
+		m_stop(false) {
+		if (threads == 0) {
+			int32_t cores = SDL_GetCPUCount();
+			threads = cores > 1 ? cores - 1 : 0;
+		}
+		for (uint32_t i = 0; i < threads; ++i) {
+			SDL_Thread* thread = SDL_CreateThread(workerMain, "FIFE worker", this);
+			if (!thread) {
+				FL_WARN(_log, LMsg("Could not create worker thread: ") << SDL_GetError());
+				break;
+			}
+			m_threads.push_back(thread);
+		}
+		FL_LOG(_log, LMsg("Worker pool started with ") << m_threads.size() << " threads");
+	}
+
+	WorkerPool::~WorkerPool() {
+		SDL_LockMutex(m_mutex);
+		m_stop = true;
+		SDL_CondBroadcast(m_wakeup);
+		SDL_UnlockMutex(m_mutex);
+		for (std::vector<SDL_Thread*>::iterator it = m_threads.begin(); it != m_threads.end(); ++it) {
+			SDL_WaitThread(*it, NULL);
+		}
+		SDL_DestroyCond(m_wakeup);
+		SDL_DestroyMutex(m_mutex);
+	}
+
+	uint32_t WorkerPool::getThreadCount() const {
+		return m_threads.size();
+	}
+
+	void WorkerPool::execute(const std::vector<WorkerTask*>& tasks) {
+		if (m_threads.empty() || tasks.size() < 2) {
+			for (std::vector<WorkerTask*>::const_iterator it = tasks.begin(); it != tasks.end(); ++it) {
+				runTask(*it);
+			}
+			return;
+		}
+
+		Batch batch;
+		batch.remaining = tasks.size();
+		batch.done = SDL_CreateCond();
+
+		SDL_LockMutex(m_mutex);
+		for (std::vector<WorkerTask*>::const_iterator it = tasks.begin(); it != tasks.end(); ++it) {
+			Job job = { *it, &batch };
+			m_jobs.push_back(job);
+		}
+		SDL_CondBroadcast(m_wakeup);
+
+		// help with the own tasks until they are taken, then wait for the rest
+		while (batch.remaining > 0) {
+			std::deque<Job>::iterator it = m_jobs.begin();
+			while (it != m_jobs.end() && it->batch != &batch) {
+				++it;
+			}
+			if (it == m_jobs.end()) {
+				SDL_CondWait(batch.done, m_mutex);
+				continue;
+			}
+			WorkerTask* task = it->task;
+			m_jobs.erase(it);
+			SDL_UnlockMutex(m_mutex);
+			runTask(task);
+			SDL_LockMutex(m_mutex);
+			--batch.remaining;
+		}
+		SDL_UnlockMutex(m_mutex);
+		SDL_DestroyCond(batch.done);
+	}
+
+	void WorkerPool::submit(WorkerTask* task) {
+		if (m_threads.empty()) {
+			runTask(task);
+			return;
+		}
+
+		SDL_LockMutex(m_mutex);
+		Job job = { task, 0 };
+		m_jobs.push_back(job);
+		SDL_CondSignal(m_wakeup);
+		SDL_UnlockMutex(m_mutex);
+	}
+
+	int32_t WorkerPool::workerMain(void* data) {
+		WorkerPool* pool = static_cast<WorkerPool*>(data);
+		SDL_LockMutex(pool->m_mutex);
+		while (true) {
+			while (!pool->m_stop && pool->m_jobs.empty()) {
+				SDL_CondWait(pool->m_wakeup, pool->m_mutex);
+			}
+			if (pool->m_jobs.empty()) {
+				break;
+			}
+			Job job = pool->m_jobs.front();
+			pool->m_jobs.pop_front();
+			SDL_UnlockMutex(pool->m_mutex);
+			runTask(job.task);
+			SDL_LockMutex(pool->m_mutex);
+			if (job.batch && --job.batch->remaining == 0) {
+				SDL_CondSignal(job.batch->done);
+			}
+		}
+		SDL_UnlockMutex(pool->m_mutex);
+		return 0;
+	}
+
+	void WorkerPool::runTask(WorkerTask* task) {
+		try {
+			task->run();
+		} catch (std::exception& e) {
+			FL_ERR(_log, LMsg("Worker task failed: ") << e.what());
+			task->failed(e.what());
+		} catch (...) {
+			FL_ERR(_log, LMsg("Worker task failed with an unknown exception"));
+			task->failed("unknown exception");
+		}
+	}
+}//FIFE
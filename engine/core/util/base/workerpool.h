@@ -0,0 +1,139 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_WORKERPOOL_H
+#define FIFE_WORKERPOOL_H
+
+// Standard C++ library includes
+#include <deque>
+#include <string>
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/base/fife_stdint.h"
+
+#include "singleton.h"
+
+struct SDL_Thread;
+struct SDL_mutex;
+struct SDL_cond;
+
+namespace FIFE {
+
+	/** Interface for a unit of work that can be executed by the WorkerPool.
+	 */
+	class WorkerTask {
+	public:
+		virtual ~WorkerTask() {}
+
+		/** Does the work. Called from a worker thread or the calling thread.
+		 */
+		virtual void run() = 0;
+
+		/** Called by the pool if run() threw an exception.
+		 *
+		 * @param error Message of the exception.
+		 */
+		virtual void failed(const std::string& error) {}
+	};
+
+	/** A fixed number of worker threads that execute WorkerTasks.
+	 *
+	 * Tasks must not touch the script bindings, the render backend or
+	 * shared resource pointers, those are not thread safe.
+	 */
+	class WorkerPool : public DynamicSingleton<WorkerPool> {
+	public:
+		/** Constructor.
+		 *
+		 * @param threads Number of worker threads, 0 uses the number of cpu cores minus one.
+		 */
+		WorkerPool(uint32_t threads = 0);
+
+		/** Destructor. Waits for the running tasks and stops the threads.
+		 */
+		virtual ~WorkerPool();
+
+		/** Returns the number of worker threads.
+		 */
+		uint32_t getThreadCount() const;
+
+		/** Executes the tasks and returns when all of them are finished.
+		 *
+		 * The calling thread works on the tasks too. If the pool has no
+		 * threads the tasks are executed in order by the calling thread.
+		 * The tasks are not deleted.
+		 *
+		 * @param tasks The tasks to execute.
+		 */
+		void execute(const std::vector<WorkerTask*>& tasks);
+
+		/** Queues the task and returns immediately.
+		 *
+		 * The task runs on one of the worker threads, if the pool has no
+		 * threads it is executed by the calling thread right away.
+		 * The task is not deleted, it has to stay alive until it has run.
+		 *
+		 * @param task The task to execute.
+		 */
+		void submit(WorkerTask* task);
+
+	private:
+		struct Batch {
+			uint32_t remaining;
+			SDL_cond* done;
+		};
+
+		struct Job {
+			WorkerTask* task;
+			//! 0 for submitted tasks.
+			Batch* batch;
+		};
+
+		/** Entry point of the worker threads.
+		 */
+		static int32_t workerMain(void* data);
+
+		/** Runs the task and catches everything it throws.
+		 * The task is told about the failure by WorkerTask::failed.
+		 */
+		static void runTask(WorkerTask* task);
+
+		//! Worker threads.
+		std::vector<SDL_Thread*> m_threads;
+		//! Queued jobs.
+		std::deque<Job> m_jobs;
+		//! Protects the queue and the batches.
+		SDL_mutex* m_mutex;
+		//! Signaled when a job is queued or the pool stops.
+		SDL_cond* m_wakeup;
+		//! Set when the threads should stop.
+		bool m_stop;
+	};
+
+}//FIFE
+
+#endif
@@ -31,6 +31,7 @@
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
+#include "util/base/fife_stdint.h"
 #include "util/base/sharedptr.h"
 
 namespace FIFE {
@@ -59,6 +60,7 @@ namespace FIFE {
 		: m_name(name),
 		  m_loader(loader),
 		  m_state(RES_NOT_LOADED),
+		  m_lastUsed(0),
 		  m_handle(m_curhandle++) { }
 
 		virtual ~IResource() { }
@@ -67,9 +69,17 @@ namespace FIFE {
 
 		ResourceHandle getHandle() { return m_handle; }
 
+		IResourceLoader* getLoader() { return m_loader; }
+
 		virtual ResourceState getState() { return m_state; }
 		virtual void setState(const ResourceState& state) { m_state = state; }
 
+		/** Returns the time the resource was used last, 0 if it was never used.
+		 * The resource managers evict the least recently used resources first.
+		 */
+		uint32_t getLastUsed() const { return m_lastUsed; }
+		void setLastUsed(uint32_t time) { m_lastUsed = time; }
+
 		virtual size_t getSize() = 0;
 
 		virtual void load() = 0;
@@ -79,6 +89,7 @@ namespace FIFE {
 		std::string m_name;
 		IResourceLoader* m_loader;
 		ResourceState m_state;
+		uint32_t m_lastUsed;
 
 	private:
 		ResourceHandle m_handle;
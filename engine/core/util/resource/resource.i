@@ -63,6 +63,9 @@ namespace FIFE {
 		virtual ResourceState getState();
 		virtual void setState(const ResourceState& state);
 
+		uint32_t getLastUsed() const;
+		void setLastUsed(uint32_t time);
+
 		virtual size_t getSize() = 0;
 
 		virtual void load() = 0;
@@ -118,4 +118,5 @@ namespace FIFE {
 
 namespace std {
 	%template(FifePointVector) vector<FIFE::Point>;
+	%template(RectVector) vector<FIFE::Rect>;
 }
@@ -0,0 +1,286 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <algorithm>
+#include <cmath>
+#include <fstream>
+
+// 3rd party library includes
+#include <SDL.h>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/base/exception.h"
+#include "util/log/logger.h"
+
+#include "profiler.h"
+
+namespace FIFE {
+	static Logger _log(LM_UTIL);
+
+	Profiler* Profiler::m_active = 0;
+
+	Profiler::Profiler(uint32_t history):
+		m_enabled(false),
+		m_history(std::max(history, static_cast<uint32_t>(1))),
+		m_frames(0),
+		m_frequency(SDL_GetPerformanceFrequency()),
+		m_origin(0) {
+		m_origin = now();
+	}
+
+	Profiler::~Profiler() {
+		if (m_active == this) {
+			m_active = 0;
+		}
+		reset();
+	}
+
+	void Profiler::setEnabled(bool enabled) {
+		m_enabled = enabled;
+		m_stack.clear();
+		m_events.clear();
+		m_active = m_enabled ? this : 0;
+	}
+
+	bool Profiler::isEnabled() const {
+		return m_enabled;
+	}
+
+	void Profiler::setHistorySize(uint32_t frames) {
+		reset();
+		m_history = std::max(frames, static_cast<uint32_t>(1));
+	}
+
+	uint32_t Profiler::getHistorySize() const {
+		return m_history;
+	}
+
+	void Profiler::beginFrame() {
+		if (!m_enabled) {
+			return;
+		}
+		m_stack.clear();
+		m_events.clear();
+		beginZone("Frame");
+	}
+
+	void Profiler::endFrame() {
+		if (!m_enabled) {
+			return;
+		}
+		while (!m_stack.empty()) {
+			endZone();
+		}
+
+		std::map<std::string, Zone*>::iterator it = m_zones.begin();
+		for (; it != m_zones.end(); ++it) {
+			Zone* zone = it->second;
+			zone->lastTime = zone->frameTime;
+			zone->lastCalls = zone->frameCalls;
+			if (zone->frameCalls > 0) {
+				zone->history[zone->next] = zone->frameTime;
+				zone->next = (zone->next + 1) % m_history;
+				zone->filled = std::min(zone->filled + 1, m_history);
+			}
+			zone->frameTime = 0;
+			zone->frameCalls = 0;
+		}
+
+		m_frameEvents.push_back(std::vector<Event>());
+		m_frameEvents.back().swap(m_events);
+		while (m_frameEvents.size() > m_history) {
+			m_frameEvents.pop_front();
+		}
+		++m_frames;
+	}
+
+	void Profiler::beginZone(const std::string& name) {
+		if (!m_enabled) {
+			return;
+		}
+		Zone* zone;
+		std::map<std::string, Zone*>::iterator it = m_zones.find(name);
+		if (it != m_zones.end()) {
+			zone = it->second;
+		} else {
+			zone = new Zone();
+			zone->name = name;
+			if (!m_stack.empty()) {
+				zone->parent = m_stack.back().zone->name;
+			}
+			zone->history.resize(m_history, 0);
+			zone->next = 0;
+			zone->filled = 0;
+			zone->frameTime = 0;
+			zone->frameCalls = 0;
+			zone->lastTime = 0;
+			zone->lastCalls = 0;
+			m_zones.insert(std::pair<std::string, Zone*>(name, zone));
+		}
+		OpenZone open = { zone, now() };
+		m_stack.push_back(open);
+	}
+
+	void Profiler::endZone() {
+		if (m_stack.empty()) {
+			return;
+		}
+		OpenZone open = m_stack.back();
+		m_stack.pop_back();
+		uint64_t duration = now() - open.start;
+		open.zone->frameTime += duration;
+		++open.zone->frameCalls;
+		Event event = { open.zone, open.start - m_origin, duration };
+		m_events.push_back(event);
+	}
+
+	std::vector<std::string> Profiler::getZoneNames() const {
+		std::vector<std::string> names;
+		std::map<std::string, Zone*>::const_iterator it = m_zones.begin();
+		for (; it != m_zones.end(); ++it) {
+			names.push_back(it->first);
+		}
+		return names;
+	}
+
+	std::string Profiler::getZoneParent(const std::string& name) const {
+		const Zone* zone = findZone(name);
+		return zone ? zone->parent : std::string();
+	}
+
+	double Profiler::getLastTime(const std::string& name) const {
+		const Zone* zone = findZone(name);
+		return zone ? zone->lastTime / 1000.0 : 0.0;
+	}
+
+	double Profiler::getMinTime(const std::string& name) const {
+		const Zone* zone = findZone(name);
+		if (!zone || zone->filled == 0) {
+			return 0.0;
+		}
+		uint64_t minTime = zone->history[0];
+		for (uint32_t i = 1; i < zone->filled; ++i) {
+			minTime = std::min(minTime, zone->history[i]);
+		}
+		return minTime / 1000.0;
+	}
+
+	double Profiler::getAverageTime(const std::string& name) const {
+		const Zone* zone = findZone(name);
+		if (!zone || zone->filled == 0) {
+			return 0.0;
+		}
+		uint64_t sum = 0;
+		for (uint32_t i = 0; i < zone->filled; ++i) {
+			sum += zone->history[i];
+		}
+		return sum / 1000.0 / zone->filled;
+	}
+
+	double Profiler::getP99Time(const std::string& name) const {
+		const Zone* zone = findZone(name);
+		if (!zone || zone->filled == 0) {
+			return 0.0;
+		}
+		std::vector<uint64_t> times(zone->history.begin(), zone->history.begin() + zone->filled);
+		uint32_t index = static_cast<uint32_t>(ceil(times.size() * 0.99)) - 1;
+		std::nth_element(times.begin(), times.begin() + index, times.end());
+		return times[index] / 1000.0;
+	}
+
+	uint32_t Profiler::getCallCount(const std::string& name) const {
+		const Zone* zone = findZone(name);
+		return zone ? zone->lastCalls : 0;
+	}
+
+	uint32_t Profiler::getFrameCount() const {
+		return m_frames;
+	}
+
+	void Profiler::reset() {
+		std::map<std::string, Zone*>::iterator it = m_zones.begin();
+		for (; it != m_zones.end(); ++it) {
+			delete it->second;
+		}
+		m_zones.clear();
+		m_stack.clear();
+		m_events.clear();
+		m_frameEvents.clear();
+		m_frames = 0;
+	}
+
+	void Profiler::dumpChromeTrace(const std::string& filename) const {
+		std::ofstream file(filename.c_str(), std::ios::out | std::ios::trunc);
+		if (!file) {
+			throw CannotOpenFile(filename);
+		}
+		file << "{\"traceEvents\":[";
+		bool first = true;
+		std::deque<std::vector<Event> >::const_iterator frame = m_frameEvents.begin();
+		for (; frame != m_frameEvents.end(); ++frame) {
+			std::vector<Event>::const_iterator event = frame->begin();
+			for (; event != frame->end(); ++event) {
+				std::string name;
+				const std::string& zoneName = event->zone->name;
+				for (std::string::const_iterator c = zoneName.begin(); c != zoneName.end(); ++c) {
+					if (*c == '"' || *c == '\\') {
+						name += '\\';
+					}
+					name += *c;
+				}
+				file << (first ? "\n" : ",\n");
+				file << "{\"name\":\"" << name << "\",\"cat\":\"fife\",\"ph\":\"X\",\"pid\":1,\"tid\":1,"
+					<< "\"ts\":" << event->start << ",\"dur\":" << event->duration << "}";
+				first = false;
+			}
+		}
+		file << "\n],\"displayTimeUnit\":\"ms\"}\n";
+		file.close();
+		FL_LOG(_log, LMsg("Profiler trace written to ") << filename);
+	}
+
+	void Profiler::printStatistics() const {
+		FL_LOG(_log, LMsg("Profiler statistics over the last ") << m_history << " frames (ms):");
+		std::map<std::string, Zone*>::const_iterator it = m_zones.begin();
+		for (; it != m_zones.end(); ++it) {
+			const std::string& name = it->first;
+			FL_LOG(_log, LMsg("  ") << name
+				<< " min: " << getMinTime(name)
+				<< " avg: " << getAverageTime(name)
+				<< " p99: " << getP99Time(name)
+				<< " calls: " << getCallCount(name));
+		}
+	}
+
+	uint64_t Profiler::now() const {
+		uint64_t counter = SDL_GetPerformanceCounter();
+		return (counter / m_frequency) * 1000000 + (counter % m_frequency) * 1000000 / m_frequency;
+	}
+
+	const Profiler::Zone* Profiler::findZone(const std::string& name) const {
+		std::map<std::string, Zone*>::const_iterator it = m_zones.find(name);
+		return it != m_zones.end() ? it->second : 0;
+	}
+}//FIFE
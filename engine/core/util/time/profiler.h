@@ -0,0 +1,245 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_PROFILER_H
+#define FIFE_PROFILER_H
+
+// Standard C++ library includes
+#include <deque>
+#include <map>
+#include <string>
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/base/singleton.h"
+#include "util/base/fife_stdint.h"
+
+namespace FIFE {
+
+	/** Frame profiler
+	 *
+	 * Measures named zones of code with a high resolution clock. Zones can be
+	 * nested, the parent of a zone is the zone that was open when it was first
+	 * entered. For every zone the summed time of each frame is kept in a ring
+	 * buffer, so min, average and 99th percentile over the last frames can be
+	 * queried. The events of the last frames can be written to a JSON file in
+	 * the Chrome trace event format (chrome://tracing or Perfetto).
+	 *
+	 * The profiler is disabled by default, then a zone costs one pointer check.
+	 *
+	 * @see ScopedProfile
+	 */
+	class Profiler : public DynamicSingleton<Profiler> {
+	public:
+		/** Constructor.
+		 *
+		 * @param history Number of frames that are kept for the statistics and the trace.
+		 */
+		Profiler(uint32_t history = 120);
+
+		/** Destructor.
+		 */
+		virtual ~Profiler();
+
+		/** Enables or disables the profiler.
+		 */
+		void setEnabled(bool enabled);
+
+		/** Returns true if the profiler is enabled.
+		 */
+		bool isEnabled() const;
+
+		/** Sets the number of frames that are kept. Resets the collected data.
+		 */
+		void setHistorySize(uint32_t frames);
+
+		/** Returns the number of frames that are kept.
+		 */
+		uint32_t getHistorySize() const;
+
+		/** Starts a new frame, called by the engine at the begin of pump.
+		 */
+		void beginFrame();
+
+		/** Ends the current frame, called by the engine at the end of pump.
+		 */
+		void endFrame();
+
+		/** Opens a zone, it has to be closed with endZone.
+		 */
+		void beginZone(const std::string& name);
+
+		/** Closes the last opened zone.
+		 */
+		void endZone();
+
+		/** Returns the names of all zones that were measured.
+		 */
+		std::vector<std::string> getZoneNames() const;
+
+		/** Returns the name of the parent zone or an empty string for a top level zone.
+		 */
+		std::string getZoneParent(const std::string& name) const;
+
+		/** Returns the time of the zone in the last frame, in milliseconds.
+		 */
+		double getLastTime(const std::string& name) const;
+
+		/** Returns the minimal frame time of the zone over the kept frames, in milliseconds.
+		 */
+		double getMinTime(const std::string& name) const;
+
+		/** Returns the average frame time of the zone over the kept frames, in milliseconds.
+		 */
+		double getAverageTime(const std::string& name) const;
+
+		/** Returns the 99th percentile of the frame times of the zone, in milliseconds.
+		 */
+		double getP99Time(const std::string& name) const;
+
+		/** Returns how often the zone was entered in the last frame.
+		 */
+		uint32_t getCallCount(const std::string& name) const;
+
+		/** Returns the number of profiled frames.
+		 */
+		uint32_t getFrameCount() const;
+
+		/** Removes all collected data.
+		 */
+		void reset();
+
+		/** Writes the events of the kept frames as Chrome trace JSON.
+		 *
+		 * @param filename The file to write.
+		 */
+		void dumpChromeTrace(const std::string& filename) const;
+
+		/** Prints the statistics of all zones to the log.
+		 */
+		void printStatistics() const;
+
+		/** Returns the profiler if it exists and is enabled, otherwise 0.
+		 */
+		static Profiler* getActive() { return m_active; }
+
+	private:
+		struct Zone {
+			std::string name;
+			std::string parent;
+			// frame times in microseconds, ring buffer
+			std::vector<uint64_t> history;
+			uint32_t next;
+			uint32_t filled;
+			uint64_t frameTime;
+			uint32_t frameCalls;
+			uint64_t lastTime;
+			uint32_t lastCalls;
+		};
+
+		struct Event {
+			Zone* zone;
+			uint64_t start;
+			uint64_t duration;
+		};
+
+		struct OpenZone {
+			Zone* zone;
+			uint64_t start;
+		};
+
+		/** Returns the current time in microseconds.
+		 */
+		uint64_t now() const;
+
+		/** Returns the zone or 0.
+		 */
+		const Zone* findZone(const std::string& name) const;
+
+		//! The enabled profiler.
+		static Profiler* m_active;
+
+		//! Is the profiler enabled.
+		bool m_enabled;
+		//! Number of kept frames.
+		uint32_t m_history;
+		//! Number of profiled frames.
+		uint32_t m_frames;
+		//! Ticks per second of the performance counter.
+		uint64_t m_frequency;
+		//! Counter value at creation, trace timestamps are relative to it.
+		uint64_t m_origin;
+		//! All zones by name.
+		std::map<std::string, Zone*> m_zones;
+		//! Currently open zones.
+		std::vector<OpenZone> m_stack;
+		//! Events of the current frame.
+		std::vector<Event> m_events;
+		//! Events of the kept frames.
+		std::deque<std::vector<Event> > m_frameEvents;
+	};
+
+	/** Measures a zone for the lifetime of the object.
+	 *
+	 * @code
+	 * void Map::update() {
+	 *     ScopedProfile zone("Map::update");
+	 *     ...
+	 * }
+	 * @endcode
+	 */
+	class ScopedProfile {
+	public:
+		ScopedProfile(const char* name):
+			m_profiler(Profiler::getActive()) {
+			if (m_profiler) {
+				m_profiler->beginZone(name);
+			}
+		}
+
+		ScopedProfile(const std::string& name):
+			m_profiler(Profiler::getActive()) {
+			if (m_profiler) {
+				m_profiler->beginZone(name);
+			}
+		}
+
+		~ScopedProfile() {
+			if (m_profiler) {
+				m_profiler->endZone();
+			}
+		}
+
+	private:
+		Profiler* m_profiler;
+
+		ScopedProfile(const ScopedProfile&);
+		ScopedProfile& operator=(const ScopedProfile&);
+	};
+
+}//FIFE
+
+#endif
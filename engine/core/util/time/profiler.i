@@ -0,0 +1,50 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+%module fife
+%{
+#include "util/time/profiler.h"
+%}
+
+namespace FIFE {
+	class Profiler {
+	public:
+		Profiler(uint32_t history = 120);
+		virtual ~Profiler();
+		void setEnabled(bool enabled);
+		bool isEnabled() const;
+		void setHistorySize(uint32_t frames);
+		uint32_t getHistorySize() const;
+		void beginZone(const std::string& name);
+		void endZone();
+		std::vector<std::string> getZoneNames() const;
+		std::string getZoneParent(const std::string& name) const;
+		double getLastTime(const std::string& name) const;
+		double getMinTime(const std::string& name) const;
+		double getAverageTime(const std::string& name) const;
+		double getP99Time(const std::string& name) const;
+		uint32_t getCallCount(const std::string& name) const;
+		uint32_t getFrameCount() const;
+		void reset();
+		void dumpChromeTrace(const std::string& filename) const;
+		void printStatistics() const;
+	};
+}
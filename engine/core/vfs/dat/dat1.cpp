@@ -89,7 +89,17 @@ namespace FIFE {
 
 	RawData* DAT1::open(const std::string& file) const {
 		const RawDataDAT1::s_info& info = getInfo(file);
-		return new RawData(new RawDataDAT1(getVFS(), m_datpath, info));
+		if (info.type != 0x40) { // not compressed
+			return new RawData(new RawDataDAT1(getVFS(), m_datpath, info));
+		}
+
+		RawData* cached = getVFS()->openCachedEntry(this, file);
+		if (cached) {
+			return cached;
+		}
+		RawDataDAT1* source = new RawDataDAT1(getVFS(), m_datpath, info);
+		getVFS()->cacheEntry(this, file, source->getData(), source->getSize());
+		return new RawData(source);
 	}
 
 	bool DAT1::fileExists(const std::string& name) const {
@@ -22,6 +22,7 @@
 // Standard C++ library includes
 
 // 3rd party library includes
+#include <SDL.h>
 #include <boost/bind.hpp>
 
 // FIFE includes
@@ -30,6 +31,7 @@
 // Second block: files included from the same folder
 #include "vfs/raw/rawdata.h"
 #include "util/base/exception.h"
+#include "util/base/mutexlock.h"
 #include "util/log/logger.h"
 
 #include "dat2.h"
@@ -41,7 +43,7 @@ namespace FIFE {
 	static Logger _log(LM_FO_LOADERS);
 
 	DAT2::DAT2(VFS* vfs, const std::string& file)
-		: VFSSource(vfs), m_datpath(file), m_data(vfs->open(file)), m_filelist() {
+		: VFSSource(vfs), m_datpath(file), m_data(vfs->open(file)), m_filelist(), m_mutex(SDL_CreateMutex()) {
 
 		FL_LOG(_log, LMsg("MFFalloutDAT2")
 			<< "loading: " << file
@@ -71,8 +73,16 @@ namespace FIFE {
 		m_timer.start();
 	}
 
+	DAT2::~DAT2() {
+		SDL_DestroyMutex(m_mutex);
+	}
+
 	void DAT2::readFileEntry() const {
-		assert( m_filecount != 0);
+		MutexLock lock(m_mutex);
+		// another thread may have read the rest in the meantime
+		if (m_filecount == 0) {
+			return;
+		}
 
 		// Load more items per call,
 		// otherwise it takes _ages_ until everything is in.
@@ -109,7 +119,17 @@ namespace FIFE {
 
 	RawData* DAT2::open(const std::string& file) const {
 		const RawDataDAT2::s_info& info = getInfo(file);
-		return new RawData(new RawDataDAT2(getVFS(), m_datpath, info));
+		if (info.type != 1) { // not compressed
+			return new RawData(new RawDataDAT2(getVFS(), m_datpath, info));
+		}
+
+		RawData* cached = getVFS()->openCachedEntry(this, file);
+		if (cached) {
+			return cached;
+		}
+		RawDataDAT2* source = new RawDataDAT2(getVFS(), m_datpath, info);
+		getVFS()->cacheEntry(this, file, source->getData(), source->getSize());
+		return new RawData(source);
 	}
 
 	bool DAT2::fileExists(const std::string& name) const {
@@ -131,6 +151,7 @@ namespace FIFE {
 		// by listFiles.
 
 		std::string name = path;
+		MutexLock lock(m_mutex);
 
 		// Normalize the path
 		if (name.find("./") == 0) {
@@ -165,6 +186,7 @@ namespace FIFE {
 	std::set<std::string> DAT2::list(const std::string& pathstr, bool dirs) const {
 		std::set<std::string> list;
 		std::string path = pathstr;
+		MutexLock lock(m_mutex);
 
 		// Force loading the complete file entries
 		// This is a costly operation... right after startup.
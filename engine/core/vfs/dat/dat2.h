@@ -42,6 +42,8 @@
 
 #include "rawdatadat2.h"
 
+struct SDL_mutex;
+
 namespace FIFE {
 	class RawData;
 
@@ -51,7 +53,8 @@ namespace FIFE {
 	 *  in chunks. Behaviour is the same as if it wouldn't do this,
 	 *  but startup is very fast. But a open/fileExists call with a
 	 *  filename that doesn't exist, does trigger completely loading
-	 *  the file entries.
+	 *  the file entries. The lazy loading is guarded by a mutex, so
+	 *  files can be opened from several threads at the same time.
 	 *
 	 * @see MFFalloutDAT1
 	 * @todo @b maybe merge common DAT1/DAT2 code in a common base class
@@ -65,6 +68,7 @@ namespace FIFE {
 			 * @param path A Fallout2 DAT file - e.g. master.DAT
 			 */
 			DAT2(VFS* vfs, const std::string& path);
+			~DAT2();
 
 			bool fileExists(const std::string& name) const;
 			RawData* open(const std::string& file) const;
@@ -90,6 +94,8 @@ namespace FIFE {
 			mutable uint32_t m_currentIndex;
 			/// lazy loading timer
 			mutable Timer m_timer;
+			/// protects the lazy loading of the file entries
+			SDL_mutex* m_mutex;
 
 			/// read a bunch of file entries
 			void readFileEntry() const;
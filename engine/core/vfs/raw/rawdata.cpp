@@ -76,6 +76,14 @@ namespace FIFE {
 		return m_datasource->getSize();
 	}
 
+	const uint8_t* RawData::getData() const {
+		return m_datasource->getData();
+	}
+
+	RawDataSource* RawData::getDataSource() const {
+		return m_datasource;
+	}
+
 	uint32_t RawData::getCurrentIndex() const {
 		return m_index_current;
 	}
@@ -101,6 +109,15 @@ namespace FIFE {
 		m_index_current += len;
 	}
 
+	void RawData::readAt(uint8_t* buffer, uint32_t start, size_t len) const {
+		if (start + len > getDataLength()) {
+			FL_LOG(_log, LMsg("RawData") << start << " : " << len << " : " << getDataLength());
+			throw IndexOverflow(__FUNCTION__);
+		}
+
+		m_datasource->readInto(buffer, start, len);
+	}
+
 	uint8_t RawData::read8() {
 		return readSingle<uint8_t>();
 	}
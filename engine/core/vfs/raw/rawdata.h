@@ -66,6 +66,17 @@ namespace FIFE {
 			 */
 			uint32_t getDataLength() const;
 
+			/** get direct access to the complete data, without copying it
+			 *
+			 * @return the data or 0 if the source does not keep it in memory
+			 * @see RawDataSource::getData()
+			 */
+			const uint8_t* getData() const;
+
+			/** get the source the data is read from
+			 */
+			RawDataSource* getDataSource() const;
+
 			/** get the current index
 			 *
 			 * @return the current index
@@ -105,6 +116,16 @@ namespace FIFE {
 			 */
 			void readInto(uint8_t* buffer, size_t len);
 
+			/** read len bytes at the given position into buffer, without using or moving the current index
+			 *
+			 * Several threads can read from the same RawData this way at the same time.
+			 * @param buffer the data will be written into it
+			 * @param start the position to read from
+			 * @param len len bytes will be written
+			 * @throws IndexOverflow if start + len > getDataLength()
+			 */
+			void readAt(uint8_t* buffer, uint32_t start, size_t len) const;
+
 			/** reads 1 byte */
 			uint8_t read8();
 
@@ -55,4 +55,31 @@ namespace FIFE {
 			bool getLine(std::string& buffer);
 	};
 	%clear std::string& outbuffer;
+
+	%extend RawData {
+		/** Reads the rest of the data like read(), but as a read-only buffer object.
+		 * If the data is in memory, e.g. a mapped file, the buffer points straight to it
+		 * and is only valid as long as this RawData lives.
+		 */
+		PyObject* readBuffer() {
+			const uint8_t* data = $self->getData();
+			uint32_t index = $self->getCurrentIndex();
+			uint32_t size = $self->getDataLength() - index;
+			if (!data) {
+				std::string buffer;
+				$self->read(buffer);
+%#if PY_VERSION_HEX >= 0x03000000
+				return PyBytes_FromStringAndSize(buffer.data(), buffer.size());
+%#else
+				return PyString_FromStringAndSize(buffer.data(), buffer.size());
+%#endif
+			}
+			$self->setIndex(index + size);
+%#if PY_VERSION_HEX >= 0x03000000
+			return PyMemoryView_FromMemory(reinterpret_cast<char*>(const_cast<uint8_t*>(data + index)), size, PyBUF_READ);
+%#else
+			return PyBuffer_FromMemory(const_cast<uint8_t*>(data + index), size);
+%#endif
+		}
+	}
 }
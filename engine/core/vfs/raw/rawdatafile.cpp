@@ -22,20 +22,23 @@
 // Standard C++ library includes
 
 // 3rd party library includes
+#include <SDL.h>
 
 // FIFE includes
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
 #include "util/base/exception.h"
+#include "util/base/mutexlock.h"
 
 #include "rawdatafile.h"
 
 namespace FIFE {
 
-	RawDataFile::RawDataFile(const std::string& file) : m_file(file), m_stream(m_file.c_str(), std::ios::binary), m_filesize(0) {
+	RawDataFile::RawDataFile(const std::string& file) : m_file(file), m_stream(m_file.c_str(), std::ios::binary), m_mutex(0), m_filesize(0) {
 		if (!m_stream)
 			throw CannotOpenFile(m_file);
+		m_mutex = SDL_CreateMutex();
 
 		m_stream.seekg(0, std::ios::end);
 		m_filesize = m_stream.tellg();
@@ -44,6 +47,7 @@ namespace FIFE {
 
 
 	RawDataFile::~RawDataFile() {
+		SDL_DestroyMutex(m_mutex);
 	}
 
 
@@ -52,6 +56,7 @@ namespace FIFE {
 	}
 
 	void RawDataFile::readInto(uint8_t* buffer, uint32_t start, uint32_t length) {
+		MutexLock lock(m_mutex);
 		m_stream.seekg(start);
 		m_stream.read(reinterpret_cast<char*>(buffer), length);
 	}
@@ -34,6 +34,8 @@
 // Second block: files included from the same folder
 #include "rawdatasource.h"
 
+struct SDL_mutex;
+
 namespace FIFE {
 
 	/** A RawDataSource for a file on the host system
@@ -57,6 +59,8 @@ namespace FIFE {
 		private:
 			std::string m_file;
 			std::ifstream m_stream;
+			//! the stream has one position, so reads are serialized
+			SDL_mutex* m_mutex;
 
 			uint32_t m_filesize;
 
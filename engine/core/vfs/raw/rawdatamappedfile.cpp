@@ -0,0 +1,144 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <algorithm>
+
+// Platform specific includes
+#if defined( WIN32 )
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/base/exception.h"
+
+#include "rawdatamappedfile.h"
+
+namespace FIFE {
+
+	/** Owns the memory mapping of a file.
+	 */
+	class RawDataMappedFile::Mapping {
+		public:
+			Mapping(const std::string& file) : m_data(0), m_size(0) {
+#if defined( WIN32 )
+				HANDLE handle = CreateFileA(file.c_str(), GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+				if (handle == INVALID_HANDLE_VALUE) {
+					throw CannotOpenFile(file);
+				}
+				m_size = GetFileSize(handle, NULL);
+				// a file of size 0 can't be mapped, there is nothing to read anyway
+				if (m_size > 0) {
+					HANDLE mapping = CreateFileMapping(handle, NULL, PAGE_READONLY, 0, 0, NULL);
+					if (mapping) {
+						m_data = static_cast<uint8_t*>(MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0));
+						CloseHandle(mapping);
+					}
+				}
+				CloseHandle(handle);
+				if (m_size > 0 && !m_data) {
+					throw CannotOpenFile(file);
+				}
+#else
+				int fd = open(file.c_str(), O_RDONLY);
+				if (fd == -1) {
+					throw CannotOpenFile(file);
+				}
+				struct stat info;
+				if (fstat(fd, &info) == -1 || !S_ISREG(info.st_mode)) {
+					close(fd);
+					throw CannotOpenFile(file);
+				}
+				m_size = static_cast<uint32_t>(info.st_size);
+				// a file of size 0 can't be mapped, there is nothing to read anyway
+				if (m_size > 0) {
+					void* data = mmap(0, m_size, PROT_READ, MAP_PRIVATE, fd, 0);
+					if (data == MAP_FAILED) {
+						close(fd);
+						throw CannotOpenFile(file);
+					}
+					m_data = static_cast<uint8_t*>(data);
+				}
+				close(fd);
+#endif
+			}
+
+			~Mapping() {
+				if (!m_data) {
+					return;
+				}
+#if defined( WIN32 )
+				UnmapViewOfFile(m_data);
+#else
+				munmap(m_data, m_size);
+#endif
+			}
+
+			uint8_t* m_data;
+			uint32_t m_size;
+
+		private:
+			Mapping(const Mapping&);
+			Mapping& operator=(const Mapping&);
+	};
+
+	RawDataMappedFile::RawDataMappedFile(const std::string& file) :
+		m_mapping(new Mapping(file)),
+		m_data(m_mapping->m_data),
+		m_size(m_mapping->m_size) {
+	}
+
+	RawDataMappedFile::RawDataMappedFile(const RawDataMappedFile& file, uint32_t start, uint32_t length) :
+		RawDataSource(),
+		m_mapping(file.m_mapping),
+		m_data(file.m_data + start),
+		m_size(length) {
+		if (start > file.m_size || length > file.m_size - start) {
+			throw IndexOverflow(__FUNCTION__);
+		}
+	}
+
+	RawDataMappedFile::~RawDataMappedFile() {
+	}
+
+	uint32_t RawDataMappedFile::getSize() const {
+		return m_size;
+	}
+
+	void RawDataMappedFile::readInto(uint8_t* buffer, uint32_t start, uint32_t length) {
+		std::copy(m_data + start, m_data + start + length, buffer);
+	}
+
+	const uint8_t* RawDataMappedFile::getData() const {
+		return m_data;
+	}
+
+}
@@ -0,0 +1,83 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_VFS_RAW_RAWDATAMAPPEDFILE_H
+#define FIFE_VFS_RAW_RAWDATAMAPPEDFILE_H
+
+// Standard C++ library includes
+#include <string>
+
+// 3rd party library includes
+#include <boost/shared_ptr.hpp>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "rawdatasource.h"
+
+namespace FIFE {
+
+	/** A RawDataSource for a file on the host system that is mapped into memory
+	 *
+	 * The data is read straight out of the mapping, getData() gives access without any copy.
+	 * Views on a part of the file share the mapping, it is unmapped together with the last one.
+	 * @see RawDataFile
+	 * @see RawDataSource
+	 */
+	class RawDataMappedFile : public RawDataSource {
+
+		public:
+			/** Constructor
+			 * Maps the whole file.
+			 * @param file The path to the file to map.
+			 * @throw CannotOpenFile
+			 */
+			RawDataMappedFile(const std::string& file);
+
+			/** Constructor
+			 * Creates a view on a part of an already mapped file.
+			 * @param file The mapped file.
+			 * @param start The start of the view inside the file.
+			 * @param length The length of the view.
+			 * @throw IndexOverflow if the view does not lie inside the file
+			 */
+			RawDataMappedFile(const RawDataMappedFile& file, uint32_t start, uint32_t length);
+
+			virtual ~RawDataMappedFile();
+
+			virtual uint32_t getSize() const;
+			virtual void readInto(uint8_t* buffer, uint32_t start, uint32_t length);
+			virtual const uint8_t* getData() const;
+
+		private:
+			class Mapping;
+			boost::shared_ptr<Mapping> m_mapping;
+
+			const uint8_t* m_data;
+			uint32_t m_size;
+
+			RawDataMappedFile& operator=(const RawDataMappedFile&) { return *this; }
+	};
+
+}
+
+#endif
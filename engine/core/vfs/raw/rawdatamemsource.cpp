@@ -47,6 +47,10 @@ namespace FIFE {
 		std::copy(m_data + start, m_data + start + length, buffer);
 	}
 
+	const uint8_t* RawDataMemSource::getData() const {
+		return m_data;
+	}
+
 	uint8_t* RawDataMemSource::getRawData() const {
 		return m_data;
 	}
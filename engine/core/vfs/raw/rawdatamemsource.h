@@ -61,6 +61,7 @@ namespace FIFE {
 
 			virtual uint32_t getSize() const;
 			virtual void readInto(uint8_t* buffer, uint32_t start, uint32_t length);
+			virtual const uint8_t* getData() const;
 
 		private:
 			uint8_t* m_data;
@@ -0,0 +1,53 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <algorithm>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "rawdatasharedmemsource.h"
+
+namespace FIFE {
+
+	RawDataSharedMemSource::RawDataSharedMemSource(const type_buffer& buffer) : m_buffer(buffer) {
+	}
+
+	RawDataSharedMemSource::~RawDataSharedMemSource() {
+	}
+
+	uint32_t RawDataSharedMemSource::getSize() const {
+		return m_buffer->size();
+	}
+
+	void RawDataSharedMemSource::readInto(uint8_t* buffer, uint32_t start, uint32_t length) {
+		std::copy(m_buffer->begin() + start, m_buffer->begin() + start + length, buffer);
+	}
+
+	const uint8_t* RawDataSharedMemSource::getData() const {
+		return m_buffer->empty() ? 0 : &(*m_buffer)[0];
+	}
+
+}
@@ -0,0 +1,67 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_VFS_RAW_RAWDATASHAREDMEMSOURCE_H
+#define FIFE_VFS_RAW_RAWDATASHAREDMEMSOURCE_H
+
+// Standard C++ library includes
+#include <vector>
+
+// Platform specific includes
+#include "util/base/fife_stdint.h"
+
+// 3rd party library includes
+#include <boost/shared_ptr.hpp>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "rawdatasource.h"
+
+namespace FIFE {
+
+	/** RawDataSource that reads from a buffer shared with others, e.g. the entry cache of the VFS
+	 *
+	 * The buffer must not be changed while it is shared.
+	 * @see RawDataSource
+	 */
+	class RawDataSharedMemSource : public RawDataSource {
+		public:
+			typedef boost::shared_ptr<const std::vector<uint8_t> > type_buffer;
+
+			/** Create a new RawDataSharedMemSource on the given buffer.
+			 * @param buffer the data to read from
+			 */
+			RawDataSharedMemSource(const type_buffer& buffer);
+			virtual ~RawDataSharedMemSource();
+
+			virtual uint32_t getSize() const;
+			virtual void readInto(uint8_t* buffer, uint32_t start, uint32_t length);
+			virtual const uint8_t* getData() const;
+
+		private:
+			type_buffer m_buffer;
+	};
+
+}
+
+#endif
@@ -34,4 +34,8 @@ namespace FIFE {
 	RawDataSource::RawDataSource() {}
 
 	RawDataSource::~RawDataSource() {}
+
+	const uint8_t* RawDataSource::getData() const {
+		return 0;
+	}
 }
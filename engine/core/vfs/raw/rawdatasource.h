@@ -52,12 +52,19 @@ namespace FIFE {
 
 			/** read data from the source
 			 *
+			 * Has to be safe to call from several threads at the same time.
 			 * @param buffer the data will be written into buffer
 			 * @param start the startindex inside the source
 			 * @param length length bytes will be written into buffer
 			 */
 			virtual void readInto(uint8_t* buffer, uint32_t start, uint32_t length) = 0;
 
+			/** get direct access to the data
+			 *
+			 * @return the complete data or 0 if the source does not keep it in memory
+			 */
+			virtual const uint8_t* getData() const;
+
 	};
 
 }
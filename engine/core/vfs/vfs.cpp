@@ -23,6 +23,7 @@
 #include <algorithm>
 
 // 3rd party library includes
+#include <SDL.h>
 #include <boost/functional.hpp>
 #include <boost/regex.hpp>
 #include <boost/algorithm/string.hpp>
@@ -32,7 +33,12 @@
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
 #include "util/base/exception.h"
+#include "util/base/mutexlock.h"
+#include "util/base/workerpool.h"
 #include "util/log/logger.h"
+#include "vfs/raw/rawdata.h"
+#include "vfs/raw/rawdatamemsource.h"
+#include "vfs/raw/rawdatasharedmemsource.h"
 
 #include "vfs.h"
 #include "vfssource.h"
@@ -44,10 +50,103 @@ namespace FIFE {
 	 */
 	static Logger _log(LM_VFS);
 
-	VFS::VFS() : m_sources() {}
+	/** Opens and reads a file on a worker thread for VFS::readAsync.
+	 */
+	class VFSReadTask : public WorkerTask {
+	public:
+		VFSReadTask(VFS* vfs, const std::string& path, VFSReadListener* listener):
+			m_vfs(vfs),
+			m_path(path),
+			m_listener(listener),
+			m_data(0) {
+			SDL_AtomicSet(&m_done, 0);
+		}
+
+		virtual ~VFSReadTask() {
+			delete m_data;
+		}
+
+		virtual void run() {
+			m_data = m_vfs->open(m_path);
+			const uint8_t* bytes = m_data->getData();
+			if (bytes) {
+				// touch every page of mapped files, so the main thread doesn't wait for the disk
+				volatile uint8_t sum = 0;
+				for (uint32_t i = 0; i < m_data->getDataLength(); i += 4096) {
+					sum += bytes[i];
+				}
+			} else {
+				// the copy owns the source, m_data stays valid until the copy is complete
+				RawDataMemSource* source = new RawDataMemSource(m_data->getDataLength());
+				RawData* data = new RawData(source);
+				try {
+					m_data->readInto(source->getRawData(), source->getSize());
+				} catch (...) {
+					delete data;
+					throw;
+				}
+				delete m_data;
+				m_data = data;
+			}
+			SDL_AtomicSet(&m_done, 1);
+		}
+
+		virtual void failed(const std::string& error) {
+			// the main thread waits for m_done
+			FL_WARN(_log, LMsg("VFS::readAsync() - ") << "could not read " << m_path << ": " << error);
+			delete m_data;
+			m_data = 0;
+			SDL_AtomicSet(&m_done, 1);
+		}
+
+		/** Returns true if the read is finished.
+		 */
+		bool isDone() {
+			return SDL_AtomicGet(&m_done) != 0;
+		}
+
+		const std::string& getPath() const {
+			return m_path;
+		}
+
+		VFSReadListener* getListener() const {
+			return m_listener;
+		}
+
+		void setListener(VFSReadListener* listener) {
+			m_listener = listener;
+		}
+
+		RawData* getData() const {
+			return m_data;
+		}
+
+	private:
+		VFS* m_vfs;
+		std::string m_path;
+		VFSReadListener* m_listener;
+		RawData* m_data;
+		SDL_atomic_t m_done;
+	};
+
+	VFS::VFS() :
+		m_sources(),
+		m_mutex(SDL_CreateMutex()),
+		m_entryCacheBudget(16 * 1024 * 1024),
+		m_entryCacheSize(0),
+		m_entryCacheHits(0),
+		m_entryCacheMisses(0) {
+	}
 
 	VFS::~VFS() {
+		for (std::list<VFSReadTask*>::iterator it = m_readTasks.begin(); it != m_readTasks.end(); ++it) {
+			while (!(*it)->isDone()) {
+				SDL_Delay(1);
+			}
+			delete *it;
+		}
 		cleanup();
+		SDL_DestroyMutex(m_mutex);
 	}
 
 	void VFS::cleanup() {
@@ -108,13 +207,20 @@ namespace FIFE {
 	}
 
 	void VFS::addSource(VFSSource* source) {
+		MutexLock lock(m_mutex);
 		m_sources.push_back(source);
+		invalidateIndex();
 	}
 
 	void VFS::removeSource(VFSSource* source) {
+		MutexLock lock(m_mutex);
 		type_sources::iterator i = std::find(m_sources.begin(), m_sources.end(), source);
-		if (i != m_sources.end())
+		if (i != m_sources.end()) {
 			m_sources.erase(i);
+			invalidateIndex();
+		}
+		// the address may be reused by a new source
+		dropCachedEntries(source);
 	}
 
 	void VFS::removeSource(const std::string& path) {
@@ -124,7 +230,7 @@ namespace FIFE {
 			if (provider->hasSource(path)) {
 				VFSSource* source = provider->getSource(path);
 				type_sources::iterator i = std::find(m_sources.begin(), m_sources.end(), source);
-				if (i == m_sources.end()) {
+				if (i != m_sources.end()) {
 					removeSource(*i);
 					return;
 				}
@@ -132,7 +238,21 @@ namespace FIFE {
 		}
 	}
 
+	void VFS::invalidateIndex() {
+		MutexLock lock(m_mutex);
+		m_fileIndex.clear();
+		m_fileListings.clear();
+		m_directoryListings.clear();
+	}
+
 	VFSSource* VFS::getSourceForFile(const std::string& file) const {
+		MutexLock lock(m_mutex);
+		type_fileindex::const_iterator it = m_fileIndex.find(file);
+		if (it != m_fileIndex.end()) {
+			return it->second;
+		}
+
+		// only found files are indexed, missing ones may still appear on the host file system
 		type_sources::const_iterator i = std::find_if(m_sources.begin(), m_sources.end(),
 										 boost::bind2nd(boost::mem_fun(&VFSSource::fileExists), file));
 		if (i == m_sources.end()) {
@@ -140,6 +260,7 @@ namespace FIFE {
 			return 0;
 		}
 
+		m_fileIndex[file] = *i;
 		return *i;
 	}
 
@@ -180,6 +301,12 @@ namespace FIFE {
 	}
 
 	std::set<std::string> VFS::listFiles(const std::string& pathstr) const {
+		MutexLock lock(m_mutex);
+		type_listings::const_iterator it = m_fileListings.find(pathstr);
+		if (it != m_fileListings.end()) {
+			return it->second;
+		}
+
 		std::set<std::string> list;
 		type_sources::const_iterator end = m_sources.end();
 		for (type_sources::const_iterator i = m_sources.begin(); i != end; ++i) {
@@ -187,6 +314,7 @@ namespace FIFE {
 			list.insert(sourcelist.begin(), sourcelist.end());
 		}
 
+		m_fileListings[pathstr] = list;
 		return list;
 	}
 
@@ -196,6 +324,12 @@ namespace FIFE {
 	}
 
 	std::set<std::string> VFS::listDirectories(const std::string& pathstr) const {
+		MutexLock lock(m_mutex);
+		type_listings::const_iterator it = m_directoryListings.find(pathstr);
+		if (it != m_directoryListings.end()) {
+			return it->second;
+		}
+
 		std::set<std::string> list;
 		type_sources::const_iterator end = m_sources.end();
 		for (type_sources::const_iterator i = m_sources.begin(); i != end; ++i) {
@@ -203,6 +337,7 @@ namespace FIFE {
 			list.insert(sourcelist.begin(), sourcelist.end());
 		}
 
+		m_directoryListings[pathstr] = list;
 		return list;
 	}
 
@@ -239,4 +374,125 @@ namespace FIFE {
 		}
 		return false;
 	}
+
+	RawData* VFS::openCachedEntry(const VFSSource* source, const std::string& name) {
+		MutexLock lock(m_mutex);
+		type_entrycache::iterator it = m_entryCache.find(type_entrykey(source, name));
+		if (it == m_entryCache.end()) {
+			++m_entryCacheMisses;
+			return 0;
+		}
+
+		++m_entryCacheHits;
+		m_entryLru.splice(m_entryLru.begin(), m_entryLru, it->second.lru);
+		return new RawData(new RawDataSharedMemSource(it->second.data));
+	}
+
+	void VFS::cacheEntry(const VFSSource* source, const std::string& name, const uint8_t* data, uint32_t length) {
+		MutexLock lock(m_mutex);
+		if (length == 0 || length > m_entryCacheBudget) {
+			return;
+		}
+		type_entrykey key(source, name);
+		if (m_entryCache.find(key) != m_entryCache.end()) {
+			return;
+		}
+
+		CachedEntry& entry = m_entryCache[key];
+		entry.data.reset(new std::vector<uint8_t>(data, data + length));
+		entry.lru = m_entryLru.insert(m_entryLru.begin(), key);
+		m_entryCacheSize += length;
+		shrinkEntryCache();
+	}
+
+	void VFS::setEntryCacheBudget(size_t bytes) {
+		MutexLock lock(m_mutex);
+		m_entryCacheBudget = bytes;
+		shrinkEntryCache();
+	}
+
+	size_t VFS::getEntryCacheBudget() const {
+		return m_entryCacheBudget;
+	}
+
+	size_t VFS::getEntryCacheSize() const {
+		return m_entryCacheSize;
+	}
+
+	uint32_t VFS::getEntryCacheHits() const {
+		return m_entryCacheHits;
+	}
+
+	uint32_t VFS::getEntryCacheMisses() const {
+		return m_entryCacheMisses;
+	}
+
+	void VFS::clearEntryCache() {
+		MutexLock lock(m_mutex);
+		m_entryCache.clear();
+		m_entryLru.clear();
+		m_entryCacheSize = 0;
+		m_entryCacheHits = 0;
+		m_entryCacheMisses = 0;
+	}
+
+	void VFS::shrinkEntryCache() {
+		while (m_entryCacheSize > m_entryCacheBudget) {
+			type_entrycache::iterator it = m_entryCache.find(m_entryLru.back());
+			m_entryCacheSize -= it->second.data->size();
+			m_entryCache.erase(it);
+			m_entryLru.pop_back();
+		}
+	}
+
+	void VFS::dropCachedEntries(const VFSSource* source) {
+		MutexLock lock(m_mutex);
+		type_entrycache::iterator it = m_entryCache.lower_bound(type_entrykey(source, std::string()));
+		while (it != m_entryCache.end() && it->first.first == source) {
+			m_entryCacheSize -= it->second.data->size();
+			m_entryLru.erase(it->second.lru);
+			m_entryCache.erase(it++);
+		}
+	}
+
+	void VFS::readAsync(const std::string& path, VFSReadListener* listener) {
+		VFSReadTask* task = new VFSReadTask(this, path, listener);
+		m_readTasks.push_back(task);
+		WorkerPool::instance()->submit(task);
+	}
+
+	void VFS::readManyAsync(const std::vector<std::string>& paths, VFSReadListener* listener) {
+		for (std::vector<std::string>::const_iterator it = paths.begin(); it != paths.end(); ++it) {
+			readAsync(*it, listener);
+		}
+	}
+
+	void VFS::cancelReads(VFSReadListener* listener) {
+		for (std::list<VFSReadTask*>::iterator it = m_readTasks.begin(); it != m_readTasks.end(); ++it) {
+			if ((*it)->getListener() == listener) {
+				(*it)->setListener(0);
+			}
+		}
+	}
+
+	uint32_t VFS::getPendingReadCount() const {
+		return m_readTasks.size();
+	}
+
+	void VFS::processAsyncReads() {
+		std::list<VFSReadTask*>::iterator it = m_readTasks.begin();
+		while (it != m_readTasks.end()) {
+			VFSReadTask* task = *it;
+			if (!task->isDone()) {
+				++it;
+				continue;
+			}
+			// the listener may start or cancel reads
+			it = m_readTasks.erase(it);
+			if (task->getListener()) {
+				task->getListener()->onReadFinished(task->getPath(), task->getData());
+			}
+			delete task;
+		}
+	}
 }
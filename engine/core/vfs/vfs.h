@@ -23,26 +23,50 @@
 #define FIFE_VFS_VFS_H
 
 // Standard C++ library includes
+#include <list>
+#include <map>
 #include <string>
 #include <vector>
 #include <set>
 
 // 3rd party library includes
 #include <boost/shared_ptr.hpp>
+#include <boost/unordered_map.hpp>
 
 // FIFE includes
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
+#include "util/base/fife_stdint.h"
 #include "util/base/singleton.h"
 
 
+struct SDL_mutex;
+
 namespace FIFE {
 
 	class RawData;
 
 	class VFSSourceProvider;
 	class VFSSource;
+	class VFSReadTask;
+
+	/** Listener for the asynchronous reads of the VFS
+	 *
+	 * @see VFS::readAsync
+	 */
+	class VFSReadListener {
+		public:
+			virtual ~VFSReadListener() {}
+
+			/** Called on the main thread during Engine::pump when a read is finished
+			 *
+			 * @param path the path that was read
+			 * @param data the content of the file or 0 if it could not be read.
+			 * It is deleted after the call, so don't keep it.
+			 */
+			virtual void onReadFinished(const std::string& path, RawData* data) = 0;
+	};
 
 	/** the main VFS (virtual file system) class
 	 *
@@ -54,6 +78,13 @@ namespace FIFE {
 	 * @note All filenames have to be @b lowercase. The VFS will convert them to lowercase
 	 * and emit a warning. This is done to avoid problems with filesystems which are not
 	 * case sensitive.
+	 *
+	 * @note exists, open and the listing functions can be called from several threads at once.
+	 *
+	 * @note Directory listings and the locations of found files are cached, also for the
+	 * host file system. Files that are created on the host later are found by exists and open,
+	 * but they are missing from the listings. Deleted files are still listed and exist.
+	 * Both stay stale until a source is added or removed, or invalidateIndex() is called.
 	 */
 	class VFS : public DynamicSingleton<VFS>{
 		public:
@@ -119,6 +150,8 @@ namespace FIFE {
 			RawData* open(const std::string& path);
 
 			/** Get a filelist of the given directory
+			 *
+			 * The list is cached until the index is invalidated, see invalidateIndex().
 			 *
 			 * @param path the directory
 			 * @return the filelist
@@ -137,6 +170,8 @@ namespace FIFE {
 			std::set<std::string> listFiles(const std::string& path, const std::string& filterregex) const;
 
 			/** Get a directorylist of the given directory
+			 *
+			 * The list is cached until the index is invalidated, see invalidateIndex().
 			 *
 			 * @param path the directory
 			 * @return the directorylist
@@ -158,6 +193,86 @@ namespace FIFE {
 			 */
 			bool hasSource(const std::string& path) const;
 
+			/** Drops the cached file locations and directory listings
+			 *
+			 * Lookups are cached and the cache is dropped whenever a source is added or removed.
+			 * Call this after files were created or deleted behind the back of the VFS,
+			 * e.g. on the host file system, so they are seen by the next lookup.
+			 */
+			void invalidateIndex();
+
+			/** Opens a decompressed archive entry from the entry cache
+			 *
+			 * Used by the archive sources, so entries are not decompressed on every open.
+			 * Counts a hit or a miss.
+			 * @param source the source that contains the entry
+			 * @param name the name of the entry
+			 * @return the entry or 0 if it is not cached; delete this when done.
+			 */
+			RawData* openCachedEntry(const VFSSource* source, const std::string& name);
+
+			/** Adds a decompressed archive entry to the entry cache
+			 *
+			 * The data is copied. The least recently used entries are dropped
+			 * to stay within the budget, entries bigger than the budget are not cached.
+			 * @param source the source that contains the entry
+			 * @param name the name of the entry
+			 * @param data the decompressed data
+			 * @param length length of the data
+			 */
+			void cacheEntry(const VFSSource* source, const std::string& name, const uint8_t* data, uint32_t length);
+
+			/** Sets the maximal number of bytes the entry cache holds, 0 disables it
+			 */
+			void setEntryCacheBudget(size_t bytes);
+
+			/** Gets the maximal number of bytes the entry cache holds
+			 */
+			size_t getEntryCacheBudget() const;
+
+			/** Gets the number of bytes in the entry cache
+			 */
+			size_t getEntryCacheSize() const;
+
+			/** Gets the number of entries opened from the entry cache
+			 */
+			uint32_t getEntryCacheHits() const;
+
+			/** Gets the number of entries that had to be decompressed
+			 */
+			uint32_t getEntryCacheMisses() const;
+
+			/** Drops all cached entries and resets the counters
+			 */
+			void clearEntryCache();
+
+			/** Reads a file in the background
+			 *
+			 * The file is opened and decompressed by the WorkerPool and handed to the
+			 * listener on the main thread, see processAsyncReads.
+			 * @param path the file to read
+			 * @param listener gets the content, it has to stay alive until then or be passed to cancelReads
+			 */
+			void readAsync(const std::string& path, VFSReadListener* listener);
+
+			/** Reads several files in the background
+			 *
+			 * The listener is called once for every file.
+			 * @see readAsync
+			 */
+			void readManyAsync(const std::vector<std::string>& paths, VFSReadListener* listener);
+
+			/** Drops the pending reads of a listener, it will not be called anymore
+			 */
+			void cancelReads(VFSReadListener* listener);
+
+			/** Gets the number of reads that were not handed to their listener yet
+			 */
+			uint32_t getPendingReadCount() const;
+
+			/** Hands the finished reads to their listeners. Called by the Engine every frame.
+			 */
+			void processAsyncReads();
 
 		private:
 			typedef std::vector<VFSSourceProvider*> type_providers;
@@ -166,6 +281,46 @@ namespace FIFE {
 			typedef std::vector<VFSSource*> type_sources;
 			type_sources m_sources;
 
+			//! protects the sources and the caches
+			SDL_mutex* m_mutex;
+
+			typedef boost::unordered_map<std::string, VFSSource*> type_fileindex;
+			//! source that provides a file, the first one in m_sources order
+			mutable type_fileindex m_fileIndex;
+
+			typedef boost::unordered_map<std::string, std::set<std::string> > type_listings;
+			//! merged listings of all sources, per directory
+			mutable type_listings m_fileListings;
+			mutable type_listings m_directoryListings;
+
+			typedef std::pair<const VFSSource*, std::string> type_entrykey;
+			typedef std::list<type_entrykey> type_entrylru;
+			struct CachedEntry {
+				boost::shared_ptr<const std::vector<uint8_t> > data;
+				//! position in m_entryLru
+				type_entrylru::iterator lru;
+			};
+			typedef std::map<type_entrykey, CachedEntry> type_entrycache;
+			//! decompressed archive entries
+			type_entrycache m_entryCache;
+			//! keys of the cached entries, most recently used first
+			type_entrylru m_entryLru;
+			size_t m_entryCacheBudget;
+			size_t m_entryCacheSize;
+			uint32_t m_entryCacheHits;
+			uint32_t m_entryCacheMisses;
+
+			//! reads in the background, in the order they were started
+			std::list<VFSReadTask*> m_readTasks;
+
+			/** Drops least recently used entries until the cache fits into the budget
+			 */
+			void shrinkEntryCache();
+
+			/** Drops the cached entries of a source
+			 */
+			void dropCachedEntries(const VFSSource* source);
+
 			std::set<std::string> filterList(const std::set<std::string>& list, const std::string& fregex) const;
 			VFSSource* getSourceForFile(const std::string& file) const;
 	};
@@ -37,6 +37,14 @@ namespace std {
 
 
 namespace FIFE {
+	%feature("director") VFSReadListener;
+	class VFSReadListener {
+	public:
+		virtual ~VFSReadListener() {};
+
+		virtual void onReadFinished(const std::string& path, RawData* data) = 0;
+	};
+
 	class VFS {
 	public:
 
@@ -53,6 +61,21 @@ namespace FIFE {
 
 		std::set<std::string> listFiles(const std::string& path) const;
 		std::set<std::string> listDirectories(const std::string& path) const;
+
+		void invalidateIndex();
+
+		void setEntryCacheBudget(size_t bytes);
+		size_t getEntryCacheBudget() const;
+		size_t getEntryCacheSize() const;
+		uint32_t getEntryCacheHits() const;
+		uint32_t getEntryCacheMisses() const;
+		void clearEntryCache();
+
+		void readAsync(const std::string& path, VFSReadListener* listener);
+		void readManyAsync(const std::vector<std::string>& paths, VFSReadListener* listener);
+		void cancelReads(VFSReadListener* listener);
+		uint32_t getPendingReadCount() const;
+		void processAsyncReads();
 	};
 }
 
@@ -29,6 +29,7 @@
 // Second block: files included from the same folder
 #include "vfs/raw/rawdata.h"
 #include "vfs/raw/rawdatafile.h"
+#include "vfs/raw/rawdatamappedfile.h"
 #include "util/log/logger.h"
 #include "util/base/exception.h"
 
@@ -65,6 +66,12 @@ namespace FIFE {
 	}
 
 	RawData* VFSDirectory::open(const std::string& file) const {
+		try {
+			return new RawData(new RawDataMappedFile(m_root + file));
+		} catch (const CannotOpenFile&) {
+			// not every file can be mapped, e.g. special files, so fall back to reading it
+			FL_DBG(_log, LMsg("VFSDirectory::open() - could not map ") << m_root + file);
+		}
 		return new RawData(new RawDataFile(m_root + file));
 	}
 
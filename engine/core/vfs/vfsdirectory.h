@@ -58,6 +58,7 @@ namespace FIFE {
 			 */
 			virtual bool fileExists(const std::string& filename) const;
 			/** Opens a file.
+			 * The file is mapped into memory if possible.
 			 * @param filename The file to open.
 			 */
 			virtual RawData* open(const std::string& filename) const;
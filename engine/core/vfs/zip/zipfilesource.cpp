@@ -48,4 +48,8 @@ namespace FIFE {
 		assert(start + len <= m_datalen);
 		memcpy(target, m_data + start, len);
 	}
+
+	const uint8_t* ZipFileSource::getData() const {
+		return m_data;
+	}
 }
@@ -33,6 +33,7 @@ namespace FIFE {
 
 			virtual uint32_t getSize() const;
 			virtual void readInto(uint8_t* target, uint32_t start, uint32_t len);
+			virtual const uint8_t* getData() const;
 
 		private:
 			uint8_t* m_data;
@@ -22,6 +22,8 @@
 // Standard C++ library includes
 #include <algorithm>
 #include <list>
+#include <sstream>
+#include <vector>
 
 // 3rd party library includes
 #include "zlib.h"
@@ -32,6 +34,7 @@
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
 #include "vfs/raw/rawdata.h"
+#include "vfs/raw/rawdatamappedfile.h"
 #include "vfs/fife_boost_filesystem.h"
 #include "util/base/exception.h"
 #include "util/log/logger.h"
@@ -45,10 +48,15 @@ namespace FIFE {
 	static const uint32_t LF_HEADER = 0x04034b50;
 	static const uint32_t DE_HEADER = 0x08064b50;
 	static const uint32_t CF_HEADER = 0x02014b50;
+	static const uint32_t EOCD_HEADER = 0x06054b50;
+
+	// name of the index written by tools/vfs_packer.py as first entry
+	static const std::string PACKED_INDEX = ".fifeindex";
 
 	static Logger _log(LM_LOADERS);
 
 	ZipSource::ZipSource(VFS* vfs, const std::string& zip_file) : VFSSource(vfs), m_zipfile(vfs->open(zip_file)) {
+		m_mappedZipfile = dynamic_cast<RawDataMappedFile*>(m_zipfile->getDataSource());
 		readIndex();
 	}
 
@@ -70,12 +78,22 @@ namespace FIFE {
 		if (node) {
 			const ZipEntryData& entryData = node->getZipEntryData();
 
-			m_zipfile->setIndex(entryData.offset);
+			if (entryData.comp == 0 && m_mappedZipfile) { // uncompressed, no need to copy it
+				return new RawData(new RawDataMappedFile(*m_mappedZipfile, entryData.offset, entryData.size_real));
+			}
+
+			if (entryData.comp == 8) {
+				RawData* cached = getVFS()->openCachedEntry(this, path);
+				if (cached) {
+					return cached;
+				}
+			}
+
 			uint8_t* data = new uint8_t[entryData.size_real]; // beware of me - one day i WILL cause memory leaks
 			if (entryData.comp == 8) { // compressed using deflate
 				FL_DBG(_log, LMsg("trying to uncompress file ") <<  path << " (compressed with method " << entryData.comp << ")");
 				boost::scoped_array<uint8_t> compdata(new uint8_t[entryData.size_comp]);
-				m_zipfile->readInto(compdata.get(), entryData.size_comp);
+				m_zipfile->readAt(compdata.get(), entryData.offset, entryData.size_comp);
 
 				z_stream zstream;
 				zstream.next_in = compdata.get();
@@ -106,8 +124,9 @@ namespace FIFE {
 				}
 
 				inflateEnd(&zstream);
+				getVFS()->cacheEntry(this, path, data, entryData.size_real);
 			} else if (entryData.comp == 0) { // uncompressed
-				m_zipfile->readInto(data, entryData.size_real);
+				m_zipfile->readAt(data, entryData.offset, entryData.size_real);
 			} else {
 				FL_ERR(_log, LMsg("unsupported compression"));
 				delete[] data;
@@ -122,10 +141,98 @@ namespace FIFE {
 
 	void ZipSource::readIndex() {
 		m_zipfile->setIndex(0);
+		if (readPackedIndex()) {
+			return;
+		}
 
+		m_zipfile->setIndex(0);
 		while (!readFileToIndex()) {}
 	}
 
+	bool ZipSource::readPackedIndex() {
+		uint32_t length = m_zipfile->getDataLength();
+		if (length < 30 + PACKED_INDEX.size() || m_zipfile->read32Little() != LF_HEADER) {
+			return false;
+		}
+		m_zipfile->moveIndex(4);
+		uint16_t comp = m_zipfile->read16Little();
+		m_zipfile->moveIndex(8);
+		uint32_t compsize = m_zipfile->read32Little();
+		uint32_t realsize = m_zipfile->read32Little();
+		uint16_t fnamelen = m_zipfile->read16Little();
+		uint16_t extralen = m_zipfile->read16Little();
+		if (comp != 0 || compsize != realsize || fnamelen != PACKED_INDEX.size() ||
+			m_zipfile->readString(fnamelen) != PACKED_INDEX) {
+			return false;
+		}
+		m_zipfile->moveIndex(extralen);
+		if (m_zipfile->getCurrentIndex() + realsize > length) {
+			FL_WARN(_log, LMsg("ZipSource::readPackedIndex() - truncated index"));
+			return false;
+		}
+
+		// every line: offset compression compressed-size size crc32 name
+		std::istringstream lines(m_zipfile->readString(realsize));
+		std::string line;
+		std::vector<std::pair<std::string, ZipEntryData> > entries;
+		uint32_t dataEnd = m_zipfile->getCurrentIndex();
+		while (std::getline(lines, line)) {
+			std::istringstream fields(line);
+			ZipEntryData data;
+			std::string name;
+			fields >> data.offset >> data.comp >> data.size_comp >> data.size_real >> data.crc32;
+			fields.get();
+			std::getline(fields, name);
+			if (fields.fail() || name.empty() || data.offset > length || data.size_comp > length - data.offset) {
+				FL_WARN(_log, LMsg("ZipSource::readPackedIndex() - invalid entry: ") << line);
+				return false;
+			}
+			entries.push_back(std::make_pair(name, data));
+			dataEnd = std::max(dataEnd, data.offset + data.size_comp);
+		}
+
+		// an archive that was changed by another tool keeps the old index,
+		// so the entries have to match the central directory
+		uint16_t count = 0;
+		uint32_t directoryOffset = 0;
+		if (!readCentralDirectoryEnd(count, directoryOffset) || count != entries.size() + 1 ||
+			directoryOffset != dataEnd) {
+			FL_WARN(_log, LMsg("ZipSource::readPackedIndex() - stale index, reading the central directory"));
+			return false;
+		}
+
+		for (std::vector<std::pair<std::string, ZipEntryData> >::const_iterator it = entries.begin(); it != entries.end(); ++it) {
+			ZipNode* node = m_zipTree.addNode(it->first);
+			if (node) {
+				node->setZipEntryData(it->second);
+			}
+		}
+		FL_DBG(_log, LMsg("read packed index with ") << entries.size() << " entries");
+		return true;
+	}
+
+	bool ZipSource::readCentralDirectoryEnd(uint16_t& count, uint32_t& offset) {
+		// the record is at the end of the archive, followed by a comment of up to 64k
+		uint32_t length = m_zipfile->getDataLength();
+		if (length < 22) {
+			return false;
+		}
+		uint32_t last = length > 22 + 0xffff ? length - 22 - 0xffff : 0;
+		for (uint32_t pos = length - 22; ; --pos) {
+			m_zipfile->setIndex(pos);
+			if (m_zipfile->read32Little() == EOCD_HEADER) {
+				m_zipfile->moveIndex(6);
+				count = m_zipfile->read16Little();
+				m_zipfile->moveIndex(4);
+				offset = m_zipfile->read32Little();
+				return true;
+			}
+			if (pos == last) {
+				return false;
+			}
+		}
+	}
+
 	bool ZipSource::readFileToIndex() {
 		uint32_t header   = m_zipfile->read32Little();
 		if (header == DE_HEADER || header == CF_HEADER) { // decryption header or central directory header - we are finished
@@ -176,6 +283,9 @@ namespace FIFE {
 		data.crc32 = crc;
 
 		std::string filename = filePath.string();
+		if (filename == PACKED_INDEX) {
+			return false;
+		}
 		ZipNode* node = m_zipTree.addNode(filename);
 
 		if (node) {
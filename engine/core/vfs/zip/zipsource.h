@@ -39,6 +39,8 @@
 #include "ziptree.h"
 
 namespace FIFE {
+	class RawDataMappedFile;
+
 	/**  Implements a Zip archive file source.
 	 *
 	 * @see FIFE::VFSSource
@@ -48,9 +50,8 @@ namespace FIFE {
         ZipSource(VFS* vfs, const std::string& zip_file);
         ~ZipSource();
 
-        /// WARNING: fileExists, listFiles and listDirectories are not
-        // thread-safe, and will probably break if called from multiple
-        // threads at the same time.
+        /// The index is only read in the constructor, afterwards all
+        // functions can be called from multiple threads at the same time.
         bool fileExists(const std::string& file) const;
         std::set<std::string> listFiles(const std::string& path) const;
         std::set<std::string> listDirectories(const std::string& path) const;
@@ -60,10 +61,20 @@ namespace FIFE {
     private:
         void readIndex();
         bool readFileToIndex();
+        /** reads the index written by the vfs packer tool, if the archive starts with one
+         *  @return true if the index was read
+         */
+        bool readPackedIndex();
+        /** reads the number of entries and the offset of the central directory from its end record
+         *  @return true if the record was found
+         */
+        bool readCentralDirectoryEnd(uint16_t& count, uint32_t& offset);
 
     private:
         ZipTree m_zipTree;
 		RawData* m_zipfile;
+		//! the archive if it is mapped into memory, stored entries are opened as views on it
+		RawDataMappedFile* m_mappedZipfile;
 
 	};
 
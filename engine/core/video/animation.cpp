@@ -34,6 +34,7 @@
 
 #include "animation.h"
 #include "image.h"
+#include "imagemanager.h"
 
 namespace FIFE {
 
@@ -138,6 +139,7 @@ namespace FIFE {
 
 	ImagePtr Animation::getFrame(int32_t index) {
 		ImagePtr image;
+		setLastUsed(TimeManager::instance()->getTime());
 		if (isValidIndex(index)) {
 			image =  m_frames[index].image;
 			if (image->getState() == IResource::RES_NOT_LOADED) {
@@ -149,17 +151,45 @@ namespace FIFE {
 
 	ImagePtr Animation::getFrameByTimestamp(uint32_t timestamp) {
 		ImagePtr val;
+		setLastUsed(TimeManager::instance()->getTime());
 		if ((static_cast<int32_t>(timestamp) <= m_animation_endtime) && (m_animation_endtime > 0)) {
 			std::map<uint32_t, FrameInfo>::const_iterator i(m_framemap.upper_bound(timestamp));
 			--i;
 			val = i->second.image;
-		}
-		if(val && val->getState() == IResource::RES_NOT_LOADED) {
-			val->load();
+			if (val->getState() == IResource::RES_NOT_LOADED) {
+				ImageManager* manager = ImageManager::instance();
+				if (!manager->isAsyncLoadingEnabled()) {
+					val->load();
+				} else {
+					// show the last loaded frame until this one is ready
+					ImagePtr previous = getLoadedFrameBefore(i->second.index);
+					if (!previous) {
+						val->load();
+					}
+					// queue the rest of the animation
+					for (std::vector<FrameInfo>::iterator it = m_frames.begin(); it != m_frames.end(); ++it) {
+						manager->prefetch(it->image);
+					}
+					if (previous) {
+						return previous;
+					}
+				}
+			}
 		}
 		return val;
 	}
 
+	ImagePtr Animation::getLoadedFrameBefore(uint32_t index) {
+		const uint32_t count = m_frames.size();
+		for (uint32_t i = 1; i < count; ++i) {
+			const ImagePtr& image = m_frames[(index + count - i) % count].image;
+			if (image->getState() == IResource::RES_LOADED) {
+				return image;
+			}
+		}
+		return ImagePtr();
+	}
+
 	std::vector<ImagePtr> Animation::getFrames() {
 		std::vector<ImagePtr> frames;
 		for (std::vector<FrameInfo>::iterator it = m_frames.begin(); it != m_frames.end(); ++it) {
@@ -89,6 +89,8 @@ namespace FIFE {
 		ImagePtr getFrame(int32_t index);
 
 		/** Gets the frame image that matches the given timestamp.
+		 * In the asynchronous loading mode of the ImageManager a frame that is not
+		 * loaded yet is queued and the previous loaded frame is returned instead.
 		 */
 		ImagePtr getFrameByTimestamp(uint32_t timestamp);
 
@@ -152,6 +154,11 @@ namespace FIFE {
 		 */
 		bool isValidIndex(int32_t index) const;
 
+		/** Returns the closest loaded frame before the given index, wraps around.
+		 * Returns an empty pointer if no other frame is loaded.
+		 */
+		ImagePtr getLoadedFrameBefore(uint32_t index);
+
 		// Map of timestamp + associated frame
 		std::map<uint32_t, FrameInfo> m_framemap;
 		// vector of frames for fast indexed access
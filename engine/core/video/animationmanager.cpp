@@ -20,6 +20,7 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
 #include <map>
 
 // 3rd party library includes
@@ -32,9 +33,11 @@
 #include "util/log/logger.h"
 #include "util/resource/resourcemanager.h"
 #include "util/resource/resource.h"
+#include "util/time/timemanager.h"
 #include "video/renderbackend.h"
 
 #include "animationmanager.h"
+#include "imagemanager.h"
 
 namespace FIFE {
 	/** Logger to use for this source file.
@@ -42,6 +45,13 @@ namespace FIFE {
 	 */
 	static Logger _log(LM_RESMGR);
 
+	AnimationManager::AnimationManager():
+		IResourceManager(),
+		m_memoryBudget(0),
+		m_evictionCount(0),
+		m_evictedBytes(0) {
+	}
+
 	AnimationManager::~AnimationManager() {
 
 	}
@@ -467,4 +477,100 @@ namespace FIFE {
 
 	}
 
+	void AnimationManager::prefetch(const std::vector<std::string>& names) {
+		ImageManager* imageManager = ImageManager::instance();
+		for (std::vector<std::string>::const_iterator it = names.begin(); it != names.end(); ++it) {
+			AnimationNameMapIterator nit = m_animNameMap.find(*it);
+			if (nit == m_animNameMap.end()) {
+				FL_WARN(_log, LMsg("AnimationManager::prefetch(std::vector<std::string>) - ") << "Resource " << *it << " is undefined.");
+				continue;
+			}
+			std::vector<ImagePtr> frames = nit->second->getFrames();
+			for (std::vector<ImagePtr>::iterator fit = frames.begin(); fit != frames.end(); ++fit) {
+				imageManager->prefetch(*fit);
+			}
+		}
+	}
+
+	void AnimationManager::setMemoryBudget(size_t bytes) {
+		m_memoryBudget = bytes;
+	}
+
+	size_t AnimationManager::getMemoryBudget() const {
+		return m_memoryBudget;
+	}
+
+	size_t AnimationManager::getFrameMemoryUsed() {
+		FrameUseMap frames;
+		getFrameUses(frames);
+		size_t used = 0;
+		for (FrameUseMap::iterator it = frames.begin(); it != frames.end(); ++it) {
+			used += it->second.second->getSize();
+		}
+		return used;
+	}
+
+	void AnimationManager::enforceMemoryBudget() {
+		if (m_memoryBudget == 0) {
+			return;
+		}
+		FrameUseMap frames;
+		getFrameUses(frames);
+		size_t used = 0;
+		for (FrameUseMap::iterator it = frames.begin(); it != frames.end(); ++it) {
+			used += it->second.second->getSize();
+		}
+		if (used <= m_memoryBudget) {
+			return;
+		}
+
+		// least recently used first
+		const uint32_t now = TimeManager::instance()->getTime();
+		std::vector<std::pair<uint32_t, ResourceHandle> > candidates;
+		for (FrameUseMap::iterator it = frames.begin(); it != frames.end(); ++it) {
+			if (it->second.first != now && it->second.second->getSize() > 0) {
+				candidates.push_back(std::make_pair(it->second.first, it->first));
+			}
+		}
+		std::sort(candidates.begin(), candidates.end());
+
+		// the image manager keeps the frames that can not be loaded again
+		ImageManager* imageManager = ImageManager::instance();
+		uint32_t count = 0;
+		std::vector<std::pair<uint32_t, ResourceHandle> >::iterator it = candidates.begin();
+		for (; it != candidates.end() && used > m_memoryBudget; ++it) {
+			size_t size = imageManager->evict(frames[it->second].second);
+			if (size == 0) {
+				continue;
+			}
+			used -= size;
+			m_evictedBytes += size;
+			++count;
+		}
+		m_evictionCount += count;
+
+		FL_DBG(_log, LMsg("AnimationManager::enforceMemoryBudget() - ") << "Freed " << count << " frames, " << used << " bytes in use.");
+	}
+
+	uint32_t AnimationManager::getEvictionCount() const {
+		return m_evictionCount;
+	}
+
+	size_t AnimationManager::getEvictedBytes() const {
+		return m_evictedBytes;
+	}
+
+	void AnimationManager::getFrameUses(FrameUseMap& frames) {
+		for (AnimationHandleMapIterator it = m_animHandleMap.begin(); it != m_animHandleMap.end(); ++it) {
+			uint32_t lastUsed = it->second->getLastUsed();
+			std::vector<ImagePtr> images = it->second->getFrames();
+			for (std::vector<ImagePtr>::iterator iit = images.begin(); iit != images.end(); ++iit) {
+				std::pair<FrameUseMap::iterator, bool> insertiter =
+					frames.insert(std::make_pair((*iit)->getHandle(), std::make_pair(lastUsed, *iit)));
+				if (!insertiter.second && insertiter.first->second.first < lastUsed) {
+					insertiter.first->second.first = lastUsed;
+				}
+			}
+		}
+	}
 } //FIFE
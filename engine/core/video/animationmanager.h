@@ -56,7 +56,7 @@ namespace FIFE {
 
 		/** Default constructor.
 		 */
-		AnimationManager() : IResourceManager() { }
+		AnimationManager();
 
 		/** Destructor.
 		 */
@@ -359,6 +359,51 @@ namespace FIFE {
 		virtual void invalidate(ResourceHandle handle);
 		virtual void invalidateAll();
 
+		/** Queues the frames of the animations for asynchronous loading.
+		 *
+		 * @param names The names of the animations.
+		 * @see ImageManager::prefetch
+		 */
+		void prefetch(const std::vector<std::string>& names);
+
+		/** Sets the memory budget for the frames of the animations in bytes.
+		 *
+		 * If the frames use more memory, enforceMemoryBudget() frees the least
+		 * recently used ones until the budget is met. The frames are freed by the
+		 * ImageManager, so frames that can not be loaded again are kept. Frames are
+		 * loaded again on access. 0 disables the budget, this is the default.
+		 *
+		 * @param bytes The budget in bytes.
+		 */
+		void setMemoryBudget(size_t bytes);
+
+		/** Returns the memory budget in bytes, 0 if there is none.
+		 */
+		size_t getMemoryBudget() const;
+
+		/** Returns the memory used by the loaded frames of all animations.
+		 *
+		 * Frames that are shared by several animations are counted once. The frames
+		 * belong to the ImageManager, so the memory is part of its getMemoryUsed().
+		 */
+		size_t getFrameMemoryUsed();
+
+		/** Frees the least recently used frames until the memory budget is met.
+		 *
+		 * A frame is as recently used as the last animation that uses it. Frames
+		 * of animations that were used in the current frame are kept.
+		 * Called by the engine at the end of each frame.
+		 */
+		void enforceMemoryBudget();
+
+		/** Returns the number of frames that were freed because of the memory budget.
+		 */
+		uint32_t getEvictionCount() const;
+
+		/** Returns the number of bytes that were freed because of the memory budget.
+		 */
+		size_t getEvictedBytes() const;
+
 	private:
 		typedef std::map< ResourceHandle, AnimationPtr > AnimationHandleMap;
 		typedef std::map< ResourceHandle, AnimationPtr >::iterator AnimationHandleMapIterator;
@@ -370,9 +415,22 @@ namespace FIFE {
 		typedef std::map< std::string, AnimationPtr >::const_iterator AnimationNameMapConstIterator;
 		typedef std::pair< std::string, AnimationPtr > AnimationNameMapPair;
 
+		typedef std::map< ResourceHandle, std::pair<uint32_t, ImagePtr> > FrameUseMap;
+
+		/** Collects the frames of all animations with the time they were last used.
+		 */
+		void getFrameUses(FrameUseMap& frames);
+
 		AnimationHandleMap m_animHandleMap;
 
 		AnimationNameMap m_animNameMap;
+
+		//! Memory budget in bytes, 0 for none.
+		size_t m_memoryBudget;
+		//! Number of frames that were freed because of the budget.
+		uint32_t m_evictionCount;
+		//! Number of bytes that were freed because of the budget.
+		size_t m_evictedBytes;
 	};
 
 } //FIFE
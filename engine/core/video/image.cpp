@@ -32,6 +32,7 @@
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
 #include "util/resource/resource.h"
+#include "util/time/timemanager.h"
 #include "loaders/native/video/imageloader.h"
 
 #include "image.h"
@@ -142,6 +143,10 @@ namespace FIFE {
 		m_state = IResource::RES_NOT_LOADED;
 	}
 
+	void Image::markUsed() {
+		setLastUsed(TimeManager::instance()->getTime());
+	}
+
 	SDL_Surface* Image::detachSurface() {
 		SDL_Surface* srf = m_surface;
 		m_surface = NULL;
@@ -112,8 +112,8 @@ namespace FIFE {
 		static void saveAsPng(const std::string& filename, const SDL_Surface& surface);
 		static bool putPixel(SDL_Surface* surface, int32_t x, int32_t y, uint8_t r, uint8_t g, uint8_t b, uint8_t a = 255);
 
-		uint32_t getWidth() const;
-		uint32_t getHeight() const;
+		virtual uint32_t getWidth() const;
+		virtual uint32_t getHeight() const;
 		Rect getArea() const;
 
 		void setXShift(int32_t xshift) {
@@ -147,6 +147,11 @@ namespace FIFE {
 		 */
 		bool isSharedImage() const { return m_shared; }
 
+		/** Marks the image as used in the current frame.
+		 * Called by the render methods, see IResource::getLastUsed.
+		 */
+		void markUsed();
+
 		/** Returns area of the image it occupies in the shared image
 		 */
 		const Rect& getSubImageRect() const { return m_subimagerect; }
@@ -20,21 +20,32 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
 #include <map>
+#include <sstream>
 
 // 3rd party library includes
+#include <boost/scoped_ptr.hpp>
+#include <SDL.h>
 #include <tinyxml.h>
 
 // FIFE includes
 // These includes are split up in two parts, separated by one empty line
 // First block: files included from the FIFE root src directory
 // Second block: files included from the same folder
+#include "loaders/native/video/imageloader.h"
+#include "util/base/exception.h"
+#include "util/base/workerpool.h"
 #include "util/log/logger.h"
 #include "util/resource/resourcemanager.h"
 #include "util/resource/resource.h"
+#include "util/time/timemanager.h"
+#include "vfs/raw/rawdata.h"
+#include "vfs/vfs.h"
 #include "video/image.h"
 #include "video/renderbackend.h"
 
+#include "atlasbook.h"
 #include "imagemanager.h"
 
 namespace FIFE {
@@ -43,8 +54,160 @@ namespace FIFE {
 	 */
 	static Logger _log(LM_RESMGR);
 
-	ImageManager::~ImageManager() {
+	/** Decodes an image file on a worker thread.
+	 *
+	 * The file is read on the main thread, the vfs is not thread safe.
+	 */
+	class ImageDecodeTask : public WorkerTask {
+	public:
+		ImageDecodeTask(ResourceHandle handle, RawData* data, const SDL_PixelFormat* format):
+			m_handle(handle),
+			m_length(data->getDataLength()),
+			m_data(new uint8_t[m_length]),
+			m_convert(format != 0),
+			m_surface(0) {
+			data->readInto(m_data, m_length);
+			if (format) {
+				m_format = *format;
+			}
+			SDL_AtomicSet(&m_done, 0);
+		}
+
+		virtual ~ImageDecodeTask() {
+			delete[] m_data;
+			if (m_surface) {
+				SDL_FreeSurface(m_surface);
+			}
+		}
+
+		virtual void run() {
+			m_surface = ImageLoader::decode(m_data, m_length, m_convert ? &m_format : 0);
+			delete[] m_data;
+			m_data = 0;
+			SDL_AtomicSet(&m_done, 1);
+		}
+
+		virtual void failed(const std::string& error) {
+			// the main thread waits for m_done
+			m_error = error;
+			SDL_AtomicSet(&m_done, 1);
+		}
+
+		/** Returns true if the decoding is finished.
+		 */
+		bool isDone() {
+			return SDL_AtomicGet(&m_done) != 0;
+		}
+
+		ResourceHandle getHandle() const {
+			return m_handle;
+		}
+
+		/** Returns the decoded surface and gives up the ownership, 0 if the decoding failed.
+		 */
+		SDL_Surface* detachSurface() {
+			SDL_Surface* surface = m_surface;
+			m_surface = 0;
+			return surface;
+		}
+
+		const std::string& getError() const {
+			return m_error;
+		}
+
+	private:
+		ResourceHandle m_handle;
+		size_t m_length;
+		uint8_t* m_data;
+		bool m_convert;
+		SDL_PixelFormat m_format;
+		SDL_Surface* m_surface;
+		std::string m_error;
+		SDL_atomic_t m_done;
+	};
+
+	/** Rebuilds an atlas page from the files of the images that were packed into it.
+	 *
+	 * Makes the pages reloadable, so the memory budget can free them like other images.
+	 */
+	class AtlasPageLoader : public IResourceLoader {
+	public:
+		AtlasPageLoader(uint32_t width, uint32_t height):
+			m_width(width),
+			m_height(height) {
+		}
+
+		/** Adds the file of an image that was copied into the page at the given position.
+		 */
+		void addImage(const std::string& filename, uint32_t x, uint32_t y) {
+			m_images.push_back(PackedImage(filename, x, y));
+		}
+
+		virtual void load(IResource* res) {
+			Image* page = static_cast<Image*>(res);
+			RenderBackend* rb = RenderBackend::instance();
+			std::vector<uint8_t> pixdata(m_width * m_height * 4, 0);
+			boost::scoped_ptr<Image> blank(rb->createImage(&pixdata[0], m_width, m_height));
+			page->setSurface(blank->detachSurface());
+
+			ImageLoader loader;
+			for (std::vector<PackedImage>::iterator it = m_images.begin(); it != m_images.end(); ++it) {
+				ImagePtr image(rb->createImage(it->filename));
+				try {
+					loader.load(image.get());
+				} catch (const Exception& e) {
+					FL_WARN(_log, LMsg("AtlasPageLoader::load() - ") << "could not load " << it->filename << ": " << e.what());
+					continue;
+				}
+				page->copySubimage(it->x, it->y, image);
+			}
+
+			// the texture is updated on the fly, so it can not be compressed
+			bool compressing = rb->isImageCompressingEnabled();
+			rb->setImageCompressingEnabled(false);
+			page->forceLoadInternal();
+			rb->setImageCompressingEnabled(compressing);
+		}
+
+	private:
+		struct PackedImage {
+			PackedImage(const std::string& name, uint32_t left, uint32_t top):
+				filename(name), x(left), y(top) {}
+			std::string filename;
+			uint32_t x;
+			uint32_t y;
+		};
+
+		uint32_t m_width;
+		uint32_t m_height;
+		std::vector<PackedImage> m_images;
+	};
+
+	ImageManager::ImageManager():
+		IResourceManager(),
+		m_asyncLoading(false),
+		m_uploadBudget(4),
+		m_memoryBudget(0),
+		m_evictionCount(0),
+		m_evictedBytes(0),
+		m_autoAtlasing(false),
+		m_atlasPageSize(1024),
+		m_atlasBook(0) {
+	}
 
+	ImageManager::~ImageManager() {
+		// the running tasks still write into their surfaces
+		for (std::list<ImageDecodeTask*>::iterator it = m_decodeTasks.begin(); it != m_decodeTasks.end(); ++it) {
+			while (!(*it)->isDone()) {
+				SDL_Delay(1);
+			}
+			delete *it;
+		}
+		delete m_atlasBook;
+		// the pages are freed with the images of the resource manager
+		for (std::vector<AtlasPageLoader*>::iterator it = m_atlasLoaders.begin(); it != m_atlasLoaders.end(); ++it) {
+			delete *it;
+		}
 	}
 
 	size_t ImageManager::getMemoryUsed() const {
@@ -490,4 +653,257 @@ namespace FIFE {
 
 	}
 
+	void ImageManager::setAsyncLoadingEnabled(bool enabled) {
+		m_asyncLoading = enabled;
+	}
+
+	bool ImageManager::isAsyncLoadingEnabled() const {
+		return m_asyncLoading;
+	}
+
+	void ImageManager::setUploadBudget(uint32_t ms) {
+		m_uploadBudget = ms;
+	}
+
+	uint32_t ImageManager::getUploadBudget() const {
+		return m_uploadBudget;
+	}
+
+	void ImageManager::prefetch(const ImagePtr& image) {
+		if (!image || image->getState() == IResource::RES_LOADED ||
+			m_pendingImages.find(image->getHandle()) != m_pendingImages.end()) {
+			return;
+		}
+		if (image->isSharedImage() || image->getLoader()) {
+			image->load();
+			return;
+		}
+
+		RenderBackend* rb = RenderBackend::instance();
+		// in case of SDL the surface is not converted
+		const SDL_PixelFormat* format = rb->getName() == "SDL" ? 0 : &rb->getPixelFormat();
+		boost::scoped_ptr<RawData> data(VFS::instance()->open(image->getName()));
+		ImageDecodeTask* task = new ImageDecodeTask(image->getHandle(), data.get(), format);
+
+		m_pendingImages.insert(std::make_pair(image->getHandle(), image));
+		m_decodeTasks.push_back(task);
+		WorkerPool::instance()->submit(task);
+	}
+
+	void ImageManager::prefetch(const std::vector<std::string>& names) {
+		for (std::vector<std::string>::const_iterator it = names.begin(); it != names.end(); ++it) {
+			ImageNameMapIterator nit = m_imgNameMap.find(*it);
+			if (nit != m_imgNameMap.end()) {
+				prefetch(nit->second);
+			} else {
+				prefetch(create(*it));
+			}
+		}
+	}
+
+	uint32_t ImageManager::getPendingLoadCount() const {
+		return m_decodeTasks.size();
+	}
+
+	void ImageManager::processAsyncLoads() {
+		if (m_decodeTasks.empty()) {
+			return;
+		}
+
+		const Uint64 budget = SDL_GetPerformanceFrequency() * m_uploadBudget / 1000;
+		const Uint64 start = SDL_GetPerformanceCounter();
+		std::list<ImageDecodeTask*>::iterator it = m_decodeTasks.begin();
+		while (it != m_decodeTasks.end()) {
+			ImageDecodeTask* task = *it;
+			if (!task->isDone()) {
+				++it;
+				continue;
+			}
+			it = m_decodeTasks.erase(it);
+
+			std::map<ResourceHandle, ImagePtr>::iterator pit = m_pendingImages.find(task->getHandle());
+			ImagePtr image = pit->second;
+			m_pendingImages.erase(pit);
+
+			SDL_Surface* surface = task->detachSurface();
+			if (!surface) {
+				FL_ERR(_log, LMsg("ImageManager::processAsyncLoads() - ") << "Could not decode " << image->getName() << ": " << task->getError());
+			} else if (image->getState() == IResource::RES_LOADED) {
+				// was loaded synchronously in the meantime
+				SDL_FreeSurface(surface);
+			} else {
+				int32_t xshift = image->getXShift();
+				int32_t yshift = image->getYShift();
+				image->setSurface(surface);
+				image->setXShift(xshift);
+				image->setYShift(yshift);
+				image->setState(IResource::RES_LOADED);
+				image->forceLoadInternal();
+			}
+			delete task;
+
+			if (SDL_GetPerformanceCounter() - start >= budget) {
+				break;
+			}
+		}
+	}
+
+	void ImageManager::setMemoryBudget(size_t bytes) {
+		m_memoryBudget = bytes;
+	}
+
+	size_t ImageManager::getMemoryBudget() const {
+		return m_memoryBudget;
+	}
+
+	void ImageManager::enforceMemoryBudget() {
+		if (m_memoryBudget == 0) {
+			return;
+		}
+		size_t used = getMemoryUsed();
+		if (used <= m_memoryBudget) {
+			return;
+		}
+
+		// least recently used first
+		const uint32_t now = TimeManager::instance()->getTime();
+		std::vector<std::pair<uint32_t, Image*> > candidates;
+		for (ImageHandleMapIterator it = m_imgHandleMap.begin(); it != m_imgHandleMap.end(); ++it) {
+			Image* image = it->second.get();
+			if (image->getState() == IResource::RES_LOADED && !image->isSharedImage() &&
+				image->getLastUsed() != now && image->getSize() > 0) {
+				candidates.push_back(std::make_pair(image->getLastUsed(), image));
+			}
+		}
+		std::sort(candidates.begin(), candidates.end());
+
+		uint32_t count = 0;
+		std::vector<std::pair<uint32_t, Image*> >::iterator it = candidates.begin();
+		for (; it != candidates.end() && used > m_memoryBudget; ++it) {
+			Image* image = it->second;
+			if (!isReloadable(image)) {
+				continue;
+			}
+			size_t size = image->getSize();
+			image->free();
+			used -= size;
+			m_evictedBytes += size;
+			++count;
+		}
+		m_evictionCount += count;
+
+		FL_DBG(_log, LMsg("ImageManager::enforceMemoryBudget() - ") << "Freed " << count << " images, " << used << " bytes in use.");
+	}
+
+	uint32_t ImageManager::getEvictionCount() const {
+		return m_evictionCount;
+	}
+
+	size_t ImageManager::getEvictedBytes() const {
+		return m_evictedBytes;
+	}
+
+	size_t ImageManager::evict(const ImagePtr& image) {
+		if (!image || image->getState() != IResource::RES_LOADED || image->isSharedImage() ||
+			!isReloadable(image.get())) {
+			return 0;
+		}
+		size_t size = image->getSize();
+		image->free();
+		return size;
+	}
+
+	bool ImageManager::isReloadable(Image* image) {
+		if (image->getLoader()) {
+			return true;
+		}
+		if (m_memoryImages.find(image->getHandle()) != m_memoryImages.end()) {
+			return false;
+		}
+		if (VFS::instance()->exists(image->getName())) {
+			return true;
+		}
+		m_memoryImages.insert(image->getHandle());
+		return false;
+	}
+
+	void ImageManager::setAutoAtlasingEnabled(bool enabled) {
+		m_autoAtlasing = enabled;
+	}
+
+	bool ImageManager::isAutoAtlasingEnabled() const {
+		return m_autoAtlasing;
+	}
+
+	void ImageManager::setAtlasPageSize(uint32_t size) {
+		if (m_atlasBook) {
+			FL_WARN(_log, LMsg("ImageManager::setAtlasPageSize() - ") << "Atlas pages are already in use, the size stays " << m_atlasPageSize);
+			return;
+		}
+		m_atlasPageSize = size;
+	}
+
+	uint32_t ImageManager::getAtlasPageSize() const {
+		return m_atlasPageSize;
+	}
+
+	uint32_t ImageManager::getAtlasPageCount() const {
+		return m_atlasPages.size();
+	}
+
+	bool ImageManager::packIntoAtlas(const ImagePtr& image) {
+		if (image->isSharedImage()) {
+			return false;
+		}
+		// the pages are rebuilt from the files, images from memory or from other loaders stay loose
+		if (image->getLoader() || !VFS::instance()->exists(image->getName())) {
+			FL_WARN(_log, LMsg("ImageManager::packIntoAtlas() - ") << "no image file, not packed: " << image->getName());
+			return false;
+		}
+		if (image->getState() != IResource::RES_LOADED) {
+			try {
+				image->load();
+			} catch (const Exception& e) {
+				FL_WARN(_log, LMsg("ImageManager::packIntoAtlas() - ") << "not packed: " << e.what());
+				return false;
+			}
+		}
+		const uint32_t width = image->getWidth();
+		const uint32_t height = image->getHeight();
+		if (width == 0 || height == 0 || width > m_atlasPageSize / 2 || height > m_atlasPageSize / 2) {
+			return false;
+		}
+
+		if (!m_atlasBook) {
+			m_atlasBook = new AtlasBook(m_atlasPageSize, m_atlasPageSize);
+		}
+		AtlasBlock* block = m_atlasBook->getBlock(width, height);
+		if (block->page >= m_atlasPages.size()) {
+			std::ostringstream name;
+			name << "auto_atlas_" << block->page;
+			AtlasPage& page = m_atlasBook->getPage(block->page);
+			AtlasPageLoader* loader = new AtlasPageLoader(page.getWidth(), page.getHeight());
+			m_atlasLoaders.push_back(loader);
+			ImagePtr atlas = create(name.str(), loader);
+			atlas->load();
+			m_atlasPages.push_back(atlas);
+		}
+		const ImagePtr& atlas = m_atlasPages[block->page];
+		// the page could be freed by the memory budget
+		if (atlas->getState() != IResource::RES_LOADED) {
+			atlas->load();
+		}
+		atlas->copySubimage(block->left, block->top, image);
+		m_atlasLoaders[block->page]->addImage(image->getName(), block->left, block->top);
+
+		// the offsets are lost when the surface changes
+		int32_t xshift = image->getXShift();
+		int32_t yshift = image->getYShift();
+		image->free();
+		image->useSharedImage(atlas, Rect(block->left, block->top, width, height));
+		image->setXShift(xshift);
+		image->setYShift(yshift);
+		return true;
+	}
+
 } //FIFE
@@ -23,7 +23,9 @@
 #define FIFE_IMAGE_MANAGER_H
 
 // Standard C++ library includes
+#include <list>
 #include <map>
+#include <set>
 #include <string>
 #include <vector>
 
@@ -41,6 +43,10 @@
 
 namespace FIFE {
 
+	class AtlasBook;
+	class ImageDecodeTask;
+	class AtlasPageLoader;
+
 	/** ImageManager
 	 *
 	 * An interface for managing images.
@@ -56,7 +62,7 @@ namespace FIFE {
 
 		/** Default constructor.
 		 */
-		ImageManager() : IResourceManager() { }
+		ImageManager();
 
 		/** Destructor.
 		 */
@@ -376,7 +382,151 @@ namespace FIFE {
 		virtual void invalidate(ResourceHandle handle);
 		virtual void invalidateAll();
 
+		/** Enables or disables the asynchronous loading mode.
+		 *
+		 * If enabled, animations queue frames that are not loaded yet
+		 * and show the previous loaded frame until they are ready. The
+		 * image files are decoded by the worker pool and uploaded in
+		 * processAsyncLoads(). Disabled by default.
+		 *
+		 * @param enabled True to enable, false to disable.
+		 */
+		void setAsyncLoadingEnabled(bool enabled);
+
+		/** Returns true if the asynchronous loading mode is enabled.
+		 */
+		bool isAsyncLoadingEnabled() const;
+
+		/** Sets the time in milliseconds that processAsyncLoads() may spend per call.
+		 *
+		 * At least one decoded image is uploaded per call, regardless of the budget.
+		 * Default is 4.
+		 *
+		 * @param ms The budget in milliseconds.
+		 */
+		void setUploadBudget(uint32_t ms);
+
+		/** Returns the upload budget in milliseconds.
+		 */
+		uint32_t getUploadBudget() const;
+
+		/** Queues an image for asynchronous loading.
+		 *
+		 * Does nothing if the image is already loaded or queued. Shared images
+		 * and images with their own loader are loaded immediately.
+		 *
+		 * @param image The image to load.
+		 */
+		void prefetch(const ImagePtr& image);
+
+		/** Queues images for asynchronous loading. Images that do not exist yet are created.
+		 *
+		 * Works independent of the asynchronous loading mode.
+		 *
+		 * @param names The names of the images.
+		 */
+		void prefetch(const std::vector<std::string>& names);
+
+		/** Returns the number of images that are queued and not uploaded yet.
+		 */
+		uint32_t getPendingLoadCount() const;
+
+		/** Uploads the decoded images, within the upload budget.
+		 *
+		 * Called by the engine once per frame from the render thread.
+		 */
+		void processAsyncLoads();
+
+		/** Sets the memory budget for the loaded images in bytes.
+		 *
+		 * If the images use more memory, enforceMemoryBudget() frees the least
+		 * recently rendered ones until the budget is met. Only images that can
+		 * be loaded again are freed, not the shared ones and not the ones that
+		 * were created from memory. 0 disables the budget, this is the default.
+		 *
+		 * @param bytes The budget in bytes.
+		 */
+		void setMemoryBudget(size_t bytes);
+
+		/** Returns the memory budget in bytes, 0 if there is none.
+		 */
+		size_t getMemoryBudget() const;
+
+		/** Frees least recently rendered images until the memory budget is met.
+		 *
+		 * Images that were rendered in the current frame are kept.
+		 * Called by the engine at the end of each frame.
+		 */
+		void enforceMemoryBudget();
+
+		/** Returns the number of images that were freed because of the memory budget.
+		 */
+		uint32_t getEvictionCount() const;
+
+		/** Returns the number of bytes that were freed because of the memory budget.
+		 */
+		size_t getEvictedBytes() const;
+
+		/** Frees the image if it can be loaded again.
+		 *
+		 * Images that are not loaded, shared images and images that were created
+		 * from memory are kept. Used by the AnimationManager to enforce its budget.
+		 *
+		 * @param image The image to free.
+		 * @return The number of bytes that were freed, 0 if the image was kept.
+		 */
+		size_t evict(const ImagePtr& image);
+
+		/** Enables or disables the automatic atlasing.
+		 *
+		 * If enabled, the object and animation loaders pack the small images
+		 * they create into atlas pages, see packIntoAtlas(). Disabled by default.
+		 *
+		 * @param enabled True to enable, false to disable.
+		 */
+		void setAutoAtlasingEnabled(bool enabled);
+
+		/** Returns true if the automatic atlasing is enabled.
+		 */
+		bool isAutoAtlasingEnabled() const;
+
+		/** Sets the width and height of the atlas pages. Default is 1024.
+		 *
+		 * Has no effect once the first image was packed.
+		 *
+		 * @param size The size in pixels.
+		 */
+		void setAtlasPageSize(uint32_t size);
+
+		/** Returns the width and height of the atlas pages.
+		 */
+		uint32_t getAtlasPageSize() const;
+
+		/** Returns the number of atlas pages that were created.
+		 */
+		uint32_t getAtlasPageCount() const;
+
+		/** Copies the image into an atlas page and turns it into a shared image of that page.
+		 *
+		 * The image is loaded if necessary. Name, handle and offsets stay the same,
+		 * so the users of the image are not affected. Images that are larger than
+		 * half of the page size and shared images are left alone.
+		 *
+		 * A page is rebuilt from the files of its images when it is loaded again, so
+		 * the memory budget can free it. Therefore only images that are loaded from a
+		 * file are packed. Images from memory or with an own loader, and files that are
+		 * missing or can not be decoded, are left alone with a warning.
+		 *
+		 * @param image The image to pack.
+		 * @return True if the image was packed.
+		 */
+		bool packIntoAtlas(const ImagePtr& image);
+
 	private:
+		/** Returns true if the image can be freed and loaded again.
+		 */
+		bool isReloadable(Image* image);
+
 		typedef std::map< ResourceHandle, ImagePtr > ImageHandleMap;
 		typedef std::map< ResourceHandle, ImagePtr >::iterator ImageHandleMapIterator;
 		typedef std::map< ResourceHandle, ImagePtr >::const_iterator ImageHandleMapConstIterator;
@@ -390,6 +540,33 @@ namespace FIFE {
 		ImageHandleMap m_imgHandleMap;
 
 		ImageNameMap m_imgNameMap;
+
+		//! Decode tasks that are running or not uploaded yet, oldest first.
+		std::list<ImageDecodeTask*> m_decodeTasks;
+		//! Handles of the queued images.
+		std::map<ResourceHandle, ImagePtr> m_pendingImages;
+		//! Is the asynchronous loading mode enabled.
+		bool m_asyncLoading;
+		//! Upload budget per frame in milliseconds.
+		uint32_t m_uploadBudget;
+		//! Memory budget in bytes, 0 for none.
+		size_t m_memoryBudget;
+		//! Number of images that were freed because of the budget.
+		uint32_t m_evictionCount;
+		//! Number of bytes that were freed because of the budget.
+		size_t m_evictedBytes;
+		//! Images that have no file or loader, they are never freed.
+		std::set<ResourceHandle> m_memoryImages;
+		//! Is the automatic atlasing enabled.
+		bool m_autoAtlasing;
+		//! Size of the atlas pages.
+		uint32_t m_atlasPageSize;
+		//! Allocates the space in the atlas pages, created with the first packed image.
+		AtlasBook* m_atlasBook;
+		//! The atlas pages, indexed like the pages of the AtlasBook.
+		std::vector<ImagePtr> m_atlasPages;
+		//! The loaders of the atlas pages, they rebuild a page from the packed image files.
+		std::vector<AtlasPageLoader*> m_atlasLoaders;
 	};
 
 } //FIFE
@@ -0,0 +1,223 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <cstring>
+
+// 3rd party library includes
+#include <boost/scoped_ptr.hpp>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/structures/rect.h"
+#include "vfs/raw/rawdata.h"
+#include "vfs/vfs.h"
+#include "video/imagemanager.h"
+#include "video/renderbackend.h"
+
+#include "nullimage.h"
+#include "renderbackendnull.h"
+
+namespace FIFE {
+
+	NullImage::NullImage(IResourceLoader* loader):
+		Image(loader),
+		m_headerRead(false),
+		m_headerWidth(0),
+		m_headerHeight(0) {
+	}
+
+	NullImage::NullImage(const std::string& name, IResourceLoader* loader):
+		Image(name, loader),
+		m_headerRead(false),
+		m_headerWidth(0),
+		m_headerHeight(0) {
+	}
+
+	NullImage::NullImage(SDL_Surface* surface):
+		Image(surface),
+		m_headerRead(false),
+		m_headerWidth(0),
+		m_headerHeight(0) {
+	}
+
+	NullImage::NullImage(const std::string& name, SDL_Surface* surface):
+		Image(name, surface),
+		m_headerRead(false),
+		m_headerWidth(0),
+		m_headerHeight(0) {
+	}
+
+	NullImage::NullImage(const uint8_t* data, uint32_t width, uint32_t height):
+		Image(data, width, height),
+		m_headerRead(false),
+		m_headerWidth(0),
+		m_headerHeight(0) {
+	}
+
+	NullImage::NullImage(const std::string& name, const uint8_t* data, uint32_t width, uint32_t height):
+		Image(name, data, width, height),
+		m_headerRead(false),
+		m_headerWidth(0),
+		m_headerHeight(0) {
+	}
+
+	NullImage::~NullImage() {
+	}
+
+	void NullImage::invalidate() {
+	}
+
+	void NullImage::setSurface(SDL_Surface* surface) {
+		reset(surface);
+	}
+
+	uint32_t NullImage::getWidth() const {
+		if (!m_shared && !m_surface && readHeaderSize()) {
+			return m_headerWidth;
+		}
+		return Image::getWidth();
+	}
+
+	uint32_t NullImage::getHeight() const {
+		if (!m_shared && !m_surface && readHeaderSize()) {
+			return m_headerHeight;
+		}
+		return Image::getHeight();
+	}
+
+	void NullImage::render(const Rect& rect, uint8_t alpha, uint8_t const* rgb) {
+		if (alpha == 0) {
+			return;
+		}
+		if (m_shared) {
+			// the atlas could be freed in the meantime
+			validateShared();
+		} else if (!m_surface && !readHeaderSize()) {
+			load();
+		}
+		markUsed();
+		if (m_shared) {
+			m_atlas_img->markUsed();
+		}
+		static_cast<RenderBackendNull*>(RenderBackend::instance())->addImageDraw();
+	}
+
+	void NullImage::render(const Rect& rect, const ImagePtr& overlay, uint8_t alpha, uint8_t const* rgb) {
+		render(rect, alpha, rgb);
+	}
+
+	void NullImage::renderZ(const Rect& rect, float vertexZ, uint8_t alpha, uint8_t const* rgb) {
+		render(rect, alpha, rgb);
+	}
+
+	void NullImage::renderZ(const Rect& rect, float vertexZ, const ImagePtr& overlay, uint8_t alpha, uint8_t const* rgb) {
+		render(rect, alpha, rgb);
+	}
+
+	void NullImage::renderZ(const Rect& rect, float vertexZ, uint8_t alpha, bool forceNewBatch, uint8_t const* rgb) {
+		render(rect, alpha, rgb);
+	}
+
+	void NullImage::useSharedImage(const ImagePtr& shared, const Rect& region) {
+		if (shared->getState() != IResource::RES_LOADED) {
+			shared->load();
+		}
+		setSurface(shared->getSurface());
+		m_shared = true;
+		m_subimagerect = region;
+		m_atlas_img = shared;
+		m_atlas_name = shared->getName();
+		setState(IResource::RES_LOADED);
+	}
+
+	void NullImage::forceLoadInternal() {
+		validateShared();
+	}
+
+	void NullImage::validateShared() {
+		if (m_atlas_name.empty()) {
+			return;
+		}
+
+		if (m_atlas_img->getState() == IResource::RES_NOT_LOADED ||
+			getState() == IResource::RES_NOT_LOADED) {
+			load();
+		}
+	}
+
+	void NullImage::load() {
+		if (!m_atlas_name.empty()) {
+			// check atlas image
+			// if it does not exist, it is created.
+			if (!ImageManager::instance()->exists(m_atlas_name)) {
+				ImagePtr newAtlas = ImageManager::instance()->create(m_atlas_name);
+				m_atlas_img = newAtlas;
+			}
+			useSharedImage(m_atlas_img, m_subimagerect);
+		} else {
+			Image::load();
+		}
+	}
+
+	bool NullImage::readHeaderSize() const {
+		if (m_headerRead) {
+			return m_headerWidth > 0 && m_headerHeight > 0;
+		}
+		m_headerRead = true;
+		// images with an own loader or without a file have to be loaded
+		if (m_loader || !VFS::instance()->exists(m_name)) {
+			return false;
+		}
+
+		// only png files are supported, the size is stored in the IHDR chunk
+		static const uint8_t signature[8] = { 0x89, 'P', 'N', 'G', '\r', '\n', 0x1a, '\n' };
+		boost::scoped_ptr<RawData> data(VFS::instance()->open(m_name));
+		if (data->getDataLength() < 24) {
+			return false;
+		}
+		uint8_t header[16];
+		data->readInto(header, 16);
+		if (memcmp(header, signature, 8) != 0 || memcmp(header + 12, "IHDR", 4) != 0) {
+			return false;
+		}
+		uint32_t width = data->read32Big();
+		uint32_t height = data->read32Big();
+		if (width == 0 || height == 0) {
+			return false;
+		}
+		m_headerWidth = width;
+		m_headerHeight = height;
+		return true;
+	}
+
+	void NullImage::free() {
+		// save the image offsets
+		int32_t xshift = m_xshift;
+		int32_t yshift = m_yshift;
+		setSurface(NULL);
+		m_xshift = xshift;
+		m_yshift = yshift;
+		m_state = IResource::RES_NOT_LOADED;
+	}
+}
@@ -0,0 +1,89 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_VIDEO_RENDERBACKENDS_NULL_NULLIMAGE_H
+#define FIFE_VIDEO_RENDERBACKENDS_NULL_NULLIMAGE_H
+
+// Standard C++ library includes
+
+// 3rd party library includes
+#include <SDL_video.h>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "video/image.h"
+
+namespace FIFE {
+
+	/** The null implementation of the @c Image base class.
+	 * The image keeps its surface for size and pixel queries, but no texture is created.
+	 * An unloaded png image reports the size from its file header and is rendered
+	 * without decoding, the pixels are decoded on an explicit load.
+	 */
+	class NullImage : public Image {
+	public:
+		NullImage(IResourceLoader* loader = 0);
+		NullImage(const std::string& name, IResourceLoader* loader = 0);
+		NullImage(SDL_Surface* surface);
+		NullImage(const std::string& name, SDL_Surface* surface);
+		NullImage(const uint8_t* data, uint32_t width, uint32_t height);
+		NullImage(const std::string& name, const uint8_t* data, uint32_t width, uint32_t height);
+
+		virtual ~NullImage();
+		virtual void invalidate();
+		virtual void setSurface(SDL_Surface* surface);
+		virtual uint32_t getWidth() const;
+		virtual uint32_t getHeight() const;
+		virtual void render(const Rect& rect, uint8_t alpha = 255, uint8_t const* rgb = 0);
+		virtual void render(const Rect& rect, const ImagePtr& overlay, uint8_t alpha = 255, uint8_t const* rgb = 0);
+		virtual void renderZ(const Rect& rect, float vertexZ, uint8_t alpha = 255, uint8_t const* rgb = 0);
+		virtual void renderZ(const Rect& rect, float vertexZ, const ImagePtr& overlay, uint8_t alpha = 255, uint8_t const* rgb = 0);
+		virtual void renderZ(const Rect& rect, float vertexZ, uint8_t alpha = 255, bool forceNewBatch = false, uint8_t const* rgb = 0);
+		virtual void useSharedImage(const ImagePtr& shared, const Rect& region);
+		virtual void forceLoadInternal();
+		virtual void load();
+		virtual void free();
+
+	private:
+		void validateShared();
+
+		/** Reads the image size from the png header instead of decoding the file.
+		 * The header is read once, later calls return the cached result.
+		 * @return True if the size could be read, false if the image has to be loaded.
+		 */
+		bool readHeaderSize() const;
+
+		// Holds Atlas ImagePtr if this is a shared image
+		ImagePtr m_atlas_img;
+		// Holds Atlas Name if this is a shared image
+		std::string m_atlas_name;
+		// True if the file header was read
+		mutable bool m_headerRead;
+		// Size read from the file header, 0 if it could not be read
+		mutable uint32_t m_headerWidth;
+		mutable uint32_t m_headerHeight;
+	};
+
+}
+
+#endif
@@ -0,0 +1,282 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+
+// 3rd party library includes
+#include <SDL.h>
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/base/exception.h"
+#include "util/log/logger.h"
+#include "video/devicecaps.h"
+
+#include "renderbackendnull.h"
+#include "nullimage.h"
+
+namespace FIFE {
+	/** Logger to use for this source file.
+	 *  @relates Logger
+	 */
+	static Logger _log(LM_VIDEO);
+
+	RenderBackendNull::RenderBackendNull(const SDL_Color& colorkey) :
+		RenderBackend(colorkey),
+		m_imageDraws(0),
+		m_lastImageDraws(0),
+		m_frames(0) {
+	}
+
+	RenderBackendNull::~RenderBackendNull() {
+		if (m_screen) {
+			SDL_FreeSurface(m_screen);
+			m_screen = NULL;
+		}
+		deinit();
+	}
+
+	const std::string& RenderBackendNull::getName() const {
+		static std::string backend_name = "Null";
+		return backend_name;
+	}
+
+	void RenderBackendNull::init(const std::string& driver) {
+	}
+
+	void RenderBackendNull::clearBackBuffer() {
+	}
+
+	void RenderBackendNull::createMainScreen(const ScreenMode& mode, const std::string& title, const std::string& icon) {
+		setScreenMode(mode);
+	}
+
+	void RenderBackendNull::setScreenMode(const ScreenMode& mode) {
+		uint16_t width = mode.getWidth();
+		uint16_t height = mode.getHeight();
+		uint16_t bitsPerPixel = mode.getBPP();
+		if (m_screen) {
+			SDL_FreeSurface(m_screen);
+		}
+		// the screen is a plain memory surface, it is never drawn to
+		m_screen = SDL_CreateRGBSurface(0, width, height, 32, RMASK, GMASK, BMASK, AMASK);
+		if (!m_screen) {
+			throw SDLException(SDL_GetError());
+		}
+		m_target = m_screen;
+
+		FL_LOG(_log, LMsg("RenderBackendNull")
+			<< "Videomode " << width << "x" << height << " without display");
+
+		m_rgba_format = *(m_screen->format);
+		if (bitsPerPixel != 16) {
+			m_rgba_format.format = SDL_PIXELFORMAT_RGBA8888;
+			m_rgba_format.BitsPerPixel = 32;
+		} else {
+			m_rgba_format.format = SDL_PIXELFORMAT_RGBA4444;
+			m_rgba_format.BitsPerPixel = 16;
+		}
+		m_rgba_format.Rmask = RMASK;
+		m_rgba_format.Gmask = GMASK;
+		m_rgba_format.Bmask = BMASK;
+		m_rgba_format.Amask = AMASK;
+
+		m_screenMode = mode;
+	}
+
+	void RenderBackendNull::startFrame() {
+		RenderBackend::startFrame();
+	}
+
+	void RenderBackendNull::endFrame() {
+		m_lastImageDraws = m_imageDraws;
+		m_imageDraws = 0;
+		++m_frames;
+		RenderBackend::endFrame();
+	}
+
+	Image* RenderBackendNull::createImage(IResourceLoader* loader) {
+		return new NullImage(loader);
+	}
+
+	Image* RenderBackendNull::createImage(const std::string& name, IResourceLoader* loader) {
+		return new NullImage(name, loader);
+	}
+
+	Image* RenderBackendNull::createImage(SDL_Surface* surface) {
+		return new NullImage(surface);
+	}
+
+	Image* RenderBackendNull::createImage(const std::string& name, SDL_Surface* surface) {
+		return new NullImage(name, surface);
+	}
+
+	Image* RenderBackendNull::createImage(const uint8_t* data, uint32_t width, uint32_t height) {
+		return new NullImage(data, width, height);
+	}
+
+	Image* RenderBackendNull::createImage(const std::string& name, const uint8_t* data, uint32_t width, uint32_t height) {
+		return new NullImage(name, data, width, height);
+	}
+
+	void RenderBackendNull::setLightingModel(uint32_t lighting) {
+	}
+
+	uint32_t RenderBackendNull::getLightingModel() const {
+		return 0;
+	}
+
+	void RenderBackendNull::setLighting(float red, float green, float blue) {
+	}
+
+	void RenderBackendNull::resetLighting() {
+	}
+
+	void RenderBackendNull::resetStencilBuffer(uint8_t buffer) {
+	}
+
+	void RenderBackendNull::changeBlending(int32_t scr, int32_t dst) {
+	}
+
+	void RenderBackendNull::renderVertexArrays() {
+	}
+
+	void RenderBackendNull::addImageToArray(uint32_t id, const Rect& rec, float const* st, uint8_t alpha, uint8_t const* rgba) {
+		addImageDraw();
+	}
+
+	void RenderBackendNull::changeRenderInfos(RenderDataType type, uint16_t elements, int32_t src, int32_t dst, bool light, bool stentest, uint8_t stenref, GLConstants stenop, GLConstants stenfunc, OverlayType otype) {
+	}
+
+	bool RenderBackendNull::putPixel(int32_t x, int32_t y, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+		return true;
+	}
+
+	void RenderBackendNull::drawLine(const Point& p1, const Point& p2, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawThickLine(const Point& p1, const Point& p2, uint8_t width, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawPolyLine(const std::vector<Point>& points, uint8_t width, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawBezier(const std::vector<Point>& points, int32_t steps, uint8_t width, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawTriangle(const Point& p1, const Point& p2, const Point& p3, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawRectangle(const Point& p, uint16_t w, uint16_t h, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::fillRectangle(const Point& p, uint16_t w, uint16_t h, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawQuad(const Point& p1, const Point& p2, const Point& p3, const Point& p4, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawVertex(const Point& p, const uint8_t size, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawCircle(const Point& p, uint32_t radius, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawFillCircle(const Point& p, uint32_t radius, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawCircleSegment(const Point& p, uint32_t radius, int32_t sangle, int32_t eangle, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawFillCircleSegment(const Point& p, uint32_t radius, int32_t sangle, int32_t eangle, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::drawLightPrimitive(const Point& p, uint8_t intensity, float radius, int32_t subdivisions, float xstretch, float ystretch, uint8_t red, uint8_t green, uint8_t blue) {
+		addDrawCalls(1, 1);
+	}
+
+	void RenderBackendNull::enableScissorTest() {
+	}
+
+	void RenderBackendNull::disableScissorTest() {
+	}
+
+	void RenderBackendNull::captureScreen(const std::string& filename) {
+		FL_WARN(_log, "RenderBackendNull::captureScreen() - the null backend has no screen content");
+	}
+
+	void RenderBackendNull::captureScreen(const std::string& filename, uint32_t width, uint32_t height) {
+		FL_WARN(_log, "RenderBackendNull::captureScreen() - the null backend has no screen content");
+	}
+
+	void RenderBackendNull::setClipArea(const Rect& cliparea, bool clear) {
+	}
+
+	void RenderBackendNull::attachRenderTarget(ImagePtr& img, bool discard) {
+		m_target = img->getSurface();
+	}
+
+	void RenderBackendNull::detachRenderTarget() {
+		m_target = m_screen;
+	}
+
+	void RenderBackendNull::renderGuiGeometry(const std::vector<GuiVertex>& vertices, const std::vector<int>& indices, const DoublePoint& translation, ImagePtr texture) {
+		addDrawCalls(1, 1);
+	}
+
+	uint32_t RenderBackendNull::getImageDraws() const {
+		return m_lastImageDraws;
+	}
+
+	uint32_t RenderBackendNull::getFrameCount() const {
+		return m_frames;
+	}
+
+	void RenderBackendNull::resetCounters() {
+		m_drawCalls = 0;
+		m_batchedItems = 0;
+		m_lastDrawCalls = 0;
+		m_lastBatchedItems = 0;
+		m_imageDraws = 0;
+		m_lastImageDraws = 0;
+		m_frames = 0;
+	}
+
+	RenderBackendNull* RenderBackendNull::getInstance() {
+		return dynamic_cast<RenderBackendNull*>(RenderBackend::instance());
+	}
+}
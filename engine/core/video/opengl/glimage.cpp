@@ -141,6 +141,10 @@ namespace FIFE {
 		} else if (m_shared) {
 			validateShared();
 		}
+		markUsed();
+		if (m_shared) {
+			m_atlas_img->markUsed();
+		}
 
 		rb->addImageToArray(m_texId, rect, m_tex_coords, alpha, rgb);
 	}
@@ -164,6 +168,10 @@ namespace FIFE {
 		} else if (m_shared) {
 			validateShared();
 		}
+		markUsed();
+		if (m_shared) {
+			m_atlas_img->markUsed();
+		}
 
 		GLImage* img = static_cast<GLImage*>(overlay.get());
 		img->forceLoadInternal();
@@ -191,6 +199,10 @@ namespace FIFE {
 		} else if (m_shared) {
 			validateShared();
 		}
+		markUsed();
+		if (m_shared) {
+			m_atlas_img->markUsed();
+		}
 		static_cast<RenderBackendOpenGL*>(rb)->addImageToArrayZ(m_texId, rect, vertexZ, m_tex_coords, alpha, rgb);
 		//rb->addImageToArray(m_texId, rect, m_tex_coords, alpha, rgb);
 	}
@@ -215,6 +227,10 @@ namespace FIFE {
 		} else if (m_shared) {
 			validateShared();
 		}
+		markUsed();
+		if (m_shared) {
+			m_atlas_img->markUsed();
+		}
 		
 		GLImage* img = static_cast<GLImage*>(overlay.get());
 		img->forceLoadInternal();
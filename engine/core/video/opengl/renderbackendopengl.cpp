@@ -789,6 +789,8 @@ namespace FIFE {
 		const uint32_t strideTC = sizeof(renderDataTC);
 		const uint32_t stride2TC = sizeof(renderData2TC);
 
+		m_batchedItems += m_renderObjects.size();
+
 		// disable alpha and depth tests
 		disableAlphaTest();
 		disableDepthTest();
@@ -881,6 +883,7 @@ namespace FIFE {
 				if (*currentElements > 0) {
 					//render
 					glDrawArrays(mode, *currentIndex, *currentElements);
+					++m_drawCalls;
 					*currentIndex += *currentElements;
 				}
 				// switch mode
@@ -1077,6 +1080,7 @@ namespace FIFE {
 		}
 		// render
 		glDrawArrays(mode, *currentIndex, *currentElements);
+		++m_drawCalls;
 
 		// reset all states
 		if (overlay_type != OVERLAY_TYPE_NONE) {
@@ -1111,49 +1115,32 @@ namespace FIFE {
 
 		// array index
 		int32_t index = 0;
-		// elements to render
-		uint32_t elements = 0;
 		// texture id
 		uint32_t texture_id = 0;
 
-		int32_t* currentIndex = &index;
-		uint32_t* currentElements = &elements;
-
 		enableAlphaTest();
 		enableDepthTest();
 		enableTextures(0);
 		enableLighting();
 		disableColorArray();
 
+		// the quads are already batched by texture
 		for(std::vector<RenderZObject>::iterator ir = m_renderTextureObjectsZ.begin(); ir != m_renderTextureObjectsZ.end(); ++ir) {
 			RenderZObject& ro = (*ir);
-			// if changes then we render all previously elements
 			if (ro.texture_id != texture_id) {
-				if (*currentElements > 0) {
-					//render
-					glDrawArrays(GL_QUADS, *currentIndex, *currentElements);
-					*currentIndex += *currentElements;
-				}
-
 				if (ro.texture_id != 0) {
 					bindTexture(0, ro.texture_id);
-					texture_id = ro.texture_id;
 				} else {
 					disableTextures(0);
-					texture_id = 0;
 				}
-
-				// set element to current size
-				*currentElements = 4;
-			} else {
-				// else add the element
-				*currentElements += 4;
+				texture_id = ro.texture_id;
 			}
+			glDrawArrays(GL_QUADS, index, ro.elements);
+			index += ro.elements;
+			++m_drawCalls;
+			m_batchedItems += ro.elements / 4;
 		}
 
-		// render
-		glDrawArrays(GL_QUADS, *currentIndex, *currentElements);
-
 		//reset all states
 		disableLighting();
 		disableTextures(0);
@@ -1183,6 +1170,8 @@ namespace FIFE {
 		for ( ; iter != m_renderZ_objects.end(); ++iter) {
 			bindTexture(iter->texture_id);
 			glDrawArrays(GL_QUADS, iter->index, iter->elements);
+			++m_drawCalls;
+			m_batchedItems += iter->elements / 4;
 		}
 		m_renderZ_objects.clear();
 
@@ -1205,49 +1194,32 @@ namespace FIFE {
 
 		// array index
 		int32_t index = 0;
-		// elements to render
-		uint32_t elements = 0;
 		// texture id
 		uint32_t texture_id = 0;
 
-		int32_t* currentIndex = &index;
-		uint32_t* currentElements = &elements;
-
 		enableDepthTest();
 		// use own value, other option would be to disable it
 		setAlphaTest(0.008);
 		enableTextures(0);
 		enableLighting();
 
+		// the quads are already batched by texture
 		for(std::vector<RenderZObject>::iterator ir = m_renderTextureColorObjectsZ.begin(); ir != m_renderTextureColorObjectsZ.end(); ++ir) {
 			RenderZObject& ro = (*ir);
-			// if changes then we render all previously elements
 			if (ro.texture_id != texture_id) {
-				if (*currentElements > 0) {
-					//render
-					glDrawArrays(GL_QUADS, *currentIndex, *currentElements);
-					*currentIndex += *currentElements;
-				}
-
 				if (ro.texture_id != 0) {
 					bindTexture(0, ro.texture_id);
-					texture_id = ro.texture_id;
 				} else {
 					disableTextures(0);
-					texture_id = 0;
 				}
-
-				// set element to current size
-				*currentElements = 4;
-			} else {
-				// else add the element
-				*currentElements += 4;
+				texture_id = ro.texture_id;
 			}
+			glDrawArrays(GL_QUADS, index, ro.elements);
+			index += ro.elements;
+			++m_drawCalls;
+			m_batchedItems += ro.elements / 4;
 		}
 
-		// render
-		glDrawArrays(GL_QUADS, *currentIndex, *currentElements);
-
 		//reset all states
 		disableLighting();
 		disableTextures(0);
@@ -1291,6 +1263,8 @@ namespace FIFE {
 		int32_t* currentIndex = &index;
 		uint32_t* currentElements = &elements;
 
+		m_batchedItems += m_renderMultitextureObjectsZ.size();
+
 		enableDepthTest();
 		enableAlphaTest();
 		enableTextures(0);
@@ -1315,6 +1289,7 @@ namespace FIFE {
 				if (*currentElements > 0) {
 					//render
 					glDrawArrays(GL_QUADS, *currentIndex, *currentElements);
+					++m_drawCalls;
 					*currentIndex += *currentElements;
 				}
 				// multitexturing
@@ -1383,6 +1358,7 @@ namespace FIFE {
 		}
 		// render
 		glDrawArrays(GL_QUADS, *currentIndex, *currentElements);
+		++m_drawCalls;
 
 		//reset all states
 		if (overlay_type != OVERLAY_TYPE_NONE) {
@@ -2017,6 +1993,17 @@ namespace FIFE {
 		return &m_renderZ_objects.back();
 	}
 
+	void RenderBackendOpenGL::addToBatch(std::vector<RenderZObject>& batches, GLuint texture_id) {
+		if (!batches.empty() && batches.back().texture_id == texture_id) {
+			batches.back().elements += 4;
+		} else {
+			RenderZObject ro;
+			ro.texture_id = texture_id;
+			ro.elements = 4;
+			batches.push_back(ro);
+		}
+	}
+
 	void RenderBackendOpenGL::addImageToArrayZ(uint32_t id, const Rect& rect, float vertexZ, float const* st, uint8_t alpha, uint8_t const* rgba) {
 		// texture quad without alpha and coloring
 		if (alpha == 255 && !rgba) {
@@ -2076,9 +2063,7 @@ namespace FIFE {
 			rd.texel[1] = st[1];
 			m_renderTextureDatasZ.push_back(rd);
 
-			RenderZObject ro;
-			ro.texture_id = id;
-			m_renderTextureObjectsZ.push_back(ro);
+			addToBatch(m_renderTextureObjectsZ, id);
 		} else {
 			// multitexture with color, second texel is used for m_maskOverlay
 			if (rgba) {
@@ -2151,9 +2136,7 @@ namespace FIFE {
 				rd.texel[1] = st[1];
 				m_renderTextureColorDatasZ.push_back(rd);
 
-				RenderZObject ro;
-				ro.texture_id = id;
-				m_renderTextureColorObjectsZ.push_back(ro);
+				addToBatch(m_renderTextureColorObjectsZ, id);
 			}
 		}
 	}
@@ -2588,6 +2571,8 @@ namespace FIFE {
 		}
 		
 		glDrawElements(GL_TRIANGLES, indices.size(), GL_UNSIGNED_INT, &indices[0]);
+		++m_drawCalls;
+		m_batchedItems += indices.size() / 3;
 		
 		glPopMatrix();
 	}
@@ -140,11 +140,16 @@ namespace FIFE {
 
 		class RenderObject;
 
+		// consecutive quads with the same texture, drawn with one call
 		struct RenderZObject {
 			GLuint texture_id;
-			//uint32_t elements;
+			uint32_t elements;
 		};
 
+		/** Adds a quad to a batch list, extends the last batch if it uses the same texture.
+		 */
+		void addToBatch(std::vector<RenderZObject>& batches, GLuint texture_id);
+
 		// for regular primitives with color and alpha
 		struct renderDataP {
 			GLfloat vertex[2];
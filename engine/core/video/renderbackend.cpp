@@ -48,6 +48,10 @@ namespace FIFE {
 		m_isDepthBuffer(false),
 		m_alphaValue(0.3),
 		m_vSync(false),
+		m_drawCalls(0),
+		m_batchedItems(0),
+		m_lastDrawCalls(0),
+		m_lastBatchedItems(0),
 		m_isframelimit(false),
 		m_frame_start(0),
 		m_framelimit(60) {
@@ -73,6 +77,10 @@ namespace FIFE {
 	}
 
 	void RenderBackend::endFrame () {
+		m_lastDrawCalls = m_drawCalls;
+		m_lastBatchedItems = m_batchedItems;
+		m_drawCalls = 0;
+		m_batchedItems = 0;
 		if (m_isframelimit) {
 			uint16_t frame_time = SDL_GetTicks() - m_frame_start;
 			const float frame_limit = 1000.0f/m_framelimit;
@@ -497,6 +497,22 @@ namespace FIFE {
 		 */
 		void addControlPoints(const std::vector<Point>& points, std::vector<Point>& newPoints);
 
+		/** Returns the number of draw calls of the last frame.
+		 */
+		uint32_t getDrawCalls() const { return m_lastDrawCalls; }
+
+		/** Returns the number of items, like image quads or primitives, that were drawn
+		 * by the draw calls of the last frame. Divided by the draw calls it gives the
+		 * average batch size.
+		 */
+		uint32_t getBatchedItems() const { return m_lastBatchedItems; }
+
+		/** Counts draw calls of the current frame, used by the backends and their images.
+		 * @param calls Number of draw calls.
+		 * @param items Number of drawn items.
+		 */
+		void addDrawCalls(uint32_t calls, uint32_t items) { m_drawCalls += calls; m_batchedItems += items; }
+
 	protected:
 		
 		/** Sets given clip area into image
@@ -533,6 +549,12 @@ namespace FIFE {
 		float m_alphaValue;
 		// vsync value
 		bool m_vSync;
+		// draw calls and drawn items of the current frame
+		uint32_t m_drawCalls;
+		uint32_t m_batchedItems;
+		// draw calls and drawn items of the last frame
+		uint32_t m_lastDrawCalls;
+		uint32_t m_lastBatchedItems;
 
 		/** Clears any possible clip areas
 		 *  @see pushClipArea
@@ -242,6 +242,7 @@ namespace FIFE {
 
 	bool RenderBackendSDL::putPixel(int32_t x, int32_t y, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
 		SDL_SetRenderDrawColor(m_renderer, r, g, b, a);
+		addDrawCalls(1, 1);
 		if (SDL_RenderDrawPoint(m_renderer, x, y) == 0) {
 			return true;
 		}
@@ -251,6 +252,7 @@ namespace FIFE {
 	void RenderBackendSDL::drawLine(const Point& p1, const Point& p2, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
 		SDL_SetRenderDrawColor(m_renderer, r, g, b, a);
 		SDL_RenderDrawLine(m_renderer, p1.x, p1.y, p2.x, p2.y);
+		addDrawCalls(1, 1);
 	}
 
 	void RenderBackendSDL::drawThickLine(const Point& p1, const Point& p2, uint8_t width, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
@@ -376,8 +378,11 @@ namespace FIFE {
 	void RenderBackendSDL::drawTriangle(const Point& p1, const Point& p2, const Point& p3, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
 		SDL_SetRenderDrawColor(m_renderer, r, g, b, a);
 		SDL_RenderDrawLine(m_renderer, p1.x, p1.y, p2.x, p2.y);
+		addDrawCalls(1, 1);
 		SDL_RenderDrawLine(m_renderer, p2.x, p2.y, p3.x, p3.y);
+		addDrawCalls(1, 1);
 		SDL_RenderDrawLine(m_renderer, p3.x, p1.y, p1.x, p1.y);
+		addDrawCalls(1, 1);
 	}
 
 	void RenderBackendSDL::drawRectangle(const Point& p, uint16_t w, uint16_t h, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
@@ -388,6 +393,7 @@ namespace FIFE {
 		rect.h = h;
 		SDL_SetRenderDrawColor(m_renderer, r, g, b, a);
 		SDL_RenderDrawRect(m_renderer, &rect);
+		addDrawCalls(1, 1);
 	}
 
 	void RenderBackendSDL::fillRectangle(const Point& p, uint16_t w, uint16_t h, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
@@ -398,6 +404,7 @@ namespace FIFE {
 		rect.h = h;
 		SDL_SetRenderDrawColor(m_renderer, r, g, b, a);
 		SDL_RenderFillRect(m_renderer, &rect);
+		addDrawCalls(1, 1);
 	}
 
 	void RenderBackendSDL::drawQuad(const Point& p1, const Point& p2, const Point& p3, const Point& p4, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
@@ -412,9 +419,13 @@ namespace FIFE {
 
 		SDL_SetRenderDrawColor(m_renderer, r, g, b, a);
 		SDL_RenderDrawLine(m_renderer, p1.x, p1.y, p2.x, p2.y);
+		addDrawCalls(1, 1);
 		SDL_RenderDrawLine(m_renderer, p2.x, p2.y, p3.x, p3.y);
+		addDrawCalls(1, 1);
 		SDL_RenderDrawLine(m_renderer, p3.x, p3.y, p4.x, p4.y);
+		addDrawCalls(1, 1);
 		SDL_RenderDrawLine(m_renderer, p4.x, p4.y, p1.x, p1.y);
+		addDrawCalls(1, 1);
 	}
 
 	void RenderBackendSDL::drawCircle(const Point& p, uint32_t radius, uint8_t r, uint8_t g, uint8_t b, uint8_t a) {
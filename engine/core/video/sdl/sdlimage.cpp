@@ -124,6 +124,15 @@ namespace FIFE {
 
 		SDL_Renderer* renderer = static_cast<RenderBackendSDL*>(RenderBackend::instance())->getRenderer();
 
+		// the atlas could be freed in the meantime
+		if (m_shared) {
+			validateShared();
+		}
+		markUsed();
+		if (m_shared) {
+			m_atlas_img->markUsed();
+		}
+
 		// create texture
 		if (!m_texture) {
 			if (!m_surface) {
@@ -146,6 +155,7 @@ namespace FIFE {
 		if (SDL_RenderCopy(renderer, m_texture, &srcRect, &tarRect) != 0) {
 			throw SDLException(SDL_GetError());
 		}
+		RenderBackend::instance()->addDrawCalls(1, 1);
 	}
 
 	size_t SDLImage::getSize() {
@@ -221,6 +231,19 @@ namespace FIFE {
 		m_state = IResource::RES_NOT_LOADED;
 	}
 
+	void SDLImage::copySubimage(uint32_t xoffset, uint32_t yoffset, const ImagePtr& img) {
+		Image::copySubimage(xoffset, yoffset, img);
+
+		// the texture is shared with the subimages, so it is updated instead of recreated
+		if (m_texture && !m_shared) {
+			SDL_Rect rect = { static_cast<int>(xoffset), static_cast<int>(yoffset),
+				static_cast<int>(img->getWidth()), static_cast<int>(img->getHeight()) };
+			const uint8_t* pixels = static_cast<uint8_t*>(m_surface->pixels) +
+				yoffset * m_surface->pitch + xoffset * m_surface->format->BytesPerPixel;
+			SDL_UpdateTexture(m_texture, &rect, pixels, m_surface->pitch);
+		}
+	}
+
 	SDL_Texture* SDLImage::getTexture() {
 		return m_texture;
 	}
@@ -55,6 +55,7 @@ namespace FIFE {
 		virtual void forceLoadInternal();
 		virtual void load();
 		virtual void free();
+		virtual void copySubimage(uint32_t xoffset, uint32_t yoffset, const ImagePtr& img);
 
 		SDL_Texture* getTexture();
 		void setTexture(SDL_Texture* texture);
@@ -27,6 +27,7 @@
 #include "video/imagemanager.h"
 #include "video/animationmanager.h"
 #include "video/renderbackend.h"
+#include "video/null/renderbackendnull.h"
 #include "video/devicecaps.h"
 #include "video/atlasbook.h"
 #include "video/color.h"
@@ -64,8 +65,8 @@ namespace FIFE {
 		//void render(const Rect& rect, uint8_t alpha = 255, uint8_t const* rgb = 0);
 		virtual ~Image();
 		SDL_Surface* getSurface();
-		uint32_t getWidth() const;
-		uint32_t getHeight() const;
+		virtual uint32_t getWidth() const;
+		virtual uint32_t getHeight() const;
 		Rect getArea() const;
 		void setXShift(int32_t xshift);
 		inline int32_t getXShift() const;
@@ -129,6 +130,28 @@ namespace FIFE {
 		virtual void invalidate(const std::string& name);
 		virtual void invalidate(ResourceHandle handle);
 		virtual void invalidateAll();
+
+		void setAsyncLoadingEnabled(bool enabled);
+		bool isAsyncLoadingEnabled() const;
+		void setUploadBudget(uint32_t ms);
+		uint32_t getUploadBudget() const;
+		void prefetch(const ImagePtr& image);
+		void prefetch(const std::vector<std::string>& names);
+		uint32_t getPendingLoadCount() const;
+		void processAsyncLoads();
+
+		void setMemoryBudget(size_t bytes);
+		size_t getMemoryBudget() const;
+		void enforceMemoryBudget();
+		uint32_t getEvictionCount() const;
+		size_t getEvictedBytes() const;
+
+		void setAutoAtlasingEnabled(bool enabled);
+		bool isAutoAtlasingEnabled() const;
+		void setAtlasPageSize(uint32_t size);
+		uint32_t getAtlasPageSize() const;
+		uint32_t getAtlasPageCount() const;
+		bool packIntoAtlas(const ImagePtr& image);
 	};
 	
 	class Animation: public IResource {
@@ -192,6 +215,15 @@ namespace FIFE {
 		virtual void invalidate(const std::string& name);
 		virtual void invalidate(ResourceHandle handle);
 		virtual void invalidateAll();
+
+		void prefetch(const std::vector<std::string>& names);
+
+		void setMemoryBudget(size_t bytes);
+		size_t getMemoryBudget() const;
+		size_t getFrameMemoryUsed();
+		void enforceMemoryBudget();
+		uint32_t getEvictionCount() const;
+		size_t getEvictedBytes() const;
 	};
 
 	enum TextureFiltering {
@@ -242,6 +274,20 @@ namespace FIFE {
 		bool isFrameLimitEnabled() const;
 		void setFrameLimit(uint16_t framelimit);
 		uint16_t getFrameLimit() const;
+		uint32_t getDrawCalls() const;
+		uint32_t getBatchedItems() const;
+	};
+
+	class RenderBackendNull : public RenderBackend {
+	public:
+		virtual ~RenderBackendNull();
+		virtual const std::string& getName() const;
+
+		uint32_t getImageDraws() const;
+		uint32_t getFrameCount() const;
+		void resetCounters();
+
+		static RenderBackendNull* getInstance();
 	};
 	
 	enum MouseCursorType {
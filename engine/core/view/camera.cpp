@@ -36,9 +36,12 @@
 #include "model/structures/instancetree.h"
 #include "model/structures/instance.h"
 #include "model/structures/location.h"
+#include "util/base/workerpool.h"
 #include "util/log/logger.h"
 #include "util/math/fife_math.h"
 #include "util/math/angles.h"
+#include "util/structures/purge.h"
+#include "util/time/profiler.h"
 #include "util/time/timemanager.h"
 #include "video/renderbackend.h"
 #include "video/image.h"
@@ -47,12 +50,31 @@
 
 #include "camera.h"
 #include "layercache.h"
+#include "layertilecache.h"
 #include "visual.h"
 
 
 namespace FIFE {
 	static Logger _log(LM_CAMERA);
 
+	class LayerCacheUpdateTask : public WorkerTask {
+	public:
+		LayerCacheUpdateTask(LayerCache* cache, Camera::Transform transform, RenderList& renderlist):
+			m_cache(cache),
+			m_transform(transform),
+			m_renderlist(renderlist) {
+		}
+
+		virtual void run() {
+			m_cache->finishUpdate(m_transform, m_renderlist);
+		}
+
+	private:
+		LayerCache* m_cache;
+		Camera::Transform m_transform;
+		RenderList& m_renderlist;
+	};
+
 	// to avoid std::bad_alloc errors, we determine the maximum size of batches
 	const uint32_t MAX_BATCH_SIZE = 100000;
 
@@ -105,6 +127,10 @@ namespace FIFE {
 			m_renderers(),
 			m_pipeline(),
 			m_updated(false),
+			m_parallelUpdate(false),
+			m_keySorting(true),
+			m_staticLayerTiling(false),
+			m_staticLayerTileSize(256),
 			m_renderbackend(renderbackend),
 			m_layerToInstances(),
 			m_lighting(false),
@@ -209,6 +235,42 @@ namespace FIFE {
 		return m_enabledZToY;
 	}
 
+	void Camera::setParallelUpdateEnabled(bool enabled) {
+		m_parallelUpdate = enabled;
+	}
+
+	bool Camera::isParallelUpdateEnabled() const {
+		return m_parallelUpdate;
+	}
+
+	void Camera::setKeySortingEnabled(bool enabled) {
+		m_keySorting = enabled;
+	}
+
+	bool Camera::isKeySortingEnabled() const {
+		return m_keySorting;
+	}
+
+	void Camera::setStaticLayerTilingEnabled(bool enabled) {
+		m_staticLayerTiling = enabled;
+	}
+
+	bool Camera::isStaticLayerTilingEnabled() const {
+		return m_staticLayerTiling;
+	}
+
+	void Camera::setStaticLayerTileSize(uint32_t size) {
+		if (size == 0) {
+			FL_WARN(_log, "Static layer tile size has to be greater than 0");
+			return;
+		}
+		m_staticLayerTileSize = size;
+	}
+
+	uint32_t Camera::getStaticLayerTileSize() const {
+		return m_staticLayerTileSize;
+	}
+
 	void Camera::setCellImageDimensions(uint32_t width, uint32_t height) {
 		m_screen_cell_width = width;
 		m_screen_cell_height = height;
@@ -905,9 +967,17 @@ namespace FIFE {
 
 	void Camera::renderStaticLayer(Layer* layer, bool update) {
 		// ToDo: Remove this function from the camera class to something like engine pre-render.
-		// ToDo: Check if partial rendering of only updated RenderItems to existing FBO is possible/faster in our case.
 		// ToDo: Add and fix support for SDL backend, for SDL it works only on the lowest layer(alpha/transparent bug).
+		if (m_staticLayerTiling) {
+			renderStaticLayerTiles(layer);
+			return;
+		}
 		LayerCache* cache = m_cache[layer];
+		if (cache->getTileCache()) {
+			// the image was not updated while the layer was tiled
+			cache->setTileCache(0);
+			update = true;
+		}
 		ImagePtr cacheImage = cache->getCacheImage();
 		if (!cacheImage.get()) {
 			// the cacheImage name will be, camera id + _virtual_layer_image_ + layer id
@@ -926,34 +996,113 @@ namespace FIFE {
 			// here we use the new viewport size
 			m_renderbackend->pushClipArea(rec, false);
 			// render stuff to texture
-			RenderList& instancesToRender = m_layerToInstances[layer];
-			// split the RenderList into smaller parts
-			if (instancesToRender.size() > MAX_BATCH_SIZE) {
-				uint8_t batches = ceil(instancesToRender.size() / static_cast<float>(MAX_BATCH_SIZE));
-				uint32_t residual = instancesToRender.size() % MAX_BATCH_SIZE;
-				for (uint8_t i = 0; i < batches; ++i) {
-					uint32_t start = i*MAX_BATCH_SIZE;
-					uint32_t end = start + ((i+1 == batches) ? residual : MAX_BATCH_SIZE);
-					RenderList tempList(instancesToRender.begin() + start, instancesToRender.begin() + end);
-					std::list<RendererBase*>::iterator r_it = m_pipeline.begin();
-					for (; r_it != m_pipeline.end(); ++r_it) {
-						if ((*r_it)->isActivedLayer(layer)) {
-							(*r_it)->render(this, layer, tempList);
-							m_renderbackend->renderVertexArrays();
-						}
-					}
-				}
-			} else {
+			renderLayer(layer, m_layerToInstances[layer]);
+			m_renderbackend->detachRenderTarget();
+			m_renderbackend->popClipArea();
+		}
+	}
+
+	void Camera::renderStaticLayerTiles(Layer* layer) {
+		LayerCache* cache = m_cache[layer];
+		LayerTileCache* tileCache = cache->getTileCache();
+		if (!tileCache || tileCache->getTileSize() != m_staticLayerTileSize) {
+			// the tile image names will be, camera id + _layer_tile_ + layer id + _ + number
+			tileCache = new LayerTileCache(m_id+"_layer_tile_"+layer->getId(), m_staticLayerTileSize);
+			cache->setTileCache(tileCache);
+		}
+		if (!layer->areInstancesVisible()) {
+			return;
+		}
+
+		std::vector<LayerTileCache::Tile*> tiles;
+		tileCache->getTiles(getStaticLayerTileArea(), tiles);
+		const uint32_t size = tileCache->getTileSize();
+		// like above, OpenGL expects the clip area at the bottom of the screen
+		Rect rec(0, m_renderbackend->getHeight()-size, size, size);
+		if (m_renderbackend->getName() == "SDL") {
+			rec = Rect(0, 0, size, size);
+		}
+		std::vector<Rect> dimensions;
+		std::vector<LayerTileCache::Tile*>::iterator it = tiles.begin();
+		for (; it != tiles.end(); ++it) {
+			LayerTileCache::Tile* tile = *it;
+			if (!tile->dirty) {
+				continue;
+			}
+			RenderList instancesToRender;
+			cache->getTileRenderList(tile->area, instancesToRender);
+			// moves the items into the tile, the screen position is restored afterwards
+			dimensions.clear();
+			RenderList::iterator item_it = instancesToRender.begin();
+			for (; item_it != instancesToRender.end(); ++item_it) {
+				RenderItem* item = *item_it;
+				dimensions.push_back(item->dimensions);
+				item->dimensions.x = static_cast<int32_t>(round(item->screenpoint.x * m_zoom)) - tile->area.x;
+				item->dimensions.y = static_cast<int32_t>(round(item->screenpoint.y * m_zoom)) - tile->area.y;
+			}
+			m_renderbackend->attachRenderTarget(tile->image, true);
+			m_renderbackend->pushClipArea(rec, false);
+			renderLayer(layer, instancesToRender);
+			m_renderbackend->detachRenderTarget();
+			m_renderbackend->popClipArea();
+			for (uint32_t i = 0; i != instancesToRender.size(); ++i) {
+				instancesToRender[i]->dimensions = dimensions[i];
+			}
+			tile->dirty = false;
+		}
+	}
+
+	void Camera::drawStaticLayerTiles(Layer* layer) {
+		LayerTileCache* tileCache = m_cache[layer]->getTileCache();
+		if (!tileCache || !layer->areInstancesVisible()) {
+			return;
+		}
+		Rect area = getStaticLayerTileArea();
+		std::vector<LayerTileCache::Tile*> tiles;
+		tileCache->getTiles(area, tiles);
+		std::vector<LayerTileCache::Tile*>::iterator it = tiles.begin();
+		for (; it != tiles.end(); ++it) {
+			Rect rec = (*it)->area;
+			rec.x += m_viewport.x - area.x;
+			rec.y += m_viewport.y - area.y;
+			(*it)->image->render(rec);
+		}
+		m_renderbackend->renderVertexArrays();
+	}
+
+	Rect Camera::getStaticLayerTileArea() {
+		// the virtual screen is only scaled and moved on screen
+		ScreenPoint origin = virtualScreenToScreen(DoublePoint3D(0.0, 0.0, 0.0));
+		return Rect(m_viewport.x - origin.x, m_viewport.y - origin.y, m_viewport.w, m_viewport.h);
+	}
+
+	void Camera::renderLayer(Layer* layer, RenderList& instancesToRender) {
+		// split the RenderList into smaller parts
+		if (instancesToRender.size() > MAX_BATCH_SIZE) {
+			uint8_t batches = ceil(instancesToRender.size() / static_cast<float>(MAX_BATCH_SIZE));
+			uint32_t residual = instancesToRender.size() % MAX_BATCH_SIZE;
+			for (uint8_t i = 0; i < batches; ++i) {
+				uint32_t start = i*MAX_BATCH_SIZE;
+				uint32_t end = start + ((i+1 == batches) ? residual : MAX_BATCH_SIZE);
+				RenderList tempList(instancesToRender.begin() + start, instancesToRender.begin() + end);
 				std::list<RendererBase*>::iterator r_it = m_pipeline.begin();
 				for (; r_it != m_pipeline.end(); ++r_it) {
 					if ((*r_it)->isActivedLayer(layer)) {
-						(*r_it)->render(this, layer, instancesToRender);
+						ScopedProfile zone(Profiler::getActive() ? (*r_it)->getName() : std::string());
+						(*r_it)->render(this, layer, tempList);
 						m_renderbackend->renderVertexArrays();
 					}
 				}
 			}
-			m_renderbackend->detachRenderTarget();
-			m_renderbackend->popClipArea();
+		} else {
+			std::list<RendererBase*>::iterator r_it = m_pipeline.begin();
+			for (; r_it != m_pipeline.end(); ++r_it) {
+				if ((*r_it)->isActivedLayer(layer)) {
+					ScopedProfile zone(Profiler::getActive() ? (*r_it)->getName() : std::string());
+					(*r_it)->render(this, layer, instancesToRender);
+					m_renderbackend->renderVertexArrays();
+				}
+			}
 		}
 	}
 
@@ -964,6 +1113,8 @@ namespace FIFE {
 			return;
 		}
 
+		bool parallel = m_parallelUpdate && m_transform != NoneTransform;
+		std::vector<WorkerTask*> tasks;
 		const std::list<Layer*>& layers = map->getLayers();
 		std::list<Layer*>::const_iterator layer_it = layers.begin();
 		for (;layer_it != layers.end(); ++layer_it) {
@@ -974,10 +1125,20 @@ namespace FIFE {
 				FL_ERR(_log, LMsg("Layer Cache miss! (This shouldn't happen!)") << (*layer_it)->getId());
 			}
 			RenderList& instancesToRender = m_layerToInstances[*layer_it];
-			if ((*layer_it)->isStatic() && m_transform == NoneTransform) {
+			// tiled static layers have to follow instance changes
+			if ((*layer_it)->isStatic() && m_transform == NoneTransform && !m_staticLayerTiling) {
 				continue;
 			}
-			cache->update(m_transform, instancesToRender);
+			if (!parallel) {
+				cache->update(m_transform, instancesToRender);
+			} else if (cache->prepareUpdate(m_transform, instancesToRender)) {
+				tasks.push_back(new LayerCacheUpdateTask(cache, m_transform, instancesToRender));
+			}
+		}
+		if (!tasks.empty()) {
+			ScopedProfile zone("LayerCache::finishUpdate");
+			WorkerPool::instance()->execute(tasks);
+			purge(tasks);
 		}
 		resetUpdates();
 	}
@@ -1011,38 +1172,17 @@ namespace FIFE {
 
 		layer_it = layers.begin();
 		for ( ; layer_it != layers.end(); ++layer_it) {
-			// layer with static flag will rendered as one texture
+			// layer with static flag will rendered as one texture or in tiles
 			if ((*layer_it)->isStatic()) {
-				m_cache[*layer_it]->getCacheImage()->render(m_viewport);
-				m_renderbackend->renderVertexArrays();
-				continue;
-			}
-			RenderList& instancesToRender = m_layerToInstances[*layer_it];
-			// split the RenderList into smaller parts
-			if (instancesToRender.size() > MAX_BATCH_SIZE) {
-				uint8_t batches = ceil(instancesToRender.size() / static_cast<float>(MAX_BATCH_SIZE));
-				uint32_t residual = instancesToRender.size() % MAX_BATCH_SIZE;
-				for (uint8_t i = 0; i < batches; ++i) {
-					uint32_t start = i*MAX_BATCH_SIZE;
-					uint32_t end = start + ((i+1 == batches) ? residual : MAX_BATCH_SIZE);
-					RenderList tempList(instancesToRender.begin() + start, instancesToRender.begin() + end);
-					std::list<RendererBase*>::iterator r_it = m_pipeline.begin();
-					for (; r_it != m_pipeline.end(); ++r_it) {
-						if ((*r_it)->isActivedLayer(*layer_it)) {
-							(*r_it)->render(this, *layer_it, tempList);
-							m_renderbackend->renderVertexArrays();
-						}
-					}
-				}
-			} else {
-				std::list<RendererBase*>::iterator r_it = m_pipeline.begin();
-				for (; r_it != m_pipeline.end(); ++r_it) {
-					if ((*r_it)->isActivedLayer(*layer_it)) {
-						(*r_it)->render(this, *layer_it, instancesToRender);
-						m_renderbackend->renderVertexArrays();
-					}
+				if (m_staticLayerTiling) {
+					drawStaticLayerTiles(*layer_it);
+				} else {
+					m_cache[*layer_it]->getCacheImage()->render(m_viewport);
+					m_renderbackend->renderVertexArrays();
 				}
+				continue;
 			}
+			renderLayer(*layer_it, m_layerToInstances[*layer_it]);
 		}
 
 		renderOverlay();
@@ -154,6 +154,55 @@ namespace FIFE {
 		 */
 		bool isZToYEnabled() const;
 
+		/** Enables or disables the parallel update of the layer caches.
+		 * If enabled, the positions of all layers are updated on the worker
+		 * pool before the render pass. Helps on maps with many layers when the
+		 * camera is rotated or zoomed.
+		 * @param enabled A boolean, true to enable or false to disable.
+		 */
+		void setParallelUpdateEnabled(bool enabled);
+
+		/** Gets if the parallel update of the layer caches is enabled.
+		 * @return true if it is enabled, otherwise false.
+		 */
+		bool isParallelUpdateEnabled() const;
+
+		/** Enables or disables the sorting of the render lists with packed integer keys.
+		 * Gives the same order as the comparison sort, but is faster on large layers.
+		 * Enabled by default.
+		 * @param enabled A boolean, true to enable or false to disable.
+		 */
+		void setKeySortingEnabled(bool enabled);
+
+		/** Gets if the render lists are sorted with packed integer keys.
+		 * @return true if it is enabled, otherwise false.
+		 */
+		bool isKeySortingEnabled() const;
+
+		/** Enables or disables the rendering of static layers in prerendered tiles.
+		 * The tiles are kept while the camera is moved, only tiles that scroll into
+		 * view or contain changed instances are rendered again. Zoom, rotation and
+		 * tilt changes invalidate all tiles.
+		 * Renderers that draw from the camera transformation instead of the render
+		 * items, like the grid renderer, should not be active on tiled layers.
+		 * @param enabled A boolean, true to enable or false to disable.
+		 */
+		void setStaticLayerTilingEnabled(bool enabled);
+
+		/** Gets if static layers are rendered in prerendered tiles.
+		 * @return true if it is enabled, otherwise false.
+		 */
+		bool isStaticLayerTilingEnabled() const;
+
+		/** Sets the width and height of the static layer tiles in pixels, default is 256.
+		 * @param size The tile size, must be greater than 0.
+		 */
+		void setStaticLayerTileSize(uint32_t size);
+
+		/** Gets the width and height of the static layer tiles in pixels.
+		 */
+		uint32_t getStaticLayerTileSize() const;
+
 		/** Sets screen cell image dimensions.
 		 * Cell image dimension is basically width and height of a bitmap, that covers
 		 * one cell in the layer where camera is bind
@@ -452,6 +501,22 @@ namespace FIFE {
 		 */
 		void renderStaticLayer(Layer* layer, bool update);
 
+		/** Renders the dirty tiles of the static layer that are on screen.
+		 */
+		void renderStaticLayerTiles(Layer* layer);
+
+		/** Draws the tiles of the static layer that are on screen.
+		 */
+		void drawStaticLayerTiles(Layer* layer);
+
+		/** Returns the viewport in zoomed virtual screen coordinates, the coordinates of the tiles.
+		 */
+		Rect getStaticLayerTileArea();
+
+		/** Renders the RenderList with the renderers of the pipeline that are active on the layer.
+		 */
+		void renderLayer(Layer* layer, RenderList& instancesToRender);
+
 		DoubleMatrix m_matrix;
 		DoubleMatrix m_inverse_matrix;
 
@@ -486,6 +551,13 @@ namespace FIFE {
 		std::list<RendererBase*> m_pipeline;
 		// false, if view has not been updated
 		bool m_updated;
+		// update the layer caches on the worker pool
+		bool m_parallelUpdate;
+		// sort the render lists with packed keys
+		bool m_keySorting;
+		// render static layers in prerendered tiles
+		bool m_staticLayerTiling;
+		uint32_t m_staticLayerTileSize;
 
 		RenderBackend* m_renderbackend;
 
@@ -48,6 +48,14 @@ namespace FIFE {
 		double getZToY() const;
 		void setZToYEnabled(bool enabled);
 		bool isZToYEnabled() const;
+		void setParallelUpdateEnabled(bool enabled);
+		bool isParallelUpdateEnabled() const;
+		void setKeySortingEnabled(bool enabled);
+		bool isKeySortingEnabled() const;
+		void setStaticLayerTilingEnabled(bool enabled);
+		bool isStaticLayerTilingEnabled() const;
+		void setStaticLayerTileSize(uint32_t size);
+		uint32_t getStaticLayerTileSize() const;
 		void setLocation(Location location);
 		Location getLocation() const;
 		Point3D getOrigin() const;
@@ -20,7 +20,9 @@
  ***************************************************************************/
 
 // Standard C++ library includes
+#include <algorithm>
 #include <cfloat>
+#include <cstring>
 
 // 3rd party library includes
 
@@ -38,6 +40,7 @@
 #include "util/log/logger.h"
 #include "util/math/fife_math.h"
 #include "util/math/angles.h"
+#include "util/time/profiler.h"
 #include "video/renderbackend.h"
 #include "video/image.h"
 #include "video/animation.h"
@@ -45,6 +48,7 @@
 
 #include "camera.h"
 #include "layercache.h"
+#include "layertilecache.h"
 #include "visual.h"
 
 
@@ -131,14 +135,12 @@ namespace FIFE {
 		}
 
 		inline bool operator()(RenderItem* const & lhs, RenderItem* const & rhs) {
-			ExactModelCoordinate lpos = lhs->instance->getLocationRef().getExactLayerCoordinates();
-			ExactModelCoordinate rpos = rhs->instance->getLocationRef().getExactLayerCoordinates();
-			lpos.x += lpos.y / 2;
-			rpos.x += rpos.y / 2;
+			const ExactModelCoordinate& lpos = lhs->instance->getLocationRef().getExactLayerCoordinatesRef();
+			const ExactModelCoordinate& rpos = rhs->instance->getLocationRef().getExactLayerCoordinatesRef();
 			InstanceVisual* liv = lhs->instance->getVisual<InstanceVisual>();
 			InstanceVisual* riv = rhs->instance->getVisual<InstanceVisual>();
-			int32_t lvc = ceil(xtox*lpos.x + ytox*lpos.y) + ceil(xtoy*lpos.x + ytoy*lpos.y) + liv->getStackPosition();
-			int32_t rvc = ceil(xtox*rpos.x + ytox*rpos.y) + ceil(xtoy*rpos.x + ytoy*rpos.y) + riv->getStackPosition();
+			int32_t lvc = getVisualOrder(lpos, liv->getStackPosition());
+			int32_t rvc = getVisualOrder(rpos, riv->getStackPosition());
 			if (lvc == rvc) {
 				if (Mathd::Equal(lpos.z, rpos.z)) {
 					return liv->getStackPosition() < riv->getStackPosition();
@@ -147,6 +149,11 @@ namespace FIFE {
 			}
 			return lvc < rvc;
 		}
+
+		inline int32_t getVisualOrder(const ExactModelCoordinate& pos, int32_t stackPosition) const {
+			double x = pos.x + pos.y / 2;
+			return ceil(xtox*x + ytox*pos.y) + ceil(xtoy*x + ytoy*pos.y) + stackPosition;
+		}
 	private:
 		double xtox;
 		double xtoy;
@@ -171,11 +178,62 @@ namespace FIFE {
 		}
 	};
 
+	// maps a double to an unsigned integer with the same order
+	inline uint64_t toSortKey(double value) {
+		// -0.0 and 0.0 are equal
+		if (value == 0.0) {
+			value = 0.0;
+		}
+		uint64_t bits;
+		std::memcpy(&bits, &value, sizeof(bits));
+		static const uint64_t signBit = static_cast<uint64_t>(1) << 63;
+		return (bits & signBit) ? ~bits : bits | signBit;
+	}
+
+	// maps a signed integer to an unsigned integer with the same order
+	inline uint32_t toSortKey(int32_t value) {
+		return static_cast<uint32_t>(value) ^ 0x80000000u;
+	}
+
+	template<typename T>
+	inline bool isLess(const T& lhs, const T& rhs) {
+		if (lhs.primary != rhs.primary) {
+			return lhs.primary < rhs.primary;
+		}
+		if (lhs.secondary != rhs.secondary) {
+			return lhs.secondary < rhs.secondary;
+		}
+		if (lhs.stack != rhs.stack) {
+			return lhs.stack < rhs.stack;
+		}
+		return lhs.index < rhs.index;
+	}
+
+	template<typename T>
+	class SortKeyLess {
+	public:
+		inline bool operator()(const T& lhs, const T& rhs) const {
+			return isLess(lhs, rhs);
+		}
+	};
+
+	// returns the digit of the key, 0-3 are the stack, 4-11 the secondary and 12-19 the primary bytes
+	template<typename T>
+	inline uint32_t getDigit(const T& key, uint32_t digit) {
+		if (digit < 4) {
+			return (key.stack >> (digit * 8)) & 0xFF;
+		} else if (digit < 12) {
+			return static_cast<uint32_t>(key.secondary >> ((digit - 4) * 8)) & 0xFF;
+		}
+		return static_cast<uint32_t>(key.primary >> ((digit - 12) * 8)) & 0xFF;
+	}
+
 	LayerCache::LayerCache(Camera* camera) {
 		m_camera = camera;
 		m_layer = 0;
 		m_layerObserver = 0;
 		m_tree = 0;
+		m_tileCache = 0;
 		m_zMin = 0.0;
 		m_zMax = 0.0;
 		m_zoom = camera->getZoom();
@@ -201,6 +259,7 @@ namespace FIFE {
 		m_layer->removeChangeListener(m_layerObserver);
 		delete m_layerObserver;
 		delete m_tree;
+		delete m_tileCache;
 	}
 
 	void LayerCache::setLayer(Layer* layer) {
@@ -231,6 +290,9 @@ namespace FIFE {
 		m_entriesToUpdate.clear();
 		m_freeEntries.clear();
 		m_cacheImage.reset();
+		if (m_tileCache) {
+			m_tileCache->invalidate();
+		}
 
 		delete m_tree;
 		m_tree = new CacheTree;
@@ -283,6 +345,7 @@ namespace FIFE {
 		Entry* entry = m_entries[m_instance_map[instance]];
 		assert(entry->instanceIndex == m_instance_map[instance]);
 		RenderItem* item = m_renderItems[entry->instanceIndex];
+		invalidateTiles(item);
 		// removes entry from updates
 		std::set<int32_t>::iterator it = m_entriesToUpdate.find(entry->entryIndex);
 		if (it != m_entriesToUpdate.end()) {
@@ -367,6 +430,13 @@ namespace FIFE {
 	}
 
 	void LayerCache::update(Camera::Transform transform, RenderList& renderlist) {
+		ScopedProfile zone(Profiler::getActive() ? "LayerCache::update " + m_layer->getId() : std::string());
+		if (prepareUpdate(transform, renderlist)) {
+			finishUpdate(transform, renderlist);
+		}
+	}
+
+	bool LayerCache::prepareUpdate(Camera::Transform transform, RenderList& renderlist) {
 		// this is only a bit faster, but works without this block too.
 		if(!m_layer->areInstancesVisible()) {
 			FL_DBG(_log, "Layer instances hidden");
@@ -378,7 +448,10 @@ namespace FIFE {
 			}
 			m_entriesToUpdate.clear();
 			renderlist.clear();
-			return;
+			if (m_tileCache) {
+				m_tileCache->invalidate();
+			}
+			return false;
 		}
 		// if transform is none then we have only to update the instances with an update info.
 		if (transform == Camera::NoneTransform) {
@@ -393,75 +466,89 @@ namespace FIFE {
 					}
 				}
 			}
-		} else {
-			m_zoom = m_camera->getZoom();
-			m_zoomed = !Mathd::Equal(m_zoom, 1.0);
-			m_straightZoom = Mathd::Equal(fmod(m_zoom, 1.0), 0.0);
-			// clear old renderlist
-			renderlist.clear();
-			// update all entries
-			if ((transform & Camera::RotationTransform) == Camera::RotationTransform ||
-				(transform & Camera::TiltTransform) == Camera::TiltTransform ||
-				(transform & Camera::ZTransform) == Camera::ZTransform) {
-				fullUpdate(transform);
-			} else {
-				fullCoordinateUpdate(transform);
-			}
-
-			// create viewport coordinates to collect entries
-			Rect viewport = m_camera->getViewPort();
-			Rect screenViewport = viewport;
-			DoublePoint3D viewport_a = m_camera->screenToVirtualScreen(Point3D(viewport.x, viewport.y));
-			DoublePoint3D viewport_b = m_camera->screenToVirtualScreen(Point3D(viewport.right(), viewport.bottom()));
-			viewport.x = static_cast<int32_t>(std::min(viewport_a.x, viewport_b.x));
-			viewport.y = static_cast<int32_t>(std::min(viewport_a.y, viewport_b.y));
-			viewport.w = static_cast<int32_t>(std::max(viewport_a.x, viewport_b.x) - viewport.x);
-			viewport.h = static_cast<int32_t>(std::max(viewport_a.y, viewport_b.y) - viewport.y);
-			m_zMin = 0.0;
-			m_zMax = 0.0;
-
-			// FL_LOG(_log, LMsg("camera-update viewport") << viewport);
-			std::vector<int32_t> index_list;
-			collect(viewport, index_list);
-			// fill renderlist
-			for (uint32_t i = 0; i != index_list.size(); ++i) {
-				Entry* entry = m_entries[index_list[i]];
-				RenderItem* item = m_renderItems[entry->instanceIndex];
-				if (!item->image || !entry->visible) {
-					continue;
-				}
+			return false;
+		}
 
-				if (item->dimensions.intersects(screenViewport)) {
-					renderlist.push_back(item);
-				}
+		// the tiles lie on a grid in zoomed virtual screen coordinates, only a move keeps them valid
+		if (m_tileCache && transform != Camera::PositionTransform) {
+			m_tileCache->invalidate();
+		}
+		m_zoom = m_camera->getZoom();
+		m_zoomed = !Mathd::Equal(m_zoom, 1.0);
+		m_straightZoom = Mathd::Equal(fmod(m_zoom, 1.0), 0.0);
+		// clear old renderlist
+		renderlist.clear();
+		fullVisualUpdate(transform);
+		// the camera calculates the map viewport lazily, so do it here and not in finishUpdate
+		if (!m_needSorting) {
+			m_camera->getMapViewPort();
+		}
+		return true;
+	}
+
+	void LayerCache::finishUpdate(Camera::Transform transform, RenderList& renderlist) {
+		fullPositionUpdate(transform);
+
+		// create viewport coordinates to collect entries
+		Rect viewport = m_camera->getViewPort();
+		Rect screenViewport = viewport;
+		DoublePoint3D viewport_a = m_camera->screenToVirtualScreen(Point3D(viewport.x, viewport.y));
+		DoublePoint3D viewport_b = m_camera->screenToVirtualScreen(Point3D(viewport.right(), viewport.bottom()));
+		viewport.x = static_cast<int32_t>(std::min(viewport_a.x, viewport_b.x));
+		viewport.y = static_cast<int32_t>(std::min(viewport_a.y, viewport_b.y));
+		viewport.w = static_cast<int32_t>(std::max(viewport_a.x, viewport_b.x) - viewport.x);
+		viewport.h = static_cast<int32_t>(std::max(viewport_a.y, viewport_b.y) - viewport.y);
+		m_zMin = 0.0;
+		m_zMax = 0.0;
+
+		// FL_LOG(_log, LMsg("camera-update viewport") << viewport);
+		std::vector<int32_t> index_list;
+		collect(viewport, index_list);
+		// fill renderlist
+		for (uint32_t i = 0; i != index_list.size(); ++i) {
+			Entry* entry = m_entries[index_list[i]];
+			RenderItem* item = m_renderItems[entry->instanceIndex];
+			if (!item->image || !entry->visible) {
+				continue;
 			}
 
-			if (m_needSorting) {
-				sortRenderList(renderlist);
-			} else {
-				// calculates zmin and zmax of the current viewport
-				Rect r = m_camera->getMapViewPort();
-				std::vector<ExactModelCoordinate> coords;
-				coords.push_back(ExactModelCoordinate(r.x, r.y));
-				coords.push_back(ExactModelCoordinate(r.x, r.y+r.h));
-				coords.push_back(ExactModelCoordinate(r.x+r.w, r.y));
-				coords.push_back(ExactModelCoordinate(r.x+r.w, r.y+r.h));
-				for (uint8_t i = 0; i < 4; ++i) {
-					double z = m_camera->toVirtualScreenCoordinates(coords[i]).z;
-					m_zMin = std::min(z, m_zMin);
-					m_zMax = std::max(z, m_zMax);
-				}
+			if (item->dimensions.intersects(screenViewport)) {
+				renderlist.push_back(item);
+			}
+		}
 
-				sortRenderList(renderlist);
+		if (m_needSorting) {
+			sortRenderList(renderlist);
+		} else {
+			// calculates zmin and zmax of the current viewport
+			Rect r = m_camera->getMapViewPort();
+			std::vector<ExactModelCoordinate> coords;
+			coords.push_back(ExactModelCoordinate(r.x, r.y));
+			coords.push_back(ExactModelCoordinate(r.x, r.y+r.h));
+			coords.push_back(ExactModelCoordinate(r.x+r.w, r.y));
+			coords.push_back(ExactModelCoordinate(r.x+r.w, r.y+r.h));
+			for (uint8_t i = 0; i < 4; ++i) {
+				double z = m_camera->toVirtualScreenCoordinates(coords[i]).z;
+				m_zMin = std::min(z, m_zMin);
+				m_zMax = std::max(z, m_zMax);
 			}
+
+			sortRenderList(renderlist);
 		}
 	}
-	
-	void LayerCache::fullUpdate(Camera::Transform transform) {
+
+	void LayerCache::fullVisualUpdate(Camera::Transform transform) {
+		bool fullUpdate = (transform & Camera::RotationTransform) == Camera::RotationTransform ||
+			(transform & Camera::TiltTransform) == Camera::TiltTransform ||
+			(transform & Camera::ZTransform) == Camera::ZTransform;
 		bool rotationChange = (transform & Camera::RotationTransform) == Camera::RotationTransform;
+		m_positionUpdates.clear();
 		for (uint32_t i = 0; i != m_entries.size(); ++i) {
 			Entry* entry = m_entries[i];
-			if (entry->instanceIndex != -1) {
+			if (entry->instanceIndex == -1) {
+				continue;
+			}
+			if (fullUpdate) {
 				if (rotationChange || entry->forceUpdate) {
 					bool force = entry->forceUpdate;
 					updateVisual(entry);
@@ -475,26 +562,35 @@ namespace FIFE {
 						m_entriesToUpdate.insert(entry->entryIndex);
 					}
 				}
-				updatePosition(entry);
+			} else if (entry->forceUpdate) {
+				updateVisual(entry);
+				m_positionUpdates.push_back(i);
+				if (!entry->forceUpdate) {
+					// no action
+					entry->updateInfo = EntryNoneUpdate;
+					m_entriesToUpdate.erase(entry->entryIndex);
+				}
 			}
 		}
 	}
 
-	void LayerCache::fullCoordinateUpdate(Camera::Transform transform) {
+	void LayerCache::fullPositionUpdate(Camera::Transform transform) {
+		bool fullUpdate = (transform & Camera::RotationTransform) == Camera::RotationTransform ||
+			(transform & Camera::TiltTransform) == Camera::TiltTransform ||
+			(transform & Camera::ZTransform) == Camera::ZTransform;
 		bool zoomChange = (transform & Camera::ZoomTransform) == Camera::ZoomTransform;
+		std::vector<int32_t>::const_iterator next = m_positionUpdates.begin();
 		for (uint32_t i = 0; i != m_entries.size(); ++i) {
 			Entry* entry = m_entries[i];
-			if (entry->instanceIndex != -1) {
-				if (entry->forceUpdate) {
-					updateVisual(entry);
-					updatePosition(entry);
-					if (!entry->forceUpdate) {
-						// no action
-						entry->updateInfo = EntryNoneUpdate;
-						m_entriesToUpdate.erase(entry->entryIndex);
-					}
-					continue;
-				}
+			while (next != m_positionUpdates.end() && *next < static_cast<int32_t>(i)) {
+				++next;
+			}
+			if (entry->instanceIndex == -1) {
+				continue;
+			}
+			if (fullUpdate || (next != m_positionUpdates.end() && *next == static_cast<int32_t>(i))) {
+				updatePosition(entry);
+			} else {
 				updateScreenCoordinate(m_renderItems[entry->instanceIndex], zoomChange);
 			}
 		}
@@ -563,6 +659,7 @@ namespace FIFE {
 		RenderItem* item = m_renderItems[entry->instanceIndex];
 		Instance* instance = item->instance;
 		InstanceVisual* visual = instance->getVisual<InstanceVisual>();
+		invalidateTiles(item);
 		item->facingAngle = instance->getRotation();
 		int32_t angle = static_cast<int32_t>(m_camera->getRotation()) + item->facingAngle;
 		Action* action = instance->getCurrentAction();
@@ -697,7 +794,10 @@ namespace FIFE {
 		Instance* instance = item->instance;
 		ExactModelCoordinate mapCoords = instance->getLocationRef().getMapCoordinates();
 		DoublePoint3D screenPosition = m_camera->toVirtualScreenCoordinates(mapCoords);
-		ImagePtr image = item->image;
+		// no copy, the reference count of the shared pointer is not thread safe
+		const ImagePtr& image = item->image;
+		// the old area, in case the item was moved
+		invalidateTiles(item);
 
 		if (image) {
 			int32_t w = image->getWidth();
@@ -713,6 +813,7 @@ namespace FIFE {
 		item->screenpoint = screenPosition;
 		item->bbox.x = static_cast<int32_t>(screenPosition.x);
 		item->bbox.y = static_cast<int32_t>(screenPosition.y);
+		invalidateTiles(item);
 
 		updateScreenCoordinate(item);
 
@@ -780,6 +881,8 @@ namespace FIFE {
 					z = (a * (*it)->screenpoint.z + b) + vis->getStackPosition() * stackdelta;
 				}
 			}
+		} else if (m_camera->isKeySortingEnabled()) {
+			sortRenderListByKeys(renderlist, m_layer->getSortingStrategy());
 		} else {
 			SortingStrategy strat = m_layer->getSortingStrategy();
 			switch (strat) {
@@ -803,6 +906,128 @@ namespace FIFE {
 		}
 	}
 
+	void LayerCache::sortRenderListByKeys(RenderList& renderlist, SortingStrategy strategy) {
+		buildSortKeys(renderlist, strategy);
+		// the list of the last frame is usually almost sorted
+		if (!repairSortKeys(m_sortKeys.size() / 16)) {
+			radixSortKeys();
+		}
+		for (uint32_t i = 0; i < m_sortKeys.size(); ++i) {
+			renderlist[i] = m_sortKeys[i].item;
+		}
+	}
+
+	void LayerCache::buildSortKeys(const RenderList& renderlist, SortingStrategy strategy) {
+		m_sortKeys.resize(renderlist.size());
+		InstanceDistanceSortLocation location(m_camera->getRotation());
+		for (uint32_t i = 0; i < renderlist.size(); ++i) {
+			RenderItem* item = renderlist[i];
+			int32_t stackPosition = item->instance->getVisual<InstanceVisual>()->getStackPosition();
+			SortKey& key = m_sortKeys[i];
+			key.item = item;
+			key.index = i;
+			key.stack = toSortKey(stackPosition);
+			switch (strategy) {
+				case SORTING_LOCATION: {
+					const ExactModelCoordinate& pos = item->instance->getLocationRef().getExactLayerCoordinatesRef();
+					key.primary = toSortKey(location.getVisualOrder(pos, stackPosition));
+					key.secondary = toSortKey(pos.z);
+				} break;
+				case SORTING_CAMERA_AND_LOCATION: {
+					key.primary = toSortKey(item->screenpoint.z);
+					key.secondary = toSortKey(item->instance->getLocationRef().getExactLayerCoordinatesRef().z);
+				} break;
+				default: {
+					key.primary = toSortKey(item->screenpoint.z);
+					key.secondary = 0;
+				} break;
+			}
+		}
+	}
+
+	bool LayerCache::repairSortKeys(uint32_t maxOutliers) {
+		uint32_t size = m_sortKeys.size();
+		uint32_t descents = 0;
+		for (uint32_t i = 1; i < size; ++i) {
+			if (isLess(m_sortKeys[i], m_sortKeys[i-1]) && ++descents > maxOutliers) {
+				return false;
+			}
+		}
+		if (descents == 0) {
+			return true;
+		}
+
+		// keep an ascending sequence in front and move the keys that break it aside,
+		// a key that is too large is replaced by its successor
+		std::vector<SortKey>& outliers = m_sortBuffer;
+		outliers.clear();
+		uint32_t kept = 0;
+		for (uint32_t i = 0; i < size; ++i) {
+			SortKey key = m_sortKeys[i];
+			if (kept == 0 || !isLess(key, m_sortKeys[kept-1])) {
+				m_sortKeys[kept++] = key;
+			} else if (kept < 2 || !isLess(key, m_sortKeys[kept-2])) {
+				outliers.push_back(m_sortKeys[kept-1]);
+				m_sortKeys[kept-1] = key;
+			} else {
+				outliers.push_back(key);
+			}
+		}
+		std::sort(outliers.begin(), outliers.end(), SortKeyLess<SortKey>());
+
+		// merge from the back, the keys are unique
+		int32_t k = kept - 1;
+		int32_t o = outliers.size() - 1;
+		int32_t out = size - 1;
+		while (o >= 0) {
+			if (k >= 0 && isLess(outliers[o], m_sortKeys[k])) {
+				m_sortKeys[out--] = m_sortKeys[k--];
+			} else {
+				m_sortKeys[out--] = outliers[o--];
+			}
+		}
+		return true;
+	}
+
+	void LayerCache::radixSortKeys() {
+		// 8 bit digits, least significant first: stack, secondary, primary.
+		// The sort is stable and the keys are in index order, so the index needs no pass.
+		static const uint32_t DIGITS = 20;
+		uint32_t size = m_sortKeys.size();
+		std::vector<uint32_t> counts(DIGITS * 256, 0);
+		for (uint32_t i = 0; i < size; ++i) {
+			const SortKey& key = m_sortKeys[i];
+			for (uint32_t d = 0; d < DIGITS; ++d) {
+				++counts[d * 256 + getDigit(key, d)];
+			}
+		}
+
+		m_sortBuffer.resize(size);
+		std::vector<SortKey>* source = &m_sortKeys;
+		std::vector<SortKey>* target = &m_sortBuffer;
+		for (uint32_t d = 0; d < DIGITS; ++d) {
+			uint32_t* count = &counts[d * 256];
+			// skip digits that are equal for all keys
+			if (count[getDigit((*source)[0], d)] == size) {
+				continue;
+			}
+			uint32_t offset = 0;
+			for (uint32_t b = 0; b < 256; ++b) {
+				uint32_t c = count[b];
+				count[b] = offset;
+				offset += c;
+			}
+			for (uint32_t i = 0; i < size; ++i) {
+				const SortKey& key = (*source)[i];
+				(*target)[count[getDigit(key, d)]++] = key;
+			}
+			std::swap(source, target);
+		}
+		if (source != &m_sortKeys) {
+			m_sortKeys.swap(m_sortBuffer);
+		}
+	}
+
 	ImagePtr LayerCache::getCacheImage() {
 		return m_cacheImage;
 	}
@@ -810,4 +1035,49 @@ namespace FIFE {
 	void LayerCache::setCacheImage(ImagePtr image) {
 		m_cacheImage = image;
 	}
+
+	LayerTileCache* LayerCache::getTileCache() {
+		return m_tileCache;
+	}
+
+	void LayerCache::setTileCache(LayerTileCache* cache) {
+		if (m_tileCache != cache) {
+			delete m_tileCache;
+			m_tileCache = cache;
+		}
+	}
+
+	void LayerCache::getTileRenderList(const Rect& area, RenderList& renderlist) {
+		double zoom = m_camera->getZoom();
+		// the area in virtual screen coordinates, with a small border against rounding errors
+		Rect viewport(static_cast<int32_t>(floor(area.x / zoom)) - 1, static_cast<int32_t>(floor(area.y / zoom)) - 1,
+			static_cast<int32_t>(ceil(area.w / zoom)) + 2, static_cast<int32_t>(ceil(area.h / zoom)) + 2);
+		std::vector<int32_t> index_list;
+		collect(viewport, index_list);
+		for (uint32_t i = 0; i != index_list.size(); ++i) {
+			Entry* entry = m_entries[index_list[i]];
+			RenderItem* item = m_renderItems[entry->instanceIndex];
+			if (!item->image || !entry->visible) {
+				continue;
+			}
+			Rect zoomed(static_cast<int32_t>(round(item->screenpoint.x * zoom)),
+				static_cast<int32_t>(round(item->screenpoint.y * zoom)), item->dimensions.w, item->dimensions.h);
+			if (zoomed.intersects(area)) {
+				renderlist.push_back(item);
+			}
+		}
+		sortRenderList(renderlist);
+	}
+
+	void LayerCache::invalidateTiles(const RenderItem* item) {
+		if (!m_tileCache || !item->image) {
+			return;
+		}
+		double zoom = m_camera->getZoom();
+		Rect area(static_cast<int32_t>(floor(item->screenpoint.x * zoom)) - 1,
+			static_cast<int32_t>(floor(item->screenpoint.y * zoom)) - 1,
+			static_cast<int32_t>(ceil(item->bbox.w * zoom)) + 3,
+			static_cast<int32_t>(ceil(item->bbox.h * zoom)) + 3);
+		m_tileCache->invalidate(area);
+	}
 }
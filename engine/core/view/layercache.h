@@ -26,6 +26,7 @@
 #include <string>
 #include <map>
 #include <set>
+#include <vector>
 
 // 3rd party library includes
 
@@ -45,6 +46,7 @@ namespace FIFE {
 
 	class Camera;
 	class CacheLayerChangeListener;
+	class LayerTileCache;
 
 	class LayerCache {
 	public:
@@ -57,6 +59,17 @@ namespace FIFE {
 
 		void update(Camera::Transform transform, RenderList& renderlist);
 
+		/** First part of update, has to run on the main thread.
+		 * Updates the visuals and everything that can call back into the script bindings.
+		 * @return True if finishUpdate has to be called.
+		 */
+		bool prepareUpdate(Camera::Transform transform, RenderList& renderlist);
+
+		/** Second part of update, updates positions, fills and sorts the renderlist.
+		 * Touches only this cache, so the caches of different layers can be finished in parallel.
+		 */
+		void finishUpdate(Camera::Transform transform, RenderList& renderlist);
+
 		void addInstance(Instance* instance);
 		void removeInstance(Instance* instance);
 		void updateInstance(Instance* instance);
@@ -64,6 +77,21 @@ namespace FIFE {
 		ImagePtr getCacheImage();
 		void setCacheImage(ImagePtr image);
 
+		/** Returns the tile cache of the static layer, or 0 if the layer is not rendered in tiles.
+		 */
+		LayerTileCache* getTileCache();
+
+		/** Sets the tile cache, the LayerCache takes ownership of it.
+		 * The old tile cache is deleted, 0 removes the tile cache.
+		 */
+		void setTileCache(LayerTileCache* cache);
+
+		/** Fills the renderlist with the visible items that intersect the area and sorts it.
+		 * @param area Rect in zoomed virtual screen coordinates.
+		 * @param renderlist RenderList that is filled.
+		 */
+		void getTileRenderList(const Rect& area, RenderList& renderlist);
+
 	private:
 		enum RenderEntryUpdateType {
 			EntryNoneUpdate = 0x00,
@@ -90,25 +118,52 @@ namespace FIFE {
 
 		void collect(const Rect& viewport, std::vector<int32_t>& indices);
 		void reset();
-		void fullUpdate(Camera::Transform transform);
-		void fullCoordinateUpdate(Camera::Transform transform);
+		void fullVisualUpdate(Camera::Transform transform);
+		void fullPositionUpdate(Camera::Transform transform);
 		void updateEntries(std::set<int32_t>& removes, RenderList& renderlist);
 		bool updateVisual(Entry* entry);
 		void updatePosition(Entry* entry);
 		void updateScreenCoordinate(RenderItem* item, bool changedZoom = true);
 		void sortRenderList(RenderList& renderlist);
+		void invalidateTiles(const RenderItem* item);
+
+		// Packed sort key of a RenderItem, ordered by primary, secondary, stack and
+		// the old position in the renderlist, so every sort gives the stable order.
+		struct SortKey {
+			uint64_t primary;
+			uint64_t secondary;
+			uint32_t stack;
+			uint32_t index;
+			RenderItem* item;
+		};
+
+		/** Sorts the renderlist like the stable comparison sort, but with integer keys.
+		 * Almost sorted lists, like the list of the last frame with a few moved
+		 * items, are repaired by merging the out of order keys back in.
+		 * Everything else is radix sorted.
+		 */
+		void sortRenderListByKeys(RenderList& renderlist, SortingStrategy strategy);
+		void buildSortKeys(const RenderList& renderlist, SortingStrategy strategy);
+		bool repairSortKeys(uint32_t maxOutliers);
+		void radixSortKeys();
 
 		Camera* m_camera;
 		Layer* m_layer;
 		CacheLayerChangeListener* m_layerObserver;
 		CacheTree* m_tree;
 		ImagePtr m_cacheImage;
+		LayerTileCache* m_tileCache;
 
 		std::map<Instance*, int32_t> m_instance_map;
 		std::vector<Entry*> m_entries;
 		std::vector<RenderItem*> m_renderItems;
 		std::set<int32_t> m_entriesToUpdate;
 		std::deque<int32_t> m_freeEntries;
+		// Entries that need a full position update in finishUpdate, sorted
+		std::vector<int32_t> m_positionUpdates;
+		// Buffers of the keyed sort, kept to avoid allocations
+		std::vector<SortKey> m_sortKeys;
+		std::vector<SortKey> m_sortBuffer;
 
 		bool m_needSorting;
 		double m_zMin;
@@ -0,0 +1,145 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+// Standard C++ library includes
+#include <sstream>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "video/imagemanager.h"
+
+#include "layertilecache.h"
+
+namespace FIFE {
+	// Maximal number of images of released tiles that are kept for reuse
+	static const uint32_t MAX_FREE_IMAGES = 16;
+
+	LayerTileCache::LayerTileCache(const std::string& name, uint32_t tileSize):
+		m_name(name),
+		m_tileSize(tileSize),
+		m_imageCount(0) {
+	}
+
+	LayerTileCache::~LayerTileCache() {
+		for (TileMap::iterator it = m_tiles.begin(); it != m_tiles.end(); ++it) {
+			if (it->second->image) {
+				ImageManager::instance()->remove(it->second->image);
+			}
+			delete it->second;
+		}
+		for (std::vector<ImagePtr>::iterator it = m_freeImages.begin(); it != m_freeImages.end(); ++it) {
+			ImageManager::instance()->remove(*it);
+		}
+	}
+
+	uint32_t LayerTileCache::getTileSize() const {
+		return m_tileSize;
+	}
+
+	uint32_t LayerTileCache::getTileCount() const {
+		return m_tiles.size();
+	}
+
+	void LayerTileCache::invalidate() {
+		for (TileMap::iterator it = m_tiles.begin(); it != m_tiles.end(); ++it) {
+			it->second->dirty = true;
+		}
+	}
+
+	void LayerTileCache::invalidate(const Rect& area) {
+		if (m_tiles.empty() || area.w <= 0 || area.h <= 0) {
+			return;
+		}
+		int32_t x1 = toTileIndex(area.x);
+		int32_t x2 = toTileIndex(area.right() - 1);
+		int32_t y1 = toTileIndex(area.y);
+		int32_t y2 = toTileIndex(area.bottom() - 1);
+		for (int32_t y = y1; y <= y2; ++y) {
+			for (int32_t x = x1; x <= x2; ++x) {
+				TileMap::iterator it = m_tiles.find(std::make_pair(x, y));
+				if (it != m_tiles.end()) {
+					it->second->dirty = true;
+				}
+			}
+		}
+	}
+
+	void LayerTileCache::getTiles(const Rect& area, std::vector<Tile*>& tiles) {
+		int32_t x1 = toTileIndex(area.x);
+		int32_t x2 = toTileIndex(area.right() - 1);
+		int32_t y1 = toTileIndex(area.y);
+		int32_t y2 = toTileIndex(area.bottom() - 1);
+
+		// releases the tiles that are out of reach
+		TileMap::iterator it = m_tiles.begin();
+		while (it != m_tiles.end()) {
+			if (it->first.first < x1 - 1 || it->first.first > x2 + 1 ||
+				it->first.second < y1 - 1 || it->first.second > y2 + 1) {
+				releaseTile(it->second);
+				m_tiles.erase(it++);
+			} else {
+				++it;
+			}
+		}
+
+		const int32_t size = static_cast<int32_t>(m_tileSize);
+		for (int32_t y = y1; y <= y2; ++y) {
+			for (int32_t x = x1; x <= x2; ++x) {
+				Tile*& tile = m_tiles[std::make_pair(x, y)];
+				if (!tile) {
+					tile = new Tile();
+					tile->area = Rect(x * size, y * size, size, size);
+					tile->dirty = true;
+					if (!m_freeImages.empty()) {
+						tile->image = m_freeImages.back();
+						m_freeImages.pop_back();
+					} else {
+						std::ostringstream name;
+						name << m_name << "_" << m_imageCount++;
+						tile->image = ImageManager::instance()->loadBlank(name.str(), m_tileSize, m_tileSize);
+					}
+				}
+				tiles.push_back(tile);
+			}
+		}
+	}
+
+	int32_t LayerTileCache::toTileIndex(int32_t value) const {
+		const int32_t size = static_cast<int32_t>(m_tileSize);
+		// rounds towards negative infinity
+		return value >= 0 ? value / size : -((-value + size - 1) / size);
+	}
+
+	void LayerTileCache::releaseTile(Tile* tile) {
+		if (tile->image) {
+			if (m_freeImages.size() < MAX_FREE_IMAGES) {
+				m_freeImages.push_back(tile->image);
+			} else {
+				ImageManager::instance()->remove(tile->image);
+			}
+		}
+		delete tile;
+	}
+}
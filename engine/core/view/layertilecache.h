@@ -0,0 +1,110 @@
+/***************************************************************************
+ *   Copyright (C) 2005-2017 by the FIFE team                              *
+ *   http://www.fifengine.net                                              *
+ *   This file is part of FIFE.                                            *
+ *                                                                         *
+ *   FIFE is free software; you can redistribute it and/or                 *
+ *   modify it under the terms of the GNU Lesser General Public            *
+ *   License as published by the Free Software Foundation; either          *
+ *   version 2.1 of the License, or (at your option) any later version.    *
+ *                                                                         *
+ *   This library is distributed in the hope that it will be useful,       *
+ *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+ *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU     *
+ *   Lesser General Public License for more details.                       *
+ *                                                                         *
+ *   You should have received a copy of the GNU Lesser General Public      *
+ *   License along with this library; if not, write to the                 *
+ *   Free Software Foundation, Inc.,                                       *
+ *   51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA          *
+ ***************************************************************************/
+
+#ifndef FIFE_VIEW_LAYERTILECACHE_H
+#define FIFE_VIEW_LAYERTILECACHE_H
+
+// Standard C++ library includes
+#include <map>
+#include <string>
+#include <vector>
+
+// 3rd party library includes
+
+// FIFE includes
+// These includes are split up in two parts, separated by one empty line
+// First block: files included from the FIFE root src directory
+// Second block: files included from the same folder
+#include "util/base/fife_stdint.h"
+#include "util/structures/rect.h"
+#include "video/image.h"
+
+namespace FIFE {
+
+	/** Prerendered tiles of a static layer.
+	 *
+	 * The tiles lie on a grid in zoomed virtual screen coordinates, so they do not
+	 * change when the camera is moved. Only tiles that become visible or were
+	 * invalidated by an instance change have to be rendered again.
+	 */
+	class LayerTileCache {
+	public:
+		struct Tile {
+			// Tile area in zoomed virtual screen coordinates
+			Rect area;
+			// Prerendered content
+			ImagePtr image;
+			// Content has to be rendered again
+			bool dirty;
+		};
+
+		/** Constructor
+		 * @param name Name prefix for the tile images.
+		 * @param tileSize Width and height of a tile in pixels.
+		 */
+		LayerTileCache(const std::string& name, uint32_t tileSize);
+
+		/** Destructor, removes the tile images from the ImageManager.
+		 */
+		~LayerTileCache();
+
+		/** Returns the width and height of a tile.
+		 */
+		uint32_t getTileSize() const;
+
+		/** Returns the number of cached tiles.
+		 */
+		uint32_t getTileCount() const;
+
+		/** Marks all tiles as dirty.
+		 */
+		void invalidate();
+
+		/** Marks the tiles that intersect the area as dirty.
+		 * @param area Rect in zoomed virtual screen coordinates.
+		 */
+		void invalidate(const Rect& area);
+
+		/** Returns the tiles that intersect the area, missing tiles are created dirty.
+		 * Tiles that are more than one tile away from the area are released.
+		 * @param area Rect in zoomed virtual screen coordinates.
+		 * @param tiles Vector that is filled with the tiles.
+		 */
+		void getTiles(const Rect& area, std::vector<Tile*>& tiles);
+
+	private:
+		typedef std::map<std::pair<int32_t, int32_t>, Tile*> TileMap;
+
+		/** Returns the tile index that contains the coordinate.
+		 */
+		int32_t toTileIndex(int32_t value) const;
+
+		void releaseTile(Tile* tile);
+
+		std::string m_name;
+		uint32_t m_tileSize;
+		uint32_t m_imageCount;
+		TileMap m_tiles;
+		// Images of released tiles, reused for new tiles
+		std::vector<ImagePtr> m_freeImages;
+	};
+}
+#endif
@@ -189,14 +189,25 @@ namespace FIFE {
 			return;
 		}
 
+		// looked up once per call and not per instance
+		const bool check_fow = isFogOfWarLayer(cam, layer);
 		if(m_need_sorting) {
-			renderAlreadySorted(cam, layer, instances);
+			renderAlreadySorted(cam, layer, instances, check_fow);
 		} else {
-			renderUnsorted(cam, layer, instances);
+			renderUnsorted(cam, layer, instances, check_fow);
 		}
 	}
 
-	void InstanceRenderer::renderUnsorted(Camera* cam, Layer* layer, RenderList& instances) {
+	bool InstanceRenderer::isFogOfWarLayer(Camera* cam, Layer* layer) {
+		// the renderer with this name is always a CellRenderer
+		CellRenderer* cr = static_cast<CellRenderer*>(cam->getRenderer("CellRenderer"));
+		if (!cr) {
+			return false;
+		}
+		return cr->getFowLayer() == layer && cr->isEnabledFogOfWar();
+	}
+
+	void InstanceRenderer::renderUnsorted(Camera* cam, Layer* layer, RenderList& instances, bool check_fow) {
 		// FIXME: Unlit is currently broken, maybe it would be the best to change Lightsystem
 		const bool any_effects = !(m_instance_outlines.empty() && m_instance_colorings.empty());
 		const bool unlit = !m_unlit_groups.empty();
@@ -218,10 +229,6 @@ namespace FIFE {
 				}
 			}
 		}
-		// Fixme
-		CellRenderer* cr = dynamic_cast<CellRenderer*>(cam->getRenderer("CellRenderer"));
-		Layer* fow_layer = cr->getFowLayer();
-		const bool check_fow = (fow_layer == layer && cr->isEnabledFogOfWar());
 
 		RenderList::iterator instance_it = instances.begin();
 		for (;instance_it != instances.end(); ++instance_it) {
@@ -392,7 +399,7 @@ namespace FIFE {
 		}
 	}
 
-	void InstanceRenderer::renderAlreadySorted(Camera* cam, Layer* layer, RenderList& instances) {
+	void InstanceRenderer::renderAlreadySorted(Camera* cam, Layer* layer, RenderList& instances, bool check_fow) {
 		const bool any_effects = !(m_instance_outlines.empty() && m_instance_colorings.empty());
 		const bool unlit = !m_unlit_groups.empty();
 		uint32_t lm = m_renderbackend->getLightingModel();
@@ -411,10 +418,6 @@ namespace FIFE {
 				}
 			}
 		}
-		// Fixme
-		CellRenderer* cr = dynamic_cast<CellRenderer*>(cam->getRenderer("CellRenderer"));
-		Layer* fow_layer = cr->getFowLayer();
-		bool check_fow = (fow_layer == layer && cr->isEnabledFogOfWar());
 
 		RenderList::iterator instance_it = instances.begin();
 		for (;instance_it != instances.end(); ++instance_it) {
@@ -236,8 +236,9 @@ namespace FIFE {
 
 		ImagePtr getMultiColorOverlay(const RenderItem& vc, OverlayColors* colors = 0);
 
-		void renderUnsorted(Camera* cam, Layer* layer, RenderList& instances);
-		void renderAlreadySorted(Camera* cam, Layer* layer, RenderList& instances);
+		void renderUnsorted(Camera* cam, Layer* layer, RenderList& instances, bool check_fow);
+		void renderAlreadySorted(Camera* cam, Layer* layer, RenderList& instances, bool check_fow);
+		bool isFogOfWarLayer(Camera* cam, Layer* layer);
 
 		void removeFromCheck(const ImagePtr& image);
 		bool isValidImage(const ImagePtr& image);
@@ -78,6 +78,7 @@ class ApplicationBase(object):
 		self.loadSettings()
 		
 		self.engine.init()
+		self.engine.getProfiler().setEnabled(self._finalSetting['ProfilingOn'])
 		
 		"""
 		we are giving users a valid screen resolution option that is supported
@@ -23,7 +23,7 @@
 import fife, sys, os
 from traceback import print_exc
 
-__all__ = ('ET', 'SerializerError', 'InvalidFormat', 'WrongFileType', 'NameClash', 'NotFound', 'warn', 'root_subfile', 'reverse_root_subfile')
+__all__ = ('ET', 'parse_xml', 'SerializerError', 'InvalidFormat', 'WrongFileType', 'NameClash', 'NotFound', 'warn', 'root_subfile', 'reverse_root_subfile')
 
 try:
 	import xml.etree.cElementTree as ET
@@ -45,6 +45,15 @@ class NameClash(SerializerError):
 class NotFound(SerializerError):
 	pass
 
+def parse_xml(f):
+	"""
+	Parses the rest of an opened vfs file like ET.parse, but feeds the parser
+	straight from the memory of the file if possible instead of copying it.
+	"""
+	parser = ET.XMLParser()
+	parser.feed(f.readBuffer())
+	return ET.ElementTree(parser.close())
+
 def warn(self, msg):
 	print 'Warning (%s): %s' % (self.filename, msg)
 
@@ -22,7 +22,7 @@
 # ####################################################################
 
 from fife import fife
-from fife.extensions.serializers import ET
+from fife.extensions.serializers import ET, parse_xml
 
 def loadXMLAnimation(engine, filename):
 	f = engine.getVFS().open(filename)
@@ -31,7 +31,7 @@ def loadXMLAnimation(engine, filename):
 	imgMgr = engine.getImageManager()
 	aniMgr = engine.getAnimationManager()
 	
-	tree = ET.parse(f)
+	tree = parse_xml(f)
 	node = tree.getroot()
 
 	ani_id = node.get('id')
@@ -116,6 +116,8 @@ def loadXMLAnimation(engine, filename):
 			image_file = '/'.join(path)
 
 			img = imgMgr.create(image_file)
+			if imgMgr.isAutoAtlasingEnabled():
+				imgMgr.packIntoAtlas(img)
 			img.setXShift(frame_x_offset)
 			img.setYShift(frame_y_offset)
 			
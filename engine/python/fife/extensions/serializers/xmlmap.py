@@ -26,7 +26,7 @@ import time
 
 from fife import fife
 
-from fife.extensions.serializers import ET
+from fife.extensions.serializers import ET, parse_xml
 from fife.extensions.serializers import SerializerError, InvalidFormat 
 from fife.extensions.serializers import NameClash, NotFound, WrongFileType
 
@@ -106,7 +106,7 @@ class XMLMapLoader(object):
 		self.source = location
 		f = self.vfs.open(self.source)
 		f.thisown = 1
-		tree = ET.parse(f)
+		tree = parse_xml(f)
 		root = tree.getroot()
 			
 		map = self.parse_map(root)
@@ -24,7 +24,7 @@
 
 from fife import fife
 
-from fife.extensions.serializers import ET
+from fife.extensions.serializers import ET, parse_xml
 from fife.extensions.serializers import SerializerError, InvalidFormat 
 from fife.extensions.serializers import NameClash, NotFound, WrongFileType
 from fife.extensions.serializers.xmlanimation import loadXMLAnimation
@@ -89,7 +89,7 @@ class XMLObjectSaver(object):
 
 		file_handle = self.vfs.open(file)
 		file_handle.thisown = 1
-		tree = ET.parse(file_handle)
+		tree = parse_xml(file_handle)
 		root = tree.getroot()
 		
 		object_id = object.getId()
@@ -295,7 +295,7 @@ class XMLObjectLoader(object):
 		
 		"""
 		if file:
-			tree = ET.parse(file)
+			tree = parse_xml(file)
 			self.node = tree.getroot()
 		self.parse_object(self.node)
 
@@ -359,6 +359,8 @@ class XMLObjectLoader(object):
 			path.append(str(source))
 
 			img = self.imgMgr.create('/'.join(path))
+			if self.imgMgr.isAutoAtlasingEnabled():
+				self.imgMgr.packIntoAtlas(img)
 			img.setXShift(int( image.get('x_offset', 0) ))
 			img.setYShift(int( image.get('y_offset', 0) ))
 			
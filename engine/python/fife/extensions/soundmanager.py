@@ -28,32 +28,31 @@ Sound Manager
 This is a simple implementation of a sound manager that was originaly
 intended for the shooter demo.  It was functional enough that we decided
 to include it in the FIFE extensions.  This is by no means a fully featured
-implementation for several reasons.  It doesnt limit how many sounds can
-play at once or allow the positioning of sounds.  It does however provide
-a good starting point for a more advanced version of a sound manager.
+implementation.  It does however provide a good starting point for a more
+advanced version of a sound manager.
+
+The number of sounds playing at once is limited by a pool of
+L{fife.SoundEmitter}s (voices).  When all voices are taken the least audible
+sound, judged by its priority, gain and distance to the listener, loses its
+voice.  It keeps playing virtually and gets a voice back as soon as one is
+free again.  While clips play virtually a L{fife_timer.Timer} checks them
+periodically, so L{fife_timer} has to be initialized.
 
 Usage::
-  soundmanager = SoundManager(my_fife_engine)
+  soundmanager = SoundManager(my_fife_engine, maxvoices=32)
 
   emitter = soundmanager.createSoundEmitter("path/filename.ogg")
   emitter.gain = 128
+  emitter.priority = 1
   emitter.play()
 
 """
 
-from fife import fife
+import math
 
+from fife import fife
 import fife.extensions.fife_timer as fife_timer
 
-def cbwa(callback,*args,**kwargs):
-	"""
-	This was stolen from pychan.  Defined here to remove the dep
-	on pychan.
-	"""
-	def real_callback():
-		callback(*args,**kwargs)
-	return real_callback
-
 
 class SoundEmitter(object):
 	"""
@@ -63,10 +62,11 @@ class SoundEmitter(object):
 	with some information about a sound clip (like gain and if its
 	looping).  All instances of SoundEmitter should be created by SoundManager.
 
-	@todo: At some point this class will store positional information
-	and also be responsible for updating the L{fife.SoundEmitter} position.
+	The L{fife.SoundEmitter} is taken from the pool of the SoundManager when
+	the sound starts playing and given back when it stops.  A playing
+	SoundEmitter without a L{fife.SoundEmitter} is virtual, it is not heard.
 	"""
-	def __init__(self, soundmanager, clip, soundname, emitter):
+	def __init__(self, soundmanager, clip, soundname, emitter, unique=False):
 		"""
 		@param soundmanager: A reference to the SoundManager
 		@type soundmanager: L{SoundManager}
@@ -75,16 +75,21 @@ class SoundEmitter(object):
 		@param soundname: The filename of the sound
 		@type soundname: C{string}
 		@param emitter: A reference to the L{fife.SoundEmitter} associated with this clip
+		or None if it has no voice yet
 		@type emitter: L{fife.SoundEmitter}
+		@param unique: If False, playing this clip stops all other clips of the
+		same sound that are not unique.
+		@type unique: C{boolean}
 
 		"""
 		self._soundmanager = soundmanager
 		self._name = soundname
+		self._unique = unique
 
 		#The FIFE SoundEmitter associated with this SoundEmitter.
 		#Note that we do NOT own the emitter.
-		self._fifeemitter = emitter
-		self._fifeemitter.thisown = 0
+		self._fifeemitter = None
+		self.fifeemitter = emitter
 		self._fifeclip = clip
 
 		#0 = mute, 255 = normal volume
@@ -92,17 +97,21 @@ class SoundEmitter(object):
 		self._looping = False
 
 		#if you set the callback it will be executed after the sound
-		#has finished playing.
+		#has finished playing.  Looping sounds never finish.
 		self._callback = None
 
 		#length of the sound
 		self._duration = 0
 
-		self._timer = None
-
 		self._position = None
 		self._rolloff = 0
 
+		#clips with a higher priority keep their voice, regardless of their gain
+		self._priority = 0
+
+		#time manager time the clip was started at, None if it is not playing
+		self._starttime = None
+
 	def __del__(self):
 		self._soundmanager.unregisterClip(self)
 
@@ -127,12 +136,16 @@ class SoundEmitter(object):
 		@type gain: C{int}
 		"""
 		self._gain = float(gain)
+		if self._fifeemitter:
+			self._soundmanager._updateFifeEmitter(self)
 
 	def _getLooping(self):
 		return self._looping
 
 	def _setLooping(self, looping):
 		self._looping = looping
+		if self._fifeemitter:
+			self._fifeemitter.setLooping(looping)
 
 	def _getFifeEmitter(self):
 		return self._fifeemitter
@@ -157,27 +170,64 @@ class SoundEmitter(object):
 	def _setDuration(self, millliseconds):
 		self._duration = millliseconds
 
-	def _getTimer(self):
-		return self._timer
-
-	def _setTimer(self, timer):
-		self._timer = timer
-
 	def _setPosition(self, position):
 		self._position = position
+		if self._fifeemitter:
+			self._soundmanager._updateFifeEmitter(self)
 
 	def _getPosition(self):
 		return self._position
 
 	def _setRolloff(self, rolloff):
 		self._rolloff = rolloff
+		if self._fifeemitter:
+			self._soundmanager._updateFifeEmitter(self)
 
 	def _getRolloff(self):
 		return self._rolloff
 
+	def _getPriority(self):
+		return self._priority
+
+	def _setPriority(self, priority):
+		"""
+		Sets the priority of the L{SoundEmitter}.
+
+		When there are more sounds playing than voices, the sounds with the lowest
+		priority lose their voice first.  Sounds of the same priority are compared
+		by their gain and their distance to the listener.
+
+		@param priority: The priority, 0 by default.
+		@type priority: C{int}
+		"""
+		self._priority = priority
+
+	def _getStartTime(self):
+		return self._starttime
+
+	def _setStartTime(self, time):
+		self._starttime = time
+
+	def _getUnique(self):
+		return self._unique
+
+	def _getTimer(self):
+		"""
+		Always None.  Looping and the callback are handled by the fife emitter
+		now, clips no longer have a timer.
+
+		@deprecated: Kept for compatibility, it will be removed.
+		"""
+		return None
+
+	def _setTimer(self, timer):
+		pass
+
 	rolloff = property(_getRolloff, _setRolloff)
+	priority = property(_getPriority, _setPriority)
+	starttime = property(_getStartTime, _setStartTime)
+	unique = property(_getUnique)
 	position = property(_getPosition, _setPosition)
-	timer = property(_getTimer, _setTimer)
 	clip = property(_getClip)
 	gain = property(_getGain, _setGain)
 	looping = property(_getLooping, _setLooping)
@@ -185,19 +235,36 @@ class SoundEmitter(object):
 	name = property(_getName)
 	callback = property(_getCallback, _setCallback)
 	duration = property(_getDuration, _setDuration)
+	timer = property(_getTimer, _setTimer)
+
+class _SoundEmitterListener(fife.SoundEmitterListener):
+	"""
+	Tells the SoundManager when the clip of one of its emitters has ended.
+	"""
+	def __init__(self, soundmanager):
+		fife.SoundEmitterListener.__init__(self)
+		self._soundmanager = soundmanager
+
+	def onSoundFinished(self, emitterId, soundClipId):
+		self._soundmanager._onSoundFinished(emitterId)
 
 class SoundManager(object):
 	"""
 	A simple sound manager class.
 
 	This class manages and plays all the sounds of the game.
-	It creates SoundEmitters and ensures that there is only one
-	L{fife.SoundEmitter} per unique sound.
+	It keeps a pool of at most maxvoices L{fife.SoundEmitter}s and hands
+	them out to the SoundEmitters that are playing.  If there are more sounds
+	playing than voices, the least audible ones play virtually until a voice
+	is free again.
 	"""
-	def __init__(self, engine):
+	def __init__(self, engine, maxvoices=32):
 		"""
 		@param engine: A reference to the FIFE engine
 		@type engine: L{fife.Engine}
+		@param maxvoices: The maximum number of sounds that are heard at the same
+		time.  OpenAL implementations have a hard limit of sources, often 32.
+		@type maxvoices: C{int}
 		"""
 
 		self._engine = engine
@@ -209,10 +276,12 @@ class SoundManager(object):
 		
 		self._fifesoundmanager.setListenerOrientation(0,1,0)
 
+		self._timemanager = self._engine.getTimeManager()
+
 		# basic rolloff used for positional sounds
 		self._rolloff = 1
 
-		#A dict of fife emitters
+		#A dict of fife sound clips and their duration
 		self._loadedclips = {}
 		
 		#A list of created clips
@@ -221,15 +290,33 @@ class SoundManager(object):
 		#A tuple representing the listener position (x,y)
 		self._listenerposition = None
 
+		#The pool of fife emitters, all created emitters and the ones that are not playing
+		self._maxvoices = maxvoices
+		self._fifeemitters = []
+		self._freeemitters = []
+
+		#Playing clips with a fife emitter (active) and without one (virtual)
+		self._activeclips = []
+		self._virtualclips = []
+
+		#The active clips by the id of their fife emitter
+		self._emitterclips = {}
+
+		#Added to all emitters of the pool to learn when their clip ended
+		self._listener = _SoundEmitterListener(self)
+
+		#Ends the virtual clips and hands them free voices while there are any
+		self._virtualtimer = None
+
 	def createSoundEmitter(self, filename, forceUnique=False, position=None):
 		"""
 		Returns a valid SoundEmitter instance.
 
 		@param filename: The relative path and filename of the sound file
 		@type filename: C{string}
-		@param forceUnique: This forces a new L{fife.SoundEmitter} to be created.
-		This is useful if you want more than one instance of the same sound
-		to be played at the same time.
+		@param forceUnique: This allows the new SoundEmitter to play at the same
+		time as other SoundEmitters of the same sound.  Without it, playing
+		the SoundEmitter stops the other ones.
 		@type forceUnique: C{boolean}
 		@param position: The position on the map that the sound emitter
 		is to be created at.
@@ -240,24 +327,17 @@ class SoundManager(object):
 		"""
 		if filename not in self._loadedclips:
 			soundclipptr = self._fifesoundclipmanager.get(filename)
+			# the duration is only known to an emitter that holds the clip
 			fifeemitter = self._fifesoundmanager.createEmitter()
 			fifeemitter.thisown = 0
 			fifeemitter.setSoundClip(soundclipptr)
-			self._loadedclips[filename] = [fifeemitter]
-			clip = SoundEmitter(self, soundclipptr, filename, fifeemitter)
-			clip.duration = fifeemitter.getDuration()
-		else:
-			if forceUnique:
-				soundclipptr = self._fifesoundclipmanager.get(filename)
-				fifeemitter = self._fifesoundmanager.createEmitter()
-				fifeemitter.thisown = 0
-				fifeemitter.setSoundClip(soundclipptr)
-				self._loadedclips[filename].append(fifeemitter)
-			else:
-				fifeemitter = self._loadedclips[filename][0]
-
-			clip = SoundEmitter(self, fifeemitter.getSoundClip(), filename, fifeemitter)
-			clip.duration = fifeemitter.getDuration()
+			duration = fifeemitter.getDuration()
+			self._fifesoundmanager.releaseEmitter(fifeemitter.getId())
+			self._loadedclips[filename] = (soundclipptr, duration)
+
+		soundclipptr, duration = self._loadedclips[filename]
+		clip = SoundEmitter(self, soundclipptr, filename, None, forceUnique)
+		clip.duration = duration
 
 		if position is not None:
 			clip.position = position
@@ -271,83 +351,34 @@ class SoundManager(object):
 		"""
 		Plays a sound clip.
 
-		This function does not use the L{fife.SoundEmitter}
-		"looping" property to loop a sound.  Instead it registers
-		a new timer and uses the duration of the clip as the timer length.
+		Looping clips loop on the L{fife.SoundEmitter} itself, without any
+		work in python per loop.  The callback of other clips is called
+		when the emitter reports the end of the clip.
 
-		If the SoundEmitter is invalid (no fifeemitter) then it attempts
-		to load it before playing it.
+		The clip gets a L{fife.SoundEmitter} from the pool.  If the pool is
+		exhausted it takes the one of the least audible playing clip, if that
+		is less audible than this one.  Otherwise this clip plays virtually.
 
-		@note: This will stop any clips that use the same L{fife.SoundEmitter}.
-		You cannot play the same sound more than once at a time unless you create
-		the SoundEmitter with the forceUnique paramater set to True.
+		@note: This will stop any clips of the same sound, unless the
+		SoundEmitters were created with the forceUnique paramater set to True.
 
 		@param clip: The L{SoundEmitter} to be played
 		@type clip: L{SoundEmitter}
 		"""
-		if clip.fifeemitter:
-			if clip.callback:
-				if clip.timer:
-					clip.timer.stop()
-					timer = None
-
-				if clip.looping:
-					repeat = 0
-					def real_callback(clip):
-						clip.fifeemitter.stop()
-						clip.fifeemitter.setGain(float(clip.gain)/255.0)
-						if self.listenerposition and clip.position:
-							# Use 1 as z coordinate, no need to specify it
-							clip.fifeemitter.setPosition(clip.position[0], clip.position[1], 1)
-							clip.fifeemitter.setRolloff(clip.rolloff)
-						elif self.listenerposition and not clip.position:
-							clip.fifeemitter.setPosition(self._listenerposition[0], self._listenerposition[1], 1)
-							clip.fifeemitter.setRolloff(self.rolloff)
-			
-						clip.fifeemitter.play()
-
-					clip.callback = cbwa(real_callback, clip)
-
-				else:
-					repeat = 1
-
-				clip.timer = fife_timer.Timer(clip.duration, clip.callback, repeat)
-
-			else:
-				if clip.looping:
-					def real_callback(clip):
-						clip.fifeemitter.stop()
-						clip.fifeemitter.setGain(float(clip.gain)/255.0)
-						if self.listenerposition and clip.position:
-							# Use 1 as z coordinate, no need to specify it
-							clip.fifeemitter.setPosition(clip.position[0], clip.position[1], 1)
-							clip.fifeemitter.setRolloff(clip.rolloff)
-						elif self.listenerposition and not clip.position:
-							clip.fifeemitter.setPosition(self._listenerposition[0], self._listenerposition[1], 1)
-							clip.fifeemitter.setRolloff(self.rolloff)
-							
-						clip.fifeemitter.play()
-
-					clip.callback = cbwa(real_callback, clip)
-					clip.timer = fife_timer.Timer(clip.duration, clip.callback, 0)
-
-			clip.fifeemitter.setGain(float(clip.gain)/255.0)
-
-			if self.listenerposition and clip.position:
-				# Use 1 as z coordinate, no need to specify it
-				clip.fifeemitter.setPosition(clip.position[0], clip.position[1], 1)
-				clip.fifeemitter.setRolloff(clip.rolloff)
-			elif self.listenerposition and not clip.position:
-				clip.fifeemitter.setPosition(self._listenerposition[0], self._listenerposition[1], 1)
-				clip.fifeemitter.setRolloff(self.rolloff)
-
-			clip.fifeemitter.play()
-			if clip.timer:
-				clip.timer.start()
-
+		self._stopClip(clip)
+		if not clip.unique:
+			for other in self._activeclips + self._virtualclips:
+				if other.name == clip.name and not other.unique:
+					self._stopClip(other)
+		self._reclaimVoices()
+
+		clip.starttime = self._timemanager.getTime()
+		fifeemitter = self._acquireFifeEmitter(clip)
+		if fifeemitter:
+			self._startClip(clip, fifeemitter)
 		else:
-			clip = self.createSoundEmitter(clip.name)
-			self.playClip(clip)
+			self._virtualclips.append(clip)
+		self._updateVirtualTimer()
 
 	def unregisterClip(self, clip):
 		self.stopClip(clip)
@@ -357,22 +388,45 @@ class SoundManager(object):
 
 	def stopClip(self, clip):
 		"""
-		Stops playing the sound clip.   Note that this will stop all clips that
-		use the same FIFE emitter.
+		Stops playing the sound clip.  Its voice is handed to the most
+		audible virtual clip.
 
 		@param clip: The SoundEmitter to stop.
 		@type clip: L{SoundEmitter}
 		"""
-		if clip.fifeemitter:
-			clip.fifeemitter.stop()
-
-		if clip.timer:
-			clip.timer.stop()
-			clip.timer = None
+		self._stopClip(clip)
+		self.updateVoices()
 
 	def stopAllSounds(self):
 		for clip in self._soundclips:
-			self.stopClip(clip)
+			self._stopClip(clip)
+
+	def updateVoices(self):
+		"""
+		Gives the voices to the most audible playing clips.
+
+		Voices of finished clips are given back to the pool and virtual clips
+		take the voices of less audible ones.  This is done when clips are
+		played or stopped, when the listener moves and periodically while
+		clips play virtually.  Changes of the gain and
+		the position reach the emitter of a playing clip right away, but call it
+		after changing the position, gain or priority of playing clips, so the
+		voices go to the most audible ones.
+		"""
+		self._reclaimVoices()
+
+		for clip in self._activeclips:
+			self._updateFifeEmitter(clip)
+
+		while self._virtualclips:
+			clip = max(self._virtualclips, key=self._getAudibility)
+			fifeemitter = self._acquireFifeEmitter(clip)
+			if not fifeemitter:
+				break
+			self._virtualclips.remove(clip)
+			self._startClip(clip, fifeemitter)
+
+		self._updateVirtualTimer()
 
 	def destroy(self):
 		"""
@@ -381,14 +435,153 @@ class SoundManager(object):
 		@note: This does not free the resources from the FIFE sound clip pool.
 		"""
 		self.stopAllSounds()
+		self._updateVirtualTimer()
 
-		for emitterlist in self._loadedclips.values():
-			for emitter in emitterlist:
-				self._fifesoundmanager.releaseEmitter(emitter.getId())
-				emitter = None
+		for emitter in self._fifeemitters:
+			self._fifesoundmanager.releaseEmitter(emitter.getId())
 
+		self._fifeemitters = []
+		self._freeemitters = []
 		self._loadedclips.clear()
-	def _getRolloff(self):
+
+	def _stopClip(self, clip):
+		"""
+		Stops the clip without handing its voice to a virtual clip.
+		"""
+		if clip.fifeemitter:
+			self._releaseFifeEmitter(clip)
+		elif clip in self._virtualclips:
+			self._virtualclips.remove(clip)
+		clip.starttime = None
+
+	def _finishClip(self, clip):
+		"""
+		Ends a clip that has played to its end and calls its callback.
+		"""
+		self._stopClip(clip)
+		if clip.callback:
+			clip.callback()
+
+	def _onSoundFinished(self, emitterId):
+		"""
+		Called by the listener when an emitter of the pool finished its clip.
+		"""
+		clip = self._emitterclips.get(emitterId)
+		if clip:
+			self._finishClip(clip)
+			self.updateVoices()
+
+	def _startClip(self, clip, fifeemitter):
+		"""
+		Plays the clip on the emitter, from where it would be by now.
+		"""
+		clip.fifeemitter = fifeemitter
+		fifeemitter.setSoundClip(clip.clip)
+		fifeemitter.setLooping(clip.looping)
+		self._updateFifeEmitter(clip)
+
+		elapsed = self._timemanager.getTime() - clip.starttime
+		if elapsed > 0 and clip.duration > 0:
+			if clip.looping:
+				elapsed %= clip.duration
+			fifeemitter.setCursor(fife.SD_TIME_POS, elapsed / 1000.0)
+
+		fifeemitter.play()
+		self._activeclips.append(clip)
+		self._emitterclips[fifeemitter.getId()] = clip
+
+	def _updateFifeEmitter(self, clip):
+		"""
+		Applies the gain and the position of the clip to its emitter.
+		"""
+		clip.fifeemitter.setGain(float(clip.gain)/255.0)
+
+		if self.listenerposition and clip.position:
+			# Use 1 as z coordinate, no need to specify it
+			clip.fifeemitter.setPosition(clip.position[0], clip.position[1], 1)
+			clip.fifeemitter.setRolloff(clip.rolloff)
+		elif self.listenerposition and not clip.position:
+			clip.fifeemitter.setPosition(self._listenerposition[0], self._listenerposition[1], 1)
+			clip.fifeemitter.setRolloff(self.rolloff)
+
+	def _acquireFifeEmitter(self, clip):
+		"""
+		Returns a free emitter for the clip, or None if all voices are taken
+		by clips that are at least as audible.
+		"""
+		if self._freeemitters:
+			return self._freeemitters.pop()
+
+		if len(self._fifeemitters) < self._maxvoices:
+			fifeemitter = self._fifesoundmanager.createEmitter()
+			fifeemitter.thisown = 0
+			fifeemitter.addListener(self._listener)
+			self._fifeemitters.append(fifeemitter)
+			return fifeemitter
+
+		if self._activeclips:
+			victim = min(self._activeclips, key=self._getAudibility)
+			if self._getAudibility(victim) < self._getAudibility(clip):
+				self._releaseFifeEmitter(victim)
+				self._virtualclips.append(victim)
+				return self._freeemitters.pop()
+
+		return None
+
+	def _releaseFifeEmitter(self, clip):
+		"""
+		Stops the emitter of the clip and gives it back to the pool.
+		"""
+		fifeemitter = clip.fifeemitter
+		clip.fifeemitter = None
+		self._activeclips.remove(clip)
+		del self._emitterclips[fifeemitter.getId()]
+
+		fifeemitter.stop()
+		fifeemitter.reset(True)
+		self._freeemitters.append(fifeemitter)
+
+	def _reclaimVoices(self):
+		"""
+		Ends the virtual clips that would be over by now.  The emitters of
+		active clips report the end of their clip themselves.
+		"""
+		now = self._timemanager.getTime()
+		for clip in self._virtualclips[:]:
+			if not clip.looping and now - clip.starttime >= clip.duration:
+				self._finishClip(clip)
+
+	def _updateVirtualTimer(self):
+		"""
+		Starts the timer that updates the voices while there are virtual
+		clips, and stops it when there are none.
+		"""
+		if self._virtualclips:
+			if not self._virtualtimer:
+				self._virtualtimer = fife_timer.Timer(100, self.updateVoices)
+			self._virtualtimer.start()
+		elif self._virtualtimer:
+			# the timer is kept, this can be called from its own callback
+			self._virtualtimer.stop()
+
+	def _getAudibility(self, clip):
+		"""
+		Returns a key to compare how well clips are heard, the priority
+		first, then the gain after the attenuation by distance.
+		"""
+		gain = float(clip.gain)/255.0
+
+		if self._listenerposition and clip.position:
+			dx = clip.position[0] - self._listenerposition[0]
+			dy = clip.position[1] - self._listenerposition[1]
+			distance = math.sqrt(dx*dx + dy*dy)
+			# the inverse distance clamped model of OpenAL with a reference distance of 1
+			if distance > 1:
+				gain /= 1 + clip.rolloff * (distance - 1)
+
+		return (clip.priority, gain)
+
+	def _getRolloff(self):
 		return self._rolloff
 
 	def _setRolloff(self, rolloff):
@@ -400,8 +593,41 @@ class SoundManager(object):
 	def _setListenerPosition(self, position):
 		self._listenerposition = position
 		self._fifesoundmanager.setListenerPosition(self._listenerposition[0], self._listenerposition[1], 10)
+		self.updateVoices()
+
+	def _getMaxVoices(self):
+		return self._maxvoices
+
+	def _setMaxVoices(self, maxvoices):
+		"""
+		Sets the size of the emitter pool.  When it shrinks, the least
+		audible clips lose their voices.
+		"""
+		self._maxvoices = maxvoices
+
+		while len(self._fifeemitters) > self._maxvoices:
+			if not self._freeemitters:
+				victim = min(self._activeclips, key=self._getAudibility)
+				self._releaseFifeEmitter(victim)
+				self._virtualclips.append(victim)
+			fifeemitter = self._freeemitters.pop()
+			self._fifeemitters.remove(fifeemitter)
+			self._fifesoundmanager.releaseEmitter(fifeemitter.getId())
+
+		self.updateVoices()
+
+	def _getActiveVoiceCount(self):
+		self._reclaimVoices()
+		return len(self._activeclips)
+
+	def _getVirtualVoiceCount(self):
+		self._reclaimVoices()
+		return len(self._virtualclips)
 
 	rolloff = property(_getRolloff, _setRolloff)
 	listenerposition = property(_getListenerPosition, _setListenerPosition)
+	maxvoices = property(_getMaxVoices, _setMaxVoices)
+	activevoicecount = property(_getActiveVoiceCount)
+	virtualvoicecount = property(_getVirtualVoiceCount)
 
 __all__ = ['SoundEmitter','SoundManager']
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ####################################################################
+#  Copyright (C) 2005-2017 by the FIFE team
+#  http://www.fifengine.net
+#  This file is part of FIFE.
+#
+#  FIFE is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2.1 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the
+#  Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+# ####################################################################
+
+"""
+Benchmark of the draw call batching with 20k visible sprites.
+
+Needs the OpenGL render backend and a display. Every frame shows all sprites,
+the draw calls, the drawn items and the render time of the InstanceRenderer
+are reported for two maps:
+
+ - shared: all sprites use the same texture, like sprites of one atlas
+ - mixed: neighbouring sprites use different textures, nothing can be batched
+
+Run it from this directory: python batching_benchmark.py
+"""
+
+import os, sys
+
+fife_path = os.path.join('..','..','engine','python')
+if os.path.isdir(fife_path) and fife_path not in sys.path:
+	sys.path.insert(0,fife_path)
+
+from fife import fife
+
+SIZE = 142 # 142 * 142 = 20164 sprites
+FRAMES = 60
+
+def createEngine():
+	engine = fife.Engine()
+	settings = engine.getSettings()
+	settings.setRenderBackend('OpenGL')
+	settings.setScreenWidth(1024)
+	settings.setScreenHeight(768)
+	settings.setDefaultFontPath('../data/FreeMono.ttf')
+	settings.setDefaultFontGlyphs(" abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" +
+			".,!?-+/:();%`'*#=[]")
+	engine.init()
+	return engine
+
+def createMap(engine, name, mixed):
+	model = engine.getModel()
+	map = model.createMap(name)
+	layer = map.createLayer("layer", model.getCellGrid("square"))
+	objects = []
+	for i, filename in enumerate(('../data/earth_1.png', '../data/mushroom_007.png')):
+		obj = model.createObject(name + str(i), "benchmark")
+		fife.ObjectVisual.create(obj)
+		img = engine.getImageManager().load(filename)
+		obj.get2dGfxVisual().addStaticImage(0, img.getHandle())
+		objects.append(obj)
+
+	for y in xrange(SIZE):
+		for x in xrange(SIZE):
+			obj = objects[(x + y) % 2] if mixed else objects[0]
+			i = layer.createInstance(obj, fife.ModelCoordinate(x - SIZE / 2, y - SIZE / 2))
+			fife.InstanceVisual.create(i)
+
+	rb = engine.getRenderBackend()
+	img = engine.getImageManager().get('../data/earth_1.png')
+	camera = map.addCamera(name, layer, fife.Rect(0, 0, rb.getWidth(), rb.getHeight()))
+	camera.setCellImageDimensions(img.getWidth(), img.getHeight())
+	# everything on screen
+	camera.setZoom(0.1)
+	return map, camera
+
+def run(engine, camera):
+	backend = engine.getRenderBackend()
+	profiler = engine.getProfiler()
+	camera.setEnabled(True)
+	engine.pump()
+	profiler.reset()
+	profiler.setEnabled(True)
+	drawCalls = 0
+	items = 0
+	for frame in xrange(FRAMES):
+		engine.pump()
+		drawCalls += backend.getDrawCalls()
+		items += backend.getBatchedItems()
+	profiler.setEnabled(False)
+	camera.setEnabled(False)
+	return (drawCalls / FRAMES, items / FRAMES, profiler.getAverageTime("InstanceRenderer"))
+
+def main():
+	engine = createEngine()
+	engine.initializePumping()
+	print "%d sprites, %d frames per run" % (SIZE * SIZE, FRAMES)
+	print "%-8s %10s %10s %12s" % ("map", "draw calls", "items", "render ms")
+	for name, mixed in (("shared", False), ("mixed", True)):
+		map, camera = createMap(engine, name, mixed)
+		print "%-8s %10d %10d %12.2f" % ((name,) + run(engine, camera))
+		engine.getModel().deleteMap(map)
+	engine.finalizePumping()
+	engine.destroy()
+
+if __name__ == '__main__':
+	main()
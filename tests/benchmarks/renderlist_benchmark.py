@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ####################################################################
+#  Copyright (C) 2005-2017 by the FIFE team
+#  http://www.fifengine.net
+#  This file is part of FIFE.
+#
+#  FIFE is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2.1 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the
+#  Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+# ####################################################################
+
+"""
+Benchmark of the render list sorting with 50k render items.
+
+Runs headless with the Null render backend and measures the layer cache
+update, which contains the sort, with the engine profiler. Two scenarios
+are measured, each with the keyed and with the comparison sort:
+
+ - static: the camera does not move, 1% of the instances move every frame
+ - scrolling: the camera moves every frame, the whole list is rebuilt
+
+Run it from this directory: python renderlist_benchmark.py
+"""
+
+import os, sys
+
+fife_path = os.path.join('..','..','engine','python')
+if os.path.isdir(fife_path) and fife_path not in sys.path:
+	sys.path.insert(0,fife_path)
+
+from fife import fife
+
+SIZE = 224 # 224 * 224 = 50176 instances
+FRAMES = 30
+MOVED = SIZE * SIZE / 100
+
+def createEngine():
+	engine = fife.Engine()
+	settings = engine.getSettings()
+	settings.setRenderBackend('Null')
+	settings.setScreenWidth(1024)
+	settings.setScreenHeight(768)
+	settings.setDefaultFontPath('../data/FreeMono.ttf')
+	settings.setDefaultFontGlyphs(" abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" +
+			".,!?-+/:();%`'*#=[]")
+	engine.init()
+	return engine
+
+def createMap(engine):
+	model = engine.getModel()
+	map = model.createMap("benchmark")
+	layer = map.createLayer("layer", model.getCellGrid("square"))
+	obj = model.createObject("tile", "benchmark")
+	fife.ObjectVisual.create(obj)
+	img = engine.getImageManager().load('../data/earth_1.png')
+	obj.get2dGfxVisual().addStaticImage(0, img.getHandle())
+
+	instances = []
+	for y in xrange(SIZE):
+		for x in xrange(SIZE):
+			i = layer.createInstance(obj, fife.ModelCoordinate(x - SIZE / 2, y - SIZE / 2))
+			fife.InstanceVisual.create(i)
+			instances.append(i)
+
+	rb = engine.getRenderBackend()
+	camera = map.addCamera("camera", layer, fife.Rect(0, 0, rb.getWidth(), rb.getHeight()))
+	camera.setCellImageDimensions(img.getWidth(), img.getHeight())
+	camera.setTilt(40)
+	camera.setRotation(45)
+	# everything on screen
+	camera.setZoom(0.05)
+	return map, layer, camera, instances
+
+def moveInstances(instances, frame):
+	for i in instances[frame % 100::100]:
+		loc = i.getLocation()
+		c = loc.getExactLayerCoordinates()
+		c.x += 0.25 if frame % 2 else -0.25
+		loc.setExactLayerCoordinates(c)
+		i.setLocation(loc)
+
+def moveCamera(camera, frame):
+	loc = camera.getLocation()
+	c = loc.getExactLayerCoordinates()
+	c.x += 0.5 if (frame / 10) % 2 else -0.5
+	loc.setExactLayerCoordinates(c)
+	camera.setLocation(loc)
+
+def run(engine, layer, camera, instances, scenario, keyed):
+	profiler = engine.getProfiler()
+	zone = "LayerCache::update " + layer.getId()
+	camera.setKeySortingEnabled(keyed)
+	engine.pump()
+	profiler.reset()
+	profiler.setEnabled(True)
+	for frame in xrange(FRAMES):
+		if scenario == "static":
+			moveInstances(instances, frame)
+		else:
+			moveCamera(camera, frame)
+		engine.pump()
+	profiler.setEnabled(False)
+	return (profiler.getMinTime(zone), profiler.getAverageTime(zone), profiler.getP99Time(zone))
+
+def main():
+	engine = createEngine()
+	map, layer, camera, instances = createMap(engine)
+	engine.initializePumping()
+	engine.pump()
+	print "%d instances, %d frames per run, layer cache update in ms" % (len(instances), FRAMES)
+	print "%-10s %-11s %8s %8s %8s" % ("scenario", "sort", "min", "avg", "p99")
+	for scenario in ("static", "scrolling"):
+		for keyed in (False, True):
+			result = run(engine, layer, camera, instances, scenario, keyed)
+			print "%-10s %-11s %8.2f %8.2f %8.2f" % ((scenario, "keyed" if keyed else "comparison") + result)
+	engine.finalizePumping()
+	engine.destroy()
+
+if __name__ == '__main__':
+	main()
@@ -22,6 +22,7 @@
 // Standard C++ library includes
 #include <iostream>
 #include <iomanip>
+#include <vector>
 
 // Platform specific includes
 #include "fife_unittest.h"
@@ -39,6 +40,7 @@
 #include "vfs/zip/zipsource.h"
 #include "vfs/raw/rawdata.h"
 #include "util/base/exception.h"
+#include "util/base/workerpool.h"
 
 using namespace FIFE;
 
@@ -54,6 +56,11 @@ using namespace FIFE;
 
 static const std::string COMPRESSED_FILE = "tests/data/testmap.zip";
 static const std::string RAW_FILE = "tests/data/test.map";
+// written by tools/vfs_packer.py, the stale copy got an entry appended by another zip tool
+// and the corrupt copy has a broken offset in the index
+static const std::string PACKED_FILE = "tests/data/packedtest.zip";
+static const std::string STALE_PACKED_FILE = "tests/data/packedtest_stale.zip";
+static const std::string CORRUPT_PACKED_FILE = "tests/data/packedtest_corrupt.zip";
 
 TEST(test_decoder) {
 	environment env;
@@ -115,6 +122,146 @@ TEST(test_decoder) {
 	delete fcomp;
 }
 
+// Opens the entries of the archive over and over and compares them with the expected content
+class OpenTask : public WorkerTask {
+public:
+	OpenTask(VFS* vfs, const std::vector<std::string>& files, const std::vector<std::vector<uint8_t> >& contents, uint32_t rounds)
+		: m_vfs(vfs), m_files(files), m_contents(contents), m_rounds(rounds), m_opened(0), m_mismatches(0) {}
+
+	virtual void run() {
+		for (uint32_t round = 0; round < m_rounds; ++round) {
+			for (uint32_t i = 0; i < m_files.size(); ++i) {
+				RawData* data = m_vfs->open(m_files[i]);
+				if (data->getDataInBytes() != m_contents[i]) {
+					++m_mismatches;
+				}
+				delete data;
+				++m_opened;
+			}
+		}
+	}
+
+	VFS* m_vfs;
+	const std::vector<std::string>& m_files;
+	const std::vector<std::vector<uint8_t> >& m_contents;
+	uint32_t m_rounds;
+	uint32_t m_opened;
+	uint32_t m_mismatches;
+};
+
+static void checkConcurrentOpen(size_t cacheBudget) {
+	environment env;
+	boost::shared_ptr<VFS> vfs(new VFS());
+	vfs->setEntryCacheBudget(cacheBudget);
+	vfs->addSource(new VFSDirectory(vfs.get()));
+	vfs->addSource(new ZipSource(vfs.get(), COMPRESSED_FILE));
+
+	std::vector<std::string> files;
+	files.push_back("ziptest_content/testdir1/file-a");
+	files.push_back("ziptest_content/maps/test.map");
+	files.push_back("content/testdir1/file");
+	files.push_back("ziptest_content/testdir1/file-b");
+
+	// read once in the main thread, the map has to match the plain copy
+	std::vector<std::vector<uint8_t> > contents;
+	for (uint32_t i = 0; i < files.size(); ++i) {
+		RawData* data = vfs->open(files[i]);
+		contents.push_back(data->getDataInBytes());
+		delete data;
+	}
+	RawData* raw = vfs->open(RAW_FILE);
+	CHECK(raw->getDataInBytes() == contents[1]);
+	delete raw;
+
+	WorkerPool pool(4);
+	std::vector<WorkerTask*> tasks;
+	for (uint32_t i = 0; i < 8; ++i) {
+		tasks.push_back(new OpenTask(vfs.get(), files, contents, 64));
+	}
+	pool.execute(tasks);
+
+	uint32_t opened = 0;
+	for (uint32_t i = 0; i < tasks.size(); ++i) {
+		OpenTask* task = static_cast<OpenTask*>(tasks[i]);
+		CHECK_EQUAL(0u, task->m_mismatches);
+		opened += task->m_opened;
+		delete task;
+	}
+	CHECK_EQUAL(8u * 64u * files.size(), opened);
+}
+
+TEST(test_concurrent_open) {
+	// without the entry cache every open reads and inflates the archive
+	checkConcurrentOpen(0);
+}
+
+TEST(test_concurrent_open_cached) {
+	checkConcurrentOpen(16 * 1024 * 1024);
+}
+
+static std::string readFile(VFS* vfs, const std::string& name) {
+	RawData* data = vfs->open(name);
+	std::vector<uint8_t> bytes = data->getDataInBytes();
+	delete data;
+	return std::string(bytes.begin(), bytes.end());
+}
+
+static void checkPackedContent(VFS* vfs) {
+	CHECK(!vfs->exists(".fifeindex"));
+
+	std::set<std::string> dirlist = vfs->listDirectories("packed");
+	CHECK(dirlist.size() == 1);
+	CHECK(dirlist.find("maps") != dirlist.end());
+	std::set<std::string> filelist = vfs->listFiles("packed/maps");
+	CHECK(filelist.size() == 1);
+	CHECK(filelist.find("test.xml") != filelist.end());
+
+	std::string map = "<map>\n";
+	for (uint32_t i = 0; i < 20; ++i) {
+		map += "\t<layer id=\"ground\"/>\n";
+	}
+	map += "</map>\n";
+	CHECK(readFile(vfs, "packed/readme.txt") == "packed archive test\n");
+	CHECK(readFile(vfs, "packed/maps/test.xml") == map);
+}
+
+TEST(test_packed_index) {
+	environment env;
+	boost::shared_ptr<VFS> vfs(new VFS());
+	vfs->addSource(new VFSDirectory(vfs.get()));
+	vfs->addSource(new ZipSource(vfs.get(), PACKED_FILE));
+
+	checkPackedContent(vfs.get());
+	std::set<std::string> filelist = vfs->listFiles("packed");
+	CHECK(filelist.size() == 1);
+	CHECK(filelist.find("readme.txt") != filelist.end());
+}
+
+TEST(test_stale_packed_index) {
+	environment env;
+	boost::shared_ptr<VFS> vfs(new VFS());
+	vfs->addSource(new VFSDirectory(vfs.get()));
+	vfs->addSource(new ZipSource(vfs.get(), STALE_PACKED_FILE));
+
+	// the appended entry is only listed by the central directory
+	checkPackedContent(vfs.get());
+	std::set<std::string> filelist = vfs->listFiles("packed");
+	CHECK(filelist.size() == 2);
+	CHECK(filelist.find("readme.txt") != filelist.end());
+	CHECK(filelist.find("added.txt") != filelist.end());
+	CHECK(readFile(vfs.get(), "packed/added.txt") == "added after packing\n");
+}
+
+TEST(test_corrupt_packed_index) {
+	environment env;
+	boost::shared_ptr<VFS> vfs(new VFS());
+	vfs->addSource(new VFSDirectory(vfs.get()));
+	vfs->addSource(new ZipSource(vfs.get(), CORRUPT_PACKED_FILE));
+
+	checkPackedContent(vfs.get());
+	CHECK(vfs->listFiles("packed").size() == 1);
+}
+
 int main() {
 	return UnitTest::RunAllTests();
 }
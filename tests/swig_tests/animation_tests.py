@@ -115,8 +115,52 @@ class TestView(unittest.TestCase):
 		self.engine.finalizePumping()
 	
 		
+class TestAsyncLoading(unittest.TestCase):
 
-TEST_CLASSES = [TestView]
+	def setUp(self):
+		self.engine = getEngine(renderbackend='Null')
+		self.imgMgr = self.engine.getImageManager()
+		self.names = ['../data/crate/full_s_000.png']
+		self.names.extend(['../data/crate/full_s_000%d.png' % i for i in xrange(1, 9)])
+		self.engine.initializePumping()
+
+	def tearDown(self):
+		self.engine.finalizePumping()
+		self.engine.destroy()
+
+	def waitForLoads(self):
+		for i in xrange(500):
+			if self.imgMgr.getPendingLoadCount() == 0:
+				break
+			self.engine.pump()
+			time.sleep(0.01)
+		self.assertEqual(self.imgMgr.getPendingLoadCount(), 0)
+
+	def testPrefetch(self):
+		loaded = self.imgMgr.getTotalResourcesLoaded()
+		self.imgMgr.prefetch(fife.StringVector(self.names))
+		self.assertEqual(self.imgMgr.getPendingLoadCount(), len(self.names))
+		# queued twice, loaded once
+		self.imgMgr.prefetch(fife.StringVector(self.names))
+		self.assertEqual(self.imgMgr.getPendingLoadCount(), len(self.names))
+		self.waitForLoads()
+		self.assertEqual(self.imgMgr.getTotalResourcesLoaded(), loaded + len(self.names))
+
+	def testAnimationFrames(self):
+		self.imgMgr.setAsyncLoadingEnabled(True)
+		anim = fife.Animation()
+		for name in self.names:
+			anim.addFrame(self.imgMgr.create(name), 100)
+		# nothing loaded yet, the first frame is loaded synchronously
+		self.assertEqual(anim.getFrameByTimestamp(50).getName(), self.names[0])
+		self.assertEqual(self.imgMgr.getPendingLoadCount(), len(self.names) - 1)
+		# the second frame is not ready, the first one is shown instead
+		self.assertEqual(anim.getFrameByTimestamp(150).getName(), self.names[0])
+		self.waitForLoads()
+		self.assertEqual(anim.getFrameByTimestamp(150).getName(), self.names[1])
+
+
+TEST_CLASSES = [TestView, TestAsyncLoading]
 
 if __name__ == '__main__':
     unittest.main()
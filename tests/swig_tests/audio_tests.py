@@ -23,6 +23,8 @@
 # ####################################################################
 
 from swig_test_utils import *
+from fife.extensions.soundmanager import SoundManager
+from fife.extensions import fife_timer
 import time, fifelog
 
 class TestAudio(unittest.TestCase):
@@ -59,7 +61,149 @@ class TestAudio(unittest.TestCase):
 		sound.play()
 		time.sleep(3);
 
-TEST_CLASSES = [TestAudio]
+class FinishListener(fife.SoundEmitterListener):
+	def __init__(self):
+		fife.SoundEmitterListener.__init__(self)
+		self.finished = []
+
+	def onSoundFinished(self, emitterId, soundClipId):
+		self.finished.append(emitterId)
+
+class TestSoundEmitterListener(unittest.TestCase):
+
+	def setUp(self):
+		self.engine = getEngine(True, 'Null')
+		self.soundmanager = self.engine.getSoundManager()
+		self.soundmanager.init()
+		self.clip = self.engine.getSoundClipManager().get('../data/audiotest1.ogg')
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def pumpUntil(self, condition, milliseconds):
+		self.engine.initializePumping()
+		end = time.time() + milliseconds / 1000.0
+		while not condition() and time.time() < end:
+			self.engine.pump()
+		self.engine.finalizePumping()
+
+	def testFinished(self):
+		listener = FinishListener()
+		emitter = self.soundmanager.createEmitter()
+		emitter.setSoundClip(self.clip)
+		emitter.addListener(listener)
+		# start close to the end of the clip
+		emitter.setCursor(fife.SD_TIME_POS, max(emitter.getDuration() - 500, 0) / 1000.0)
+		emitter.play()
+		# streamed clips are refilled every 5 seconds
+		self.pumpUntil(lambda: listener.finished, 6000)
+		self.assertEqual(listener.finished, [emitter.getId()])
+		emitter.removeListener(listener)
+
+	def testLoopingNeverFinishes(self):
+		listener = FinishListener()
+		emitter = self.soundmanager.createEmitter()
+		emitter.setSoundClip(self.clip)
+		emitter.setLooping(True)
+		emitter.addListener(listener)
+		emitter.setCursor(fife.SD_TIME_POS, max(emitter.getDuration() - 500, 0) / 1000.0)
+		emitter.play()
+		self.pumpUntil(lambda: listener.finished, 1000)
+		self.assertEqual(listener.finished, [])
+		emitter.stop()
+		emitter.removeListener(listener)
+
+	def testPausedNeverFinishes(self):
+		listener = FinishListener()
+		emitter = self.soundmanager.createEmitter()
+		emitter.setSoundClip(self.clip)
+		emitter.addListener(listener)
+		emitter.setCursor(fife.SD_TIME_POS, max(emitter.getDuration() - 500, 0) / 1000.0)
+		emitter.play()
+		emitter.pause()
+		self.pumpUntil(lambda: listener.finished, 1000)
+		self.assertEqual(listener.finished, [])
+
+		# play schedules the check for the end again
+		emitter.play()
+		self.pumpUntil(lambda: listener.finished, 6000)
+		self.assertEqual(listener.finished, [emitter.getId()])
+		emitter.removeListener(listener)
+
+class TestSoundManagerVoices(unittest.TestCase):
+
+	def setUp(self):
+		self.engine = getEngine(True, 'Null')
+		fife_timer.init(self.engine.getTimeManager())
+		self.soundmanager = SoundManager(self.engine, maxvoices=2)
+		self.soundmanager.listenerposition = (0, 0)
+
+	def tearDown(self):
+		self.soundmanager.destroy()
+		self.engine.destroy()
+
+	def createClip(self, position):
+		return self.soundmanager.createSoundEmitter('../data/left_right_test.ogg', True, position)
+
+	def testVoiceStealing(self):
+		near = self.createClip((1, 0))
+		far = self.createClip((50, 0))
+		farther = self.createClip((100, 0))
+
+		far.play()
+		farther.play()
+		self.assertEqual(self.soundmanager.activevoicecount, 2)
+		self.assertEqual(self.soundmanager.virtualvoicecount, 0)
+
+		# the farthest clip loses its voice
+		near.play()
+		self.assertEqual(self.soundmanager.activevoicecount, 2)
+		self.assertEqual(self.soundmanager.virtualvoicecount, 1)
+		self.assert_(near.fifeemitter)
+		self.failIf(farther.fifeemitter)
+
+		# the priority beats the distance
+		farther.priority = 1
+		self.soundmanager.updateVoices()
+		self.assert_(farther.fifeemitter)
+		self.failIf(far.fifeemitter)
+
+		# a stopped clip hands its voice to a virtual one
+		near.stop()
+		self.assert_(far.fifeemitter)
+		self.assertEqual(self.soundmanager.activevoicecount, 2)
+		self.assertEqual(self.soundmanager.virtualvoicecount, 0)
+
+	def testVirtualClipCallback(self):
+		finished = []
+		ambient = [self.createClip((1, 0)), self.createClip((2, 0))]
+		for clip in ambient:
+			clip.looping = True
+			clip.play()
+		far = self.createClip((100, 0))
+		far.callback = lambda: finished.append(far)
+		far.play()
+		self.failIf(far.fifeemitter)
+
+		# only the timer of the manager looks at the virtual clip
+		self.engine.initializePumping()
+		end = time.time() + (far.duration + 1000) / 1000.0
+		while not finished and time.time() < end:
+			self.engine.pump()
+		self.engine.finalizePumping()
+		self.assertEqual(finished, [far])
+		self.assertEqual(self.soundmanager.virtualvoicecount, 0)
+
+	def testSharedSound(self):
+		first = self.soundmanager.createSoundEmitter('../data/left_right_test.ogg')
+		second = self.soundmanager.createSoundEmitter('../data/left_right_test.ogg')
+
+		first.play()
+		second.play()
+		self.failIf(first.fifeemitter)
+		self.assertEqual(self.soundmanager.activevoicecount, 1)
+
+TEST_CLASSES = [TestAudio, TestSoundEmitterListener, TestSoundManagerVoices]
 
 if __name__ == '__main__':
     unittest.main()
@@ -117,6 +117,53 @@ class TestModel(unittest.TestCase):
 		#print p2.x, p2.y
 		#self.assertEqual(inst.getLocation().getLayerCoordinates(), fife.ModelCoordinate(4,4))
 
+	def testBatchQueries(self):
+		map = self.model.createMap("map007")
+		grid = fife.SquareGrid()
+		obj = self.model.createObject("object003","test_nspace")
+		layer = map.createLayer("layer004", grid)
+		for y in xrange(10):
+			for x in xrange(10):
+				layer.createInstance(obj, fife.ModelCoordinate(x,y))
+
+		rects = fife.RectVector()
+		rects.append(fife.Rect(0,0,1,1))
+		rects.append(fife.Rect(5,5,2,0))
+		rects.append(fife.Rect(20,20,2,2))
+		instances = fife.InstanceVector()
+		offsets = fife.IntVector()
+		layer.getInstancesInRects(rects, instances, offsets)
+		self.assertEqual(list(offsets), [0, 4, 7, 7])
+		self.assertEqual(len(instances), 7)
+		for inst in instances[4:7]:
+			self.assertEqual(inst.getLocation().getLayerCoordinates().y, 5)
+		# within a rect the instances are ordered by x coordinate, the far rect makes the query sparse
+		self._checkRectOrder(instances, offsets)
+
+		# a dense query walks the tree once
+		dense = fife.RectVector()
+		dense.append(fife.Rect(0,0,9,9))
+		dense.append(fife.Rect(2,3,4,4))
+		layer.getInstancesInRects(dense, instances, offsets)
+		self.assertEqual(list(offsets), [0, 100, 125])
+		self._checkRectOrder(instances, offsets)
+
+		# the buffers are reused
+		centers = fife.ModelCoordinateVector()
+		centers.append(fife.ModelCoordinate(5,5))
+		centers.append(fife.ModelCoordinate(0,0))
+		radii = fife.IntVector()
+		radii.append(1)
+		layer.getInstancesInCircles(centers, radii, instances, offsets)
+		single = layer.getInstancesInCircle(fife.ModelCoordinate(0,0), 1)
+		self.assertEqual(offsets[1] - offsets[0], 9)
+		self.assertEqual(offsets[2] - offsets[1], len(set([inst.getFifeId() for inst in single])))
+
+	def _checkRectOrder(self, instances, offsets):
+		for start, end in zip(offsets, offsets[1:]):
+			xs = [inst.getLocation().getLayerCoordinates().x for inst in instances[start:end]]
+			self.assertEqual(xs, sorted(xs))
+
 	def testObjects(self):
 		obj1 = self.model.createObject("object003","test_nspace")
 		obj2 = self.model.createObject("object004","test_nspace")
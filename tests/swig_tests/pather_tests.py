@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ####################################################################
+#  Copyright (C) 2005-2017 by the FIFE team
+#  http://www.fifengine.net
+#  This file is part of FIFE.
+#
+#  FIFE is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2.1 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the
+#  Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+# ####################################################################
+
+
+from swig_test_utils import *
+import struct
+
+class PatherTests(unittest.TestCase):
+	def setUp(self):
+		self.engine = getEngine(True)
+		self.model = self.engine.getModel()
+		self.map = self.model.createMap("map001")
+		self.grid = self.model.getCellGrid("square")
+		self.layer = self.map.createLayer("Layer001", self.grid)
+		self.layer.setWalkable(True)
+		self.layer.setPathingStrategy(fife.CELL_EDGES_AND_DIAGONALS)
+
+		self.ground = self.model.createObject("ground", "plaa")
+		self.wall = self.model.createObject("wall", "plaa")
+		self.wall.setBlocking(True)
+		self.wall.setStatic(True)
+
+		# 48x48 cells with a wall in the middle, the gap is at the bottom
+		for y in xrange(48):
+			for x in xrange(48):
+				self.layer.createInstance(self.ground, fife.ModelCoordinate(x, y))
+		self.walls = {}
+		for y in xrange(44):
+			self.walls[y] = self.layer.createInstance(self.wall, fife.ModelCoordinate(24, y))
+		self.map.initializeCellCaches()
+		self.map.finalizeCellCaches()
+		self.cache = self.layer.getCellCache()
+
+		self.pather = fife.RoutePather()
+
+	def tearDown(self):
+		del self.pather
+		self.engine.destroy()
+
+	def _solve(self, mode, start, end):
+		startLoc = fife.Location(self.layer)
+		startLoc.setLayerCoordinates(fife.ModelCoordinate(*start))
+		endLoc = fife.Location(self.layer)
+		endLoc.setLayerCoordinates(fife.ModelCoordinate(*end))
+		route = fife.Route(startLoc, endLoc)
+		route.setSearchMode(mode)
+		self.pather.solveRoute(route, fife.HIGH_PRIORITY, True)
+		return route
+
+	def _checkPath(self, route, start, end):
+		path = route.getPath()
+		self.assertEqual(route.getRouteStatus(), fife.ROUTE_SOLVED)
+		coords = [loc.getLayerCoordinates() for loc in path]
+		self.assertEqual((coords[0].x, coords[0].y), start)
+		self.assertEqual((coords[-1].x, coords[-1].y), end)
+		for prev, cur in zip(coords, coords[1:]):
+			self.assertTrue(max(abs(prev.x - cur.x), abs(prev.y - cur.y)) == 1)
+			self.assertFalse(self.cache.getCell(cur).getCellType() == fife.CTYPE_STATIC_BLOCKER)
+		return len(coords)
+
+	def _pathCost(self, route):
+		# the costs of the square grid, straight steps cost 1.0 and diagonal ones 1.4
+		coords = [loc.getLayerCoordinates() for loc in route.getPath()]
+		cost = 0.0
+		for prev, cur in zip(coords, coords[1:]):
+			cost += 1.4 if prev.x != cur.x and prev.y != cur.y else 1.0
+		return cost
+
+	def testSearchMode(self):
+		self.assertEqual(self.pather.getSearchMode(), fife.SEARCH_MODE_ASTAR)
+		self.pather.setSearchMode(fife.SEARCH_MODE_HIERARCHICAL)
+		self.assertEqual(self.pather.getSearchMode(), fife.SEARCH_MODE_HIERARCHICAL)
+		self.pather.setSearchMode(fife.SEARCH_MODE_DEFAULT)
+		self.assertEqual(self.pather.getSearchMode(), fife.SEARCH_MODE_ASTAR)
+
+		self.assertEqual(self.cache.getClusterSize(), 16)
+		self.cache.setClusterSize(8)
+		self.assertEqual(self.cache.getClusterSize(), 8)
+
+	def testHierarchicalRoute(self):
+		start = (2, 2)
+		end = (45, 3)
+		astar = self._solve(fife.SEARCH_MODE_ASTAR, start, end)
+		hpa = self._solve(fife.SEARCH_MODE_HIERARCHICAL, start, end)
+		self._checkPath(astar, start, end)
+		self._checkPath(hpa, start, end)
+		self.assertEqual(hpa.getUsedSearchMode(), fife.SEARCH_MODE_HIERARCHICAL)
+		self._checkHierarchicalCost(hpa, astar)
+
+	def _checkHierarchicalCost(self, hpa, astar):
+		astarCost = self._pathCost(astar)
+		hpaCost = self._pathCost(hpa)
+		# A* finds the cheapest path, a cheaper hierarchical path means its costs are wrong
+		self.assertTrue(hpaCost >= astarCost - 0.001, "%f < %f" % (hpaCost, astarCost))
+		# the hierarchical path is near optimal
+		self.assertTrue(hpaCost <= astarCost * 1.2, "%f > %f" % (hpaCost, astarCost * 1.2))
+
+	def testHierarchicalRouteUpdate(self):
+		start = (2, 2)
+		end = (45, 3)
+		self._checkPath(self._solve(fife.SEARCH_MODE_HIERARCHICAL, start, end), start, end)
+		# move the gap to the top, the graph must be updated
+		for y in xrange(44, 48):
+			self.walls[y] = self.layer.createInstance(self.wall, fife.ModelCoordinate(24, y))
+		self.layer.deleteInstance(self.walls[0])
+		route = self._solve(fife.SEARCH_MODE_HIERARCHICAL, start, end)
+		length = self._checkPath(route, start, end)
+		self.assertTrue(length < 50)
+		self.assertEqual(route.getUsedSearchMode(), fife.SEARCH_MODE_HIERARCHICAL)
+		self._checkHierarchicalCost(route, self._solve(fife.SEARCH_MODE_ASTAR, start, end))
+
+	def testFlowFieldRoutes(self):
+		end = (45, 3)
+		self.assertEqual(self.cache.getMaxFlowFields(), 16)
+		for start in ((2, 2), (2, 40), (10, 20), (20, 47)):
+			astar = self._solve(fife.SEARCH_MODE_ASTAR, start, end)
+			flow = self._solve(fife.SEARCH_MODE_FLOW_FIELD, start, end)
+			self._checkPath(flow, start, end)
+			self._checkPath(astar, start, end)
+			# both follow the cheapest path
+			self.assertAlmostEqual(self._pathCost(flow), self._pathCost(astar), 3)
+
+	def testFlowFieldUpdate(self):
+		start = (2, 2)
+		end = (45, 3)
+		self._checkPath(self._solve(fife.SEARCH_MODE_FLOW_FIELD, start, end), start, end)
+		# move the gap to the top, the field must be repaired
+		for y in xrange(44, 48):
+			self.walls[y] = self.layer.createInstance(self.wall, fife.ModelCoordinate(24, y))
+		self.layer.deleteInstance(self.walls[0])
+		flow = self._solve(fife.SEARCH_MODE_FLOW_FIELD, start, end)
+		astar = self._solve(fife.SEARCH_MODE_ASTAR, start, end)
+		self._checkPath(flow, start, end)
+		self._checkPath(astar, start, end)
+		# the repaired field is as good as a new one
+		self.assertAlmostEqual(self._pathCost(flow), self._pathCost(astar), 3)
+
+	def testJumpPointRoutes(self):
+		self.assertEqual(self.cache.getSearchMode(), fife.SEARCH_MODE_DEFAULT)
+		self.cache.setSearchMode(fife.SEARCH_MODE_JUMP_POINT)
+		self.assertEqual(self.cache.getSearchMode(), fife.SEARCH_MODE_JUMP_POINT)
+		end = (45, 3)
+		astarNodes = 0
+		jpsNodes = 0
+		for start in ((2, 2), (2, 40), (10, 20), (20, 47), (30, 30)):
+			astar = self._solve(fife.SEARCH_MODE_ASTAR, start, end)
+			# the mode of the cache is used
+			jps = self._solve(fife.SEARCH_MODE_DEFAULT, start, end)
+			self._checkPath(astar, start, end)
+			self._checkPath(jps, start, end)
+			self.assertEqual(astar.getUsedSearchMode(), fife.SEARCH_MODE_ASTAR)
+			self.assertEqual(jps.getUsedSearchMode(), fife.SEARCH_MODE_JUMP_POINT)
+			# the costs are uniform, so the jump point search finds the cheapest path too
+			self.assertAlmostEqual(self._pathCost(jps), self._pathCost(astar), 3)
+			astarNodes += astar.getExpandedNodes()
+			jpsNodes += jps.getExpandedNodes()
+		self.assertTrue(0 < jpsNodes < astarNodes)
+
+	def testJumpPointFallback(self):
+		start = (2, 2)
+		end = (45, 3)
+		# costs are not uniform, so A* is used
+		cell = self.cache.getCell(fife.ModelCoordinate(10, 10))
+		cell.setCostMultiplier(5.0)
+		route = self._solve(fife.SEARCH_MODE_JUMP_POINT, start, end)
+		self._checkPath(route, start, end)
+		self.assertEqual(route.getUsedSearchMode(), fife.SEARCH_MODE_ASTAR)
+
+		cell.resetCostMultiplier()
+		route = self._solve(fife.SEARCH_MODE_JUMP_POINT, start, end)
+		self._checkPath(route, start, end)
+		self.assertEqual(route.getUsedSearchMode(), fife.SEARCH_MODE_JUMP_POINT)
+
+	def testCellGridExport(self):
+		width = self.cache.getWidth()
+		height = self.cache.getHeight()
+		size = self.cache.getSize()
+		types = self.cache.getCellTypeGrid()
+		self.assertEqual(len(types), width * height)
+		index = (24 - size.x) + (10 - size.y) * width
+		self.assertEqual(ord(types[index]), fife.CTYPE_STATIC_BLOCKER)
+		self.assertEqual(ord(types[index + 1]), fife.CTYPE_NO_BLOCKER)
+
+		costs = struct.unpack("%dd" % (width * height), self.cache.getCostMultiplierGrid())
+		self.assertTrue(max(costs) < 0.0)
+
+	def testCellGridImport(self):
+		width = self.cache.getWidth()
+		height = self.cache.getHeight()
+		costs = [-1.0] * (width * height)
+		costs[5] = 3.0
+		self.cache.setCostMultiplierGrid(struct.pack("%dd" % len(costs), *costs))
+		exported = struct.unpack("%dd" % len(costs), self.cache.getCostMultiplierGrid())
+		self.assertEqual(exported[5], 3.0)
+		self.assertEqual(exported[6], -1.0)
+
+		mask = ["\0"] * (width * height)
+		mask[7] = "\1"
+		self.cache.setSpeedMultiplierMask("".join(mask), 0.5)
+		speeds = struct.unpack("%dd" % len(mask), self.cache.getSpeedMultiplierGrid())
+		self.assertEqual(speeds[7], 0.5)
+		self.assertEqual(speeds[8], -1.0)
+
+		self.assertRaises(fife.InvalidFormat, self.cache.setCostMultiplierGrid, "")
+
+	def testCellMultipliers(self):
+		width = self.cache.getWidth()
+		size = self.cache.getSize()
+		cell = self.cache.getCell(fife.ModelCoordinate(3, 5))
+		index = (3 - size.x) + (5 - size.y) * width
+		self.assertEqual(cell.getCostMultiplier(), 1.0)
+
+		cell.setCostMultiplier(2.5)
+		cell.setSpeedMultiplier(0.5)
+		self.assertEqual(cell.getCostMultiplier(), 2.5)
+		self.assertEqual(cell.getSpeedMultiplier(), 0.5)
+		costs = struct.unpack("%dd" % (width * self.cache.getHeight()), self.cache.getCostMultiplierGrid())
+		self.assertEqual(costs[index], 2.5)
+		self.assertEqual(costs[index + 1], -1.0)
+
+		cell.resetCostMultiplier()
+		cell.resetSpeedMultiplier()
+		self.assertEqual(cell.getCostMultiplier(), 1.0)
+		self.assertEqual(cell.getSpeedMultiplier(), 1.0)
+		speeds = struct.unpack("%dd" % (width * self.cache.getHeight()), self.cache.getSpeedMultiplierGrid())
+		self.assertTrue(max(speeds) < 0.0)
+
+	def testZoneUpdate(self):
+		doorMap = self.model.createMap("map002")
+		layer = doorMap.createLayer("Layer001", self.grid)
+		layer.setWalkable(True)
+		# a small and a large room, connected by a corridor of one cell
+		for y in xrange(5):
+			for x in xrange(40):
+				layer.createInstance(self.ground, fife.ModelCoordinate(x, y))
+				if x in (4, 5, 6) and y != 2:
+					layer.createInstance(self.wall, fife.ModelCoordinate(x, y))
+		doorMap.initializeCellCaches()
+		doorMap.finalizeCellCaches()
+		cache = layer.getCellCache()
+		# the model is only updated if a camera is active
+		doorMap.addCamera("camera", layer, fife.Rect(0, 0, 1, 1))
+		self.engine.pump()
+		cache.resetZoneUpdateStats()
+
+		door = layer.createInstance(self.wall, fife.ModelCoordinate(5, 2))
+		self.engine.pump()
+		self.assertEqual(cache.getZoneUpdates(), 1)
+		# only the small room is visited twice, the large room is not flood filled
+		self.assertTrue(0 < cache.getZoneUpdateCells() < 100)
+
+		layer.deleteInstance(door)
+		self.engine.pump()
+		self.assertEqual(cache.getZoneUpdates(), 1)
+		self.assertTrue(cache.getMaxZoneUpdateCells() >= cache.getZoneUpdateCells())
+
+		self.engine.pump()
+		self.assertEqual(cache.getZoneUpdates(), 0)
+		self.assertEqual(cache.getZoneUpdateCells(), 0)
+
+	def testZoneUpdateDoors(self):
+		doorMap = self.model.createMap("map002")
+		layer = doorMap.createLayer("Layer001", self.grid)
+		layer.setWalkable(True)
+		door = self.model.createObject("door", "plaa")
+		door.setBlocking(True)
+		# two rooms, connected by a corridor of four cells with two doors side by side
+		for y in xrange(5):
+			for x in xrange(20):
+				layer.createInstance(self.ground, fife.ModelCoordinate(x, y))
+				if x in (4, 5, 6, 7) and y != 2:
+					layer.createInstance(self.wall, fife.ModelCoordinate(x, y))
+		doorMap.initializeCellCaches()
+		doorMap.finalizeCellCaches()
+		cache = layer.getCellCache()
+		doorMap.addCamera("camera", layer, fife.Rect(0, 0, 1, 1))
+		self.engine.pump()
+
+		def zone(x, y):
+			return cache.getCell(fife.ModelCoordinate(x, y)).getZone().getId()
+
+		self.assertEqual(zone(0, 0), zone(19, 0))
+		door1 = layer.createInstance(door, fife.ModelCoordinate(5, 2))
+		door2 = layer.createInstance(door, fife.ModelCoordinate(6, 2))
+		self.engine.pump()
+		self.assertTrue(cache.getCell(fife.ModelCoordinate(5, 2)).isZoneProtected())
+		self.assertTrue(cache.getCell(fife.ModelCoordinate(6, 2)).isZoneProtected())
+		self.assertNotEqual(zone(0, 0), zone(19, 0))
+
+		# the second door is still closed, so the rooms stay apart
+		layer.deleteInstance(door1)
+		self.engine.pump()
+		self.assertNotEqual(zone(0, 0), zone(19, 0))
+		self.assertEqual(zone(5, 2), zone(0, 0))
+
+		layer.deleteInstance(door2)
+		self.engine.pump()
+		self.assertEqual(zone(0, 0), zone(19, 0))
+		self.assertEqual(zone(6, 2), zone(19, 0))
+
+TEST_CLASSES = [PatherTests]
+
+if __name__ == '__main__':
+	unittest.main()
@@ -50,7 +50,136 @@ class TestImgMgr(unittest.TestCase):
 #		self.assertRaises(RuntimeError,imgMgr.load,'does_not_exist.png')
 
 
-TEST_CLASSES = [TestImgMgr]
+class TestMemoryBudget(unittest.TestCase):
+
+	def setUp(self):
+		self.engine = getEngine(renderbackend='Null')
+		self.imgMgr = self.engine.getImageManager()
+		self.engine.initializePumping()
+
+	def tearDown(self):
+		self.engine.finalizePumping()
+		self.engine.destroy()
+
+	def testImageBudget(self):
+		names = ['../data/beach_e1.png', '../data/earth_1.png', '../data/mushroom_007.png']
+		imgs = [self.imgMgr.load(name) for name in names]
+		blank = self.imgMgr.loadBlank(64, 64)
+		used = self.imgMgr.getMemoryUsed()
+		self.assertEqual(self.imgMgr.getMemoryBudget(), 0)
+		self.engine.pump()
+		self.assertEqual(self.imgMgr.getEvictionCount(), 0)
+
+		self.imgMgr.setMemoryBudget(used - 1)
+		self.engine.pump()
+		self.assert_(self.imgMgr.getEvictionCount() >= 1)
+		self.assert_(self.imgMgr.getMemoryUsed() <= used - 1)
+		self.assertEqual(self.imgMgr.getMemoryUsed() + self.imgMgr.getEvictedBytes(), used)
+
+		# images created from memory are kept
+		self.imgMgr.setMemoryBudget(1)
+		self.engine.pump()
+		for img in imgs:
+			self.assertEqual(img.getState(), fife.IResource.RES_NOT_LOADED)
+		self.assertEqual(blank.getState(), fife.IResource.RES_LOADED)
+
+		# evicted images are loaded again on access
+		img = self.imgMgr.get(names[0])
+		self.assert_(img.getWidth() > 0)
+
+	def testAnimationBudget(self):
+		animMgr = self.engine.getAnimationManager()
+		shared = self.imgMgr.load('../data/beach_e1.png')
+		first = self.imgMgr.load('../data/earth_1.png')
+		second = self.imgMgr.load('../data/mushroom_007.png')
+		blank = self.imgMgr.loadBlank(64, 64)
+		anim1 = animMgr.create('anim1')
+		anim1.addFrame(shared, 100)
+		anim1.addFrame(first, 100)
+		anim1.addFrame(blank, 100)
+		anim2 = animMgr.create('anim2')
+		anim2.addFrame(shared, 100)
+		anim2.addFrame(second, 100)
+
+		# the frames belong to the image manager, a shared frame is counted once
+		used = animMgr.getFrameMemoryUsed()
+		self.assertEqual(used, shared.getSize() + first.getSize() + second.getSize() + blank.getSize())
+		self.assertEqual(animMgr.getMemoryUsed(), 0)
+		self.engine.pump()
+		self.assertEqual(animMgr.getEvictionCount(), 0)
+
+		# frames created from memory are kept
+		animMgr.setMemoryBudget(1)
+		self.engine.pump()
+		for img in (shared, first, second):
+			self.assertEqual(img.getState(), fife.IResource.RES_NOT_LOADED)
+		self.assertEqual(blank.getState(), fife.IResource.RES_LOADED)
+		self.assertEqual(animMgr.getEvictionCount(), 3)
+		self.assertEqual(animMgr.getEvictedBytes(), used - blank.getSize())
+		self.assertEqual(animMgr.getFrameMemoryUsed(), blank.getSize())
+
+		# evicted frames are loaded again on access
+		self.assert_(anim2.getFrame(1).getWidth() > 0)
+
+
+class TestAutoAtlas(unittest.TestCase):
+
+	def setUp(self):
+		self.engine = getEngine(renderbackend='Null')
+		self.imgMgr = self.engine.getImageManager()
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def testPackIntoAtlas(self):
+		self.imgMgr.setAtlasPageSize(512)
+		names = ['../data/beach_e1.png', '../data/earth_1.png', '../data/mushroom_007.png']
+		for name in names:
+			img = self.imgMgr.create(name)
+			img.setXShift(3)
+			img.setYShift(-5)
+			self.assert_(self.imgMgr.packIntoAtlas(img))
+			self.assert_(img.isSharedImage())
+			self.assertEqual(img.getXShift(), 3)
+			self.assertEqual(img.getYShift(), -5)
+		self.assertEqual(self.imgMgr.getAtlasPageCount(), 1)
+		self.assertEqual(self.imgMgr.get(names[2]).getWidth(), 64)
+
+		# larger than half a page
+		big = self.imgMgr.create('../data/rpg_tiles_01.png')
+		self.assertFalse(self.imgMgr.packIntoAtlas(big))
+		self.assertFalse(big.isSharedImage())
+		self.assertEqual(self.imgMgr.getAtlasPageCount(), 1)
+
+	def testAtlasPageReload(self):
+		self.imgMgr.setAtlasPageSize(512)
+		names = ['../data/beach_e1.png', '../data/mushroom_007.png']
+		imgs = [self.imgMgr.create(name) for name in names]
+		for img in imgs:
+			self.assert_(self.imgMgr.packIntoAtlas(img))
+		page = self.imgMgr.get('auto_atlas_0')
+		points = []
+		for img in imgs:
+			rect = img.getSubImageRect()
+			points.append((rect.x + rect.w / 2, rect.y + rect.h / 2))
+		pixels = [page.getPixelRGBA(x, y) for x, y in points]
+
+		# the page is rebuilt from the image files
+		page.free()
+		self.assertEqual(page.getState(), fife.IResource.RES_NOT_LOADED)
+		page.load()
+		self.assertEqual(page.getWidth(), 512)
+		self.assertEqual([page.getPixelRGBA(x, y) for x, y in points], pixels)
+
+	def testPackMissingImage(self):
+		img = self.imgMgr.create('../data/does_not_exist.png')
+		self.assertFalse(self.imgMgr.packIntoAtlas(img))
+		self.assertFalse(img.isSharedImage())
+		self.assertEqual(img.getState(), fife.IResource.RES_NOT_LOADED)
+		self.assertEqual(self.imgMgr.getAtlasPageCount(), 0)
+
+
+TEST_CLASSES = [TestImgMgr, TestMemoryBudget, TestAutoAtlas]
 
 if __name__ == '__main__':
     unittest.main()
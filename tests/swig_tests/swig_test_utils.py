@@ -33,12 +33,12 @@ print "Using the FIFE python module found here: ", os.path.dirname(fife.__file__
 
 from fife.extensions import fifelog
 
-def getEngine(minimized=False):
+def getEngine(minimized=False, renderbackend='OpenGL'):
 	e = fife.Engine()
 	log = fifelog.LogManager(e, promptlog=False, filelog=True)
 	log.setVisibleModules('all')
 	s = e.getSettings()
-	s.setRenderBackend('OpenGL')
+	s.setRenderBackend(renderbackend)
 	s.setDefaultFontPath('../data/FreeMono.ttf')
 	s.setDefaultFontGlyphs(" abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" +
 			".,!?-+/:();%`'*#=[]")
@@ -23,7 +23,7 @@
 # ####################################################################
 
 from swig_test_utils import *
-import time
+import time, os, json, tempfile
 
 class MyTimeEvent(fife.TimeEvent):
 	def __init__(self, period):
@@ -52,7 +52,59 @@ class TestTimer(unittest.TestCase):
 
 		self.timemanager.unregisterEvent(e)
 
-TEST_CLASSES = [TestTimer]
+class TestProfiler(unittest.TestCase):
+	def setUp(self):
+		self.engine = getEngine(True)
+		self.profiler = self.engine.getProfiler()
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def testZones(self):
+		self.engine.initializePumping()
+		self.engine.pump()
+		self.assertEqual(self.profiler.getFrameCount(), 0)
+
+		self.profiler.setEnabled(True)
+		for i in xrange(20):
+			self.engine.pump()
+		self.engine.finalizePumping()
+
+		self.assertEqual(self.profiler.getFrameCount(), 20)
+		names = list(self.profiler.getZoneNames())
+		self.assertTrue("Frame" in names)
+		self.assertTrue("TimeManager::update" in names)
+		self.assertEqual(self.profiler.getZoneParent("TimeManager::update"), "Frame")
+		self.assertEqual(self.profiler.getCallCount("TimeManager::update"), 1)
+		self.assertTrue(self.profiler.getMinTime("Frame") <= self.profiler.getAverageTime("Frame"))
+		self.assertTrue(self.profiler.getAverageTime("Frame") <= self.profiler.getP99Time("Frame"))
+
+		self.profiler.setEnabled(False)
+		self.engine.pump()
+		self.assertEqual(self.profiler.getFrameCount(), 20)
+
+	def testChromeTrace(self):
+		self.profiler.setHistorySize(5)
+		self.profiler.setEnabled(True)
+		self.engine.initializePumping()
+		for i in xrange(10):
+			self.engine.pump()
+		self.engine.finalizePumping()
+
+		fd, filename = tempfile.mkstemp(suffix=".json")
+		os.close(fd)
+		try:
+			self.profiler.dumpChromeTrace(filename)
+			trace = json.load(open(filename))
+		finally:
+			os.remove(filename)
+		frames = [e for e in trace["traceEvents"] if e["name"] == "Frame"]
+		self.assertEqual(len(frames), 5)
+		for event in trace["traceEvents"]:
+			self.assertEqual(event["ph"], "X")
+			self.assertTrue(event["dur"] >= 0)
+
+TEST_CLASSES = [TestTimer, TestProfiler]
 
 if __name__ == '__main__':
     unittest.main()
@@ -24,6 +24,8 @@
 
 from swig_test_utils import *
 
+import os
+import shutil
 import sys
 
 class TestVfs(unittest.TestCase):
@@ -52,7 +54,154 @@ class TestVfs(unittest.TestCase):
 		self.assert_(data.getDataInBytes())
 		del data
 
-TEST_CLASSES = [TestVfs]
+	def testReadBuffer(self):
+		data = self.vfs.open('../../test_fife.py')
+		content = data.read()
+		data.setIndex(10)
+		buf = data.readBuffer()
+		self.assertEqual(str(buf), content[10:])
+		self.assertEqual(data.getCurrentIndex(), data.getDataLength())
+		del buf
+		del data
+
+	def testStoredZipEntry(self):
+		self.vfs.addNewSource('../data/testmap.zip')
+		data = self.vfs.open('ziptest_content/testdir1/file-a')
+		self.assertEqual(data.getDataLength(), 0)
+		self.assertEqual(str(data.readBuffer()), '')
+		del data
+
+class TestVfsIndex(unittest.TestCase):
+	def setUp(self):
+		self.engine = getEngine(True)
+		self.vfs = self.engine.getVFS()
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def testListingsStale(self):
+		# the vfs wants lowercase names
+		path = 'vfs_stale_test'
+		tmpdir = os.path.join('.', path)
+		os.mkdir(tmpdir)
+		try:
+			self.assertEqual(len(self.vfs.listFiles(path)), 0)
+			f = open(os.path.join(tmpdir, 'added.txt'), 'w')
+			f.write('added')
+			f.close()
+
+			# the cached listing hides the new file, but it is found
+			self.assertEqual(len(self.vfs.listFiles(path)), 0)
+			self.assert_(self.vfs.exists(path + '/added.txt'))
+			self.vfs.invalidateIndex()
+			self.assert_('added.txt' in self.vfs.listFiles(path))
+			self.assert_(self.vfs.exists(path + '/added.txt'))
+
+			# a deleted file stays listed and indexed
+			os.remove(os.path.join(tmpdir, 'added.txt'))
+			self.assert_('added.txt' in self.vfs.listFiles(path))
+			self.assert_(self.vfs.exists(path + '/added.txt'))
+			self.vfs.invalidateIndex()
+			self.assertEqual(len(self.vfs.listFiles(path)), 0)
+			self.assert_(not self.vfs.exists(path + '/added.txt'))
+		finally:
+			shutil.rmtree(tmpdir)
+
+	def testSourceChanges(self):
+		self.assert_(not self.vfs.exists('content/maps/test.map'))
+		self.assert_(not self.vfs.listDirectories('content'))
+
+		self.vfs.addNewSource('../data/testmap.zip')
+		self.assert_(self.vfs.exists('content/maps/test.map'))
+		self.assert_('maps' in self.vfs.listDirectories('content'))
+
+		self.vfs.removeSource('../data/testmap.zip')
+		self.assert_(not self.vfs.exists('content/maps/test.map'))
+		self.assert_(not self.vfs.listDirectories('content'))
+
+class TestEntryCache(unittest.TestCase):
+	def setUp(self):
+		self.engine = getEngine(True)
+		self.vfs = self.engine.getVFS()
+		self.vfs.addNewSource('../data/testmap.zip')
+		self.vfs.clearEntryCache()
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def testHitsAndMisses(self):
+		first = self.vfs.open('content/maps/test.map')
+		second = self.vfs.open('content/maps/test.map')
+		self.assertEqual(self.vfs.getEntryCacheMisses(), 1)
+		self.assertEqual(self.vfs.getEntryCacheHits(), 1)
+		self.assertEqual(self.vfs.getEntryCacheSize(), first.getDataLength())
+		self.assertEqual(first.read(), second.read())
+		del first
+		del second
+
+	def testBudget(self):
+		self.vfs.setEntryCacheBudget(1024)
+		data = self.vfs.open('content/maps/test.map')
+		self.assert_(data.getDataLength() > 1024)
+		self.assertEqual(self.vfs.getEntryCacheSize(), 0)
+		del data
+
+		self.vfs.setEntryCacheBudget(16 * 1024 * 1024)
+		data = self.vfs.open('ziptest_content/maps/test.map')
+		self.assertEqual(self.vfs.getEntryCacheSize(), data.getDataLength())
+		self.vfs.setEntryCacheBudget(0)
+		self.assertEqual(self.vfs.getEntryCacheSize(), 0)
+		del data
+
+class ReadListener(fife.VFSReadListener):
+	def __init__(self):
+		fife.VFSReadListener.__init__(self)
+		self.results = {}
+
+	def onReadFinished(self, path, data):
+		if data:
+			self.results[path] = data.read()
+		else:
+			self.results[path] = None
+
+class TestAsyncRead(unittest.TestCase):
+	def setUp(self):
+		self.engine = getEngine(True, 'Null')
+		self.vfs = self.engine.getVFS()
+		self.vfs.addNewSource('../data/testmap.zip')
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def waitForReads(self):
+		while self.vfs.getPendingReadCount():
+			self.vfs.processAsyncReads()
+
+	def testReadAsync(self):
+		listener = ReadListener()
+		self.vfs.readAsync('content/maps/test.map', listener)
+		self.waitForReads()
+		data = self.vfs.open('../data/test.map')
+		self.assertEqual(listener.results['content/maps/test.map'], data.read())
+		del data
+
+	def testReadManyAsync(self):
+		listener = ReadListener()
+		paths = ['content/maps/test.map', '../data/test.map', 'does/not/exist']
+		self.vfs.readManyAsync(paths, listener)
+		self.waitForReads()
+		self.assertEqual(sorted(listener.results.keys()), sorted(paths))
+		self.assertEqual(listener.results[paths[0]], listener.results[paths[1]])
+		self.assertEqual(listener.results[paths[2]], None)
+
+	def testCancelReads(self):
+		listener = ReadListener()
+		self.vfs.readAsync('content/maps/test.map', listener)
+		self.vfs.cancelReads(listener)
+		self.waitForReads()
+		self.assertEqual(listener.results, {})
+
+TEST_CLASSES = [TestVfs, TestVfsIndex, TestEntryCache, TestAsyncRead]
 
 if __name__ == '__main__':
     unittest.main()
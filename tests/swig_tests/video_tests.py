@@ -55,8 +55,86 @@ class TestVideo(unittest.TestCase):
 
 		self.engine.finalizePumping()
 	
+	def testBatching(self):
+		self.engine.initializePumping()
+		backend = self.engine.getRenderBackend()
+		image = self.engine.getImageManager().load('../data/mushroom_007.png')
+
+		renderer = self.engine.getOffRenderer()
+		renderer.setEnable(True)
+		for i in xrange(50):
+			renderer.addImage("images", fife.Point(10 + i * 5, 100), image)
+
+		self.engine.pump()
+		self.engine.pump()
+		# the quads of one texture are drawn together
+		self.assertTrue(backend.getBatchedItems() >= 50)
+		self.assertTrue(backend.getDrawCalls() < backend.getBatchedItems())
+
+		renderer.removeAll("images")
+		self.engine.finalizePumping()
+
+class TestNullVideo(unittest.TestCase):
+
+	def setUp(self):
+		self.engine = getEngine(renderbackend='Null')
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def testCounters(self):
+		backend = fife.RenderBackendNull.getInstance()
+		self.assertEqual(backend.getName(), 'Null')
+
+		self.engine.initializePumping()
+		renderer = self.engine.getOffRenderer()
+		renderer.setEnable(True)
+		renderer.addLine("lines", fife.Point(1,1), fife.Point(50,20), 255, 255, 255)
+		renderer.addPoint("lines", fife.Point(10,10), 255, 255, 255)
+
+		backend.resetCounters()
+		for i in xrange(10):
+			self.engine.pump()
+		self.assertEqual(backend.getFrameCount(), 10)
+		self.assertTrue(backend.getDrawCalls() >= 2)
+		# nothing is batched
+		self.assertEqual(backend.getBatchedItems(), backend.getDrawCalls())
+
+		renderer.removeAll("lines")
+		self.engine.finalizePumping()
+
+	def testRenderSkipsDecoding(self):
+		backend = fife.RenderBackendNull.getInstance()
+		imgMgr = self.engine.getImageManager()
+		image = imgMgr.create('../data/earth_1.png')
+		# the size is read from the png header
+		self.assertEqual(image.getWidth(), 126)
+		self.assertEqual(image.getHeight(), 96)
+		self.assertEqual(image.getState(), fife.IResource.RES_NOT_LOADED)
+
+		self.engine.initializePumping()
+		renderer = self.engine.getOffRenderer()
+		renderer.setEnable(True)
+		renderer.addImage("images", fife.Point(100, 100), image)
+
+		backend.resetCounters()
+		self.engine.pump()
+		self.assertTrue(backend.getImageDraws() >= 1)
+		# the image was drawn without decoding it
+		self.assertEqual(image.getState(), fife.IResource.RES_NOT_LOADED)
+		self.assertEqual(image.getArea(), fife.Rect(0, 0, 126, 96))
+
+		# a loaded image reports the same size
+		imgMgr.get(image.getHandle())
+		self.assertEqual(image.getState(), fife.IResource.RES_LOADED)
+		self.assertEqual(image.getWidth(), 126)
+		self.assertEqual(image.getHeight(), 96)
+
+		renderer.removeAll("images")
+		self.engine.finalizePumping()
+
 
-TEST_CLASSES = [TestVideo]
+TEST_CLASSES = [TestVideo, TestNullVideo]
 
 if __name__ == '__main__':
     unittest.main()
@@ -110,10 +110,169 @@ class TestView(unittest.TestCase):
 				cam.setZoom(cam.getZoom() - 0.010)
 			self.engine.pump()
 		self.engine.finalizePumping()
-	
+
+	def testParallelUpdate(self):
+		rb = self.engine.getRenderBackend()
+		viewport = fife.Rect(0, 0, rb.getWidth(), rb.getHeight())
+		layers = [self.layer]
+		for l in xrange(1, 6):
+			layers.append(self.map.createLayer("layer%03d" % (l + 1), self.grid))
+		for layer in layers:
+			for y in xrange(-6, 6):
+				for x in xrange(-6, 6):
+					i = layer.createInstance(self.obj2, fife.ModelCoordinate(x,y))
+					fife.InstanceVisual.create(i)
+
+		serial = self.map.addCamera("serial", self.layer, viewport)
+		parallel = self.map.addCamera("parallel", self.layer, viewport)
+		parallel.setParallelUpdateEnabled(True)
+		self.assertTrue(parallel.isParallelUpdateEnabled())
+		self.assertFalse(serial.isParallelUpdateEnabled())
+		for cam in (serial, parallel):
+			cam.setCellImageDimensions(self.screen_cell_w, self.screen_cell_h)
+			cam.setTilt(40)
+
+		area = fife.Rect(viewport.w / 2 - 50, viewport.h / 2 - 50, 100, 100)
+		self.engine.initializePumping()
+		for i in xrange(20):
+			for cam in (serial, parallel):
+				cam.setRotation(cam.getRotation() + 7)
+				cam.setZoom(1.0 + (i % 4) * 0.25)
+			self.engine.pump()
+			for layer in layers:
+				a = fife.InstanceList()
+				b = fife.InstanceList()
+				serial.getMatchingInstances(area, layer, a)
+				parallel.getMatchingInstances(area, layer, b)
+				self.assertTrue(len(a) > 0)
+				self.assertEqual([x.getFifeId() for x in a], [x.getFifeId() for x in b])
+		self.engine.finalizePumping()
+
+	def testKeySorting(self):
+		rb = self.engine.getRenderBackend()
+		viewport = fife.Rect(0, 0, rb.getWidth(), rb.getHeight())
+		instances = []
+		for y in xrange(-8, 8):
+			for x in xrange(-8, 8):
+				i = self.layer.createInstance(self.obj2, fife.ModelCoordinate(x,y))
+				fife.InstanceVisual.create(i)
+				instances.append(i)
+		# equal coordinates, only the stack position differs
+		for stack in xrange(3):
+			i = self.layer.createInstance(self.obj1, fife.ModelCoordinate(1,1))
+			fife.InstanceVisual.create(i).setStackPosition(2 - stack)
+			instances.append(i)
+
+		keyed = self.map.addCamera("keyed", self.layer, viewport)
+		compared = self.map.addCamera("compared", self.layer, viewport)
+		compared.setKeySortingEnabled(False)
+		self.assertTrue(keyed.isKeySortingEnabled())
+		for cam in (keyed, compared):
+			cam.setCellImageDimensions(self.screen_cell_w, self.screen_cell_h)
+			cam.setTilt(40)
+
+		area = fife.Rect(viewport.w / 2 - 150, viewport.h / 2 - 150, 300, 300)
+		self.engine.initializePumping()
+		for strategy in (fife.SORTING_CAMERA, fife.SORTING_LOCATION, fife.SORTING_CAMERA_AND_LOCATION):
+			self.layer.setSortingStrategy(strategy)
+			for frame in xrange(12):
+				if frame % 3 == 0:
+					for cam in (keyed, compared):
+						cam.setRotation(cam.getRotation() + 30)
+				else:
+					# static camera, a few instances move
+					for i in instances[frame::37]:
+						loc = i.getLocation()
+						c = loc.getExactLayerCoordinates()
+						c.x += 0.5
+						loc.setExactLayerCoordinates(c)
+						i.setLocation(loc)
+				self.engine.pump()
+				a = fife.InstanceList()
+				b = fife.InstanceList()
+				keyed.getMatchingInstances(area, self.layer, a)
+				compared.getMatchingInstances(area, self.layer, b)
+				self.assertTrue(len(a) > 0)
+				self.assertEqual([x.getFifeId() for x in a], [x.getFifeId() for x in b])
+		self.engine.finalizePumping()
 		
 
-TEST_CLASSES = [TestView]
+class TestStaticLayerTiles(unittest.TestCase):
+
+	def setUp(self):
+		self.engine = getEngine(renderbackend='Null')
+		self.model = self.engine.getModel()
+		self.map = self.model.createMap("map001")
+		self.grid = self.model.getCellGrid("square")
+
+		self.obj = self.model.createObject('0','test_nspace')
+		fife.ObjectVisual.create(self.obj)
+		img = self.engine.getImageManager().load('../data/earth_1.png')
+		self.obj.get2dGfxVisual().addStaticImage(0, img.getHandle())
+
+		self.layer = self.map.createLayer("ground", self.grid)
+		self.layer.setStatic(True)
+		for y in xrange(-20, 20):
+			for x in xrange(-20, 20):
+				i = self.layer.createInstance(self.obj, fife.ModelCoordinate(x,y))
+				fife.InstanceVisual.create(i)
+				if x == 0 and y == 0:
+					self.center = i
+
+		rb = self.engine.getRenderBackend()
+		self.cam = self.map.addCamera("tiled", self.layer, fife.Rect(0, 0, rb.getWidth(), rb.getHeight()))
+		self.cam.setCellImageDimensions(img.getWidth(), img.getHeight())
+		fife.InstanceRenderer.getInstance(self.cam).activateAllLayers(self.map)
+
+	def tearDown(self):
+		self.engine.destroy()
+
+	def move(self, dx):
+		loc = self.cam.getLocation()
+		c = loc.getExactLayerCoordinates()
+		c.x += dx
+		loc.setExactLayerCoordinates(c)
+		self.cam.setLocation(loc)
+		self.engine.pump()
+
+	def testTiles(self):
+		backend = fife.RenderBackendNull.getInstance()
+		self.assertFalse(self.cam.isStaticLayerTilingEnabled())
+		self.cam.setStaticLayerTilingEnabled(True)
+		self.cam.setStaticLayerTileSize(256)
+		self.assertEqual(self.cam.getStaticLayerTileSize(), 256)
+
+		self.engine.initializePumping()
+		self.engine.pump()
+		self.move(0.1)
+		self.move(-0.1)
+		# the tiles exist already, only they are drawn
+		tiles = backend.getImageDraws()
+		self.assertTrue(tiles > 0)
+		self.move(0.1)
+		self.move(-0.1)
+		self.assertEqual(backend.getImageDraws(), tiles)
+
+		# a changed instance renders its tiles again
+		loc = self.center.getLocation()
+		c = loc.getExactLayerCoordinates()
+		c.y += 0.5
+		loc.setExactLayerCoordinates(c)
+		self.center.setLocation(loc)
+		self.engine.pump()
+		self.assertTrue(backend.getImageDraws() > tiles)
+		self.engine.pump()
+		self.assertEqual(backend.getImageDraws(), tiles)
+
+		# without tiles the whole layer is rendered again on every move
+		self.cam.setStaticLayerTilingEnabled(False)
+		self.engine.pump()
+		self.move(0.1)
+		self.assertTrue(backend.getImageDraws() > tiles)
+		self.engine.finalizePumping()
+
+
+TEST_CLASSES = [TestView, TestStaticLayerTiles]
 
 if __name__ == '__main__':
     unittest.main()
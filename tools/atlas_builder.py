@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ####################################################################
+#  Copyright (C) 2005-2017 by the FIFE team
+#  http://www.fifengine.net
+#  This file is part of FIFE.
+#
+#  FIFE is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2.1 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the
+#  Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+# ####################################################################
+
+"""
+Packs the frames of animation files into atlas images.
+
+Every animation file found in the given directory, directly or through the
+<animation source="..."/> entries of object files, gets its own atlas image
+next to it (<name>_atlas.png). The frames are placed with fife.AtlasBook, the
+same packing the engine uses, and the animation file is rewritten to the atlas
+format of loadXMLAnimation (atlas, xpos, ypos, width and height attributes).
+
+The frame sources stay in the rewritten files, so the tool can be run again.
+A manifest in the directory remembers the frames of each animation, only
+animations with changed frames are packed again.
+
+Usage: atlas_builder.py [--page-size 1024] [--force] directory
+"""
+
+from __future__ import print_function
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+fife_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'engine', 'python')
+if os.path.isdir(fife_path) and fife_path not in sys.path:
+	sys.path.insert(0, fife_path)
+
+from fife import fife
+
+MANIFEST = 'atlas_builder.json'
+# increase if the output changes for the same input
+VERSION = 1
+
+
+def normalize(path):
+	"""Returns the path in the form the vfs expects, relative with forward slashes."""
+	return os.path.normpath(path).replace(os.sep, '/')
+
+def relative_to(xmlfile, source):
+	"""Resolves a path that is relative to the directory of an xml file."""
+	return normalize(os.path.join(os.path.dirname(xmlfile), source))
+
+def indent(elem, level=0):
+	"""Indents the tree with tabs, like the hand written files."""
+	i = "\n" + level * "\t"
+	if len(elem):
+		if not elem.text or not elem.text.strip():
+			elem.text = i + "\t"
+		for child in elem:
+			indent(child, level + 1)
+		if not child.tail or not child.tail.strip():
+			child.tail = i
+	if level and (not elem.tail or not elem.tail.strip()):
+		elem.tail = i
+
+def find_animations(directory):
+	"""Returns the sorted paths of all animation files in and referenced from the directory."""
+	animations = set()
+	for root, dirs, files in os.walk(directory):
+		dirs.sort()
+		for name in sorted(files):
+			if not name.endswith('.xml'):
+				continue
+			path = normalize(os.path.relpath(os.path.join(root, name), directory))
+			try:
+				node = ET.parse(path).getroot()
+			except ET.ParseError:
+				continue
+			if node.tag == 'animation':
+				animations.add(path)
+			elif node.tag == 'object':
+				for anim in node.findall('action/animation'):
+					source = anim.get('source')
+					if source:
+						animations.add(relative_to(path, source))
+	return sorted(animations)
+
+class AtlasBuilder(object):
+	def __init__(self, page_size, force):
+		self.page_size = page_size
+		self.force = force
+
+		self.engine = fife.Engine()
+		settings = self.engine.getSettings()
+		settings.setRenderBackend('Null')
+		self.engine.init()
+		self.imgMgr = self.engine.getImageManager()
+
+		self.manifest = {}
+		if os.path.exists(MANIFEST):
+			with open(MANIFEST) as f:
+				self.manifest = json.load(f)
+
+	def destroy(self):
+		with open(MANIFEST, 'w') as f:
+			json.dump(self.manifest, f, indent=1, sort_keys=True)
+		self.engine.destroy()
+
+	def digest(self, sources):
+		"""Returns a hash over the packing settings and the content of the frames."""
+		sha = hashlib.sha1()
+		sha.update(('%d:%d' % (VERSION, self.page_size)).encode('utf-8'))
+		for source in sources:
+			sha.update(source.encode('utf-8'))
+			with open(source, 'rb') as f:
+				sha.update(f.read())
+		return sha.hexdigest()
+
+	def build(self, xmlfile):
+		"""Packs the frames of one animation file. Returns True if the file was rewritten."""
+		tree = ET.parse(xmlfile)
+		node = tree.getroot()
+		frames = node.findall('frame')
+		sources = []
+		for frame in frames:
+			source = relative_to(xmlfile, frame.get('source', ''))
+			if not os.path.isfile(source):
+				print('%s: frame %s not found, skipped' % (xmlfile, source))
+				return False
+			if source not in sources:
+				sources.append(source)
+		if not sources:
+			return False
+
+		atlas = os.path.splitext(os.path.basename(xmlfile))[0] + '_atlas.png'
+		atlasfile = relative_to(xmlfile, atlas)
+		digest = self.digest(sources)
+		if not self.force and self.manifest.get(xmlfile) == digest and os.path.isfile(atlasfile):
+			return False
+
+		# largest frames first, the order of equal frames is kept
+		images = dict((source, self.imgMgr.load(source)) for source in sources)
+		order = sorted(sources, key=lambda s: (-images[s].getHeight(), -images[s].getWidth()))
+
+		book = fife.AtlasBook(self.page_size, self.page_size)
+		blocks = {}
+		for source in order:
+			image = images[source]
+			try:
+				block = book.getBlock(image.getWidth(), image.getHeight())
+			except fife.Exception:
+				block = None
+			if block is None or block.page != 0:
+				print('%s: frames do not fit on one %dx%d page, skipped' % (xmlfile, self.page_size, self.page_size))
+				self.imgMgr.removeAll()
+				return False
+			blocks[source] = (block.left, block.top)
+		book.shrink(True)
+
+		page = self.imgMgr.loadBlank(book.getPageWidth(0), book.getPageHeight(0))
+		for source in order:
+			x, y = blocks[source]
+			page.copySubimage(x, y, images[source])
+		page.saveImage(atlasfile)
+
+		node.set('atlas', atlas)
+		for frame in frames:
+			source = relative_to(xmlfile, frame.get('source'))
+			x, y = blocks[source]
+			frame.set('xpos', str(x))
+			frame.set('ypos', str(y))
+			frame.set('width', str(images[source].getWidth()))
+			frame.set('height', str(images[source].getHeight()))
+		indent(node)
+		tree.write(xmlfile)
+
+		self.manifest[xmlfile] = digest
+		self.imgMgr.removeAll()
+		return True
+
+def main():
+	parser = argparse.ArgumentParser(description='Packs the frames of FIFE animation files into atlas images.')
+	parser.add_argument('directory', help='directory with object and animation xml files')
+	parser.add_argument('--page-size', type=int, default=1024, help='maximal width and height of an atlas')
+	parser.add_argument('--force', action='store_true', help='pack all animations, also the unchanged ones')
+	args = parser.parse_args()
+
+	# the vfs works with paths relative to the working directory
+	os.chdir(args.directory)
+	builder = AtlasBuilder(args.page_size, args.force)
+	built = 0
+	animations = find_animations('.')
+	try:
+		for xmlfile in animations:
+			if builder.build(xmlfile):
+				print('%s: packed' % xmlfile)
+				built += 1
+	finally:
+		builder.destroy()
+	print('%d of %d animations packed' % (built, len(animations)))
+
+if __name__ == '__main__':
+	main()
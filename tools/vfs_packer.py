@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ####################################################################
+#  Copyright (C) 2005-2017 by the FIFE team
+#  http://www.fifengine.net
+#  This file is part of FIFE.
+#
+#  FIFE is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2.1 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the
+#  Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+# ####################################################################
+
+"""
+Packs a content directory into a zip or Fallout 2 DAT archive for the VFS.
+
+The entries are written in the order they are loaded, taken from a load
+trace, so a map load reads the archive front to back. The trace is a text
+file with one path per line, or a fife.log written with debug output of the
+VFS module, which contains a line "Opening: <path>" for every opened file.
+Entries that are not in the trace follow in alphabetical order.
+
+Files that are compressed already (png, ogg, ...) are stored, the rest is
+compressed. Zip archives start with an index entry (.fifeindex) that the
+ZipSource reads instead of walking over all entries. The archive stays a
+normal zip file. If another zip tool changes it later, the index no longer
+matches the central directory and the ZipSource walks over the entries.
+The timestamps are fixed, so the same content always gives the same archive.
+
+Usage: vfs_packer.py [--format zip|dat2] [--trace fife.log] directory archive
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import struct
+import zlib
+
+INDEX_NAME = '.fifeindex'
+STORED_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.ogg', '.zip', '.dat', '.ttf']
+# 1980-01-01 00:00, the first date a zip file can hold
+DOS_TIME = 0
+DOS_DATE = (1 << 5) | 1
+
+
+def collect_files(directory):
+	"""Returns the sorted archive names of all files in the directory."""
+	names = []
+	for root, dirs, files in os.walk(directory):
+		dirs.sort()
+		for name in sorted(files):
+			path = os.path.relpath(os.path.join(root, name), directory)
+			names.append(path.replace(os.sep, '/'))
+	return names
+
+def read_trace(filename, directory):
+	"""Returns the paths of a load trace as archive names, in load order."""
+	marker = 'Opening: '
+	paths = []
+	with open(filename) as f:
+		for line in f:
+			if marker in line:
+				line = line.split(marker, 1)[1]
+			line = line.strip()
+			if not line:
+				continue
+			path = os.path.normpath(line)
+			relative = os.path.relpath(path, directory)
+			if not relative.startswith('..'):
+				path = relative
+			paths.append(path.replace(os.sep, '/'))
+	return paths
+
+def order_files(names, trace):
+	"""Puts the traced files first, in the order they were loaded. Returns the names and the number of traced ones."""
+	known = set(names)
+	ordered = []
+	seen = set()
+	for path in trace:
+		if path in known and path not in seen:
+			ordered.append(path)
+			seen.add(path)
+	return ordered + [name for name in names if name not in seen], len(ordered)
+
+def is_stored(name, stored_extensions):
+	return os.path.splitext(name)[1].lower() in stored_extensions
+
+class Entry(object):
+	def __init__(self, name, data, compressed):
+		self.name = name
+		self.size = len(data)
+		self.crc = zlib.crc32(data) & 0xffffffff
+		self.compressed = compressed
+		self.data = data
+		self.offset = 0
+
+def write_zip(archive, entries):
+	def local_header(name, method, crc, compsize, size):
+		return struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0, method, DOS_TIME, DOS_DATE,
+			crc, compsize, size, len(name), 0) + name
+
+	for entry in entries:
+		entry.method = 0
+		entry.payload = entry.data
+		if entry.compressed:
+			compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+			payload = compressor.compress(entry.data) + compressor.flush()
+			# keep it stored if deflate doesn't help
+			if len(payload) < entry.size:
+				entry.method = 8
+				entry.payload = payload
+		entry.encoded = entry.name.encode('utf-8')
+
+	# the index lists the data offsets, which depend on the size of the index itself
+	index = b''
+	while True:
+		offset = 30 + len(INDEX_NAME) + len(index)
+		for entry in entries:
+			entry.header = offset
+			entry.offset = offset + 30 + len(entry.encoded)
+			offset = entry.offset + len(entry.payload)
+		lines = ['%d %d %d %d %d %s\n' % (e.offset, e.method, len(e.payload), e.size, e.crc, e.name) for e in entries]
+		new_index = ''.join(lines).encode('utf-8')
+		if new_index == index:
+			break
+		index = new_index
+
+	index_entry = Entry(INDEX_NAME, index, False)
+	index_entry.method = 0
+	index_entry.payload = index
+	index_entry.encoded = INDEX_NAME.encode('utf-8')
+	index_entry.header = 0
+	entries = [index_entry] + entries
+
+	with open(archive, 'wb') as f:
+		for entry in entries:
+			assert f.tell() == entry.header
+			f.write(local_header(entry.encoded, entry.method, entry.crc, len(entry.payload), entry.size))
+			f.write(entry.payload)
+
+		directory_start = f.tell()
+		for entry in entries:
+			f.write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 0, entry.method, DOS_TIME, DOS_DATE,
+				entry.crc, len(entry.payload), entry.size, len(entry.encoded), 0, 0, 0, 0, 0, entry.header))
+			f.write(entry.encoded)
+		directory_size = f.tell() - directory_start
+		f.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(entries), len(entries),
+			directory_size, directory_start, 0))
+
+def write_dat2(archive, entries):
+	with open(archive, 'wb') as f:
+		for entry in entries:
+			entry.offset = f.tell()
+			entry.type = 0
+			entry.payload = entry.data
+			if entry.compressed:
+				payload = zlib.compress(entry.data, 9)
+				if len(payload) < entry.size:
+					entry.type = 1
+					entry.payload = payload
+			f.write(entry.payload)
+
+		tree = struct.pack('<I', len(entries))
+		for entry in entries:
+			name = entry.name.replace('/', '\\').encode('utf-8')
+			tree += struct.pack('<I', len(name)) + name
+			tree += struct.pack('<BIII', entry.type, entry.size, len(entry.payload), entry.offset)
+		f.write(tree)
+		archive_size = f.tell() + 8
+		f.write(struct.pack('<II', len(tree), archive_size))
+
+def main():
+	parser = argparse.ArgumentParser(description='Packs a content directory into an archive for the FIFE VFS.')
+	parser.add_argument('directory', help='content directory')
+	parser.add_argument('archive', help='archive to write')
+	parser.add_argument('--format', choices=['zip', 'dat2'], default='zip', help='archive format')
+	parser.add_argument('--trace', help='load trace, a list of paths or a fife.log with VFS debug output')
+	parser.add_argument('--store', default=','.join(STORED_EXTENSIONS),
+		help='comma separated extensions that are stored without compression')
+	args = parser.parse_args()
+
+	stored_extensions = [e.strip().lower() for e in args.store.split(',') if e.strip()]
+	names = collect_files(args.directory)
+	archive = os.path.abspath(args.archive)
+	# don't pack the archive into itself
+	names = [n for n in names if os.path.abspath(os.path.join(args.directory, n)) != archive]
+	trace = read_trace(args.trace, args.directory) if args.trace else []
+	names, traced = order_files(names, trace)
+
+	entries = []
+	for name in names:
+		with open(os.path.join(args.directory, name), 'rb') as f:
+			entries.append(Entry(name, f.read(), not is_stored(name, stored_extensions)))
+
+	if args.format == 'zip':
+		write_zip(args.archive, entries)
+	else:
+		write_dat2(args.archive, entries)
+
+	print('%d files packed into %s, %d in load order' % (len(entries), args.archive, traced))
+
+if __name__ == '__main__':
+	main()